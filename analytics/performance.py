@@ -1,7 +1,12 @@
 """Performance tracking module"""
-from typing import Dict
+from typing import Dict, Optional
+import json
 import logging
 from datetime import datetime
+from pathlib import Path
+
+from core.config.settings import config
+from core.latency_tracker import latency_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +19,29 @@ class PerformanceTracker:
         """Record trade result"""
         self.trades.append(trade)
         
-    def save_report(self):
-        """Save performance report"""
+    def save_report(self, path: Optional[Path] = None) -> Dict:
+        """Save performance report, including the per-stage latency breakdown"""
         logger.info(f"Guardando reporte de {len(self.trades)} trades")
+        report = {
+            'generated_at': datetime.now().isoformat(),
+            'stats': self.get_stats(),
+            'latency_ms': latency_tracker.snapshot()
+        }
+        
+        for pipeline, stages in report['latency_ms'].items():
+            total = stages.get('total', {})
+            logger.info(f"Latencia {pipeline}: p50={total.get('p50', 0):.1f}ms "
+                       f"p99={total.get('p99', 0):.1f}ms n={total.get('count', 0)}")
+        
+        try:
+            path = Path(path) if path else config.DATA_DIR / 'performance_report.json'
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2, default=str)
+        except Exception as e:
+            logger.error(f"Error guardando reporte: {e}")
+        
+        return report
         
     def get_stats(self) -> Dict:
         """Get performance statistics"""
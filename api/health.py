@@ -31,6 +31,9 @@ try:
 except ImportError as e:
     logger.warning(f"Dashboard integration failed: {e}")
 
+from core.latency_tracker import latency_tracker
+from core.startup_profile import startup_profile
+
 class HealthChecker:
     def __init__(self):
         self.start_time = datetime.utcnow()
@@ -168,7 +171,8 @@ def detailed_health_check():
             "checks": checks,
             "metrics": {
                 "system": system_metrics,
-                "trading": trading_metrics
+                "trading": trading_metrics,
+                "latency_ms": latency_tracker.snapshot()
             },
             "version": "1.0.0",
             "environment": os.getenv("ENVIRONMENT", "unknown")
@@ -225,6 +229,39 @@ def liveness_check():
             "error": str(e)
         }), 500
 
+@app.route('/health/latency', methods=['GET'])
+def latency_breakdown():
+    """Per-stage latency percentiles for executions and bot cycles"""
+    try:
+        return jsonify({
+            "timestamp": datetime.utcnow().isoformat(),
+            "window_seconds": latency_tracker.window_seconds,
+            "pipelines": latency_tracker.snapshot()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Latency endpoint failed: {e}")
+        return jsonify({
+            "timestamp": datetime.utcnow().isoformat(),
+            "error": str(e)
+        }), 500
+
+@app.route('/health/startup', methods=['GET'])
+def startup_breakdown():
+    """Startup phase durations and slowest module imports"""
+    try:
+        return jsonify({
+            "timestamp": datetime.utcnow().isoformat(),
+            **startup_profile.report()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Startup endpoint failed: {e}")
+        return jsonify({
+            "timestamp": datetime.utcnow().isoformat(),
+            "error": str(e)
+        }), 500
+
 @app.route('/metrics', methods=['GET'])
 def prometheus_metrics():
     """Prometheus-compatible metrics endpoint"""
@@ -247,6 +284,16 @@ def prometheus_metrics():
         # Uptime metric
         metrics.append(f'quantum_trading_uptime_seconds {uptime}')
         
+        # Stage latency percentiles
+        for pipeline, stages in latency_tracker.snapshot().items():
+            for stage, summary in stages.items():
+                labels = f'pipeline="{pipeline}",stage="{stage}"'
+                for quantile in ('p50', 'p90', 'p99'):
+                    metrics.append(
+                        f'quantum_trading_latency_ms{{{labels},quantile="{quantile}"}} {summary[quantile]}'
+                    )
+                metrics.append(f'quantum_trading_latency_count{{{labels}}} {summary["count"]}')
+        
         return '\n'.join(metrics), 200, {'Content-Type': 'text/plain'}
         
     except Exception as e:
@@ -7,6 +7,9 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from .config.settings import config
+from .portfolio_risk import portfolio_risk_engine
+from .exit_engine import exit_engine
+from .stress_engine import stress_engine
 
 logger = logging.getLogger(__name__)
 
@@ -58,17 +61,25 @@ class AdvancedRiskManager:
             if not basic_validation['approved']:
                 return basic_validation
             
+            # One pre-trade check against the live covariance feeds heat and correlation analysis
+            portfolio_risk_engine.sync_positions(current_positions)
+            pre_trade = self._pre_trade_check(signal, account_balance, proposed_leverage, proposed_position_size)
+            
             # Portfolio heat analysis
             heat_analysis = await self._analyze_portfolio_heat(
                 signal, proposed_position_size, proposed_leverage, 
-                current_positions, account_balance, exchange
+                current_positions, account_balance, exchange, pre_trade
             )
             
             # Correlation exposure analysis
             correlation_analysis = await self._analyze_correlation_exposure(
-                signal, proposed_position_size, current_positions
+                signal, account_balance, pre_trade
             )
             
+            # Shock scenarios on the book with the proposed position added
+            stress_analysis = self._analyze_stress(signal, account_balance, proposed_leverage,
+                                                   current_positions, pre_trade)
+            
             # Performance-based adjustments
             performance_adjustment = self._analyze_performance_based_risk()
             
@@ -77,7 +88,7 @@ class AdvancedRiskManager:
             
             # Combine all risk factors
             combined_assessment = self._combine_risk_assessments(
-                basic_validation, heat_analysis, correlation_analysis,
+                basic_validation, heat_analysis, correlation_analysis, stress_analysis,
                 performance_adjustment, regime_adjustment
             )
             
@@ -147,33 +158,30 @@ class AdvancedRiskManager:
             return {'approved': False, 'risk_score': 1.0, 'warnings': [str(e)], 
                    'adjustments': {}, 'reasoning': "Basic validation error"}
     
+    def _pre_trade_check(self, signal: Dict, account_balance: float,
+                         leverage: float, position_size: float) -> Dict:
+        """Portfolio risk before and after the proposed trade"""
+        direction = -1 if str(signal.get('action', 'buy')).lower() in ('sell', 'short') else 1
+        notional = direction * account_balance * position_size * leverage
+        return portfolio_risk_engine.pre_trade_check(signal.get('symbol', 'UNKNOWN'), notional)
+    
     async def _analyze_portfolio_heat(self, signal: Dict, position_size: float,
                                     leverage: int, current_positions: Dict,
-                                    account_balance: float, exchange) -> Dict:
+                                    account_balance: float, exchange,
+                                    pre_trade: Optional[Dict] = None) -> Dict:
         """Analyze portfolio heat and exposure concentration"""
         try:
             symbol = signal.get('symbol', 'UNKNOWN')
             
-            # Calculate current portfolio heat
-            current_heat = 0.0
-            symbol_exposure = {}
-            
-            for pos_symbol, position in current_positions.items():
-                position_value = position.get('quantity', 0) * position.get('entry_price', 0)
-                position_risk = position_value / account_balance
-                current_heat += position_risk
-                
-                if pos_symbol in symbol_exposure:
-                    symbol_exposure[pos_symbol] += position_risk
-                else:
-                    symbol_exposure[pos_symbol] = position_risk
-            
-            # Calculate new position heat
-            new_position_value = account_balance * position_size * leverage
-            new_position_heat = new_position_value / account_balance
+            if pre_trade is None:
+                portfolio_risk_engine.sync_positions(current_positions)
+                pre_trade = self._pre_trade_check(signal, account_balance, leverage, position_size)
             
-            # Check portfolio heat limit
-            projected_heat = current_heat + new_position_heat
+            # Gross exposure comes from the engine's position vector
+            current_heat = pre_trade['gross_exposure'] / account_balance
+            projected_heat = pre_trade['projected_gross_exposure'] / account_balance
+            current_symbol_exposure = pre_trade['symbol_exposure'] / account_balance
+            projected_symbol_exposure = pre_trade['projected_symbol_exposure'] / account_balance
             
             warnings = []
             adjustments = {}
@@ -186,9 +194,6 @@ class AdvancedRiskManager:
                 risk_score += 0.3
             
             # Check symbol concentration
-            current_symbol_exposure = symbol_exposure.get(symbol, 0.0)
-            projected_symbol_exposure = current_symbol_exposure + new_position_heat
-            
             if projected_symbol_exposure > self.max_symbol_exposure:
                 warnings.append(f"Symbol exposure would exceed {self.max_symbol_exposure:.1%}")
                 max_symbol_size = (self.max_symbol_exposure - current_symbol_exposure) / leverage
@@ -223,51 +228,26 @@ class AdvancedRiskManager:
             return {'approved': True, 'risk_score': 0.1, 'warnings': [str(e)], 
                    'adjustments': {}, 'heat_data': {}}
     
-    async def _analyze_correlation_exposure(self, signal: Dict, position_size: float,
-                                          current_positions: Dict) -> Dict:
-        """Analyze correlation exposure risk"""
+    async def _analyze_correlation_exposure(self, signal: Dict, account_balance: float,
+                                          pre_trade: Dict) -> Dict:
+        """Analyze correlation exposure and VaR of the book with the proposed trade"""
         try:
-            symbol = signal.get('symbol', 'UNKNOWN')
-            
-            # Define correlation groups
-            correlation_groups = {
-                'major_alts': ['ETHUSDT', 'BNBUSDT', 'ADAUSDT', 'DOTUSDT'],
-                'defi_tokens': ['SOLUSDT', 'AVAXUSDT', 'MATICUSDT'],
-                'layer1s': ['ETHUSDT', 'AXSUSDT', 'SOLUSDT', 'AVAXUSDT', 'DOTUSDT']
-            }
-            
-            # Find which group this symbol belongs to
-            symbol_groups = []
-            for group_name, symbols in correlation_groups.items():
-                if symbol in symbols:
-                    symbol_groups.append(group_name)
+            # Open positions weighted by their live correlation with the traded symbol
+            correlated_pct = pre_trade['correlated_exposure'] / account_balance
+            var_pct = pre_trade['projected_var'] / account_balance
             
-            if not symbol_groups:
-                return {'approved': True, 'risk_score': 0.0, 'warnings': [], 'adjustments': {}}
-            
-            # Calculate current exposure in each group
-            group_exposures = {group: 0.0 for group in correlation_groups.keys()}
-            
-            for pos_symbol, position in current_positions.items():
-                position_exposure = position.get('quantity', 0) * position.get('entry_price', 0)
-                
-                for group_name, symbols in correlation_groups.items():
-                    if pos_symbol in symbols:
-                        group_exposures[group_name] += position_exposure
-            
-            # Check correlation exposure limits
             warnings = []
             adjustments = {}
             risk_score = 0.0
             
-            for group_name in symbol_groups:
-                current_group_exposure = group_exposures[group_name]
-                # Assuming account balance for calculation
-                current_group_pct = current_group_exposure / 10000  # Placeholder
-                
-                if current_group_pct > self.max_correlation_exposure:
-                    warnings.append(f"High correlation exposure in {group_name}: {current_group_pct:.1%}")
-                    risk_score += 0.2
+            if correlated_pct > self.max_correlation_exposure:
+                warnings.append(f"High correlation exposure for {signal.get('symbol', 'UNKNOWN')}: {correlated_pct:.1%}")
+                risk_score += 0.2
+            
+            # VaR is only trusted once the covariance has warmed up
+            if pre_trade['ready'] and var_pct > config.MAX_PORTFOLIO_VAR:
+                warnings.append(f"Portfolio VaR would reach {var_pct:.1%} of balance")
+                risk_score += 0.3
             
             return {
                 'approved': risk_score < 0.5,
@@ -275,8 +255,11 @@ class AdvancedRiskManager:
                 'warnings': warnings,
                 'adjustments': adjustments,
                 'correlation_data': {
-                    'symbol_groups': symbol_groups,
-                    'group_exposures': group_exposures
+                    'correlated_exposure': correlated_pct,
+                    'projected_correlated_exposure': pre_trade['projected_correlated_exposure'] / account_balance,
+                    'portfolio_var': var_pct,
+                    'incremental_var': pre_trade['incremental_var'] / account_balance,
+                    'covariance_ready': pre_trade['ready']
                 }
             }
             
@@ -284,6 +267,46 @@ class AdvancedRiskManager:
             logger.error(f"Error analyzing correlation exposure: {e}")
             return {'approved': True, 'risk_score': 0.0, 'warnings': [str(e)], 'adjustments': {}}
     
+    def _analyze_stress(self, signal: Dict, account_balance: float, leverage: float,
+                        current_positions: Dict, pre_trade: Dict) -> Dict:
+        """Stress the book with the proposed position: tail loss and liquidation probability"""
+        try:
+            notional = pre_trade['projected_symbol_exposure'] - pre_trade['symbol_exposure']
+            if str(signal.get('action', 'buy')).lower() in ('sell', 'short'):
+                notional = -notional
+            stress = stress_engine.run(current_positions, account_balance, candidate={
+                'symbol': signal.get('symbol', 'UNKNOWN'), 'notional': notional, 'leverage': leverage
+            })
+            
+            if stress.liquidation_probability > config.MAX_STRESS_LIQUIDATION_PROBABILITY:
+                return {
+                    'approved': False,
+                    'risk_score': 1.0,
+                    'warnings': [f"Account liquidated in {stress.liquidation_probability:.1%} of stress scenarios"],
+                    'adjustments': {},
+                    'reasoning': f"Stress test liquidation risk (worst: {stress.worst_scenario})"
+                }
+            
+            tail_loss_pct = stress.expected_shortfall / account_balance
+            warnings = []
+            risk_score = 0.0
+            
+            if tail_loss_pct > config.MAX_STRESS_LOSS:
+                warnings.append(f"Stress tail loss {tail_loss_pct:.1%} of balance (worst: {stress.worst_scenario})")
+                risk_score += 0.3
+            
+            return {
+                'approved': True,
+                'risk_score': risk_score,
+                'warnings': warnings,
+                'adjustments': {},
+                'stress_data': stress.to_dict()
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in stress analysis: {e}")
+            return {'approved': True, 'risk_score': 0.0, 'warnings': [str(e)], 'adjustments': {}}
+    
     def _analyze_performance_based_risk(self) -> Dict:
         """Adjust risk based on recent performance"""
         try:
@@ -539,9 +562,16 @@ class AdvancedRiskManager:
                 'last_updated': datetime.now()
             }
             
-            # Store trailing stop data
+            # Store trailing stop data; the exit engine ratchets and triggers it on every tick
             position_key = f"{symbol}_{position.get('order_id', 'unknown')}"
             self.stop_adjustments[position_key] = trailing_data
+            exit_engine.register(
+                position_key, symbol, side,
+                trailing_distance=trailing_distance,
+                reference_price=current_price,
+                on_trigger=self._on_trailing_stop_hit,
+                metadata={'source': 'advanced_risk_manager'}
+            )
             
             logger.info(f"Trailing stop setup for {symbol}: distance={trailing_distance:.4f}, "
                        f"initial_stop={initial_stop:.4f}")
@@ -559,36 +589,26 @@ class AdvancedRiskManager:
                 return {'updated': False, 'reason': 'No trailing stop data found'}
             
             trailing_data = self.stop_adjustments[position_key]
-            side = trailing_data['side']
-            current_stop = trailing_data['current_stop']
-            trailing_distance = trailing_data['trailing_distance']
-            
-            updated = False
-            new_stop = current_stop
+            exit_engine.on_price(trailing_data['symbol'], current_price)
             
-            if side == 'BUY':
-                # Update highest price
-                if current_price > trailing_data.get('highest_price', 0):
-                    trailing_data['highest_price'] = current_price
-                    new_stop = current_price - trailing_distance
-                    
-                    # Only update if new stop is higher (trailing up)
-                    if new_stop > current_stop:
-                        trailing_data['current_stop'] = new_stop
-                        updated = True
+            if trailing_data.get('triggered'):
+                return {
+                    'updated': False,
+                    'triggered': True,
+                    'current_stop': trailing_data['current_stop'],
+                    'current_price': current_price,
+                    'trailing_data': trailing_data
+                }
             
-            else:  # SELL
-                # Update lowest price
-                if current_price < trailing_data.get('lowest_price', float('inf')):
-                    trailing_data['lowest_price'] = current_price
-                    new_stop = current_price + trailing_distance
-                    
-                    # Only update if new stop is lower (trailing down)
-                    if new_stop < current_stop:
-                        trailing_data['current_stop'] = new_stop
-                        updated = True
+            new_stop = exit_engine.trailing_stop(position_key)
+            updated = new_stop is not None and new_stop != trailing_data['current_stop']
             
             if updated:
+                trailing_data['current_stop'] = new_stop
+                if trailing_data['side'] == 'BUY':
+                    trailing_data['highest_price'] = new_stop + trailing_data['trailing_distance']
+                else:
+                    trailing_data['lowest_price'] = new_stop - trailing_data['trailing_distance']
                 trailing_data['last_updated'] = datetime.now()
                 trailing_data['current_price'] = current_price
                 
@@ -606,6 +626,21 @@ class AdvancedRiskManager:
             logger.error(f"Error updating trailing stop: {e}")
             return {'updated': False, 'reason': str(e)}
     
+    def _on_trailing_stop_hit(self, trigger):
+        """Exit engine callback: mark the trailing stop as triggered"""
+        trailing_data = self.stop_adjustments.get(trigger.key)
+        if trailing_data is None:
+            return
+        trailing_data.update({
+            'current_stop': trigger.level,
+            'current_price': trigger.price,
+            'trailing_active': False,
+            'triggered': True,
+            'last_updated': datetime.now()
+        })
+        logger.warning(f"Trailing stop hit for {trigger.symbol}: price={trigger.price:.4f}, "
+                       f"stop={trigger.level:.4f}")
+    
     def add_performance_record(self, trade_result: Dict):
         """Add trade result to performance tracking"""
         try:
@@ -635,6 +670,7 @@ class AdvancedRiskManager:
                 'active_trailing_stops': len(self.stop_adjustments),
                 'recent_performance_records': len(self.recent_performance),
                 'heat_map_entries': len(self.heat_map),
+                'stress': stress_engine.last_result.to_dict() if stress_engine.last_result else None,
                 'trailing_parameters': {
                     'atr_multiplier': self.trailing_stop_atr_multiplier,
                     'min_profit_required': self.min_trailing_profit,
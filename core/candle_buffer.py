@@ -0,0 +1,290 @@
+"""
+Per-symbol candle buffers with incrementally maintained volatility statistics
+Keeps the newest bars in fixed-capacity float32 arrays and updates rolling sums as
+bars arrive or the forming bar changes, so a scan only fetches the newest candles
+"""
+import logging
+import math
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+ANNUALIZATION = np.sqrt(24 * 365)  # Scanner convention for 5m bars
+GK_COEFF = 2 * np.log(2) - 1
+
+# Multi-horizon volatility: metric name -> closes in the horizon (5m bars)
+HORIZONS = {'vol_5min': 1, 'vol_15min': 3, 'vol_1h': 12, 'vol_4h': 48, 'vol_24h': 288}
+
+
+class RollingStats:
+    """Sum and sum of squares over the last ``window`` values
+
+    NaN values occupy a slot but are not counted, matching pandas' NaN-skipping
+    reductions. Sums are taken around a shift near the data's mean so the
+    variance does not suffer from cancellation, and are rebuilt from the held
+    values every few windows so add/subtract rounding cannot accumulate.
+    Values are held in a preallocated ring rather than as Python floats.
+    """
+
+    def __init__(self, window: int):
+        self.window = max(int(window), 0)
+        self._ring = np.empty(self.window)
+        self._head = 0  # Slot of the oldest value
+        self._size = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.count = 0
+        self.shift = None
+        self._updates = 0
+
+    def _add(self, value: float, sign: int):
+        if value == value:  # Not NaN
+            if self.shift is None:
+                self.shift = value
+            value -= self.shift
+            self.total += sign * value
+            self.total_sq += sign * value * value
+            self.count += sign
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def values(self) -> np.ndarray:
+        """Held values, oldest first"""
+        return np.roll(self._ring, -self._head)[:self._size] if self._size == self.window else self._ring[:self._size]
+
+    def append(self, value: float):
+        if not self.window:
+            return
+        if self._size == self.window:
+            self._add(float(self._ring[self._head]), -1)
+            self._ring[self._head] = value
+            self._head = (self._head + 1) % self.window
+        else:
+            self._ring[self._size] = value
+            self._size += 1
+        self._add(value, 1)
+        self._tick()
+
+    def replace_last(self, value: float):
+        """Replace the newest value (the forming bar changed)"""
+        if not self._size:
+            return self.append(value)
+        last = (self._head + self._size - 1) % self.window
+        self._add(float(self._ring[last]), -1)
+        self._ring[last] = value
+        self._add(value, 1)
+        self._tick()
+
+    def _tick(self):
+        self._updates += 1
+        if self._updates >= 4 * self.window:
+            self._updates = 0
+            valid = [v for v in self.values.tolist() if v == v]
+            self.shift = math.fsum(valid) / len(valid) if valid else None
+            self.total = math.fsum(v - self.shift for v in valid)
+            self.total_sq = math.fsum((v - self.shift) ** 2 for v in valid)
+            self.count = len(valid)
+
+    def mean(self) -> float:
+        return self.shift + self.total / self.count if self.count else float('nan')
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), NaN with fewer than two values"""
+        n = self.count
+        if n < 2:
+            return float('nan')
+        variance = (self.total_sq - self.total * self.total / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+class CandleSeries:
+    """Newest ``capacity`` OHLCV bars of one symbol with rolling volatility statistics
+
+    ``update`` takes ccxt OHLCV rows: a row with the newest timestamp replaces
+    the forming bar, newer rows are appended, older rows are ignored. Each bar
+    only touches its own per-bar terms (true range, log returns, range terms),
+    so updates cost O(1) and ``metrics`` reads the running sums. The running
+    sums see full-precision bar values; the stored bars are float32 columns on
+    an int64 timestamp axis, with a little slack so eviction is an occasional
+    block copy.
+    """
+
+    def __init__(self, symbol: str, capacity: int = 500):
+        self.symbol = symbol
+        self.capacity = capacity
+        rows = capacity + max(capacity // 8, 16)
+        self._timestamps = np.zeros(rows, dtype=np.int64)
+        self._data = np.zeros((rows, len(COLUMNS)), dtype=np.float32)  # OHLCV, then the 12-bar return std
+        self._start = 0
+        self._end = 0
+
+        self.stats = {
+            'true_range': RollingStats(14),
+            'log_return': RollingStats(capacity - 1),
+            'parkinson': RollingStats(capacity),
+            'garman_klass': RollingStats(capacity),
+            'overnight': RollingStats(capacity - 1),
+            'open_close': RollingStats(capacity),
+            'volume': RollingStats(50),
+            'return_12': RollingStats(12)
+        }
+        self.horizons = {name: RollingStats(closes - 1) for name, closes in HORIZONS.items()}
+        self._last_close = float('nan')
+        self._prev_close = float('nan')
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Column view, oldest bar first"""
+        if column == 'timestamp':
+            return self._timestamps[self._start:self._end]
+        index = len(COLUMNS) - 1 if column == 'return_std_12' else COLUMNS.index(column) - 1
+        return self._data[self._start:self._end, index]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the bar arrays and the rolling statistics"""
+        stats = list(self.stats.values()) + list(self.horizons.values())
+        return self._timestamps.nbytes + self._data.nbytes + sum(s._ring.nbytes for s in stats)
+
+    @property
+    def last_timestamp(self) -> int:
+        return int(self._timestamps[self._end - 1]) if len(self) else 0
+
+    def update(self, rows: Sequence[Sequence[float]]) -> int:
+        """Apply OHLCV rows (oldest first); returns the number of new bars"""
+        appended = 0
+        for row in rows:
+            timestamp = row[0]
+            if not len(self) or timestamp > self.last_timestamp:
+                self._append(row)
+                appended += 1
+            elif timestamp == self.last_timestamp:
+                self._replace_last(row)
+        return appended
+
+    def _terms(self, row, prev_close: float) -> Dict[str, float]:
+        _, open_price, high, low, close, volume = (float(v) for v in row[:6])
+        hl = math.log(high / low)
+        oc = math.log(close / open_price)
+        gk_arg = 0.5 * hl * hl - GK_COEFF * oc * oc
+        if prev_close == prev_close:
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            log_return = math.log(close / prev_close)
+            overnight = math.log(open_price / prev_close)
+        else:
+            true_range, log_return, overnight = high - low, float('nan'), float('nan')
+        return {
+            'true_range': true_range,
+            'log_return': log_return,
+            'parkinson': abs(hl),
+            'garman_klass': math.sqrt(gk_arg) if gk_arg >= 0 else float('nan'),
+            'overnight': overnight,
+            'open_close': oc,
+            'volume': volume,
+            'return_12': log_return
+        }
+
+    def _append(self, row):
+        prev_close = self._last_close if len(self) else float('nan')
+        terms = self._terms(row, prev_close)
+        for name, stats in self.stats.items():
+            stats.append(terms[name])
+        for stats in self.horizons.values():
+            stats.append(terms['log_return'])
+
+        if self._end == len(self._data):
+            keep = self.capacity - 1
+            self._timestamps[:keep] = self._timestamps[self._end - keep:self._end]
+            self._data[:keep] = self._data[self._end - keep:self._end]
+            self._start, self._end = 0, keep
+        self._store(self._end, row)
+        self._end += 1
+        if len(self) > self.capacity:
+            self._start += 1
+
+    def _replace_last(self, row):
+        prev_close = self._prev_close
+        terms = self._terms(row, prev_close)
+        for name, stats in self.stats.items():
+            stats.replace_last(terms[name])
+        for stats in self.horizons.values():
+            stats.replace_last(terms['log_return'])
+        self._store(self._end - 1, row)
+
+    def _store(self, index: int, row):
+        # Full-precision closes of the last two bars feed the next bar's terms
+        if index == self._end:
+            self._prev_close = self._last_close if self._end > self._start else float('nan')
+        self._last_close = float(row[4])
+        self._timestamps[index] = int(row[0])
+        self._data[index, :len(COLUMNS) - 1] = [float(v) for v in row[1:6]]
+        self._data[index, len(COLUMNS) - 1] = self._return_std_12()
+
+    def _return_std_12(self) -> float:
+        stats = self.stats['return_12']
+        return stats.std() if stats.count == stats.window else float('nan')
+
+    def metrics(self) -> Dict:
+        """The scanner's volatility metrics from the running sums"""
+        n = len(self)
+        if n < 30:
+            return {}
+        close, volume = self['close'], self['volume']
+        stats = self.stats
+        price = self._last_close
+
+        atr = stats['true_range'].mean()
+        horizon_vols = {
+            name: (self.horizons[name].std() * np.sqrt(24 * 365 / closes) if n >= closes else 0)
+            for name, closes in HORIZONS.items()
+        }
+        avg_volume = stats['volume'].mean()
+
+        recent_volume = volume[-30:].astype(np.float64)
+        recent_vol = self['return_std_12'][-30:].astype(np.float64)
+        valid = ~np.isnan(recent_vol)
+        vol_corr = _corr(recent_volume[valid], recent_vol[valid])
+
+        window_high = float(self['high'][-288:].max())
+        window_low = float(self['low'][-288:].min())
+        current_volume = float(volume[-1])
+        return {
+            'atr': atr,
+            'atr_percent': atr / price * 100,
+            'historical_vol': stats['log_return'].std() * ANNUALIZATION,
+            'parkinson_vol': stats['parkinson'].mean() * ANNUALIZATION,
+            'garman_klass_vol': stats['garman_klass'].mean() * ANNUALIZATION,
+            'yang_zhang_vol': np.sqrt(stats['overnight'].std() ** 2 + 0.5 * stats['open_close'].std() ** 2) * ANNUALIZATION,
+            **horizon_vols,
+            'price_change_5min': (price - self._prev_close) / self._prev_close * 100,
+            'price_change_1h': (price - float(close[-12])) / float(close[-12]) * 100,
+            'price_change_24h': (price - float(close[-288])) / float(close[-288]) * 100 if n >= 288 else 0,
+            'high_low_ratio': (window_high - window_low) / window_low * 100,
+            'volume_spike_ratio': current_volume / avg_volume if avg_volume > 0 else 1,
+            'volume_volatility_correlation': vol_corr,
+            'current_price': price,
+            'current_volume': current_volume
+        }
+
+    def frame(self) -> pd.DataFrame:
+        """Bars as a timestamp-indexed DataFrame (for callers that still want one)"""
+        data = {column: self[column] for column in COLUMNS[1:]}
+        index = pd.to_datetime(self['timestamp'], unit='ms')
+        return pd.DataFrame(data, index=pd.Index(index, name='timestamp'))
+
+
+def _corr(x: np.ndarray, y: np.ndarray) -> float:
+    if len(x) < 2:
+        return float('nan')
+    x = x - x.mean()
+    y = y - y.mean()
+    denominator = np.sqrt((x * x).sum() * (y * y).sum())
+    return float((x * y).sum() / denominator) if denominator > 0 else float('nan')
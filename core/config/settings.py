@@ -27,6 +27,9 @@ class Config:
     MIN_LEVERAGE = int(os.getenv('MIN_LEVERAGE', 8))  # Minimum for target achievement
     STOP_LOSS_PERCENT = 0.018  # 1.8% stop loss for volatile pairs
     TAKE_PROFIT_RATIO = 2.5  # 4.5% take profit (1.8% * 2.5) for volatility capture
+    MIN_SIGNAL_CONFIDENCE = 0.3  # Signals below this never reach execution
+    MAX_DAILY_TRADES = 35  # Daily trade budget for scalping
+    MAX_SIGNALS_PER_SYMBOL = 1  # Signals approved per symbol per cycle
     
     # Advanced Leverage Parameters - HIGH-VOLATILITY OPTIMIZED
     MAX_DAILY_DRAWDOWN = 0.12  # 12% daily loss limit for volatile pairs
@@ -35,6 +38,25 @@ class Config:
     LEVERAGE_REDUCTION_TRIGGER = 0.10  # Reduce leverage after 10% drawdown
     MAX_MARGIN_USAGE = 0.70    # Conservative margin usage for scalping
     
+    # Portfolio Risk Engine - covariance of tick returns
+    PORTFOLIO_RISK_EWMA_DECAY = 0.99  # Per-tick EWMA decay (~70 tick half-life)
+    PORTFOLIO_RISK_MIN_OBSERVATIONS = 30  # Ticks before a symbol's covariance replaces the prior
+    PORTFOLIO_RISK_PRIOR_VOL = 0.0003  # Per-tick volatility assumed for new symbols
+    PORTFOLIO_VAR_CONFIDENCE = 0.99
+    PORTFOLIO_VAR_HORIZON_SECONDS = 3600
+    MAX_PORTFOLIO_VAR = float(os.getenv('MAX_PORTFOLIO_VAR', 0.05))  # VaR limit as a fraction of balance
+    
+    # Stress Testing - shock scenarios applied to the open book
+    STRESS_CORRELATED_SCENARIOS = 5000  # Draws from the live covariance per run
+    STRESS_HORIZON_SECONDS = 86400  # Horizon the covariance is scaled to (one day, like the replays)
+    STRESS_TAIL_DOF = 4  # Student-t degrees of freedom for fat-tailed draws
+    STRESS_HISTORY_DAYS = 365  # Daily candles replayed as historical scenarios
+    STRESS_FUNDING_SPIKES = [0.003, -0.003, 0.0075, -0.0075]  # Funding rate per interval
+    STRESS_FUNDING_PERIODS = 3  # Funding intervals a spike lasts
+    MAINTENANCE_MARGIN_RATE = 0.004
+    MAX_STRESS_LOSS = float(os.getenv('MAX_STRESS_LOSS', 0.25))  # Tail loss limit as a fraction of balance
+    MAX_STRESS_LIQUIDATION_PROBABILITY = 0.01
+    
     # Leverage Tiers based on signal strength - SCALPING OPTIMIZED
     LEVERAGE_TIERS = {
         'base': 8,                # Conservative base for scalping
@@ -45,14 +67,46 @@ class Config:
     
     # Execution - HIGH-FREQUENCY OPTIMIZED
     SLIPPAGE_TOLERANCE = 0.0005  # Tighter slippage tolerance for scalping
+    ORDER_BOOK_DEPTH = 20  # Levels kept per side in the shared order book cache
+    ORDER_BOOK_MAX_AGE_SECONDS = 1.0  # Cached books older than this are refetched
+    MARK_PRICE_MAX_AGE_SECONDS = 3.0  # Cached mark prices older than this trigger a bulk refresh
+    FUNDING_RATE_MAX_AGE_SECONDS = 300  # Cached funding rates are trusted this long
+    SCAN_REQUEST_WEIGHT_PER_MINUTE = 600  # Scanner's share of the exchange request-weight limit
+    SCAN_MAX_CONCURRENCY = 8  # Pair scans in flight at once
     MAX_ORDER_RETRIES = 5  # More retries for high-frequency trading
     ORDER_TIMEOUT = 5  # Shorter timeout for faster execution
     SIGNAL_GENERATION_INTERVAL = 45  # Generate signals every 45 seconds for volatile pairs
     MIN_SIGNAL_INTERVAL = 30  # Minimum 30 seconds between signals for processing
-    
+    RETRY_BASE_DELAY = 0.2  # Jittered backoff base; safe because retries check client order ids first
+    RETRY_MAX_DELAY = 2.0  # Backoff cap in seconds
+    ORDER_LOOKUP_ATTEMPTS = 3  # Lookups by client order id before declaring the order state unknown
+
+    # Execution Algorithms - cost-aware order placement
+    EXECUTION_MODE = os.getenv('EXECUTION_MODE', 'market')  # market, post_only, marketable_limit, twap, iceberg (opt in to limit-based modes)
+    POST_ONLY_REPRICE_SECONDS = 2.0  # Reprice resting post-only orders this often
+    POST_ONLY_MAX_REPRICES = 5  # Then cross the spread with a marketable limit
+    SLICE_THRESHOLD_USD = float(os.getenv('SLICE_THRESHOLD_USD', 'inf'))  # Clips above this notional are sliced (opt in)
+    SLICED_EXECUTION_MODE = 'twap'  # Algorithm used for large clips
+    TWAP_SLICES = 5
+    TWAP_DURATION_SECONDS = 30
+    ICEBERG_VISIBLE_RATIO = 0.2  # Visible child size as a fraction of the parent
+    BATCH_ORDER_SIZE = 5  # Binance futures batchOrders limit
+    # Exchange-side reduce-only brackets; only close_all_positions cancels them, so opt in
+    PLACE_PROTECTIVE_ORDERS = os.getenv('PLACE_PROTECTIVE_ORDERS', 'false').lower() == 'true'
+
     # Data Settings
     LOOKBACK_DAYS = 30
     CACHE_EXPIRY = 300
+    STATE_SNAPSHOT_PATH = os.getenv('STATE_SNAPSHOT_PATH', 'state/warm_start.snapshot')  # Warm analytic state across restarts
+    STATE_SNAPSHOT_INTERVAL = int(os.getenv('STATE_SNAPSHOT_INTERVAL', 60))  # Seconds between snapshots
+    STATE_SNAPSHOT_MAX_AGE = int(os.getenv('STATE_SNAPSHOT_MAX_AGE', 3600))  # Older snapshots are ignored at boot
+    CANDLE_STORE_DIR = os.getenv('CANDLE_STORE_DIR', 'state/candles')  # Local OHLCV history used to pre-warm at startup
+    PREWARM_REQUEST_WEIGHT = 600  # Request-weight budget per rolling minute while pre-warming
+    PREWARM_MAX_CONCURRENCY = 10  # History fetches in flight at once
+
+    # Machine Learning
+    ML_COMPILED_INFERENCE = os.getenv('ML_COMPILED_INFERENCE', 'true').lower() == 'true'  # Flattened-tree evaluator instead of sklearn predict
+    ML_ONLINE_LEARNING = os.getenv('ML_ONLINE_LEARNING', 'false').lower() == 'true'  # Serve incrementally updated models once warmed up
     
     # Database
     REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
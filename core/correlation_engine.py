@@ -1,4 +1,5 @@
 """Advanced correlation analysis engine"""
+import time
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
@@ -10,9 +11,11 @@ from .config.settings import config
 logger = logging.getLogger(__name__)
 
 class CorrelationEngine:
-    def __init__(self, window_size: int = None):
+    def __init__(self, window_size: int = None, symbols: List[str] = None):
         """Initialize CorrelationEngine with configurable parameters"""
         self.window_size = window_size or config.CORRELATION_PERIOD
+        self.symbols = symbols or config.SYMBOLS
+        self.history_as_of_ms = None  # When the restored price history was snapshotted
         self.correlation_history = {}
         self.last_correlations = None
         self.price_history = {}
@@ -86,6 +89,51 @@ class CorrelationEngine:
                 if len(self.price_history[symbol]) > max_history:
                     self.price_history[symbol] = self.price_history[symbol][-max_history:]
     
+    def export_state(self) -> Dict:
+        """Price and correlation history for warm-start snapshots (copies)"""
+        return {
+            'price_history': {symbol: np.array(prices, dtype=np.float64)
+                              for symbol, prices in self.price_history.items()},
+            'correlation_history': {symbol: list(history) for symbol, history in self.correlation_history.items()},
+            'last_correlations': self.last_correlations.copy() if self.last_correlations is not None else None,
+            'as_of_ms': int(time.time() * 1000)
+        }
+    
+    def restore_state(self, state: Dict):
+        """Resume from a warm-start snapshot"""
+        max_history = self.window_size + 50
+        self.price_history = {symbol: prices.tolist()[-max_history:]
+                              for symbol, prices in state.get('price_history', {}).items()}
+        self.correlation_history = {symbol: list(history)[-100:]
+                                    for symbol, history in state.get('correlation_history', {}).items()}
+        self.last_correlations = state.get('last_correlations')
+        self.history_as_of_ms = state.get('as_of_ms')
+    
+    def history_requirements(self) -> Dict[Tuple[str, str], int]:
+        """One-minute candles needed to fill the price history at startup"""
+        return {(symbol, '1m'): self.window_size + 50 for symbol in self.symbols}
+    
+    def load_history(self, candles: Dict[Tuple[str, str], np.ndarray]):
+        """
+        Fill price history from pre-warmed OHLCV closes
+        
+        After a warm start, closes of candles opened since the snapshot extend
+        the restored history; symbols still short of ``window_size`` points are
+        seeded with the candle closes instead.
+        """
+        max_history = self.window_size + 50
+        filled = {}
+        for (symbol, _), ohlcv in candles.items():
+            history = self.price_history.get(symbol, [])
+            if self.history_as_of_ms is not None and history:
+                history = history + ohlcv[ohlcv[:, 0] > self.history_as_of_ms, 4].tolist()
+            if len(history) < self.window_size:
+                history = ohlcv[:, 4].tolist()
+            self.price_history[symbol] = history[-max_history:]
+            filled[symbol] = len(self.price_history[symbol])
+        
+        logger.info(f"Price history pre-warmed: {filled}")
+    
     def _calculate_correlation_matrix(self, symbols: List[str]) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
         """Calculate correlation matrix with statistical significance"""
         try:
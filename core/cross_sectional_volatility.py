@@ -0,0 +1,315 @@
+"""
+Cross-sectional volatility metrics for the whole scanner universe
+Stacks every monitored pair into aligned (symbol x time) arrays and computes the
+scanner's estimators, regimes, volatility states, percentiles and opportunity
+scores in one vectorized pass
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .candle_buffer import ANNUALIZATION, COLUMNS, GK_COEFF, HORIZONS
+
+logger = logging.getLogger(__name__)
+
+# Codes index these tuples; values match VolatilityState / MarketCondition in the scanner
+STATES = ('dormant', 'normal', 'elevated', 'high', 'extreme', 'breakout')
+REGIMES = ('trending_up', 'trending_down', 'ranging', 'breakout', 'exhaustion', 'accumulation', 'distribution')
+
+MIN_BARS = 30
+REGIME_BARS = 50
+
+
+@dataclass
+class UniverseSnapshot:
+    """One cross-sectional pass; every array is aligned with ``symbols``"""
+    symbols: List[str]
+    metrics: Dict[str, np.ndarray]
+    state_codes: np.ndarray
+    regime_codes: np.ndarray
+    percentile_24h: np.ndarray
+    breakout_strength: np.ndarray
+    opportunity_score: np.ndarray
+    volatility_score: np.ndarray
+    risk_score: np.ndarray
+    elapsed_ms: float = 0.0
+    skipped: List[str] = field(default_factory=list)  # Pairs with too little history
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def row(self, index: int) -> Dict[str, float]:
+        """Metrics of one pair as the per-symbol metrics dict"""
+        return {name: float(values[index]) for name, values in self.metrics.items()}
+
+    def state(self, index: int) -> str:
+        return STATES[self.state_codes[index]]
+
+    def regime(self, index: int) -> str:
+        return REGIMES[self.regime_codes[index]]
+
+
+class CrossSectionalVolatility:
+    """Vectorized scanner metrics over all pairs at once
+
+    Keeps each pair's recent 1h-volatility readings in a (symbol x history)
+    matrix, so percentiles and breakout checks are array operations too.
+    """
+
+    def __init__(self, history_length: int = 288, breakout_multiplier: float = 2.0,
+                 trend_strength: float = 0.7, length: int = 500):
+        self.history_length = history_length
+        self.breakout_multiplier = breakout_multiplier
+        self.trend_strength = trend_strength
+        self.length = length
+
+        self.rows: Dict[str, int] = {}
+        self._history = np.full((0, history_length), np.nan)
+        self._history_count = np.zeros(0, dtype=np.int64)
+        self._history_pos = np.zeros(0, dtype=np.int64)
+
+    def _history_rows(self, symbols: Sequence[str]) -> np.ndarray:
+        new = [symbol for symbol in symbols if symbol not in self.rows]
+        if new:
+            for symbol in new:
+                self.rows[symbol] = len(self.rows)
+            grow = len(self.rows) - len(self._history)
+            self._history = np.vstack([self._history, np.full((grow, self.history_length), np.nan)])
+            self._history_count = np.r_[self._history_count, np.zeros(grow, dtype=np.int64)]
+            self._history_pos = np.r_[self._history_pos, np.zeros(grow, dtype=np.int64)]
+        return np.array([self.rows[symbol] for symbol in symbols], dtype=np.int64)
+
+    def evaluate(self, candles: Dict[str, object], record: bool = True) -> UniverseSnapshot:
+        """Score every pair in ``candles`` (symbol -> CandleSeries or [T x 6] bar array)
+
+        With ``record`` the pairs' 1h volatility joins the history used for
+        percentiles and breakouts in later passes.
+        """
+        started = time.perf_counter()
+        symbols = [symbol for symbol, series in candles.items() if len(series) >= MIN_BARS]
+        skipped = [symbol for symbol, series in candles.items() if len(series) < MIN_BARS]
+        bars, lengths = stack_candles([candles[symbol] for symbol in symbols], self.length)
+
+        metrics = universe_metrics(bars, lengths)
+        regime_codes = detect_regimes(bars, lengths, metrics, self.trend_strength)
+
+        rows = self._history_rows(symbols)
+        history = self._history[rows]
+        counts = self._history_count[rows]
+        current = metrics['vol_1h']
+        percentile = percentile_of_score(history, current)
+        state_codes = classify_states(current, history, counts, percentile, self.breakout_multiplier)
+        percentile_24h = np.where(counts > 0, percentile, 50.0)
+
+        vol_24h = metrics['vol_24h']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            breakout_strength = np.where(vol_24h > 0, current / vol_24h, 1.0)
+        opportunity = opportunity_scores(state_codes, regime_codes, metrics['volume_spike_ratio'],
+                                         metrics['volume_volatility_correlation'], percentile_24h)
+
+        if record and len(rows):
+            pos = self._history_pos[rows]
+            self._history[rows, pos] = current
+            self._history_pos[rows] = (pos + 1) % self.history_length
+            self._history_count[rows] = np.minimum(counts + 1, self.history_length)
+
+        return UniverseSnapshot(
+            symbols=symbols,
+            metrics=metrics,
+            state_codes=state_codes,
+            regime_codes=regime_codes,
+            percentile_24h=percentile_24h,
+            breakout_strength=breakout_strength,
+            opportunity_score=opportunity,
+            volatility_score=np.minimum(current * 1000, 100),
+            risk_score=np.minimum(metrics['atr_percent'] * 10, 100),
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+            skipped=skipped
+        )
+
+
+def stack_candles(series_list: Sequence, length: int) -> tuple:
+    """Right-aligned, NaN-padded (column -> [symbols x length]) arrays and bar counts"""
+    bars = {column: np.full((len(series_list), length), np.nan) for column in COLUMNS[1:]}
+    lengths = np.zeros(len(series_list), dtype=np.int64)
+    for i, series in enumerate(series_list):
+        if isinstance(series, np.ndarray):
+            columns = {column: series[-length:, j] for j, column in enumerate(COLUMNS)}
+        else:
+            columns = {column: series[column][-length:] for column in COLUMNS}
+        n = len(columns['close'])
+        lengths[i] = n
+        for column in COLUMNS[1:]:
+            bars[column][i, length - n:] = columns[column]
+    return bars, lengths
+
+
+def _nanmean(x: np.ndarray) -> np.ndarray:
+    valid = ~np.isnan(x)
+    count = valid.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(count > 0, np.where(valid, x, 0.0).sum(axis=-1) / count, np.nan)
+
+
+def _nanstd(x: np.ndarray, min_count: int = 2) -> np.ndarray:
+    """Sample std (ddof=1) over the last axis, NaN below ``min_count`` values"""
+    valid = ~np.isnan(x)
+    count = valid.sum(axis=-1)
+    mean = _nanmean(x)
+    deviation = np.where(valid, x - mean[..., None], 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = (deviation * deviation).sum(axis=-1) / (count - 1)
+    return np.where(count >= max(min_count, 2), np.sqrt(variance), np.nan)
+
+
+def _masked_corr(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Row-wise Pearson correlation over positions where both are present"""
+    valid = ~(np.isnan(x) | np.isnan(y))
+    count = valid.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = np.where(valid, x, 0.0).sum(axis=-1) / count
+        y_mean = np.where(valid, y, 0.0).sum(axis=-1) / count
+        dx = np.where(valid, x - x_mean[:, None], 0.0)
+        dy = np.where(valid, y - y_mean[:, None], 0.0)
+        denominator = np.sqrt((dx * dx).sum(axis=-1) * (dy * dy).sum(axis=-1))
+        corr = (dx * dy).sum(axis=-1) / denominator
+    return np.where((count >= 2) & (denominator > 0), corr, np.nan)
+
+
+def universe_metrics(bars: Dict[str, np.ndarray], lengths: np.ndarray) -> Dict[str, np.ndarray]:
+    """The scanner's per-symbol volatility metrics for every row at once"""
+    open_price, high, low, close, volume = (bars[c] for c in COLUMNS[1:])
+    prev_close = np.c_[np.full(len(close), np.nan), close[:, :-1]]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        log_return = np.log(close / prev_close)
+        hl = np.log(high / low)
+        oc = np.log(close / open_price)
+        gk_arg = 0.5 * hl ** 2 - GK_COEFF * oc ** 2
+        garman_klass = np.sqrt(np.where(gk_arg >= 0, gk_arg, np.nan))
+        overnight = np.log(open_price / prev_close)
+
+    price = close[:, -1]
+    atr = _nanmean(true_range[:, -14:])
+    metrics = {
+        'atr': atr,
+        'atr_percent': atr / price * 100,
+        'historical_vol': _nanstd(log_return) * ANNUALIZATION,
+        'parkinson_vol': _nanmean(np.abs(hl)) * ANNUALIZATION,
+        'garman_klass_vol': _nanmean(garman_klass) * ANNUALIZATION,
+        'yang_zhang_vol': np.sqrt(_nanstd(overnight) ** 2 + 0.5 * _nanstd(oc) ** 2) * ANNUALIZATION
+    }
+    for name, closes in HORIZONS.items():
+        window = log_return[:, -(closes - 1):] if closes > 1 else np.full((len(close), 1), np.nan)
+        metrics[name] = np.where(lengths >= closes, _nanstd(window) * np.sqrt(24 * 365 / closes), 0.0)
+
+    def change(bars_back: int) -> np.ndarray:
+        past = close[:, -bars_back]
+        return np.where(lengths >= bars_back, (price - past) / past * 100, 0.0)
+
+    window_high = np.nanmax(high[:, -288:], axis=1)
+    window_low = np.nanmin(low[:, -288:], axis=1)
+    avg_volume = _nanmean(volume[:, -50:])
+    current_volume = volume[:, -1]
+
+    # Volume vs rolling 12-bar return volatility over the last 30 bars
+    rolling_vol = _nanstd(sliding_window_view(log_return[:, -41:], 12, axis=1), min_count=12)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        metrics.update({
+            'price_change_5min': change(2),
+            'price_change_1h': change(12),
+            'price_change_24h': change(288),
+            'high_low_ratio': (window_high - window_low) / window_low * 100,
+            'volume_spike_ratio': np.where(avg_volume > 0, current_volume / avg_volume, 1.0),
+            'volume_volatility_correlation': _masked_corr(volume[:, -30:], rolling_vol),
+            'current_price': price,
+            'current_volume': current_volume
+        })
+    return metrics
+
+
+def detect_regimes(bars: Dict[str, np.ndarray], lengths: np.ndarray, metrics: Dict[str, np.ndarray],
+                   trend_strength: float) -> np.ndarray:
+    """Market regime codes (indices into REGIMES), same rules as the per-symbol detector"""
+    close = bars['close'][:, -REGIME_BARS:]
+    volume = bars['volume'][:, -20:]
+    sma_20 = close[:, -20:].mean(axis=1)
+    sma_50 = close.mean(axis=1)
+
+    up = sma_20 > sma_50 * 1.02
+    down = sma_20 < sma_50 * 0.98
+    strength = np.where(up, (sma_20 - sma_50) / sma_50, np.where(down, (sma_50 - sma_20) / sma_50, 0.0))
+
+    delta = np.diff(close[:, -15:], axis=1)
+    gain = np.where(delta > 0, delta, 0).mean(axis=1)
+    loss = np.where(delta < 0, -delta, 0).mean(axis=1)
+    avg_volume = volume.mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + gain / loss))
+        volume_ratio = np.where(avg_volume > 0, volume[:, -1] / avg_volume, 1.0)
+
+    neutral = ~up & ~down
+    rising = close[:, -5:].mean(axis=1) > close[:, -10:-5].mean(axis=1)
+    conditions = [
+        lengths < REGIME_BARS,
+        metrics['vol_1h'] > metrics['vol_24h'] * 2,
+        ((rsi > 80) | (rsi < 20)) & (volume_ratio < 0.7),
+        neutral & (volume_ratio > 1.5) & rising,
+        neutral & (volume_ratio > 1.5),
+        up & (strength > trend_strength),
+        down & (strength > trend_strength)
+    ]
+    choices = [REGIMES.index(name) for name in
+               ('ranging', 'breakout', 'exhaustion', 'accumulation', 'distribution', 'trending_up', 'trending_down')]
+    return np.select(conditions, choices, default=REGIMES.index('ranging'))
+
+
+def percentile_of_score(history: np.ndarray, score: np.ndarray) -> np.ndarray:
+    """Row-wise ``scipy.stats.percentileofscore`` (kind='rank') over NaN-padded history"""
+    valid = ~np.isnan(history)
+    n = valid.sum(axis=1)
+    left = (valid & (history < score[:, None])).sum(axis=1)
+    right = (valid & (history <= score[:, None])).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(n > 0, (left + right + (right > left)) * 50.0 / n, np.nan)
+
+
+def classify_states(current: np.ndarray, history: np.ndarray, counts: np.ndarray,
+                    percentile: np.ndarray, breakout_multiplier: float) -> np.ndarray:
+    """Volatility state codes (indices into STATES), same rules as the per-symbol classifier"""
+    code = {name: STATES.index(name) for name in STATES}
+    absolute = np.select(
+        [current < 0.02, current < 0.05, current < 0.10, current < 0.15],
+        [code['dormant'], code['normal'], code['elevated'], code['high']],
+        default=code['extreme']
+    )
+    relative = np.select(
+        [current > _nanmean(history) * breakout_multiplier,
+         percentile < 25, percentile < 75, percentile < 90, percentile < 95],
+        [code['breakout'], code['dormant'], code['normal'], code['elevated'], code['high']],
+        default=code['extreme']
+    )
+    return np.where(counts < 10, absolute, relative)
+
+
+def opportunity_scores(state_codes: np.ndarray, regime_codes: np.ndarray, volume_spike: np.ndarray,
+                       correlation: np.ndarray, percentile_24h: np.ndarray) -> np.ndarray:
+    """Vectorized ``calculate_opportunity_score`` (0-100)"""
+    state_points = np.array([{'breakout': 40, 'extreme': 35, 'high': 25, 'elevated': 15}.get(s, 0) for s in STATES])
+    regime_points = np.array([{'breakout': 20, 'trending_up': 15, 'trending_down': 15,
+                               'accumulation': 10}.get(r, 0) for r in REGIMES])
+    abs_corr = np.abs(correlation)
+    score = (
+        state_points[state_codes]
+        + np.select([volume_spike > 3, volume_spike > 2, volume_spike > 1.5], [20, 15, 10], default=0)
+        + regime_points[regime_codes]
+        + np.select([abs_corr > 0.7, abs_corr > 0.5], [10, 5], default=0)
+        + np.select([percentile_24h > 95, percentile_24h > 90, percentile_24h > 80], [10, 7, 4], default=0)
+    )
+    return np.minimum(score, 100).astype(float)
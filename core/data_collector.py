@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
 import time
+from array import array
 
 try:
     import pandas as pd
@@ -24,6 +25,8 @@ from .data_authenticity_validator import authenticity_validator, DataAuthenticit
 
 logger = logging.getLogger(__name__)
 
+BUFFER_FIELDS = ('price', 'volume', 'bid', 'ask')
+
 class DataCollector:
     def __init__(self, symbols: List[str]):
         self.symbols = symbols
@@ -167,6 +170,32 @@ class DataCollector:
         
         return recent_data if len(recent_data) >= 10 else None  # Need at least 10 points
     
+    def export_state(self) -> Dict:
+        """Tick buffers as columnar float arrays, for warm-start snapshots"""
+        buffers = {}
+        for symbol, points in self.data_buffer.items():
+            columns = {'timestamp': array('d', (point['timestamp'].timestamp() for point in points))}
+            for field in BUFFER_FIELDS:
+                columns[field] = array('d', (float('nan') if point[field] is None else point[field]
+                                             for point in points))
+            buffers[symbol] = columns
+        return {'data_buffer': buffers}
+    
+    def restore_state(self, state: Dict):
+        """Put snapshot tick points ahead of anything collected since boot"""
+        for symbol, columns in state.get('data_buffer', {}).items():
+            if symbol not in self.data_buffer:
+                continue
+            restored = [
+                {
+                    'timestamp': datetime.fromtimestamp(timestamp),
+                    **{field: (value if value == value else None)
+                       for field, value in zip(BUFFER_FIELDS, values)}
+                }
+                for timestamp, *values in zip(columns['timestamp'], *(columns[field] for field in BUFFER_FIELDS))
+            ]
+            self.data_buffer[symbol] = (restored + self.data_buffer[symbol])[-1000:]
+    
     def get_data_health(self) -> Dict:
         """Get health status of data feeds"""
         health = {}
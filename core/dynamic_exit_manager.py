@@ -8,6 +8,7 @@ import pandas as pd
 from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from .config.settings import config
+from .exit_engine import exit_engine, ExitKind
 
 logger = logging.getLogger(__name__)
 
@@ -106,6 +107,16 @@ class DynamicExitManager:
             position_key = f"{symbol}_{entry_time.strftime('%Y%m%d_%H%M%S')}"
             self.position_timings[position_key] = result
             
+            # Price and time exits fire from the exit engine on the tick that crosses them
+            exit_engine.register(
+                position_key, symbol, side,
+                stop_loss=exit_conditions['dynamic_stop_loss'],
+                take_profit=exit_conditions['dynamic_take_profit'],
+                max_hold_seconds=max(adjusted_timing - position_age, 0) * 60,
+                on_trigger=self._on_exit_trigger,
+                metadata={'source': 'dynamic_exit_manager'}
+            )
+            
             logger.info(f"Dynamic exit timing calculated for {symbol}: "
                        f"regime={volatility_regime}, timing={adjusted_timing}min, "
                        f"recommendation={exit_recommendation['action']}")
@@ -422,9 +433,22 @@ class DynamicExitManager:
             'calculated_at': datetime.now()
         }
     
+    def _on_exit_trigger(self, trigger):
+        """Exit engine callback: turn a crossed level or expired hold into an exit recommendation"""
+        timing_data = self.position_timings.get(trigger.key)
+        if timing_data is None:
+            return
+        timing_data['exit_recommendation'] = {
+            'action': 'exit_target' if trigger.kind == ExitKind.TAKE_PROFIT else 'exit_now',
+            'reason': trigger.reason,
+            'recommended_exit_time': 0,
+            'urgency': 'high' if trigger.kind == ExitKind.STOP_LOSS else 'medium'
+        }
+    
     def should_exit_position(self, position_key: str) -> Dict:
         """Check if a position should be exited based on dynamic conditions"""
         try:
+            exit_engine.on_time()
             if position_key not in self.position_timings:
                 return {'should_exit': False, 'reason': 'No timing data available'}
             
@@ -457,6 +481,7 @@ class DynamicExitManager:
             
             for key in keys_to_remove:
                 del self.position_timings[key]
+                exit_engine.cancel(key)
             
             if keys_to_remove:
                 logger.info(f"Cleaned up {len(keys_to_remove)} old position timings")
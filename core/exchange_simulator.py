@@ -0,0 +1,351 @@
+"""
+In-process exchange backend for Executor load testing
+Implements the ccxt calls the Executor uses with configurable latency, error injection and fills
+"""
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import ccxt.async_support as ccxt
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRICES = {
+    'BTCUSDT': 65000.0,
+    'ETHUSDT': 3200.0,
+    'SOLUSDT': 150.0,
+    'AXSUSDT': 6.5,
+    'SANDUSDT': 0.45,
+    'LINKUSDT': 14.0,
+}
+
+@dataclass
+class LatencyProfile:
+    """Lognormal round-trip latency; ``median_ms`` and ``sigma`` shape the tail"""
+    median_ms: float = 5.0
+    sigma: float = 0.5
+
+    def sample(self, rng: np.random.Generator) -> float:
+        """One round trip in seconds"""
+        if self.median_ms <= 0:
+            return 0.0
+        return float(self.median_ms * rng.lognormal(0.0, self.sigma)) / 1000.0
+
+
+@dataclass
+class ErrorProfile:
+    """Per-call error injection
+
+    ``network_error_rate`` raises RequestTimeout; for order placement a share
+    ``landed_ratio`` of those orders still reach the book, like a lost
+    acknowledgement. ``rejection_rate`` raises InsufficientFunds on orders.
+    """
+    network_error_rate: float = 0.0
+    landed_ratio: float = 0.5
+    rejection_rate: float = 0.0
+
+
+class ExchangeSimulator:
+    """ccxt-compatible futures exchange held in memory
+
+    Prices follow a per-symbol random walk stepped on every market data call.
+    Market orders fill at the touch plus ``slippage_bps``; limit orders fill at
+    the touch when they cross, otherwise rest and fill with probability
+    ``passive_fill_probability`` on each status poll. Only for benchmarks and
+    tests: the Executor refuses custom backends in production.
+    """
+
+    def __init__(self,
+                 prices: Optional[Dict[str, float]] = None,
+                 latency: Union[LatencyProfile, Dict[str, LatencyProfile], None] = None,
+                 errors: Union[ErrorProfile, Dict[str, ErrorProfile], None] = None,
+                 spread_bps: float = 1.0,
+                 slippage_bps: float = 1.0,
+                 volatility_bps: float = 2.0,
+                 passive_fill_probability: float = 0.3,
+                 balance: float = 10000.0,
+                 seed: Optional[int] = None):
+        self.prices = dict(DEFAULT_PRICES if prices is None else prices)
+        self.latency = latency if latency is not None else LatencyProfile()
+        self.errors = errors if errors is not None else ErrorProfile()
+        self.spread_bps = spread_bps
+        self.slippage_bps = slippage_bps
+        self.volatility_bps = volatility_bps
+        self.passive_fill_probability = passive_fill_probability
+        self.balance = balance
+        self.rng = np.random.default_rng(seed)
+
+        self.has = {'createOrders': True, 'fetchPositions': True, 'setLeverage': True}
+        self.orders: Dict[str, Dict] = {}
+        self.orders_by_client_id: Dict[str, str] = {}
+        self.positions: Dict[str, Dict] = {}
+        self.leverage: Dict[str, int] = {}
+        self.call_counts: Dict[str, int] = {}
+        self.injected_errors: Dict[str, int] = {}
+        self._order_ids = itertools.count(1)
+
+    # Transport
+
+    def _profile(self, profiles, method: str):
+        if isinstance(profiles, dict):
+            return profiles.get(method) or profiles.get('default')
+        return profiles
+
+    async def _round_trip(self, method: str) -> Optional[ErrorProfile]:
+        """Wait out the call latency; returns the error profile for the method"""
+        self.call_counts[method] = self.call_counts.get(method, 0) + 1
+        latency = self._profile(self.latency, method)
+        if latency:
+            await asyncio.sleep(latency.sample(self.rng))
+        return self._profile(self.errors, method)
+
+    def _roll(self, rate: float) -> bool:
+        return rate > 0 and self.rng.random() < rate
+
+    def _inject(self, method: str, error: ccxt.BaseError):
+        self.injected_errors[method] = self.injected_errors.get(method, 0) + 1
+        raise error
+
+    async def _call(self, method: str):
+        """Round trip for read-only calls, which can only fail in transit"""
+        errors = await self._round_trip(method)
+        if errors and self._roll(errors.network_error_rate):
+            self._inject(method, ccxt.RequestTimeout(f"{method} timed out"))
+
+    # Market data
+
+    def _mid(self, symbol: str, step: bool = True) -> float:
+        price = self.prices.setdefault(symbol, 100.0)
+        if step and self.volatility_bps > 0:
+            price *= float(np.exp(self.rng.normal(0.0, self.volatility_bps / 10000)))
+            self.prices[symbol] = price
+        return price
+
+    def mark_price(self, symbol: str) -> float:
+        """Current mid price without advancing the walk"""
+        return self._mid(symbol, step=False)
+
+    def _touch(self, symbol: str, step: bool = True):
+        mid = self._mid(symbol, step)
+        half_spread = mid * self.spread_bps / 20000
+        return mid - half_spread, mid + half_spread
+
+    async def fetch_ticker(self, symbol: str, params: Optional[Dict] = None) -> Dict:
+        await self._call('fetch_ticker')
+        bid, ask = self._touch(symbol)
+        last = (bid + ask) / 2
+        return {
+            'symbol': symbol, 'timestamp': int(time.time() * 1000),
+            'bid': bid, 'ask': ask, 'last': last, 'close': last,
+            'high': last * 1.01, 'low': last * 0.99,
+            'baseVolume': 1e6, 'quoteVolume': 1e6 * last, 'percentage': 0.0
+        }
+
+    async def fetch_order_book(self, symbol: str, limit: int = 5, params: Optional[Dict] = None) -> Dict:
+        await self._call('fetch_order_book')
+        bid, ask = self._touch(symbol)
+        tick = (ask - bid) or bid * 1e-5
+        return {
+            'symbol': symbol, 'timestamp': int(time.time() * 1000),
+            'bids': [[bid - i * tick, 10.0 * (i + 1)] for i in range(limit)],
+            'asks': [[ask + i * tick, 10.0 * (i + 1)] for i in range(limit)]
+        }
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: Optional[int] = None,
+                          limit: int = 100, params: Optional[Dict] = None) -> List[List[float]]:
+        """Random-walk candles ending at the current price"""
+        await self._call('fetch_ohlcv')
+        limit = limit or 100
+        step_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        end = int(time.time() * 1000) // step_ms * step_ms
+        sigma = self.volatility_bps / 10000 * 4
+        returns = self.rng.normal(0.0, sigma, limit)
+        closes = self._mid(symbol) * np.exp(-(returns[::-1].cumsum()[::-1] - returns))
+        opens = np.concatenate(([closes[0]], closes[:-1]))
+        wick = np.abs(self.rng.normal(0.0, sigma, limit))
+        highs = np.maximum(opens, closes) * (1 + wick)
+        lows = np.minimum(opens, closes) * (1 - wick)
+        volumes = self.rng.lognormal(8.0, 0.5, limit)
+        timestamps = end - step_ms * np.arange(limit - 1, -1, -1)
+        return [[int(t), float(o), float(h), float(l), float(c), float(v)]
+                for t, o, h, l, c, v in zip(timestamps, opens, highs, lows, closes, volumes)]
+
+    # Account
+
+    async def fetch_balance(self, params: Optional[Dict] = None) -> Dict:
+        await self._call('fetch_balance')
+        used = sum(p['initialMargin'] for p in self.positions.values())
+        usdt = {'free': self.balance - used, 'used': used, 'total': self.balance}
+        return {'USDT': usdt, 'free': {'USDT': usdt['free']}, 'used': {'USDT': used},
+                'total': {'USDT': self.balance}}
+
+    async def set_leverage(self, leverage: int, symbol: Optional[str] = None,
+                           params: Optional[Dict] = None) -> Dict:
+        await self._call('set_leverage')
+        self.leverage[symbol] = int(leverage)
+        return {'symbol': symbol, 'leverage': int(leverage)}
+
+    async def fetch_positions(self, symbols: Optional[List[str]] = None,
+                              params: Optional[Dict] = None) -> List[Dict]:
+        await self._call('fetch_positions')
+        positions = []
+        for symbol, position in self.positions.items():
+            if symbols and symbol not in symbols:
+                continue
+            mark = self._mid(symbol, step=False)
+            direction = 1 if position['side'] == 'long' else -1
+            positions.append({
+                **position,
+                'markPrice': mark,
+                'unrealizedPnl': direction * (mark - position['entryPrice']) * position['contracts'],
+            })
+        return positions
+
+    # Orders
+
+    async def create_order(self, symbol: str, type: str, side: str, amount: float,
+                           price: Optional[float] = None, params: Optional[Dict] = None) -> Dict:
+        errors = await self._round_trip('create_order')
+        if errors and self._roll(errors.network_error_rate):
+            if self._roll(errors.landed_ratio):
+                self._book_order(symbol, type, side, amount, price, params or {})
+            self._inject('create_order', ccxt.RequestTimeout('create_order timed out'))
+        if errors and self._roll(errors.rejection_rate):
+            self._inject('create_order', ccxt.InsufficientFunds('Margin is insufficient.'))
+        return dict(self._book_order(symbol, type, side, amount, price, params or {}))
+
+    async def create_orders(self, orders: List[Dict], params: Optional[Dict] = None) -> List[Dict]:
+        """Batch placement; per-order failures come back as orders without an id"""
+        errors = await self._round_trip('create_orders')
+        if errors and self._roll(errors.network_error_rate):
+            self._inject('create_orders', ccxt.RequestTimeout('create_orders timed out'))
+        results = []
+        for request in orders:
+            try:
+                if errors and self._roll(errors.rejection_rate):
+                    raise ccxt.InsufficientFunds('Margin is insufficient.')
+                results.append(dict(self._book_order(
+                    request['symbol'], request['type'], request['side'], request['amount'],
+                    request.get('price'), request.get('params') or {}
+                )))
+            except ccxt.ExchangeError as e:
+                results.append({'id': None, 'symbol': request['symbol'], 'info': {'msg': str(e)}})
+        return results
+
+    async def fetch_order(self, id: Optional[str], symbol: Optional[str] = None,
+                          params: Optional[Dict] = None) -> Dict:
+        await self._call('fetch_order')
+        if id is None:
+            client_order_id = (params or {}).get('origClientOrderId')
+            id = self.orders_by_client_id.get(client_order_id)
+        order = self.orders.get(id) if id else None
+        if order is None:
+            raise ccxt.OrderNotFound('Order does not exist.')
+        if order['status'] == 'open' and order['type'] == 'limit' and self._roll(self.passive_fill_probability):
+            self._fill(order, order['price'])
+        return dict(order)
+
+    async def cancel_order(self, id: str, symbol: Optional[str] = None,
+                           params: Optional[Dict] = None) -> Dict:
+        await self._call('cancel_order')
+        order = self.orders.get(id)
+        if order is None or order['status'] != 'open':
+            raise ccxt.OrderNotFound('Unknown order sent.')
+        order['status'] = 'canceled'
+        return dict(order)
+
+    async def close(self):
+        pass
+
+    def amount_to_precision(self, symbol: str, amount: float) -> str:
+        return f"{amount:.6f}".rstrip('0').rstrip('.')
+
+    def price_to_precision(self, symbol: str, price: float) -> str:
+        return f"{price:.8g}"
+
+    def _book_order(self, symbol: str, type: str, side: str, amount: float,
+                    price: Optional[float], params: Dict) -> Dict:
+        """Accept an order into the book and fill whatever crosses"""
+        client_order_id = params.get('clientOrderId')
+        if client_order_id and client_order_id in self.orders_by_client_id:
+            raise ccxt.DuplicateOrderId('Duplicate order sent.')
+        if amount <= 0:
+            raise ccxt.InvalidOrder('Invalid quantity.')
+
+        order_id = str(next(self._order_ids))
+        order = {
+            'id': order_id, 'clientOrderId': client_order_id, 'symbol': symbol,
+            'type': type.lower(), 'side': side, 'amount': amount, 'price': price,
+            'filled': 0.0, 'remaining': amount, 'average': None, 'status': 'open',
+            'timestamp': int(time.time() * 1000), 'fee': None,
+            'reduceOnly': bool(params.get('reduceOnly')), 'stopPrice': params.get('stopPrice')
+        }
+
+        bid, ask = self._touch(symbol)
+        touch = ask if side == 'buy' else bid
+        direction = 1 if side == 'buy' else -1
+        if order['type'] == 'market':
+            self._fill(order, touch * (1 + direction * self.slippage_bps / 10000))
+        elif order['type'] == 'limit':
+            crosses = price >= ask if side == 'buy' else price <= bid
+            if crosses and params.get('postOnly'):
+                raise ccxt.OrderImmediatelyFillable('Order would immediately match and take.')
+            if crosses:
+                self._fill(order, touch)
+            elif params.get('timeInForce') in ('IOC', 'FOK'):
+                order['status'] = 'expired'
+        # Stop and take-profit orders rest until cancelled
+
+        self.orders[order_id] = order
+        if client_order_id:
+            self.orders_by_client_id[client_order_id] = order_id
+        return order
+
+    def _fill(self, order: Dict, price: float):
+        order.update(filled=order['amount'], remaining=0.0, average=price, status='closed',
+                     fee={'currency': 'USDT', 'cost': order['amount'] * price * 0.0004})
+        self._apply_fill(order['symbol'], order['side'], order['amount'], price, order['reduceOnly'])
+
+    def _apply_fill(self, symbol: str, side: str, amount: float, price: float, reduce_only: bool):
+        """Net a fill into the symbol's one-way position"""
+        signed = amount if side == 'buy' else -amount
+        position = self.positions.get(symbol)
+        current = 0.0
+        if position:
+            current = position['contracts'] if position['side'] == 'long' else -position['contracts']
+        if reduce_only and (current == 0 or np.sign(signed) == np.sign(current)):
+            return
+        new = current + signed
+        if abs(new) < 1e-12:
+            self.positions.pop(symbol, None)
+            return
+
+        if current == 0 or np.sign(new) != np.sign(current):
+            entry = price
+        elif abs(new) > abs(current):
+            entry = (position['entryPrice'] * abs(current) + price * amount) / abs(new)
+        else:
+            entry = position['entryPrice']
+        leverage = self.leverage.get(symbol, 1)
+        self.positions[symbol] = {
+            'symbol': symbol, 'side': 'long' if new > 0 else 'short', 'contracts': abs(new),
+            'entryPrice': entry, 'leverage': leverage,
+            'initialMargin': abs(new) * entry / leverage
+        }
+
+    def stats(self) -> Dict:
+        """Call counts, injected errors and order totals"""
+        statuses: Dict[str, int] = {}
+        for order in self.orders.values():
+            statuses[order['status']] = statuses.get(order['status'], 0) + 1
+        return {
+            'calls': dict(self.call_counts),
+            'injected_errors': dict(self.injected_errors),
+            'orders': len(self.orders),
+            'order_statuses': statuses,
+            'open_positions': len(self.positions)
+        }
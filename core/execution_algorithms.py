@@ -0,0 +1,284 @@
+"""
+Execution algorithms for cost-aware order placement
+Post-only with repricing, marketable limit, TWAP and iceberg slicing driven off the live book
+"""
+import asyncio
+import logging
+import time
+import uuid
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+import ccxt.async_support as ccxt
+
+from .config.settings import config
+from .order_idempotency import (
+    make_client_order_id, child_client_order_id, create_order_idempotent, find_order_by_client_id
+)
+
+logger = logging.getLogger(__name__)
+
+# Exchange rejections of a post-only order that would have taken liquidity (Binance futures
+# -5022, spot -2010); ccxt maps them to InvalidOrder, like precision and min-notional errors
+POST_ONLY_REJECT_MARKERS = ('-5022', 'could not be executed as maker', 'would immediately match')
+
+
+def is_post_only_reject(error: Exception) -> bool:
+    """True if the exchange refused a post-only order only because it would cross the book"""
+    if isinstance(error, ccxt.OrderImmediatelyFillable):
+        return True
+    message = str(error).lower()
+    return isinstance(error, ccxt.InvalidOrder) and any(marker in message for marker in POST_ONLY_REJECT_MARKERS)
+
+
+class ExecutionMode(Enum):
+    """Supported execution algorithms"""
+    MARKET = "market"
+    POST_ONLY = "post_only"
+    MARKETABLE_LIMIT = "marketable_limit"
+    TWAP = "twap"
+    ICEBERG = "iceberg"
+
+
+class ExecutionAlgorithms:
+    """Runs a parent order as one or more child limit orders and reports its cost
+
+    Every algorithm returns a ccxt-shaped order dict aggregated over its child
+    orders, with an extra ``execution_cost`` entry comparing the realized average
+    price with the arrival mid price. A run that fills nothing comes back with
+    ``filled`` 0 and status ``canceled``.
+    """
+
+    def __init__(self, exchange, slippage_tolerance: float = None,
+                 reprice_seconds: float = None, max_reprices: int = None,
+                 poll_interval: float = 0.25):
+        self.exchange = exchange
+        self.slippage_tolerance = slippage_tolerance or config.SLIPPAGE_TOLERANCE
+        self.reprice_seconds = reprice_seconds or config.POST_ONLY_REPRICE_SECONDS
+        self.max_reprices = max_reprices if max_reprices is not None else config.POST_ONLY_MAX_REPRICES
+        self.poll_interval = poll_interval
+        self._child_counters: Dict[str, int] = {}
+
+    def select_mode(self, signal: Dict, quantity: float, price: float) -> ExecutionMode:
+        """Pick the algorithm for a signal; large clips are sliced"""
+        requested = signal.get('execution_mode')
+        if requested:
+            return ExecutionMode(requested)
+        if quantity * price >= config.SLICE_THRESHOLD_USD:
+            return ExecutionMode(config.SLICED_EXECUTION_MODE)
+        return ExecutionMode(config.EXECUTION_MODE)
+
+    async def execute(self, mode: ExecutionMode, symbol: str, side: str, quantity: float,
+                      client_order_id: str = None) -> Optional[Dict]:
+        """Run ``quantity`` through the chosen algorithm
+
+        Child orders get client ids derived from ``client_order_id`` (``<id>c0``,
+        ``<id>c1``...), so a lost acknowledgement never leads to a duplicate child.
+        """
+        started = time.monotonic()
+        parent_id = client_order_id or make_client_order_id(uuid.uuid4().hex)
+        self._child_counters[parent_id] = 0
+        try:
+            book = await self._fetch_book(symbol)
+            arrival_price = book['mid']
+
+            if mode == ExecutionMode.POST_ONLY:
+                fills = await self._post_only(parent_id, symbol, side, quantity, book)
+            elif mode == ExecutionMode.MARKETABLE_LIMIT:
+                fills = await self._marketable_limit(parent_id, symbol, side, quantity, book)
+            elif mode == ExecutionMode.TWAP:
+                fills = await self._twap(parent_id, symbol, side, quantity)
+            elif mode == ExecutionMode.ICEBERG:
+                fills = await self._iceberg(parent_id, symbol, side, quantity)
+            else:
+                raise ValueError(f"Unsupported execution mode: {mode}")
+        finally:
+            self._child_counters.pop(parent_id, None)
+
+        return self._aggregate(fills, mode, symbol, side, quantity, arrival_price, started)
+
+    async def recover(self, mode: ExecutionMode, symbol: str, side: str, quantity: float,
+                      client_order_id: str) -> Optional[Dict]:
+        """Rebuild the parent order of an interrupted run from its child orders
+
+        Children are looked up by client id in placement order. Ids of post-only
+        attempts rejected for crossing were never used, so the scan stops only after
+        more consecutive misses than a run can produce. Children still working are
+        cancelled. Returns None if no child reached the exchange (safe to resend).
+        """
+        started = time.monotonic()
+        fills = []
+        index = misses = 0
+        while misses <= self.max_reprices + 1:
+            child = await find_order_by_client_id(self.exchange, child_client_order_id(client_order_id, index), symbol)
+            index += 1
+            if child is None:
+                misses += 1
+                continue
+            misses = 0
+            fills.append(await self._wait_or_cancel(child, symbol, 0))
+        if not fills:
+            return None
+        logger.info(f"Recovered {len(fills)} child orders of {mode.value} execution {client_order_id}")
+        return self._aggregate(fills, mode, symbol, side, quantity, None, started)
+
+    async def _post_only(self, parent_id: str, symbol: str, side: str, quantity: float,
+                         book: Optional[Dict] = None) -> List[Dict]:
+        """Rest at the touch, reprice when the book moves, cross for the remainder"""
+        fills = []
+        remaining = quantity
+        for _ in range(self.max_reprices + 1):
+            if remaining <= 0:
+                break
+            book = book or await self._fetch_book(symbol)
+            price = book['bid'] if side == 'buy' else book['ask']
+            book = None
+
+            try:
+                order = await self._create_limit(parent_id, symbol, side, remaining, price, {'postOnly': True})
+            except ccxt.InvalidOrder as e:
+                if not is_post_only_reject(e):
+                    raise  # Precision, min notional and other errors would fail every reprice too
+                # Book moved through our price before the order landed; reprice
+                logger.debug(f"Post-only order for {symbol} would cross, repricing: {e}")
+                continue
+
+            order = await self._wait_or_cancel(order, symbol, self.reprice_seconds)
+            fills.append(order)
+            remaining -= order.get('filled') or 0.0
+
+        if remaining > 0:
+            logger.info(f"Post-only {symbol} left {remaining} after {self.max_reprices} reprices, crossing spread")
+            fills.extend(await self._marketable_limit(parent_id, symbol, side, remaining))
+        return fills
+
+    async def _marketable_limit(self, parent_id: str, symbol: str, side: str, quantity: float,
+                                book: Optional[Dict] = None) -> List[Dict]:
+        """Cross the spread with an IOC limit capped at the slippage tolerance"""
+        book = book or await self._fetch_book(symbol)
+        if side == 'buy':
+            price = book['mid'] * (1 + self.slippage_tolerance)
+        else:
+            price = book['mid'] * (1 - self.slippage_tolerance)
+
+        order = await self._create_limit(parent_id, symbol, side, quantity, price, {'timeInForce': 'IOC'})
+        if order.get('status') not in ('closed', 'canceled', 'expired'):
+            order = await self._wait_or_cancel(order, symbol, self.reprice_seconds)
+        return [order]
+
+    async def _twap(self, parent_id: str, symbol: str, side: str, quantity: float) -> List[Dict]:
+        """Equal marketable-limit slices spread evenly over the TWAP horizon"""
+        slices = max(1, config.TWAP_SLICES)
+        interval = config.TWAP_DURATION_SECONDS / slices
+        fills = []
+        remaining = quantity
+        for index in range(slices):
+            slice_quantity = remaining / (slices - index)
+            slice_fills = await self._marketable_limit(parent_id, symbol, side, slice_quantity)
+            fills.extend(slice_fills)
+            remaining -= sum(o.get('filled') or 0.0 for o in slice_fills)
+            if remaining <= 0:
+                break
+            if index < slices - 1:
+                await asyncio.sleep(interval)
+        return fills
+
+    async def _iceberg(self, parent_id: str, symbol: str, side: str, quantity: float) -> List[Dict]:
+        """Work the parent as a sequence of small post-only clips at the touch"""
+        visible = quantity * config.ICEBERG_VISIBLE_RATIO
+        fills = []
+        remaining = quantity
+        while remaining > 1e-12:
+            clip = min(visible, remaining)
+            clip_fills = await self._post_only(parent_id, symbol, side, clip)
+            filled = sum(o.get('filled') or 0.0 for o in clip_fills)
+            fills.extend(clip_fills)
+            if filled <= 0:
+                break
+            remaining -= filled
+        return fills
+
+    async def _fetch_book(self, symbol: str) -> Dict:
+        """Best bid/ask and mid from the live book"""
+        order_book = await self.exchange.fetch_order_book(symbol, limit=5)
+        bid = order_book['bids'][0][0]
+        ask = order_book['asks'][0][0]
+        return {'bid': bid, 'ask': ask, 'mid': (bid + ask) / 2}
+
+    async def _create_limit(self, parent_id: str, symbol: str, side: str, quantity: float,
+                            price: float, params: Dict) -> Dict:
+        amount, price = self._apply_precision(symbol, quantity, price)
+        index = self._child_counters.get(parent_id, 0)
+        self._child_counters[parent_id] = index + 1
+        client_order_id = child_client_order_id(parent_id, index)
+        logger.info(f"Placing limit {side} {amount} {symbol} @ {price} {params} ({client_order_id})")
+        return await create_order_idempotent(self.exchange, {
+            'symbol': symbol,
+            'type': 'limit',
+            'side': side,
+            'amount': amount,
+            'price': price,
+            'params': {**params, 'clientOrderId': client_order_id}
+        })
+
+    async def _wait_or_cancel(self, order: Dict, symbol: str, timeout: float) -> Dict:
+        """Poll a child order until it closes; cancel it when the timeout expires"""
+        order_id = order.get('id')
+        if not order_id:
+            return order
+        deadline = time.monotonic() + timeout
+        while order.get('status') not in ('closed', 'canceled', 'expired', 'rejected'):
+            if time.monotonic() >= deadline:
+                try:
+                    await self.exchange.cancel_order(order_id, symbol)
+                except ccxt.OrderNotFound:
+                    pass  # Filled or expired between the last poll and the cancel
+                return await self.exchange.fetch_order(order_id, symbol)
+            await asyncio.sleep(self.poll_interval)
+            order = await self.exchange.fetch_order(order_id, symbol)
+        return order
+
+    def _apply_precision(self, symbol: str, quantity: float, price: float) -> Tuple[float, float]:
+        try:
+            return (float(self.exchange.amount_to_precision(symbol, quantity)),
+                    float(self.exchange.price_to_precision(symbol, price)))
+        except Exception:
+            return quantity, price
+
+    def _aggregate(self, fills: List[Dict], mode: ExecutionMode, symbol: str, side: str,
+                   quantity: float, arrival_price: float, started: float) -> Optional[Dict]:
+        """Fold child orders into one parent order with arrival-price cost"""
+        filled = sum(o.get('filled') or 0.0 for o in fills)
+        if filled <= 0:
+            logger.warning(f"{mode.value} execution for {symbol} did not fill")
+
+        notional = sum((o.get('filled') or 0.0) * (o.get('average') or o.get('price') or 0.0) for o in fills)
+        average = notional / filled if filled > 0 else None
+        direction = 1 if side == 'buy' else -1
+        cost_bps = direction * (average - arrival_price) / arrival_price * 10000 if arrival_price and average else 0.0
+
+        fees = [o['fee'] for o in fills if o.get('fee')]
+        last = fills[-1] if fills else {}
+        return {
+            'id': last.get('id'),
+            'symbol': symbol,
+            'type': 'limit',
+            'side': side,
+            'status': 'closed' if filled >= quantity * 0.999 else 'canceled',
+            'amount': quantity,
+            'filled': filled,
+            'average': average,
+            'price': average,
+            'timestamp': last.get('timestamp'),
+            'fees': fees,
+            'child_orders': [o.get('id') for o in fills],
+            'execution_cost': {
+                'mode': mode.value,
+                'arrival_price': arrival_price,
+                'realized_price': average,
+                'cost_bps': cost_bps,
+                'fill_ratio': filled / quantity if quantity else 0.0,
+                'child_orders': len(fills),
+                'duration_ms': int((time.monotonic() - started) * 1000)
+            }
+        }
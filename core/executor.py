@@ -14,6 +14,12 @@ from .leverage_manager import leverage_manager
 from .optimization_integrator import optimization_integrator
 from .data_authenticity_validator import authenticity_validator, DataAuthenticityError
 from .environment_manager import environment_manager, Environment
+from .latency_tracker import latency_tracker
+from .execution_algorithms import ExecutionAlgorithms, ExecutionMode
+from .order_idempotency import (
+    OrderStateUnknown, make_client_order_id,
+    retry_delay, find_order_by_client_id, create_order_idempotent
+)
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +62,7 @@ class ExecutionResult:
     error_message: Optional[str] = None
     retry_count: int = 0
     risk_checks_passed: bool = False
+    stage_timings_ms: Dict[str, float] = field(default_factory=dict)
     additional_info: Dict[str, Any] = field(default_factory=dict)
 
 class Executor:
@@ -63,21 +70,29 @@ class Executor:
     
     def __init__(self, 
                  max_retries: int = 3,
-                 retry_delay: float = 1.0,
-                 slippage_tolerance: float = None):
-        """Initialize production Executor with real Binance API and security validation"""
+                 retry_delay: float = None,
+                 slippage_tolerance: float = None,
+                 exchange=None):
+        """Initialize production Executor with real Binance API and security validation
+        
+        ``exchange`` replaces the Binance client with another ccxt-compatible
+        backend (e.g. ExchangeSimulator for benchmarks); refused in production.
+        """
         self.max_retries = max_retries
-        self.retry_delay = retry_delay
+        self.retry_delay = config.RETRY_BASE_DELAY if retry_delay is None else retry_delay
         self.slippage_tolerance = slippage_tolerance or config.SLIPPAGE_TOLERANCE
         
         # Order and position tracking
         self.active_orders: Dict[str, Dict] = {}
         self.positions: Dict[str, Dict] = {}
         self.execution_history: List[ExecutionResult] = []
+        self.client_order_ids: Dict[str, Optional[str]] = {}  # client order id -> exchange order id
         
         # Exchange connection
         self.exchange = None
+        self.exchange_backend = exchange
         self.connected = False
+        self.execution_algorithms: Optional[ExecutionAlgorithms] = None
         
         # Performance tracking
         self.total_trades = 0
@@ -92,21 +107,32 @@ class Executor:
     async def initialize_exchange(self) -> bool:
         """Initialize and authenticate with Binance exchange"""
         try:
-            self.exchange = ccxt.binance({
-                'apiKey': config.BINANCE_API_KEY,
-                'secret': config.BINANCE_SECRET_KEY,
-                'sandbox': config.BINANCE_TESTNET,
-                'enableRateLimit': True,
-                'timeout': config.ORDER_TIMEOUT * 1000,  # Convert to milliseconds
-                'options': {
-                    'adjustForTimeDifference': True,
-                    'recvWindow': 10000,
-                }
-            })
+            if self.exchange_backend is not None:
+                if environment_manager.is_production():
+                    logger.error("Custom exchange backends are not allowed in production")
+                    self.connected = False
+                    return False
+                self.exchange = self.exchange_backend
+            else:
+                self.exchange = ccxt.binance({
+                    'apiKey': config.BINANCE_API_KEY,
+                    'secret': config.BINANCE_SECRET_KEY,
+                    'sandbox': config.BINANCE_TESTNET,
+                    'enableRateLimit': True,
+                    'timeout': config.ORDER_TIMEOUT * 1000,  # Convert to milliseconds
+                    'options': {
+                        'adjustForTimeDifference': True,
+                        'recvWindow': 10000,
+                    }
+                })
+            
+            self.execution_algorithms = ExecutionAlgorithms(self.exchange, self.slippage_tolerance)
             
             # Test connection and permissions
             account_info = await self.exchange.fetch_balance()
-            logger.info(f"Exchange connection successful. Account type: {'TESTNET' if config.BINANCE_TESTNET else 'MAINNET'}")
+            account_type = type(self.exchange).__name__ if self.exchange_backend is not None else (
+                'TESTNET' if config.BINANCE_TESTNET else 'MAINNET')
+            logger.info(f"Exchange connection successful. Account type: {account_type}")
             
             self.connected = True
             return True
@@ -117,13 +143,48 @@ class Executor:
             return False
     
     async def execute(self, signal: Dict) -> ExecutionResult:
+        """Execute trading signal and record its per-stage latency breakdown"""
+        with latency_tracker.trace('execution') as trace:
+            result = await self._execute_signal(signal)
+        result.stage_timings_ms = trace.breakdown()
+        return result
+    
+    async def _execute_signal(self, signal: Dict) -> ExecutionResult:
         """Execute trading signal with comprehensive error handling and retry logic"""
         start_time = time.time()
         signal_id = signal.get('id', 'unknown')
         
         # SECURITY: Validate signal data authenticity
+        rejection = await self._validate_authenticity(signal)
+        if rejection:
+            return rejection
+        
+        # OPTIMIZATION ENHANCEMENT: Generate enhanced signal
+        signal, account_balance = await self._enhance_signal(signal)
+        result = self._new_result(signal)
+        
         try:
-            if not authenticity_validator.validate_market_data(signal, f"trading_signal_{signal_id}"):
+            position_size = await self._prepare_order(signal, result, account_balance)
+            if position_size is not None:
+                await self._place_with_retries(signal, result, position_size)
+            
+        except Exception as e:
+            result.status = "ERROR"
+            result.error_message = f"Critical error: {str(e)}"
+            logger.error(f"Critical execution error for {signal_id}: {e}", exc_info=True)
+        
+        finally:
+            self._finalize_execution(result, start_time)
+        
+        return result
+    
+    async def _validate_authenticity(self, signal: Dict) -> Optional[ExecutionResult]:
+        """Reject signals that fail data authenticity validation"""
+        signal_id = signal.get('id', 'unknown')
+        try:
+            with latency_tracker.span('authenticity_validation'):
+                authentic = authenticity_validator.validate_market_data(signal, f"trading_signal_{signal_id}")
+            if not authentic:
                 raise DataAuthenticityError(f"Trading signal {signal_id} failed authenticity validation")
             logger.debug(f"Signal {signal_id} passed authenticity validation")
         except DataAuthenticityError as e:
@@ -138,8 +199,12 @@ class Executor:
                 signal_id=signal_id,
                 error_message=f"Security validation failed: {e}"
             )
+        return None
+    
+    async def _enhance_signal(self, signal: Dict, ml_result: Dict = None) -> Tuple[Dict, Optional[float]]:
+        """Enhance the signal through the optimization system; returns (signal, account balance)"""
+        account_balance = None
         
-        # OPTIMIZATION ENHANCEMENT: Generate enhanced signal
         try:
             logger.info(f"🚀 OPTIMIZATION: Enhancing signal for {signal.get('symbol', 'UNKNOWN')}")
             await telegram_notifier.send_message(
@@ -150,12 +215,14 @@ class Executor:
             )
             
             # Get account balance for risk validation
-            account_balance = await self._get_account_balance()
+            with latency_tracker.span('account_balance'):
+                account_balance = await self._get_account_balance()
             
             # Generate enhanced signal using optimization system
-            enhanced_signal = await optimization_integrator.generate_enhanced_signal(
-                signal, config.SYMBOLS + ['BTCUSDT'], self.exchange
-            )
+            with latency_tracker.span('signal_enhancement'):
+                enhanced_signal = await optimization_integrator.generate_enhanced_signal(
+                    signal, config.SYMBOLS + ['BTCUSDT'], self.exchange, ml_result=ml_result
+                )
             
             # Use enhanced signal if available
             if enhanced_signal.get('enhanced', False):
@@ -179,88 +246,106 @@ class Executor:
                 signal.get('symbol', 'UNKNOWN')
             )
         
-        # Initialize result object
-        result = ExecutionResult(
+        return signal, account_balance
+    
+    def _new_result(self, signal: Dict) -> ExecutionResult:
+        """Initialize the result object for a signal"""
+        return ExecutionResult(
             status="PENDING",
-            signal_id=signal_id,
+            signal_id=signal.get('id', 'unknown'),
             symbol=signal.get('symbol', ''),
             action=signal.get('action', ''),
             requested_price=signal.get('entry_price')
         )
+    
+    async def _prepare_order(self, signal: Dict, result: ExecutionResult,
+                             account_balance: Optional[float]) -> Optional[float]:
+        """Run pre-trade checks, set leverage and size the order; None means rejected"""
+        # Ensure exchange is connected
+        if not self.connected:
+            if not await self.initialize_exchange():
+                result.status = "ERROR"
+                result.error_message = "Failed to connect to exchange"
+                return None
         
+        if account_balance is None:
+            account_balance = await self._get_account_balance()
+        
+        # Validate signal
+        if not self._validate_signal(signal):
+            result.status = "REJECTED"
+            result.error_message = "Signal validation failed"
+            return None
+        
+        # Client order ids derive from the signal id, so a repeated signal would repeat its orders
+        signal['client_order_id'] = make_client_order_id(signal['id'])
+        if signal['client_order_id'] in self.client_order_ids:
+            result.status = "REJECTED"
+            result.error_message = f"Duplicate signal {signal['id']} already executed"
+            logger.warning(result.error_message)
+            return None
+        
+        # OPTIMIZATION: Enhanced risk validation
         try:
-            # Ensure exchange is connected
-            if not self.connected:
-                if not await self.initialize_exchange():
-                    result.status = "ERROR"
-                    result.error_message = "Failed to connect to exchange"
-                    return result
-            
-            # Validate signal
-            if not self._validate_signal(signal):
-                result.status = "REJECTED"
-                result.error_message = "Signal validation failed"
-                return result
+            await telegram_notifier.send_message(
+                f"🔒 ADVANCED RISK VALIDATION\n"
+                f"Running enhanced risk checks with:\n"
+                f"• Portfolio heat analysis\n"
+                f"• Correlation exposure limits\n"
+                f"• Performance-based adjustments\n"
+                f"• Market regime analysis"
+            )
             
-            # OPTIMIZATION: Enhanced risk validation
-            try:
-                await telegram_notifier.send_message(
-                    f"🔒 ADVANCED RISK VALIDATION\n"
-                    f"Running enhanced risk checks with:\n"
-                    f"• Portfolio heat analysis\n"
-                    f"• Correlation exposure limits\n"
-                    f"• Performance-based adjustments\n"
-                    f"• Market regime analysis"
-                )
-                
-                # Get current positions for risk analysis
+            # Get current positions for risk analysis
+            with latency_tracker.span('risk_validation'):
                 current_positions = await self._get_current_positions()
                 
                 # Run enhanced risk validation
                 risk_validation = await optimization_integrator.validate_enhanced_trade_risk(
                     signal, account_balance, current_positions, self.exchange
                 )
+            
+            if not risk_validation.get('approved', False):
+                result.status = "REJECTED"
+                result.error_message = f"Enhanced risk validation failed: {risk_validation.get('reasoning', 'Risk too high')}"
                 
-                if not risk_validation.get('approved', False):
-                    result.status = "REJECTED"
-                    result.error_message = f"Enhanced risk validation failed: {risk_validation.get('reasoning', 'Risk too high')}"
-                    
-                    await telegram_notifier.send_error_alert(
-                        "Trade Rejected - Risk Management",
-                        f"Enhanced risk validation failed:\n{risk_validation.get('reasoning', 'Risk too high')}",
-                        signal.get('symbol', 'UNKNOWN')
-                    )
-                    return result
-                
-                # Apply risk adjustments if any
-                adjustments = risk_validation.get('adjustments', {})
-                if adjustments:
-                    logger.info(f"Applying risk adjustments: {adjustments}")
-                    if 'leverage' in adjustments:
-                        signal['suggested_leverage'] = adjustments['leverage']
-                    if 'position_size' in adjustments:
-                        signal['suggested_position_size'] = adjustments['position_size']
-                    
-                    await telegram_notifier.send_message(
-                        f"⚡ RISK ADJUSTMENTS APPLIED\n"
-                        f"Leverage: {adjustments.get('leverage', 'no change')}\n"
-                        f"Position Size: {adjustments.get('position_size', 'no change'):.3f}\n"
-                        f"Risk Score: {risk_validation.get('risk_score', 0):.2f}/1.0"
-                    )
-                
-            except Exception as e:
-                logger.error(f"Enhanced risk validation failed: {e}")
                 await telegram_notifier.send_error_alert(
-                    "Risk Validation Error", 
-                    f"Enhanced validation failed, using basic validation: {e}",
+                    "Trade Rejected - Risk Management",
+                    f"Enhanced risk validation failed:\n{risk_validation.get('reasoning', 'Risk too high')}",
                     signal.get('symbol', 'UNKNOWN')
                 )
+                return None
             
-            # Use the account balance we already fetched
-            # balance = await self.exchange.fetch_balance()
-            # account_balance = balance.get('USDT', {}).get('free', 0)
+            # Apply risk adjustments if any
+            adjustments = risk_validation.get('adjustments', {})
+            if adjustments:
+                logger.info(f"Applying risk adjustments: {adjustments}")
+                if 'leverage' in adjustments:
+                    signal['suggested_leverage'] = adjustments['leverage']
+                if 'position_size' in adjustments:
+                    signal['suggested_position_size'] = adjustments['position_size']
+                
+                await telegram_notifier.send_message(
+                    f"⚡ RISK ADJUSTMENTS APPLIED\n"
+                    f"Leverage: {adjustments.get('leverage', 'no change')}\n"
+                    f"Position Size: {adjustments.get('position_size', 'no change'):.3f}\n"
+                    f"Risk Score: {risk_validation.get('risk_score', 0):.2f}/1.0"
+                )
             
-            # Calculate optimal leverage
+        except Exception as e:
+            logger.error(f"Enhanced risk validation failed: {e}")
+            await telegram_notifier.send_error_alert(
+                "Risk Validation Error", 
+                f"Enhanced validation failed, using basic validation: {e}",
+                signal.get('symbol', 'UNKNOWN')
+            )
+        
+        # Use the account balance we already fetched
+        # balance = await self.exchange.fetch_balance()
+        # account_balance = balance.get('USDT', {}).get('free', 0)
+        
+        # Calculate optimal leverage
+        with latency_tracker.span('leverage_calculation'):
             optimal_leverage = await leverage_manager.calculate_optimal_leverage(
                 signal, account_balance, exchange=self.exchange
             )
@@ -272,118 +357,155 @@ class Executor:
             position_size = leverage_manager.calculate_optimal_position_size(
                 signal, account_balance, optimal_leverage
             )
-            result.requested_quantity = position_size
-            
-            # Execute order with retry logic
-            for attempt in range(self.max_retries + 1):
-                try:
-                    result.retry_count = attempt
-                    
-                    # Place order
+        result.requested_quantity = position_size
+        
+        return position_size
+    
+    async def _place_with_retries(self, signal: Dict, result: ExecutionResult, position_size: float):
+        """Place the order with retry logic and record the fill"""
+        signal_id = signal.get('id', 'unknown')
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                result.retry_count = attempt
+                
+                # Check-then-retry: an earlier attempt may have reached the exchange
+                order = await self._recover_order(signal, position_size) if attempt > 0 else None
+                
+                # Place order
+                if order is None:
                     order = await self._place_order(signal, position_size)
-                    
-                    if order:
-                        result.order_id = order.get('id')
-                        result.status = "FILLED"
-                        result.executed_quantity = order.get('filled', 0)
-                        result.executed_price = order.get('average') or order.get('price')
-                        result.exchange_timestamp = order.get('timestamp')
-                        result.fees = order.get('fees', {})
-                        
-                        # Calculate slippage
-                        if result.executed_price and result.requested_price:
-                            result.slippage = self._calculate_slippage(
-                                result.requested_price, 
-                                result.executed_price, 
-                                signal.get('action', 'buy')
-                            )
-                        
-                        # Update tracking
-                        await self._update_position_tracking(signal, order, result)
-                        
-                        # Send Telegram notification for successful order
-                        await self._send_order_notification(signal, result)
-                        
-                        # Mark as successful
-                        self.successful_trades += 1
-                        result.risk_checks_passed = True
-                        
-                        logger.info(f"Successfully executed {signal_id}: "
-                                  f"{result.action} {result.executed_quantity} {result.symbol} "
-                                  f"at {result.executed_price}")
-                        break
-                    
-                except ccxt.InsufficientFunds as e:
-                    result.status = "REJECTED"
-                    result.error_message = f"Insufficient funds: {str(e)}"
-                    logger.error(f"Insufficient funds for {signal_id}: {e}")
-                    break  # Don't retry for insufficient funds
                 
-                except ccxt.InvalidOrder as e:
+                if order and self._is_unfilled(order):
                     result.status = "REJECTED"
-                    result.error_message = f"Invalid order: {str(e)}"
-                    logger.error(f"Invalid order for {signal_id}: {e}")
-                    break  # Don't retry for invalid orders
-                
-                except (ccxt.NetworkError, ccxt.ExchangeError) as e:
-                    if attempt < self.max_retries:
-                        wait_time = self.retry_delay * (2 ** attempt)  # Exponential backoff
-                        logger.warning(f"Network/Exchange error for {signal_id} (attempt {attempt + 1}): {e}. "
-                                     f"Retrying in {wait_time}s...")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    else:
-                        result.status = "ERROR"
-                        result.error_message = f"Max retries exceeded: {str(e)}"
-                        logger.error(f"Max retries exceeded for {signal_id}: {e}")
+                    result.error_message = f"Order not filled ({order.get('status')})"
+                    logger.warning(f"Order for {signal_id} did not fill, nothing to protect")
+                    break
                 
-                except Exception as e:
-                    result.status = "ERROR"
-                    result.error_message = f"Unexpected error: {str(e)}"
-                    logger.error(f"Unexpected execution error for {signal_id}: {e}", exc_info=True)
-                    
-                    # Send error notification
-                    await telegram_notifier.send_error_alert(
-                        "Execution Error", 
-                        str(e), 
-                        signal.get('symbol')
-                    )
+                if order:
+                    await self._record_fill(signal, order, result)
+                    await self._place_protective_orders([(signal, result)])
                     break
+                
+            except OrderStateUnknown as e:
+                result.status = "ERROR"
+                result.error_message = f"Order state unknown, not resending: {str(e)}"
+                logger.error(f"Order state unknown for {signal_id}: {e}")
+                break  # Resending could duplicate the position
             
-        except Exception as e:
-            result.status = "ERROR"
-            result.error_message = f"Critical error: {str(e)}"
-            logger.error(f"Critical execution error for {signal_id}: {e}", exc_info=True)
-        
-        finally:
-            # Record execution time
-            result.execution_time_ms = int((time.time() - start_time) * 1000)
+            except ccxt.DuplicateOrderId as e:
+                # Our client order id is already live on the exchange; recover it next attempt
+                logger.warning(f"Duplicate client order id for {signal_id}: {e}")
+                continue
             
-            # Update statistics
-            self.total_trades += 1
-            if result.slippage is not None:
-                self.total_slippage += abs(result.slippage)
-            
-            # Store in history
-            self.execution_history.append(result)
-            if len(self.execution_history) > 1000:  # Keep last 1000 executions
-                self.execution_history = self.execution_history[-1000:]
-            
-            # Update leverage manager with trade result
-            if result.status == "FILLED" and hasattr(result, 'executed_price'):
-                trade_pnl = 0  # Will be calculated when position is closed
-                if result.slippage is not None:
-                    # Estimate P&L from slippage for now
-                    trade_pnl = -abs(result.slippage) * result.executed_quantity * 0.01
+            except ccxt.InsufficientFunds as e:
+                result.status = "REJECTED"
+                result.error_message = f"Insufficient funds: {str(e)}"
+                logger.error(f"Insufficient funds for {signal_id}: {e}")
+                break  # Don't retry for insufficient funds
+            
+            except ccxt.InvalidOrder as e:
+                result.status = "REJECTED"
+                result.error_message = f"Invalid order: {str(e)}"
+                logger.error(f"Invalid order for {signal_id}: {e}")
+                break  # Don't retry for invalid orders
+            
+            except (ccxt.NetworkError, ccxt.ExchangeError) as e:
+                if attempt < self.max_retries:
+                    wait_time = retry_delay(attempt, self.retry_delay)  # Jittered backoff
+                    logger.warning(f"Network/Exchange error for {signal_id} (attempt {attempt + 1}): {e}. "
+                                 f"Retrying in {wait_time:.2f}s...")
+                    await asyncio.sleep(wait_time)
+                    continue
+                else:
+                    result.status = "ERROR"
+                    result.error_message = f"Max retries exceeded: {str(e)}"
+                    logger.error(f"Max retries exceeded for {signal_id}: {e}")
+            
+            except Exception as e:
+                result.status = "ERROR"
+                result.error_message = f"Unexpected error: {str(e)}"
+                logger.error(f"Unexpected execution error for {signal_id}: {e}", exc_info=True)
                 
-                leverage_manager.update_daily_pnl(trade_pnl)
-                leverage_manager.add_trade_result({
-                    'pnl_usd': trade_pnl,
-                    'symbol': result.symbol,
-                    'status': result.status
-                })
+                # Send error notification
+                await telegram_notifier.send_error_alert(
+                    "Execution Error", 
+                    str(e), 
+                    signal.get('symbol')
+                )
+                break
+    
+    async def _record_fill(self, signal: Dict, order: Dict, result: ExecutionResult):
+        """Populate the result from a filled order and update tracking"""
+        signal_id = signal.get('id', 'unknown')
+        result.order_id = order.get('id')
+        result.status = "FILLED"
+        result.executed_quantity = order.get('filled', 0)
+        result.executed_price = order.get('average') or order.get('price')
+        result.exchange_timestamp = order.get('timestamp')
+        result.fees = order.get('fees', {})
+        result.order_type = order.get('type', result.order_type)
+        if signal.get('client_order_id'):
+            self._remember_client_order_id(signal['client_order_id'], result.order_id)
+            result.additional_info['client_order_id'] = signal['client_order_id']
         
-        return result
+        if order.get('execution_cost'):
+            result.additional_info['execution_cost'] = order['execution_cost']
+            logger.info(f"Execution cost for {signal_id}: "
+                      f"{order['execution_cost']['cost_bps']:.2f} bps vs arrival "
+                      f"({order['execution_cost']['mode']})")
+        
+        # Calculate slippage
+        if result.executed_price and result.requested_price:
+            result.slippage = self._calculate_slippage(
+                result.requested_price, 
+                result.executed_price, 
+                signal.get('action', 'buy')
+            )
+        
+        # Update tracking
+        await self._update_position_tracking(signal, order, result)
+        
+        # Send Telegram notification for successful order
+        with latency_tracker.span('notification'):
+            await self._send_order_notification(signal, result)
+        
+        # Mark as successful
+        self.successful_trades += 1
+        result.risk_checks_passed = True
+        
+        logger.info(f"Successfully executed {signal_id}: "
+                  f"{result.action} {result.executed_quantity} {result.symbol} "
+                  f"at {result.executed_price}")
+    
+    def _finalize_execution(self, result: ExecutionResult, start_time: float):
+        """Record execution time, statistics, history and leverage manager feedback"""
+        # Record execution time
+        result.execution_time_ms = int((time.time() - start_time) * 1000)
+        
+        # Update statistics
+        self.total_trades += 1
+        if result.slippage is not None:
+            self.total_slippage += abs(result.slippage)
+        
+        # Store in history
+        self.execution_history.append(result)
+        if len(self.execution_history) > 1000:  # Keep last 1000 executions
+            self.execution_history = self.execution_history[-1000:]
+        
+        # Update leverage manager with trade result
+        if result.status == "FILLED" and hasattr(result, 'executed_price'):
+            trade_pnl = 0  # Will be calculated when position is closed
+            if result.slippage is not None:
+                # Estimate P&L from slippage for now
+                trade_pnl = -abs(result.slippage) * result.executed_quantity * 0.01
+            
+            leverage_manager.update_daily_pnl(trade_pnl)
+            leverage_manager.add_trade_result({
+                'pnl_usd': trade_pnl,
+                'symbol': result.symbol,
+                'status': result.status
+            })
         
     def _validate_signal(self, signal: Dict) -> bool:
         """Validate trading signal before execution"""
@@ -471,46 +593,314 @@ class Executor:
             # Map action to exchange format
             side = 'buy' if action in ['long', 'buy'] else 'sell'
             
-            # For now, use market orders for guaranteed execution
-            # TODO: Add support for limit orders with better price control
-            order_type = 'market'
+            # Limit-based algorithms work the order off the live book
+            mode = self._select_execution_mode(signal, quantity)
+            if mode != ExecutionMode.MARKET:
+                logger.info(f"Executing {side} {quantity} {symbol} via {mode.value}")
+                with latency_tracker.span('order_placement'):
+                    return await self.execution_algorithms.execute(
+                        mode, symbol, side, quantity, client_order_id=self._signal_client_order_id(signal)
+                    )
+            
+            request = self._entry_order_request(signal, quantity)
             
-            logger.info(f"Placing {order_type} {side} order: {quantity} {symbol}")
+            logger.info(f"Placing {request['type']} {side} order: {quantity} {symbol}")
             
             # Place order
-            order = await self.exchange.create_order(
-                symbol=symbol,
-                type=order_type,
-                side=side,
-                amount=quantity,
-                price=None,  # Market order
-                params={}
-            )
+            with latency_tracker.span('order_placement'):
+                order = await self.exchange.create_order(**request)
             
             # Wait for order to be filled (for market orders, usually immediate)
             if order and order.get('id'):
-                order_id = order['id']
-                
-                # Wait up to 30 seconds for fill
-                for _ in range(30):
-                    updated_order = await self.exchange.fetch_order(order_id, symbol)
-                    if updated_order.get('status') == 'closed':
-                        logger.info(f"Order {order_id} filled successfully")
-                        return updated_order
-                    await asyncio.sleep(1)
-                
-                logger.warning(f"Order {order_id} not filled within timeout")
-                return updated_order
+                with latency_tracker.span('fill_polling'):
+                    return await self._await_fill(order['id'], symbol)
             
             return order
             
-        except (ccxt.InsufficientFunds, ccxt.InvalidOrder) as e:
-            # Re-raise specific exceptions to be handled by execute method
-            raise e
+        except ccxt.BaseError:
+            # Exchange and transport errors are handled by the retry loop, which
+            # checks the client order id before anything is resent
+            raise
         except Exception as e:
             logger.error(f"Order placement error: {e}")
             return None
     
+    def _select_execution_mode(self, signal: Dict, quantity: float) -> ExecutionMode:
+        """Execution algorithm for a signal of the given size"""
+        if self.execution_algorithms is None:
+            self.execution_algorithms = ExecutionAlgorithms(self.exchange, self.slippage_tolerance)
+        return self.execution_algorithms.select_mode(signal, quantity, signal['entry_price'])
+    
+    def _entry_order_request(self, signal: Dict, quantity: float) -> Dict:
+        """Market entry order in ccxt create_order/create_orders format"""
+        side = 'buy' if signal['action'].lower() in ['long', 'buy'] else 'sell'
+        return {
+            'symbol': signal['symbol'],
+            'type': 'market',
+            'side': side,
+            'amount': quantity,
+            'price': None,  # Market order
+            'params': {'clientOrderId': self._signal_client_order_id(signal)}
+        }
+    
+    def _signal_client_order_id(self, signal: Dict, leg: str = 'entry') -> str:
+        """Deterministic client order id for a leg of the signal"""
+        if leg == 'entry' and signal.get('client_order_id'):
+            return signal['client_order_id']
+        return make_client_order_id(signal['id'], leg)
+    
+    def _remember_client_order_id(self, client_order_id: str, order_id: Optional[str]):
+        self.client_order_ids[client_order_id] = order_id
+        if len(self.client_order_ids) > 5000:  # Keep the most recent ids
+            for stale in list(self.client_order_ids)[:1000]:
+                del self.client_order_ids[stale]
+    
+    @staticmethod
+    def _is_unfilled(order: Dict) -> bool:
+        """Order finished without filling anything (e.g. an IOC that found no liquidity)"""
+        return not order.get('filled') and order.get('status') in ('canceled', 'expired', 'rejected')
+    
+    async def _recover_order(self, signal: Dict, quantity: float) -> Optional[Dict]:
+        """Find the order a failed attempt may have placed; None means safe to resend
+        
+        For execution algorithms the child orders (``<id>c0``, ``<id>c1``...) are
+        fetched and their fills aggregated. Raises OrderStateUnknown when the
+        exchange cannot confirm either way.
+        """
+        symbol = signal['symbol']
+        client_order_id = self._signal_client_order_id(signal)
+        mode = self._select_execution_mode(signal, quantity)
+        
+        with latency_tracker.span('order_recovery'):
+            if mode != ExecutionMode.MARKET:
+                side = 'buy' if signal['action'].lower() in ['long', 'buy'] else 'sell'
+                return await self.execution_algorithms.recover(mode, symbol, side, quantity, client_order_id)
+            
+            order = await find_order_by_client_id(self.exchange, client_order_id, symbol)
+            if order is None:
+                return None
+            
+            logger.info(f"Recovered order {client_order_id} for {signal.get('id')} from the exchange")
+            if order.get('status') != 'closed' and order.get('id'):
+                order = await self._await_fill(order['id'], symbol)
+            return order
+    
+    async def _await_fill(self, order_id: str, symbol: str, timeout_seconds: int = 30) -> Dict:
+        """Poll an order until it closes or the timeout expires"""
+        for _ in range(timeout_seconds):
+            updated_order = await self.exchange.fetch_order(order_id, symbol)
+            if updated_order.get('status') == 'closed':
+                logger.info(f"Order {order_id} filled successfully")
+                return updated_order
+            if self._is_unfilled(updated_order):
+                return updated_order  # Finished without a fill, no point polling on
+            await asyncio.sleep(1)
+        
+        logger.warning(f"Order {order_id} not filled within timeout")
+        return updated_order
+    
+    async def execute_batch(self, signals: List[Dict]) -> List[ExecutionResult]:
+        """Execute a cycle's signals, sending entries and brackets as batch orders
+        
+        Results are returned in the same order as ``signals``.
+        """
+        if len(signals) < 2:
+            return [await self.execute(signal) for signal in signals]
+        
+        with latency_tracker.trace('batch_execution') as trace:
+            results = await self._execute_signal_batch(signals)
+        
+        breakdown = trace.breakdown()
+        for result in results:
+            result.stage_timings_ms = breakdown
+        return results
+    
+    async def _execute_signal_batch(self, signals: List[Dict]) -> List[ExecutionResult]:
+        start_time = time.time()
+        results: List[Optional[ExecutionResult]] = [None] * len(signals)
+        batched = []  # (index, signal, result, position_size)
+        
+        # One model call scores the whole cycle
+        with latency_tracker.span('ml_batch_prediction'):
+            ml_results = await optimization_integrator.predict_ml_batch(signals)
+        
+        # Pre-trade checks run per signal, placement is grouped
+        for index, signal in enumerate(signals):
+            rejection = await self._validate_authenticity(signal)
+            if rejection:
+                results[index] = rejection
+                continue
+            
+            signal, account_balance = await self._enhance_signal(signal, ml_results[index])
+            result = self._new_result(signal)
+            results[index] = result
+            
+            try:
+                position_size = await self._prepare_order(signal, result, account_balance)
+                if position_size is None:
+                    self._finalize_execution(result, start_time)
+                elif self._select_execution_mode(signal, position_size) != ExecutionMode.MARKET:
+                    # Limit-based algorithms manage their own child orders
+                    try:
+                        await self._place_with_retries(signal, result, position_size)
+                    finally:
+                        self._finalize_execution(result, start_time)
+                else:
+                    batched.append((index, signal, result, position_size))
+            except Exception as e:
+                result.status = "ERROR"
+                result.error_message = f"Critical error: {str(e)}"
+                logger.error(f"Critical execution error for {result.signal_id}: {e}", exc_info=True)
+                self._finalize_execution(result, start_time)
+        
+        if batched:
+            try:
+                await self._place_entry_batch([(signal, result, size) for _, signal, result, size in batched])
+            except Exception as e:
+                logger.error(f"Batch execution error: {e}", exc_info=True)
+                for _, _, result, _ in batched:
+                    if result.status == "PENDING":
+                        result.status = "ERROR"
+                        result.error_message = f"Critical error: {str(e)}"
+            finally:
+                for _, _, result, _ in batched:
+                    self._finalize_execution(result, start_time)
+        
+        return results
+    
+    async def _place_entry_batch(self, batch: List[Tuple[Dict, ExecutionResult, float]]):
+        """Submit entry orders as batches, map fills back and bracket the filled positions"""
+        requests = [self._entry_order_request(signal, size) for signal, _, size in batch]
+        logger.info(f"Placing {len(requests)} entry orders in batches of {config.BATCH_ORDER_SIZE}")
+        
+        with latency_tracker.span('order_placement'):
+            orders = await self._submit_orders(requests)
+        
+        async def settle(order: Dict) -> Dict:
+            if order.get('id') and order.get('status') != 'closed' and not self._is_unfilled(order):
+                return await self._await_fill(order['id'], order.get('symbol'))
+            return order
+        
+        with latency_tracker.span('fill_polling'):
+            orders = await asyncio.gather(*[settle(order) for order in orders])
+        
+        filled = []
+        for (signal, result, _), order in zip(batch, orders):
+            if order.get('id') and (self._is_unfilled(order) or not order.get('filled')):
+                result.status = "REJECTED"
+                result.error_message = f"Order not filled ({order.get('status')})"
+                logger.warning(f"Batch entry for {result.signal_id} did not fill, nothing to protect")
+            elif order.get('id'):
+                await self._record_fill(signal, order, result)
+                filled.append((signal, result))
+            else:
+                result.status = "REJECTED"
+                result.error_message = f"Batch order rejected: {order.get('info', {}).get('msg', 'unknown error')}"
+                logger.error(f"Batch entry for {result.signal_id} rejected: {result.error_message}")
+        
+        await self._place_protective_orders(filled)
+    
+    async def _place_protective_orders(self, fills: List[Tuple[Dict, ExecutionResult]]):
+        """Place reduce-only stop loss and take profit orders for filled entries"""
+        if not config.PLACE_PROTECTIVE_ORDERS:
+            return
+        
+        requests = []
+        owners = []  # (result, kind) per request
+        for signal, result in fills:
+            if result.status != "FILLED" or not result.executed_quantity:
+                continue
+            exit_side = 'sell' if signal['action'].lower() in ['long', 'buy'] else 'buy'
+            for kind, order_type in (('stop_loss', 'STOP_MARKET'), ('take_profit', 'TAKE_PROFIT_MARKET')):
+                trigger_price = signal.get(kind)
+                if not trigger_price:
+                    continue
+                requests.append({
+                    'symbol': result.symbol,
+                    'type': order_type,
+                    'side': exit_side,
+                    'amount': result.executed_quantity,
+                    'price': None,
+                    'params': {
+                        'stopPrice': trigger_price,
+                        'reduceOnly': True,
+                        'clientOrderId': self._signal_client_order_id(signal, kind)
+                    }
+                })
+                owners.append((result, kind))
+        
+        if not requests:
+            return
+        
+        with latency_tracker.span('protective_orders'):
+            orders = await self._submit_orders(requests)
+        
+        for (result, kind), order in zip(owners, orders):
+            protective = result.additional_info.setdefault('protective_orders', {})
+            protective[kind] = order.get('id')
+            if not order.get('id'):
+                logger.error(f"Failed to place {kind} for {result.symbol}: "
+                           f"{order.get('info', {}).get('msg', 'unknown error')}")
+            position = self.positions.get(result.signal_id)
+            if position is not None:
+                position.setdefault('protective_orders', {})[kind] = order.get('id')
+    
+    async def _cancel_protective_orders(self, position: Dict):
+        """Cancel a position's stop loss and take profit orders on the exchange"""
+        protective = position.get('protective_orders') or {}
+        for kind, order_id in list(protective.items()):
+            if not order_id:
+                protective.pop(kind)
+                continue
+            try:
+                await self.exchange.cancel_order(order_id, position['symbol'])
+                protective.pop(kind)
+            except ccxt.OrderNotFound:
+                protective.pop(kind)  # Already triggered or cancelled
+            except Exception as e:
+                logger.error(f"Failed to cancel {kind} order {order_id} for {position['symbol']}: {e}")
+    
+    async def _submit_orders(self, requests: List[Dict]) -> List[Dict]:
+        """Send order requests in exchange-sized batches, falling back to single orders
+        
+        Always returns one order dict per request; failed orders have no ``id`` and
+        carry the error message in ``info['msg']``.
+        """
+        orders = []
+        batch_size = max(1, config.BATCH_ORDER_SIZE)
+        supports_batch = bool(getattr(self.exchange, 'has', {}).get('createOrders'))
+        
+        for start in range(0, len(requests), batch_size):
+            chunk = requests[start:start + batch_size]
+            batch_in_doubt = False
+            if supports_batch and len(chunk) > 1:
+                try:
+                    batch_orders = await self.exchange.create_orders(chunk)
+                    orders.extend(
+                        {**order, 'symbol': order.get('symbol') or request['symbol']}
+                        for request, order in zip(chunk, batch_orders)
+                    )
+                    continue
+                except ccxt.NetworkError as e:
+                    # Some legs may have reached the exchange; the idempotent
+                    # single-order path below looks each one up before resending
+                    logger.warning(f"Batch order request failed in transit, reconciling by client id: {e}")
+                    batch_in_doubt = True
+                except (ccxt.NotSupported, ccxt.ExchangeError) as e:
+                    logger.warning(f"Batch order request rejected, falling back to single orders: {e}")
+            
+            for request in chunk:
+                try:
+                    order = await create_order_idempotent(
+                        self.exchange, request, self.max_retries, check_first=batch_in_doubt
+                    )
+                    orders.append({**order, 'symbol': order.get('symbol') or request['symbol']})
+                except Exception as e:
+                    logger.error(f"Order request for {request['symbol']} failed: {e}")
+                    orders.append({'id': None, 'symbol': request['symbol'], 'info': {'msg': str(e)}})
+        
+        return orders
+    
     def _calculate_slippage(self, requested_price: float, executed_price: float, action: str) -> float:
         """Calculate slippage percentage"""
         try:
@@ -687,6 +1077,9 @@ class Executor:
                         side = 'sell' if position['side'].lower() in ['long', 'buy'] else 'buy'
                         quantity = position['quantity']
                         
+                        # Reduce-only triggers left behind could later close a new position
+                        await self._cancel_protective_orders(position)
+                        
                         # Place closing order
                         close_order = await self.exchange.create_order(
                             symbol=symbol,
@@ -741,6 +1134,7 @@ class Executor:
             'success_rate': success_rate,
             'average_slippage': avg_slippage,
             'average_execution_time_ms': avg_execution_time,
+            'stage_latency_ms': latency_tracker.snapshot().get('execution', {}),
             'status_breakdown': status_counts,
             'open_positions': len(await self.get_open_positions()),
             'slippage_tolerance': self.slippage_tolerance,
@@ -0,0 +1,358 @@
+"""
+Event-driven exit engine
+Stop-loss, take-profit, trailing-stop and max-hold exits indexed by trigger price per symbol,
+evaluated on every price tick instead of polling each position
+"""
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExitKind(Enum):
+    STOP_LOSS = "stop_loss"
+    TAKE_PROFIT = "take_profit"
+    TRAILING_STOP = "trailing_stop"
+    MAX_HOLD = "max_hold"
+
+
+@dataclass
+class ExitTrigger:
+    """An exit that fired on a tick"""
+    key: str
+    symbol: str
+    side: str
+    kind: ExitKind
+    level: float
+    price: float
+    timestamp: float
+    metadata: Dict = field(default_factory=dict)
+
+    @property
+    def reason(self) -> str:
+        if self.kind == ExitKind.MAX_HOLD:
+            return f"Max hold time reached at {self.price:.6g}"
+        return f"{self.kind.value.replace('_', ' ').capitalize()} hit: {self.price:.6g} vs level {self.level:.6g}"
+
+
+@dataclass
+class ExitOrder:
+    """Exit levels registered for one position; the first leg to trigger cancels the rest"""
+    key: str
+    symbol: str
+    side: str
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    trailing_distance: Optional[float] = None
+    expires_at: Optional[float] = None
+    on_trigger: Optional[Callable[[ExitTrigger], Any]] = None
+    metadata: Dict = field(default_factory=dict)
+    version: int = 0
+
+    @property
+    def is_long(self) -> bool:
+        return is_long(self.side)
+
+
+def is_long(side: str) -> bool:
+    return str(side).lower() in ('buy', 'long')
+
+
+class _Bucket:
+    """Trailing stops that share a peak: a min-heap of (distance, seq, key)"""
+    __slots__ = ('peak', 'heap', 'parent')
+
+    def __init__(self, peak: float):
+        self.peak = peak
+        self.heap: List = []
+        self.parent: Optional['_Bucket'] = None
+
+
+class _TrailingBook:
+    """Trailing stops of one direction on one symbol
+
+    Works on direction-adjusted prices ``x`` (price for longs, -price for
+    shorts), so a stop triggers when ``x <= peak - distance``. When ``x`` makes
+    a new high every stop whose peak is below it moves to the same peak, so
+    stops are grouped into buckets by peak and a new high merges buckets
+    (smaller into larger, with union-find for membership) instead of touching
+    each stop. A max-heap holds the level of each bucket's tightest stop.
+    """
+
+    def __init__(self):
+        self._seq = itertools.count()
+        self.live: Dict[str, tuple] = {}  # key -> (distance, seq)
+        self.members: Dict[str, _Bucket] = {}
+        self.buckets: Dict[float, _Bucket] = {}  # Root buckets by peak
+        self.peaks: List[float] = []
+        self.levels: List = []  # (distance - peak, peak, seq, key)
+
+    def __len__(self) -> int:
+        return len(self.live)
+
+    def _find(self, bucket: _Bucket) -> _Bucket:
+        root = bucket
+        while root.parent is not None:
+            root = root.parent
+        while bucket.parent is not None and bucket.parent is not root:
+            bucket.parent, bucket = root, bucket.parent
+        return root
+
+    def _is_live(self, seq: int, key: str) -> bool:
+        entry = self.live.get(key)
+        return entry is not None and entry[1] == seq
+
+    def _push_level(self, bucket: _Bucket):
+        heap = bucket.heap
+        while heap and not self._is_live(heap[0][1], heap[0][2]):
+            heapq.heappop(heap)
+        if not heap:
+            if self.buckets.get(bucket.peak) is bucket:
+                del self.buckets[bucket.peak]
+            return
+        distance, seq, key = heap[0]
+        heapq.heappush(self.levels, (distance - bucket.peak, bucket.peak, seq, key))
+
+    def add(self, key: str, distance: float, peak: float):
+        self.remove(key)
+        bucket = self.buckets.get(peak)
+        if bucket is None:
+            bucket = self.buckets[peak] = _Bucket(peak)
+            heapq.heappush(self.peaks, peak)
+        seq = next(self._seq)
+        self.live[key] = (distance, seq)
+        self.members[key] = bucket
+        heapq.heappush(bucket.heap, (distance, seq, key))
+        heapq.heappush(self.levels, (distance - peak, peak, seq, key))
+
+    def remove(self, key: str):
+        if self.live.pop(key, None) is None:
+            return
+        self._push_level(self._find(self.members.pop(key)))
+
+    def level(self, key: str) -> Optional[float]:
+        if key not in self.live:
+            return None
+        return self._find(self.members[key]).peak - self.live[key][0]
+
+    def raise_peak(self, x: float):
+        """Move every stop whose peak is below ``x`` up to ``x``"""
+        if not self.peaks or self.peaks[0] >= x:
+            return
+        target = self.buckets.get(x)
+        is_new_peak = target is None
+        while self.peaks and self.peaks[0] < x:
+            bucket = self.buckets.pop(heapq.heappop(self.peaks), None)
+            if bucket is None:
+                continue
+            if target is None:
+                target = bucket
+                continue
+            if len(bucket.heap) > len(target.heap):
+                target, bucket = bucket, target
+            for entry in bucket.heap:
+                if self._is_live(entry[1], entry[2]):
+                    heapq.heappush(target.heap, entry)
+            bucket.heap = []
+            bucket.parent = target
+        if target is None:
+            return
+        target.peak = x
+        self.buckets[x] = target
+        if is_new_peak:
+            heapq.heappush(self.peaks, x)
+        self._push_level(target)
+
+    def pop_triggered(self, x: float) -> List[tuple]:
+        """Remove and return (key, level) of every stop at or above ``x``"""
+        fired = []
+        while self.levels:
+            negative_level, peak, seq, key = self.levels[0]
+            if not self._is_live(seq, key) or self._find(self.members[key]).peak != peak:
+                heapq.heappop(self.levels)
+                continue
+            if -negative_level < x:
+                break
+            heapq.heappop(self.levels)
+            fired.append((key, -negative_level))
+            self.remove(key)
+        return fired
+
+
+class _SymbolExits:
+    """Fixed levels split by trigger direction plus trailing stops per direction"""
+
+    def __init__(self):
+        self.below: List = []  # Fire when price <= level; max-heap of (-level, seq, key, version, kind)
+        self.above: List = []  # Fire when price >= level; min-heap of (level, seq, key, version, kind)
+        self.trailing = {1: _TrailingBook(), -1: _TrailingBook()}
+
+
+class ExitEngine:
+    """One registry of exits for every strategy, evaluated per price tick
+
+    A tick pops only the levels it crosses, so the cost is O(log n) per exit
+    that fires (plus amortised bucket merges for trailing stops) rather than a
+    scan of every open position. Triggers are returned from ``on_price`` and
+    also passed to the order's ``on_trigger`` callback; coroutine callbacks are
+    scheduled on the running loop.
+    """
+
+    def __init__(self):
+        self.orders: Dict[str, ExitOrder] = {}
+        self.last_prices: Dict[str, float] = {}
+        self._symbols: Dict[str, _SymbolExits] = {}
+        self._expiries: List = []
+        self._seq = itertools.count(1)
+        self._tasks = set()
+        self.stats = {'registered': 0, 'triggered': 0, 'ticks': 0}
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def register(self, key: str, symbol: str, side: str, stop_loss: float = None,
+                 take_profit: float = None, trailing_distance: float = None,
+                 reference_price: float = None, max_hold_seconds: float = None,
+                 on_trigger: Callable[[ExitTrigger], Any] = None, metadata: Dict = None,
+                 now: float = None) -> ExitOrder:
+        """Register (or replace) the exits of a position
+
+        ``side`` is the position side (buy/long or sell/short). Trailing stops
+        start from ``reference_price``, usually the current price. A
+        ``max_hold_seconds`` of 0 (a position already past its hold time)
+        expires on the next tick.
+        """
+        if trailing_distance and not reference_price:
+            raise ValueError("Trailing stops need a reference price")
+        self.cancel(key)
+
+        now = time.time() if now is None else now
+        order = ExitOrder(
+            key=key, symbol=symbol, side=side, stop_loss=stop_loss, take_profit=take_profit,
+            trailing_distance=trailing_distance,
+            expires_at=now + max_hold_seconds if max_hold_seconds is not None else None,
+            on_trigger=on_trigger, metadata=metadata or {}, version=next(self._seq)
+        )
+        self.orders[key] = order
+        book = self._symbols.setdefault(symbol, _SymbolExits())
+        long = order.is_long
+
+        if stop_loss:
+            self._push_fixed(book, order, ExitKind.STOP_LOSS, stop_loss, fires_below=long)
+        if take_profit:
+            self._push_fixed(book, order, ExitKind.TAKE_PROFIT, take_profit, fires_below=not long)
+        if trailing_distance:
+            sign = 1 if long else -1
+            book.trailing[sign].add(key, trailing_distance, sign * reference_price)
+        if order.expires_at is not None:
+            heapq.heappush(self._expiries, (order.expires_at, order.version, key))
+
+        self.stats['registered'] += 1
+        return order
+
+    def _push_fixed(self, book: _SymbolExits, order: ExitOrder, kind: ExitKind, level: float, fires_below: bool):
+        if fires_below:
+            heapq.heappush(book.below, (-level, order.version, order.key, order.version, kind))
+        else:
+            heapq.heappush(book.above, (level, order.version, order.key, order.version, kind))
+
+    def cancel(self, key: str) -> bool:
+        """Drop a position's exits; heap entries are discarded lazily"""
+        order = self.orders.pop(key, None)
+        if order is None:
+            return False
+        if order.trailing_distance:
+            book = self._symbols.get(order.symbol)
+            if book is not None:
+                book.trailing[1 if order.is_long else -1].remove(key)
+        return True
+
+    def trailing_stop(self, key: str) -> Optional[float]:
+        """Current trailing stop price of a position, if it has one"""
+        order = self.orders.get(key)
+        if order is None or not order.trailing_distance:
+            return None
+        sign = 1 if order.is_long else -1
+        level = self._symbols[order.symbol].trailing[sign].level(key)
+        return sign * level if level is not None else None
+
+    def on_price(self, symbol: str, price: float, timestamp: float = None) -> List[ExitTrigger]:
+        """Fold one price tick in and fire every exit it crosses"""
+        timestamp = time.time() if timestamp is None else timestamp
+        self.last_prices[symbol] = price
+        self.stats['ticks'] += 1
+        triggers = []
+
+        book = self._symbols.get(symbol)
+        if book is not None:
+            while book.below and -book.below[0][0] >= price:
+                negative_level, _, key, version, kind = heapq.heappop(book.below)
+                self._fire_if_live(key, version, kind, -negative_level, price, timestamp, triggers)
+            while book.above and book.above[0][0] <= price:
+                level, _, key, version, kind = heapq.heappop(book.above)
+                self._fire_if_live(key, version, kind, level, price, timestamp, triggers)
+            for sign, trailing in book.trailing.items():
+                if not len(trailing):
+                    continue
+                trailing.raise_peak(sign * price)
+                for key, level in trailing.pop_triggered(sign * price):
+                    order = self.orders.get(key)
+                    if order is not None:
+                        triggers.append(self._fire(order, ExitKind.TRAILING_STOP, sign * level, price, timestamp))
+
+        triggers.extend(self.on_time(timestamp))
+        return triggers
+
+    def on_time(self, now: float = None) -> List[ExitTrigger]:
+        """Fire max-hold exits that have expired"""
+        now = time.time() if now is None else now
+        triggers = []
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, version, key = heapq.heappop(self._expiries)
+            order = self.orders.get(key)
+            if order is not None and order.version == version:
+                price = self.last_prices.get(order.symbol, 0.0)
+                triggers.append(self._fire(order, ExitKind.MAX_HOLD, expires_at, price, now))
+        return triggers
+
+    def _fire_if_live(self, key: str, version: int, kind: ExitKind, level: float, price: float,
+                      timestamp: float, triggers: List[ExitTrigger]):
+        order = self.orders.get(key)
+        if order is not None and order.version == version:
+            triggers.append(self._fire(order, kind, level, price, timestamp))
+
+    def _fire(self, order: ExitOrder, kind: ExitKind, level: float, price: float, timestamp: float) -> ExitTrigger:
+        self.cancel(order.key)
+        trigger = ExitTrigger(order.key, order.symbol, order.side, kind, level, price, timestamp, order.metadata)
+        self.stats['triggered'] += 1
+        if order.on_trigger is not None:
+            self._dispatch(order.on_trigger, trigger)
+        return trigger
+
+    def _dispatch(self, callback: Callable[[ExitTrigger], Any], trigger: ExitTrigger):
+        try:
+            result = callback(trigger)
+        except Exception as e:
+            logger.error(f"Exit callback error for {trigger.key}: {e}")
+            return
+        if not inspect.iscoroutine(result):
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(result)
+        except RuntimeError:
+            result.close()
+            logger.error(f"No running event loop for exit callback of {trigger.key}")
+            return
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+# Global instance
+exit_engine = ExitEngine()
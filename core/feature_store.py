@@ -0,0 +1,262 @@
+"""
+Incremental ML feature store
+Feature rows are computed once, when a signal, position or market snapshot is seen, and
+appended to columnar arrays keyed by (symbol, timestamp); inference and training both
+read those arrays, so the models are trained on exactly what they were served
+"""
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAX_ROWS = 100_000  # Per table; unlabelled rows are evicted first
+
+# Column layouts; absent inputs take the defaults below, so every row has the full width
+SIGNAL_FEATURES = (
+    'correlation', 'deviation', 'abs_correlation', 'deviation_squared',
+    'volatility', 'volume_ratio', 'price_change_1h', 'price_change_4h', 'price_change_24h',
+    'hour_of_day', 'day_of_week', 'time_of_day'
+)
+EXIT_FEATURES = (
+    'position_age_hours', 'entry_price', 'current_profit_pct', 'abs_profit_pct', 'leverage',
+    'volatility_regime_score', 'trend_strength', 'volume_trend'
+)
+REGIME_FEATURES = (
+    'daily_volatility', 'weekly_volatility', 'volatility_trend',
+    'price_change_1d', 'price_change_7d', 'price_change_30d',
+    'rsi', 'macd_signal', 'bollinger_position', 'volume_sma_ratio', 'volume_trend'
+)
+
+
+def to_millis(value=None) -> int:
+    """Epoch milliseconds from a datetime, ISO string, epoch seconds/milliseconds or None (now)"""
+    if value is None:
+        return int(time.time() * 1000)
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    if isinstance(value, str):
+        return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp() * 1000)
+    value = float(value)
+    return int(value if value > 1e11 else value * 1000)
+
+
+def signal_features(signal: Dict, market_data: Dict = None, timestamp_ms: int = None) -> np.ndarray:
+    """Signal strength features; time features are taken at the signal's own time"""
+    market_data = market_data or {}
+    timestamp_ms = to_millis(signal.get('timestamp')) if timestamp_ms is None else timestamp_ms
+    moment = datetime.fromtimestamp(timestamp_ms / 1000)
+    correlation = float(signal.get('correlation', 0.0))
+    deviation = float(signal.get('deviation', 0.0))
+    return np.array([
+        correlation,
+        deviation,
+        abs(correlation),
+        deviation ** 2,
+        market_data.get('volatility', 0.03),
+        market_data.get('volume_ratio', 1.0),
+        market_data.get('price_change_1h', 0.0),
+        market_data.get('price_change_4h', 0.0),
+        market_data.get('price_change_24h', 0.0),
+        moment.hour / 24.0,
+        moment.weekday() / 6.0,
+        (timestamp_ms / 1000 % 86400) / 86400
+    ], dtype=np.float64)
+
+
+def exit_features(position: Dict, market_conditions: Dict = None, timestamp_ms: int = None) -> np.ndarray:
+    """Exit timing features for a position as of ``timestamp_ms`` (default now)"""
+    market_conditions = market_conditions or {}
+    now_ms = to_millis(timestamp_ms)
+    entry_time = position.get('entry_time')
+    entry_ms = to_millis(entry_time) if entry_time is not None else now_ms - 3_600_000  # Default 1 hour
+    profit_pct = float(position.get('current_profit_pct', 0.0))
+    return np.array([
+        (now_ms - entry_ms) / 3_600_000,
+        position.get('entry_price', 0.0),
+        profit_pct,
+        abs(profit_pct),
+        position.get('leverage', 1.0),
+        market_conditions.get('volatility_regime_score', 0.5),
+        market_conditions.get('trend_strength', 0.0),
+        market_conditions.get('volume_trend', 1.0)
+    ], dtype=np.float64)
+
+
+def regime_features(market_data: Dict) -> np.ndarray:
+    """Regime classification features"""
+    return np.array([
+        market_data.get('daily_volatility', 0.03),
+        market_data.get('weekly_volatility', 0.05),
+        market_data.get('volatility_trend', 0.0),
+        market_data.get('price_change_1d', 0.0),
+        market_data.get('price_change_7d', 0.0),
+        market_data.get('price_change_30d', 0.0),
+        market_data.get('rsi', 50.0) / 100.0,  # Normalized RSI
+        market_data.get('macd_signal', 0.0),
+        market_data.get('bollinger_position', 0.5),  # Position in Bollinger bands
+        market_data.get('volume_sma_ratio', 1.0),
+        market_data.get('volume_trend', 0.0)
+    ], dtype=np.float64)
+
+
+class FeatureTable:
+    """Feature rows with an optional target per row, bounded at ``max_rows``
+
+    Rows live in one (rows x columns) float64 array that doubles when full,
+    next to int64 timestamps and a target column (NaN until labelled).
+    Recording a (symbol, timestamp) key that already exists returns the
+    existing row; rows appended with ``unique=False`` are never matched.
+
+    At ``max_rows`` the table is compacted to three quarters of it: the
+    newest unlabelled rows (signals still awaiting an outcome) keep up to a
+    quarter, labelled rows the rest, and the oldest of each go. Compaction
+    renumbers rows, so an index is only valid until the next append.
+    """
+
+    def __init__(self, columns: Sequence[str], capacity: int = 1024, max_rows: int = None):
+        self.columns = tuple(columns)
+        self.max_rows = max_rows
+        capacity = min(capacity, max_rows) if max_rows else capacity
+        self._values = np.zeros((capacity, len(self.columns)))
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._targets = np.full(capacity, np.nan)
+        self._size = 0
+        self._keys: Dict[Tuple[str, int], int] = {}
+        self.labeled_total = 0  # Rows ever labelled, including evicted ones
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self):
+        capacity = 2 * len(self._values)
+        if self.max_rows:
+            capacity = min(capacity, self.max_rows)
+        self._values = np.resize(self._values, (capacity, len(self.columns)))
+        self._timestamps = np.resize(self._timestamps, capacity)
+        targets = np.full(capacity, np.nan)
+        targets[:self._size] = self._targets[:self._size]
+        self._targets = targets
+
+    def _evict(self):
+        """Compact a full table down to three quarters of ``max_rows``"""
+        labeled = ~np.isnan(self._targets[:self._size])
+        unlabeled_rows = np.flatnonzero(~labeled)
+        labeled_rows = np.flatnonzero(labeled)
+        keep_total = (self.max_rows * 3) // 4
+        unlabeled_rows = unlabeled_rows[max(0, len(unlabeled_rows) - self.max_rows // 4):]
+        labeled_rows = labeled_rows[max(0, len(labeled_rows) - (keep_total - len(unlabeled_rows))):]
+        keep = np.sort(np.concatenate([labeled_rows, unlabeled_rows]))
+
+        positions = np.full(self._size, -1, dtype=np.intp)
+        positions[keep] = np.arange(len(keep))
+        self._keys = {key: int(positions[index]) for key, index in self._keys.items() if positions[index] >= 0}
+        kept = len(keep)
+        self._values[:kept] = self._values[keep]
+        self._timestamps[:kept] = self._timestamps[keep]
+        self._targets[:kept] = self._targets[keep]
+        self._targets[kept:] = np.nan
+        self.evicted += self._size - kept
+        logger.debug(f"Feature table evicted {self._size - kept} rows, {kept} kept")
+        self._size = kept
+
+    def append(self, symbol: str, timestamp_ms: int, row: np.ndarray, target: float = np.nan,
+               unique: bool = True) -> int:
+        key = (symbol, int(timestamp_ms))
+        index = self._keys.get(key) if unique else None
+        if index is not None:
+            if not np.isnan(target):
+                self.set_target(index, target)
+            return index
+        if self._size == len(self._values):
+            if self.max_rows and self._size >= self.max_rows:
+                self._evict()
+            else:
+                self._grow()
+        index = self._size
+        self._values[index] = row
+        self._timestamps[index] = key[1]
+        self._targets[index] = target
+        if not np.isnan(target):
+            self.labeled_total += 1
+        if unique:
+            self._keys[key] = index
+        self._size += 1
+        return index
+
+    def index_of(self, symbol: str, timestamp_ms: int) -> Optional[int]:
+        return self._keys.get((symbol, int(timestamp_ms)))
+
+    def set_target(self, index: int, target: float):
+        if np.isnan(self._targets[index]):
+            self.labeled_total += 1
+        self._targets[index] = target
+
+    def row(self, index: int) -> np.ndarray:
+        """One feature row (a copy)"""
+        return self._values[index].copy()
+
+    def matrix(self, indices: Sequence[int] = None) -> np.ndarray:
+        """Feature rows (a copy), all of them by default"""
+        if indices is None:
+            return self._values[:self._size].copy()
+        return self._values[np.asarray(indices, dtype=np.intp)]
+
+    @property
+    def labeled_count(self) -> int:
+        return int(np.count_nonzero(~np.isnan(self._targets[:self._size])))
+
+    def labeled(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(features, targets, timestamps) of labelled rows, oldest first"""
+        rows = np.flatnonzero(~np.isnan(self._targets[:self._size]))
+        rows = rows[np.argsort(self._timestamps[rows], kind='stable')]
+        return self._values[rows], self._targets[rows], self._timestamps[rows]
+
+
+class FeatureStore:
+    """Signal, exit and regime feature tables shared by inference and training"""
+
+    def __init__(self, max_rows: int = MAX_ROWS):
+        self.tables = {
+            'signal_strength': FeatureTable(SIGNAL_FEATURES, max_rows=max_rows),
+            'exit_timing': FeatureTable(EXIT_FEATURES, max_rows=max_rows),
+            'regime_classification': FeatureTable(REGIME_FEATURES, max_rows=max_rows)
+        }
+
+    def __getitem__(self, name: str) -> FeatureTable:
+        return self.tables[name]
+
+    def record_signal(self, signal: Dict, market_data: Dict = None, target: float = np.nan) -> int:
+        """Row of a signal; a signal seen before (same symbol and timestamp) keeps the features it was scored with"""
+        symbol = signal.get('symbol', '')
+        timestamp = signal.get('timestamp')
+        timestamp_ms = to_millis(timestamp)
+        table = self.tables['signal_strength']
+        index = table.index_of(symbol, timestamp_ms) if timestamp is not None else None
+        if index is None:
+            row = signal_features(signal, market_data, timestamp_ms)
+            return table.append(symbol, timestamp_ms, row, target, unique=timestamp is not None)
+        if not np.isnan(target):
+            table.set_target(index, target)
+        return index
+
+    def record_exit(self, position: Dict, market_conditions: Dict = None, target: float = np.nan,
+                    timestamp=None) -> int:
+        timestamp_ms = to_millis(timestamp)
+        row = exit_features(position, market_conditions, timestamp_ms)
+        return self.tables['exit_timing'].append(position.get('symbol', ''), timestamp_ms, row, target,
+                                                 unique=timestamp is not None)
+
+    def record_regime(self, market_data: Dict, target: float = np.nan, timestamp=None) -> int:
+        timestamp = timestamp if timestamp is not None else market_data.get('timestamp')
+        row = regime_features(market_data)
+        return self.tables['regime_classification'].append(market_data.get('symbol', ''), to_millis(timestamp),
+                                                           row, target, unique=timestamp is not None)
+
+    def training_sets(self) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Labelled (features, targets, timestamps) per model"""
+        return {name: table.labeled() for name, table in self.tables.items()}
@@ -0,0 +1,90 @@
+"""
+Flattened tree-ensemble inference
+Exports fitted sklearn regression trees into contiguous NumPy node arrays and evaluates
+every tree for every row with a fixed number of vectorized steps
+"""
+import logging
+from typing import Optional
+
+import numpy as np
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+logger = logging.getLogger(__name__)
+
+# Estimators whose prediction is the plain mean of their trees' leaf values
+SUPPORTED_MODELS = (RandomForestRegressor, ExtraTreesRegressor, DecisionTreeRegressor)
+
+
+class FlatForest:
+    """Mean of a fitted regression-tree ensemble, evaluated from flat node arrays
+
+    All trees' nodes are concatenated into one set of arrays; each tree's
+    root is an offset into them. Leaves point back at themselves with an
+    infinite threshold, so every (row, tree) walk can take ``max_depth``
+    steps in lockstep without per-node branching. Inputs are rounded to
+    float32 before comparison, as sklearn does, so predictions match
+    ``model.predict``.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray,
+                 right: np.ndarray, value: np.ndarray, roots: np.ndarray, max_depth: int,
+                 n_features: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features = n_features
+
+    @classmethod
+    def from_model(cls, model) -> Optional['FlatForest']:
+        """Flatten a fitted forest or single regression tree; None if the model is not supported"""
+        if not isinstance(model, SUPPORTED_MODELS):
+            return None
+        estimators = getattr(model, 'estimators_', [model])
+        trees = [estimator.tree_ for estimator in estimators]
+        if any(tree.n_outputs != 1 for tree in trees):
+            return None  # Multi-output models are left to sklearn
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            node_ids = np.arange(tree.node_count)
+            leaf = tree.children_left == -1
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+            lefts.append(np.where(leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(leaf, node_ids, tree.children_right) + offset)
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max(tree.max_depth for tree in trees),
+            n_features=trees[0].n_features
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Ensemble mean for each row of ``X`` (n_rows x n_features)"""
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node].mean(axis=1)
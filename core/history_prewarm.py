@@ -0,0 +1,178 @@
+"""
+Startup history pre-warm
+Fetches the OHLCV history every analysis engine needs in one concurrent pass under a
+request-weight budget (or reads it from the local candle store) and hands each engine
+its candles through ``history_requirements`` / ``load_history``
+"""
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from .config.settings import config
+from .scan_scheduler import kline_weight
+from .sliding_window import SlidingWindowCounter
+
+logger = logging.getLogger(__name__)
+
+HistoryKey = Tuple[str, str]  # (symbol, timeframe)
+
+TIMEFRAME_UNITS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def timeframe_ms(timeframe: str) -> int:
+    """Length of a ccxt timeframe ('1m', '4h', '1d', ...) in milliseconds"""
+    return int(timeframe[:-1]) * TIMEFRAME_UNITS[timeframe[-1]] * 1000
+
+
+class CandleStore:
+    """Local OHLCV history: one float64 (rows x 6) ``.npy`` file per symbol and timeframe"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, key: HistoryKey) -> str:
+        symbol, timeframe = key
+        return os.path.join(self.directory, f"{symbol.replace('/', '_')}_{timeframe}.npy")
+
+    def load(self, key: HistoryKey) -> Optional[np.ndarray]:
+        try:
+            candles = np.load(self.path(key))
+        except (OSError, ValueError):
+            return None
+        return candles if candles.ndim == 2 and candles.shape[1] == 6 else None
+
+    def save(self, key: HistoryKey, candles: np.ndarray):
+        """Atomically replace the stored candles"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.candles-', suffix='.npy', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                np.save(handle, candles)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class HistoryPrewarmer:
+    """Loads the startup history of a set of engines in one pass
+
+    An engine declares ``history_requirements() -> {(symbol, timeframe): candles}``
+    and takes ``load_history({(symbol, timeframe): candles})``, where candles
+    are float64 arrays of ccxt OHLCV rows, oldest first. Requirements shared by
+    several engines are fetched once, at the largest depth asked for. With a
+    candle store, stored history is topped up with only the candles missing
+    since it was written.
+    """
+
+    def __init__(self, exchange, weight_budget: int = None, max_concurrency: int = None,
+                 store: CandleStore = None):
+        self.exchange = exchange
+        self.weight_budget = weight_budget if weight_budget is not None else config.PREWARM_REQUEST_WEIGHT
+        self.max_concurrency = max_concurrency if max_concurrency is not None else config.PREWARM_MAX_CONCURRENCY
+        self.store = store
+        self.weight_used = SlidingWindowCounter(60, buckets=60)
+        self.stats = {'requests': 0, 'weight': 0, 'from_store': 0, 'topped_up': 0, 'failed': 0, 'elapsed_ms': 0.0}
+
+    @staticmethod
+    def requirements(engines: Iterable) -> Dict[HistoryKey, int]:
+        """Union of the engines' requirements, deepest limit per (symbol, timeframe)"""
+        merged: Dict[HistoryKey, int] = {}
+        for engine in engines:
+            for key, limit in engine.history_requirements().items():
+                merged[key] = max(merged.get(key, 0), int(limit))
+        return merged
+
+    async def _spend(self, weight: int):
+        """Wait until the request fits in the rolling minute's weight budget, then charge it"""
+        while self.weight_used.total() + weight > self.weight_budget and self.weight_used.total() > 0:
+            await asyncio.sleep(self.weight_used.bucket_seconds)
+        self.weight_used.add(weight)
+        self.stats['requests'] += 1
+        self.stats['weight'] += weight
+
+    async def _fetch(self, key: HistoryKey, limit: int, since: int = None) -> np.ndarray:
+        symbol, timeframe = key
+        await self._spend(kline_weight(limit))
+        rows = await self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+        return np.asarray(rows, dtype=np.float64).reshape(-1, 6)
+
+    async def _history(self, key: HistoryKey, limit: int, semaphore: asyncio.Semaphore,
+                       now_ms: int) -> Optional[np.ndarray]:
+        stored = self.store.load(key) if self.store else None
+        # Candles opened since the newest stored one; the store is only used if it still covers the limit
+        missing = limit
+        if stored is not None and len(stored):
+            missing = int((now_ms - stored[-1, 0]) // timeframe_ms(key[1]))
+            if len(stored) + missing < limit or missing >= limit:
+                missing = limit
+        async with semaphore:
+            try:
+                if missing <= 0:
+                    self.stats['from_store'] += 1
+                    return stored[-limit:]
+                if missing < limit:
+                    # Re-fetch the newest stored candle too, it may have still been forming
+                    fresh = await self._fetch(key, missing + 1, since=int(stored[-1, 0]))
+                    self.stats['topped_up'] += 1
+                    candles = np.vstack([stored[stored[:, 0] < fresh[0, 0]], fresh]) if len(fresh) else stored
+                    return candles[-limit:]
+                return await self._fetch(key, limit)
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.warning(f"Failed to pre-warm {key[0]} {key[1]}: {e}")
+                return stored[-limit:] if stored is not None else None
+
+    async def fetch(self, requirements: Dict[HistoryKey, int]) -> Dict[HistoryKey, np.ndarray]:
+        """Candles for every requirement, fetched concurrently; failed keys are left out"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        now_ms = int(time.time() * 1000)
+        keys = list(requirements)
+        results = await asyncio.gather(
+            *(self._history(key, requirements[key], semaphore, now_ms) for key in keys)
+        )
+        candles = {key: rows for key, rows in zip(keys, results) if rows is not None and len(rows)}
+
+        if self.store and candles:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._save_all, candles)
+        return candles
+
+    def _save_all(self, candles: Dict[HistoryKey, np.ndarray]):
+        for key, rows in candles.items():
+            try:
+                self.store.save(key, rows)
+            except OSError as e:
+                logger.warning(f"Could not store candles for {key[0]} {key[1]}: {e}")
+
+    async def prewarm(self, engines: Iterable) -> Dict[HistoryKey, np.ndarray]:
+        """Fetch everything the engines need and fill their buffers"""
+        start = time.perf_counter()
+        engines = list(engines)
+        requirements = self.requirements(engines)
+        candles = await self.fetch(requirements)
+        for engine in engines:
+            wanted = engine.history_requirements()
+            try:
+                engine.load_history({key: candles[key][-limit:] for key, limit in wanted.items() if key in candles})
+            except Exception as e:
+                logger.error(f"Error loading history into {type(engine).__name__}: {e}")
+        self.stats['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        logger.info(f"Pre-warmed {len(candles)}/{len(requirements)} histories for {len(engines)} engines "
+                    f"in {self.stats['elapsed_ms']:.0f} ms ({self.stats['requests']} requests, "
+                    f"weight {self.stats['weight']}, {self.stats['from_store']} from store)")
+        return candles
+
+    def get_status(self) -> Dict:
+        return {
+            'weight_budget': self.weight_budget,
+            'max_concurrency': self.max_concurrency,
+            'store': self.store.directory if self.store else None,
+            **self.stats
+        }
@@ -0,0 +1,198 @@
+"""
+Per-stage latency instrumentation for the signal-to-fill pipeline
+Records stage timings into rolling HDR-style histograms
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Trace active in the current task, so nested calls can attach stages to it
+_current_trace: ContextVar[Optional['LatencyTrace']] = ContextVar('latency_trace', default=None)
+
+
+class LatencyHistogram:
+    """Log-linear (HDR-style) histogram of microsecond latencies over a rolling window
+
+    Values below ``2**sub_bucket_bits`` microseconds are recorded exactly; larger
+    values keep ``sub_bucket_bits - 1`` bits of precision (<1% error at the default).
+    The window is split into slices that are recycled as time moves on, so
+    percentiles always describe roughly the last ``window_seconds``.
+    """
+
+    def __init__(self, window_seconds: float = 300.0, slices: int = 5,
+                 sub_bucket_bits: int = 7, highest_us: int = 3_600_000_000):
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.sub_bucket_bits = sub_bucket_bits
+        self.highest_us = highest_us
+        self.bucket_count = self._index(highest_us) + 1
+
+        self.slice_seconds = window_seconds / slices
+        self.counts = np.zeros((slices, self.bucket_count), dtype=np.int64)
+        self.slice_started = np.zeros(slices, dtype=np.float64)
+        self.current_slice = 0
+        self.slice_started[0] = time.monotonic()
+
+        self.total_count = 0
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        if value_us < self.sub_bucket_count:
+            return value_us
+        shift = value_us.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.half_count + ((value_us >> shift) - self.half_count)
+
+    def _bucket_value(self, index: int) -> int:
+        """Upper edge (inclusive) of a bucket, in microseconds"""
+        if index < self.sub_bucket_count:
+            return index
+        shift = (index - self.sub_bucket_count) // self.half_count + 1
+        mantissa = (index - self.sub_bucket_count) % self.half_count + self.half_count
+        return ((mantissa + 1) << shift) - 1
+
+    def _rotate(self, now: float):
+        elapsed = now - self.slice_started[self.current_slice]
+        if elapsed < self.slice_seconds:
+            return
+        steps = min(int(elapsed // self.slice_seconds), len(self.slice_started))
+        for _ in range(steps):
+            self.current_slice = (self.current_slice + 1) % len(self.slice_started)
+            self.counts[self.current_slice].fill(0)
+        self.slice_started[self.current_slice] = now
+
+    def record(self, value_ms: float):
+        """Record a latency in milliseconds"""
+        value_us = min(max(int(value_ms * 1000.0), 0), self.highest_us)
+        self._rotate(time.monotonic())
+        self.counts[self.current_slice, self._index(value_us)] += 1
+        self.total_count += 1
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def percentiles(self, quantiles: Tuple[float, ...] = (0.5, 0.9, 0.99, 0.999)) -> Dict[str, float]:
+        """Percentiles (ms) over the rolling window"""
+        self._rotate(time.monotonic())
+        merged = self.counts.sum(axis=0)
+        window_count = int(merged.sum())
+        result = {'count': window_count}
+        if window_count == 0:
+            for q in quantiles:
+                result[f"p{q * 100:g}"] = 0.0
+            result['max'] = 0.0
+            return result
+
+        cumulative = np.cumsum(merged)
+        for q in quantiles:
+            rank = max(1, int(np.ceil(q * window_count)))
+            index = int(np.searchsorted(cumulative, rank))
+            result[f"p{q * 100:g}"] = self._bucket_value(index) / 1000.0
+        result['max'] = self._bucket_value(int(np.flatnonzero(merged)[-1])) / 1000.0
+        return result
+
+
+class LatencyTrace:
+    """Stage breakdown of a single pipeline run (one execution or one bot cycle)"""
+
+    def __init__(self, tracker: 'LatencyTracker', pipeline: str):
+        self.tracker = tracker
+        self.pipeline = pipeline
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.total_ms: Optional[float] = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a stage; repeated stages within one trace accumulate"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed_ms
+
+    def finish(self) -> Dict[str, float]:
+        """Close the trace, record every stage and the total, and return the breakdown"""
+        if self.total_ms is None:
+            self.total_ms = (time.perf_counter() - self.started) * 1000.0
+            for name, elapsed_ms in self.stages.items():
+                self.tracker.record(self.pipeline, name, elapsed_ms)
+            self.tracker.record(self.pipeline, 'total', self.total_ms)
+        return self.breakdown()
+
+    def breakdown(self) -> Dict[str, float]:
+        timings = {name: round(ms, 3) for name, ms in self.stages.items()}
+        if self.total_ms is not None:
+            timings['total'] = round(self.total_ms, 3)
+        return timings
+
+
+class LatencyTracker:
+    """Registry of rolling latency histograms keyed by (pipeline, stage)"""
+
+    def __init__(self, window_seconds: float = 300.0, slices: int = 5):
+        self.window_seconds = window_seconds
+        self.slices = slices
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, pipeline: str, stage: str, elapsed_ms: float):
+        """Record one stage timing"""
+        key = (pipeline, stage)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = LatencyHistogram(self.window_seconds, self.slices)
+                self.histograms[key] = histogram
+            histogram.record(elapsed_ms)
+
+    @contextmanager
+    def trace(self, pipeline: str):
+        """Open a trace for one pipeline run and make it current for nested spans"""
+        trace = LatencyTrace(self, pipeline)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+            trace.finish()
+
+    @contextmanager
+    def span(self, stage: str, pipeline: Optional[str] = None):
+        """Time a stage of the current trace, or record it standalone under ``pipeline``"""
+        trace = _current_trace.get()
+        if trace is not None and pipeline is None:
+            with trace.stage(stage):
+                yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(pipeline or 'untraced', stage, (time.perf_counter() - started) * 1000.0)
+
+    def current_trace(self) -> Optional[LatencyTrace]:
+        return _current_trace.get()
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Percentile summary of every stage, grouped by pipeline"""
+        with self._lock:
+            items = list(self.histograms.items())
+            summary: Dict[str, Dict[str, Dict[str, float]]] = {}
+            for (pipeline, stage), histogram in items:
+                summary.setdefault(pipeline, {})[stage] = histogram.percentiles()
+        return summary
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+
+
+# Global instance
+latency_tracker = LatencyTracker()
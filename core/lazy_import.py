@@ -0,0 +1,67 @@
+"""
+Deferred imports
+Module attributes imported on first use instead of when the importing module loads, so
+heavy dependencies (and the module-level singletons they build) stay off the startup path
+"""
+import importlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+class LazyAttribute:
+    """``module.attribute``, imported the first time it is used
+
+    Attribute reads, assignments and calls are forwarded to the real
+    object. Code that needs the object itself (``isinstance``, identity
+    checks, passing it to C code) should go through ``resolve``.
+    """
+
+    __slots__ = ('_module', '_attribute', '_target', '_lock')
+
+    def __init__(self, module: str, attribute: str):
+        object.__setattr__(self, '_module', module)
+        object.__setattr__(self, '_attribute', attribute)
+        object.__setattr__(self, '_target', _UNSET)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _resolve(self):
+        target = object.__getattribute__(self, '_target')
+        if target is _UNSET:
+            with object.__getattribute__(self, '_lock'):
+                target = object.__getattribute__(self, '_target')
+                if target is _UNSET:
+                    module = importlib.import_module(object.__getattribute__(self, '_module'))
+                    target = getattr(module, object.__getattribute__(self, '_attribute'))
+                    object.__setattr__(self, '_target', target)
+        return target
+
+    @property
+    def loaded(self) -> bool:
+        return object.__getattribute__(self, '_target') is not _UNSET
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<lazy {self._module}.{self._attribute} ({state})>"
+
+
+def lazy_import(module: str, attribute: str) -> LazyAttribute:
+    """Stand-in for ``from module import attribute`` that defers the import to first use"""
+    return LazyAttribute(module, attribute)
+
+
+def resolve(value):
+    """The real object behind a lazy attribute (importing it now), or ``value`` itself"""
+    return value._resolve() if isinstance(value, LazyAttribute) else value
@@ -7,6 +7,7 @@ import numpy as np
 from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from .config.settings import config
+from .sliding_window import TradeWindows
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +17,7 @@ class LeverageManager:
     def __init__(self):
         self.daily_pnl = 0.0
         self.daily_start = datetime.now().date()
-        self.recent_trades = []
+        self.trade_windows = TradeWindows()  # Closed trades, valued by PnL
         self.current_margin_usage = 0.0
         self.volatility_cache = {}
         
@@ -254,28 +255,20 @@ class LeverageManager:
     def add_trade_result(self, trade_result: Dict):
         """Add completed trade to recent performance tracking"""
         try:
-            # Keep only last 20 trades for performance calculation
-            self.recent_trades.append({
-                'pnl': trade_result.get('pnl_usd', 0),
-                'timestamp': datetime.now(),
-                'success': trade_result.get('pnl_usd', 0) > 0
-            })
-            
-            # Keep only recent trades (last 20)
-            if len(self.recent_trades) > 20:
-                self.recent_trades = self.recent_trades[-20:]
-                
+            pnl = trade_result.get('pnl_usd', 0) or 0
+            self.trade_windows.record(pnl, win=pnl > 0)
+            
         except Exception as e:
             logger.error(f"Error adding trade result: {e}")
     
     def _calculate_recent_win_rate(self) -> float:
-        """Calculate win rate from recent trades"""
+        """Win rate over the last hour, falling back to the last 24 hours"""
         try:
-            if not self.recent_trades:
-                return 0.5  # Default to 50% if no data
-            
-            wins = sum(1 for trade in self.recent_trades if trade['success'])
-            return wins / len(self.recent_trades)
+            for name in ('1h', '24h'):
+                window = self.trade_windows[name]
+                if window.count():
+                    return window.win_rate()
+            return 0.5  # Default to 50% if no data
             
         except Exception as e:
             logger.error(f"Error calculating win rate: {e}")
@@ -290,7 +283,7 @@ class LeverageManager:
                 'current_margin_usage': self.current_margin_usage,
                 'max_margin_usage': config.MAX_MARGIN_USAGE,
                 'recent_win_rate': self._calculate_recent_win_rate(),
-                'total_recent_trades': len(self.recent_trades),
+                'total_recent_trades': self.trade_windows['24h'].count(),
                 'risk_status': 'normal' if not self._check_daily_drawdown_exceeded() else 'reduced'
             }
             
@@ -544,6 +544,20 @@ class MarketRegimeDetector:
         """Get the current market regime"""
         return self.current_regime
     
+    def export_state(self) -> Dict:
+        """Regime history for warm-start snapshots"""
+        return {
+            'regime_history': list(self.regime_history),
+            'current_regime': self.current_regime,
+            'regime_confidence': self.regime_confidence
+        }
+    
+    def restore_state(self, state: Dict):
+        """Resume from a warm-start snapshot"""
+        self.regime_history = list(state.get('regime_history', []))[-100:]
+        self.current_regime = state.get('current_regime')
+        self.regime_confidence = state.get('regime_confidence', 0.0)
+    
     def get_regime_history(self, limit: int = 10) -> List[Dict]:
         """Get recent regime history"""
         return self.regime_history[-limit:] if self.regime_history else []
@@ -0,0 +1,156 @@
+"""
+Shared mark-price and funding cache
+Premium index data (mark, index, funding rate, next funding time) for every symbol,
+refreshed by one bulk request or the mark-price stream and read by the risk checks
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from .config.settings import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MarkState:
+    """Latest premium index data for one symbol"""
+    symbol: str
+    mark_price: float
+    index_price: float = 0.0
+    funding_rate: Optional[float] = None  # None until a funding value arrives
+    next_funding_time: int = 0  # Epoch milliseconds
+    updated: float = field(default_factory=time.monotonic)
+    funding_updated: float = 0.0  # Mark-only updates do not refresh the funding rate
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.updated
+
+    @property
+    def funding_age(self) -> float:
+        return time.monotonic() - self.funding_updated if self.funding_rate is not None else float('inf')
+
+
+class MarketStateCache:
+    """Per-symbol mark price and funding shared by the risk managers
+
+    The whole table is refreshed in one request (Binance ``premiumIndex``,
+    python-binance ``futures_mark_price()`` without a symbol) or kept current
+    from ``markPriceUpdate`` stream events. Reads take an explicit staleness
+    bound; concurrent callers that find the table stale share one refresh.
+    """
+
+    def __init__(self, mark_max_age: float = None, funding_max_age: float = None):
+        self.mark_max_age = mark_max_age if mark_max_age is not None else config.MARK_PRICE_MAX_AGE_SECONDS
+        self.funding_max_age = funding_max_age if funding_max_age is not None else config.FUNDING_RATE_MAX_AGE_SECONDS
+        self.states: Dict[str, MarkState] = {}
+        self.last_refresh: float = 0.0
+        self._pending: Optional[asyncio.Future] = None
+        self.stats = {'hits': 0, 'refreshes': 0, 'shared_refreshes': 0}
+
+    def update(self, symbol: str, mark_price: float, index_price: float = None,
+               funding_rate: float = None, next_funding_time: int = None) -> MarkState:
+        """Record a mark price; fields left as None keep their previous value"""
+        state = self.states.get(symbol)
+        if state is None:
+            state = MarkState(symbol, float(mark_price))
+            self.states[symbol] = state
+        state.mark_price = float(mark_price)
+        if index_price is not None:
+            state.index_price = float(index_price)
+        now = time.monotonic()
+        if funding_rate is not None:
+            state.funding_rate = float(funding_rate)
+            state.funding_updated = now
+        if next_funding_time is not None:
+            state.next_funding_time = int(next_funding_time)
+        state.updated = now
+        return state
+
+    def apply_premium_index(self, rows: Iterable[Dict]) -> int:
+        """Load REST ``premiumIndex`` rows (exchange strings); returns the number applied"""
+        if isinstance(rows, dict):
+            rows = [rows]
+        applied = 0
+        for row in rows:
+            try:
+                self.update(row['symbol'], row['markPrice'], row.get('indexPrice'),
+                            row.get('lastFundingRate'), row.get('nextFundingTime'))
+                applied += 1
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug(f"Skipping premium index row {row}: {e}")
+        self.last_refresh = time.monotonic()
+        return applied
+
+    def apply_mark_price_event(self, event: Dict) -> Optional[MarkState]:
+        """Apply a ``markPriceUpdate`` stream event (``s``, ``p``, ``i``, ``r``, ``T``)"""
+        try:
+            return self.update(event['s'], event['p'], event.get('i'), event.get('r'), event.get('T'))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"Skipping mark price event {event}: {e}")
+            return None
+
+    def get(self, symbol: str, max_age: float = None) -> Optional[MarkState]:
+        """Cached state if it is fresh enough (defaults to the mark-price bound)"""
+        state = self.states.get(symbol)
+        max_age = self.mark_max_age if max_age is None else max_age
+        if state is None or state.age > max_age:
+            return None
+        return state
+
+    def funding_rate(self, symbol: str, max_age: float = None) -> Optional[float]:
+        """Cached funding rate if one was received within the funding bound"""
+        state = self.states.get(symbol)
+        max_age = self.funding_max_age if max_age is None else max_age
+        if state is None or state.funding_age > max_age:
+            return None
+        return state.funding_rate
+
+    def next_funding_time(self, symbols: Iterable[str] = None) -> Optional[datetime]:
+        """Nearest upcoming funding time over ``symbols`` (default: all cached)"""
+        states = self.states.values() if symbols is None else (self.states.get(s) for s in symbols)
+        times = [state.next_funding_time for state in states if state is not None and state.next_funding_time]
+        return datetime.fromtimestamp(min(times) / 1000) if times else None
+
+    async def refresh(self, fetch_all: Callable[[], Awaitable[List[Dict]]], max_age: float = None) -> int:
+        """Bulk refresh with ``fetch_all`` unless the table is younger than ``max_age``"""
+        max_age = self.mark_max_age if max_age is None else max_age
+        if self.states and time.monotonic() - self.last_refresh <= max_age:
+            self.stats['hits'] += 1
+            return 0
+
+        if self._pending is not None:
+            self.stats['shared_refreshes'] += 1
+            return await asyncio.shield(self._pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending = future
+        try:
+            self.stats['refreshes'] += 1
+            applied = self.apply_premium_index(await fetch_all())
+            future.set_result(applied)
+            return applied
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when no one else is waiting
+            raise
+        finally:
+            self._pending = None
+
+    async def get_or_refresh(self, symbol: str, fetch_all: Callable[[], Awaitable[List[Dict]]],
+                             max_age: float = None) -> Optional[MarkState]:
+        """Fresh state for ``symbol``, refreshing the whole table once if it is stale"""
+        state = self.get(symbol, max_age)
+        if state is not None:
+            self.stats['hits'] += 1
+            return state
+        await self.refresh(fetch_all, max_age=0.0)
+        return self.get(symbol, max_age)
+
+
+# Global instance
+market_state_cache = MarketStateCache()
@@ -0,0 +1,82 @@
+"""
+Compact per-symbol metric history
+Scanner metric snapshots kept as preallocated float32 columns on one int64 timestamp
+axis; dict and DataFrame views are built only when a caller asks for them
+"""
+import logging
+import time
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Volatility metrics recorded per scan (CandleSeries.metrics keys)
+METRIC_FIELDS = (
+    'atr', 'atr_percent', 'historical_vol', 'parkinson_vol', 'garman_klass_vol', 'yang_zhang_vol',
+    'vol_5min', 'vol_15min', 'vol_1h', 'vol_4h', 'vol_24h',
+    'price_change_5min', 'price_change_1h', 'price_change_24h', 'high_low_ratio',
+    'volume_spike_ratio', 'volume_volatility_correlation', 'current_price', 'current_volume'
+)
+
+
+class MetricHistory:
+    """Newest ``capacity`` metric snapshots of one symbol
+
+    Each snapshot is one row of a (capacity x fields) float32 ring; missing
+    fields are stored as NaN and unknown keys are ignored. Columns come back
+    oldest first.
+    """
+
+    def __init__(self, capacity: int = 288, fields: Sequence[str] = METRIC_FIELDS):
+        self.capacity = int(capacity)
+        self.fields = tuple(fields)
+        self._index = {name: i for i, name in enumerate(self.fields)}
+        self._timestamps = np.zeros(self.capacity, dtype=np.int64)  # Epoch milliseconds
+        self._values = np.full((self.capacity, len(self.fields)), np.nan, dtype=np.float32)
+        self._head = 0  # Next slot to write
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._timestamps.nbytes + self._values.nbytes
+
+    def append(self, metrics: Dict[str, float], timestamp: float = None):
+        """Record a snapshot taken at ``timestamp`` (epoch seconds, default now)"""
+        row = self._values[self._head]
+        row[:] = np.nan
+        for name, value in metrics.items():
+            i = self._index.get(name)
+            if i is not None:
+                row[i] = value
+        self._timestamps[self._head] = int((time.time() if timestamp is None else timestamp) * 1000)
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def _order(self) -> np.ndarray:
+        """Ring slots oldest first"""
+        start = (self._head - self._size) % self.capacity
+        return (start + np.arange(self._size)) % self.capacity
+
+    def column(self, name: str) -> np.ndarray:
+        return self._values[self._order(), self._index[name]]
+
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[self._order()]
+
+    def latest(self) -> Dict[str, float]:
+        if not self._size:
+            return {}
+        row = self._values[(self._head - 1) % self.capacity]
+        return {name: float(row[i]) for i, name in enumerate(self.fields)}
+
+    def frame(self) -> pd.DataFrame:
+        """Snapshots as a timestamp-indexed DataFrame (float64 copy)"""
+        order = self._order()
+        index = pd.to_datetime(self._timestamps[order], unit='ms')
+        return pd.DataFrame(self._values[order].astype(np.float64), columns=list(self.fields),
+                            index=pd.Index(index, name='timestamp'))
@@ -7,6 +7,7 @@ import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
+from dataclasses import dataclass, field
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingClassifier
 from sklearn.linear_model import LinearRegression, LogisticRegression
 from sklearn.preprocessing import StandardScaler
@@ -14,18 +15,49 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, mean_squared_error
 import joblib
 import os
+from .config.settings import config
+from .flat_forest import FlatForest
+from .online_models import OnlineModel, PageHinkley
+from .feature_store import (
+    FeatureStore, EXIT_FEATURES, REGIME_FEATURES, SIGNAL_FEATURES, exit_features, regime_features, signal_features, to_millis
+)
 
 logger = logging.getLogger(__name__)
 
+REGIME_LABELS = {'bull': 0, 'bear': 1, 'sideways': 2, 'volatile': 3}
+
+# Predictor attribute holding each model, by model (and scaler) name
+MODEL_ATTRIBUTES = {
+    'signal_strength': 'signal_strength_model',
+    'exit_timing': 'exit_timing_model',
+    'regime_classification': 'regime_classifier'
+}
+
+@dataclass
+class ModelBundle:
+    """A complete set of predictor models and scalers, installed together"""
+    signal_strength_model: Any = None
+    exit_timing_model: Any = None
+    regime_classifier: Any = None
+    scalers: Dict[str, Any] = field(default_factory=dict)
+    version: int = 0
+    trained_at: Optional[datetime] = None
+    training_samples: int = 0
+    holdout_errors: Dict[str, Optional[float]] = field(default_factory=dict)  # Per model, on held-out samples
+    results: Dict = field(default_factory=dict)
+
 class MLSignalPredictor:
     """Machine Learning system for signal prediction and optimization"""
     
-    def __init__(self):
+    def __init__(self, load_models: bool = True):
         # Model storage
         self.signal_strength_model = None
         self.exit_timing_model = None
         self.regime_classifier = None
         self.scalers = {}
+        self.compiled_models: Dict[str, FlatForest] = {}  # Flattened trees for fast inference
+        self.model_version = 0
+        self.retrainer = None  # Background retraining worker, attached by ModelRetrainer
         
         # Model parameters
         self.min_training_samples = 50
@@ -34,6 +66,17 @@ class MLSignalPredictor:
         
         # Training data storage
         self.training_data = []
+        self.feature_store = FeatureStore()  # Feature rows shared by inference and training
+        
+        # Online learning: updated on every labelled sample (served when ML_ONLINE_LEARNING is set)
+        self.online_models = {
+            'signal_strength': OnlineModel.regressor(warmup=self.min_training_samples),
+            'regime_classification': OnlineModel.classifier(list(REGIME_LABELS.values()),
+                                                            warmup=self.min_training_samples)
+        }
+        # Drift in the batch models' errors on new samples flags a rebuild
+        self.drift_detectors = {name: PageHinkley() for name in self.online_models}
+        self.drift_detected = {name: False for name in self.online_models}
         self.model_performance = {}
         
         # Feature engineering parameters
@@ -44,7 +87,8 @@ class MLSignalPredictor:
         os.makedirs(self.model_dir, exist_ok=True)
         
         # Load existing models if available
-        self._load_existing_models()
+        if load_models:
+            self._load_existing_models()
     
     async def predict_signal_strength(self, signal_data: Dict, market_data: Dict = None) -> Dict:
         """
@@ -57,54 +101,152 @@ class MLSignalPredictor:
         Returns:
             ML-enhanced signal prediction
         """
-        try:
-            if self.signal_strength_model is None:
-                logger.warning("Signal strength model not trained, using fallback")
-                return self._fallback_signal_prediction(signal_data)
-            
-            # Extract features from signal and market data
-            features = await self._extract_signal_features(signal_data, market_data)
-            
-            if not features:
-                return self._fallback_signal_prediction(signal_data)
+        return (await self.predict_signal_strengths([signal_data], market_data))[0]
+    
+    async def predict_signal_strengths(self, signals: List[Dict], market_data: Dict = None) -> List[Dict]:
+        """
+        Predict signal strength for a cycle's signals in one model call
+        
+        Args:
+            signals: Signals to score
+            market_data: Market context shared by the signals
             
-            # Scale features
-            feature_array = np.array(features).reshape(1, -1)
-            if 'signal_strength' in self.scalers:
-                feature_array = self.scalers['signal_strength'].transform(feature_array)
+        Returns:
+            ML-enhanced signal predictions, in the order of ``signals``
+        """
+        if not signals:
+            return []
+        
+        try:
+            # Extract features from signals and market data (recorded even without a model, for training)
+            features = self._signal_feature_matrix(signals, market_data)
             
-            # Predict signal strength
-            predicted_strength = self.signal_strength_model.predict(feature_array)[0]
-            predicted_strength = max(0.0, min(1.0, predicted_strength))  # Bound between 0-1
+            online = self._online_model('signal_strength')
+            if self.signal_strength_model is None and online is None:
+                logger.warning("Signal strength model not trained, using fallback")
+                return [self._fallback_signal_prediction(signal) for signal in signals]
             
-            # Get prediction confidence
-            if hasattr(self.signal_strength_model, 'predict_proba'):
-                confidence_scores = self.signal_strength_model.predict_proba(feature_array)[0]
-                confidence = max(confidence_scores) if len(confidence_scores) > 0 else 0.7
+            if online is not None:
+                predicted = np.clip(online.predict(features), 0.0, 1.0)
+                confidence = self._estimate_prediction_confidences(features)
+                model_type = f"online_{type(online.estimator).__name__}"
             else:
-                # For regression models, estimate confidence from feature quality
-                confidence = self._estimate_prediction_confidence(features)
-            
-            # Generate enhanced signal
-            enhanced_signal = {
-                'original_strength': signal_data.get('deviation', 0.0),
-                'ml_predicted_strength': predicted_strength,
-                'confidence': confidence,
-                'features_used': len(features),
-                'model_type': type(self.signal_strength_model).__name__,
-                'enhancement_factor': predicted_strength / max(0.01, signal_data.get('deviation', 0.01)),
-                'final_strength': (predicted_strength + signal_data.get('deviation', 0.0)) / 2,  # Average
-                'timestamp': datetime.now()
-            }
-            
-            logger.info(f"ML signal strength prediction: original={signal_data.get('deviation', 0):.3f}, "
-                       f"predicted={predicted_strength:.3f}, confidence={confidence:.3f}")
+                # Scale features
+                feature_array = features
+                if 'signal_strength' in self.scalers:
+                    feature_array = self.scalers['signal_strength'].transform(feature_array)
+                
+                # Predict signal strength, bounded between 0-1
+                predicted = np.clip(self._predict('signal_strength', self.signal_strength_model, feature_array), 0.0, 1.0)
+                
+                # Get prediction confidence
+                if hasattr(self.signal_strength_model, 'predict_proba'):
+                    confidence = self.signal_strength_model.predict_proba(feature_array).max(axis=1)
+                else:
+                    # For regression models, estimate confidence from feature quality
+                    confidence = self._estimate_prediction_confidences(features)
+                
+                model_type = type(self.signal_strength_model).__name__
+            now = datetime.now()
+            predictions = []
+            for signal, predicted_strength, row_confidence in zip(signals, predicted.tolist(), confidence.tolist()):
+                deviation = signal.get('deviation', 0.0)
+                predictions.append({
+                    'original_strength': deviation,
+                    'ml_predicted_strength': predicted_strength,
+                    'confidence': row_confidence,
+                    'features_used': features.shape[1],
+                    'model_type': model_type,
+                    'enhancement_factor': predicted_strength / max(0.01, signal.get('deviation', 0.01)),
+                    'final_strength': (predicted_strength + deviation) / 2,  # Average
+                    'timestamp': now
+                })
+            
+            if len(signals) == 1:
+                logger.info(f"ML signal strength prediction: original={signals[0].get('deviation', 0):.3f}, "
+                           f"predicted={predicted[0]:.3f}, confidence={confidence[0]:.3f}")
+            else:
+                logger.info(f"ML signal strength predictions for {len(signals)} signals: "
+                           f"mean predicted={predicted.mean():.3f}, mean confidence={confidence.mean():.3f}")
             
-            return enhanced_signal
+            return predictions
             
         except Exception as e:
             logger.error(f"Error in ML signal prediction: {e}")
-            return self._fallback_signal_prediction(signal_data)
+            return [self._fallback_signal_prediction(signal) for signal in signals]
+    
+    def _predict(self, name: str, model, feature_array: np.ndarray) -> np.ndarray:
+        """Model predictions, from the flattened trees when the model has been compiled"""
+        compiled = self.compiled_models.get(name)
+        if compiled is not None:
+            return compiled.predict(feature_array)
+        return model.predict(feature_array)
+    
+    def _compile_models(self):
+        """Flatten tree models for fast inference (ML_COMPILED_INFERENCE)"""
+        self.compiled_models = self._compiled_for(self.signal_strength_model)
+    
+    def _compiled_for(self, signal_strength_model) -> Dict[str, FlatForest]:
+        if not config.ML_COMPILED_INFERENCE or signal_strength_model is None:
+            return {}
+        compiled = FlatForest.from_model(signal_strength_model)
+        if compiled is None:
+            return {}
+        logger.info(f"Compiled signal strength model: {compiled.n_trees} trees, depth {compiled.max_depth}")
+        return {'signal_strength': compiled}
+    
+    def export_models(self) -> ModelBundle:
+        """The live models and scalers as a bundle"""
+        return ModelBundle(
+            signal_strength_model=self.signal_strength_model,
+            exit_timing_model=self.exit_timing_model,
+            regime_classifier=self.regime_classifier,
+            scalers=dict(self.scalers),
+            version=self.model_version
+        )
+    
+    def install_models(self, bundle: ModelBundle):
+        """Swap in a bundle's models and scalers together
+        
+        Everything is prepared before the first assignment and nothing here
+        awaits, so no prediction ever sees a new model with an old scaler.
+        """
+        compiled = self._compiled_for(bundle.signal_strength_model)
+        self.signal_strength_model = bundle.signal_strength_model
+        self.exit_timing_model = bundle.exit_timing_model
+        self.regime_classifier = bundle.regime_classifier
+        self.scalers = dict(bundle.scalers)
+        self.compiled_models = compiled
+        self.model_version = bundle.version
+        for name, detector in self.drift_detectors.items():
+            detector.reset()  # Errors of the previous model say nothing about this one
+            self.drift_detected[name] = False
+        logger.info(f"Installed ML model version {bundle.version}")
+    
+    def holdout_error(self, features: np.ndarray, targets: np.ndarray, name: str = 'signal_strength') -> Optional[float]:
+        """Error of a live model on held-out rows (None without model or data)
+        
+        Mean squared error for the signal strength and exit timing regressors,
+        misclassification rate (1 - accuracy) for the regime classifier.
+        """
+        model = getattr(self, MODEL_ATTRIBUTES[name])
+        if model is None or not len(features):
+            return None
+        try:
+            feature_array = np.asarray(features)
+            if name in self.scalers:
+                feature_array = self.scalers[name].transform(feature_array)
+            if name == 'regime_classification':
+                return float(np.mean(np.round(model.predict(feature_array)) != np.asarray(targets)))
+            predicted = self._predict(name, model, feature_array)
+            if name == 'signal_strength':
+                predicted = np.clip(predicted, 0.0, 1.0)
+            else:
+                predicted = np.clip(predicted, 30, 360)  # Exit minutes, bounded as predict_optimal_exit_timing serves them
+            return float(mean_squared_error(targets, predicted))
+        except ValueError as e:
+            logger.warning(f"Holdout evaluation of {name} failed: {e}")
+            return None
     
     async def predict_optimal_exit_timing(self, position_data: Dict, market_conditions: Dict = None) -> Dict:
         """
@@ -125,9 +267,6 @@ class MLSignalPredictor:
             # Extract features for exit timing prediction
             features = await self._extract_exit_features(position_data, market_conditions)
             
-            if not features:
-                return self._fallback_exit_timing(position_data)
-            
             # Scale features
             feature_array = np.array(features).reshape(1, -1)
             if 'exit_timing' in self.scalers:
@@ -173,24 +312,26 @@ class MLSignalPredictor:
             ML-classified market regime
         """
         try:
-            if self.regime_classifier is None:
+            online = self._online_model('regime_classification')
+            if self.regime_classifier is None and online is None:
                 logger.warning("Regime classifier not trained, using fallback")
                 return {'regime': 'unknown', 'confidence': 0.5}
             
             # Extract regime features
             features = await self._extract_regime_features(market_data)
             
-            if not features:
-                return {'regime': 'unknown', 'confidence': 0.5}
-            
-            # Scale features
-            feature_array = np.array(features).reshape(1, -1)
-            if 'regime_classification' in self.scalers:
-                feature_array = self.scalers['regime_classification'].transform(feature_array)
-            
-            # Classify regime
-            predicted_regime_idx = self.regime_classifier.predict(feature_array)[0]
-            regime_probs = self.regime_classifier.predict_proba(feature_array)[0]
+            if online is not None:
+                regime_probs = online.predict_proba(features)[0]
+                predicted_regime_idx = int(online.estimator.classes_[np.argmax(regime_probs)])
+            else:
+                # Scale features
+                feature_array = np.array(features).reshape(1, -1)
+                if 'regime_classification' in self.scalers:
+                    feature_array = self.scalers['regime_classification'].transform(feature_array)
+                
+                # Classify regime
+                predicted_regime_idx = self.regime_classifier.predict(feature_array)[0]
+                regime_probs = self.regime_classifier.predict_proba(feature_array)[0]
             
             # Map to regime names
             regime_names = ['bull', 'bear', 'sideways', 'volatile']
@@ -209,12 +350,13 @@ class MLSignalPredictor:
             logger.error(f"Error in ML regime classification: {e}")
             return {'regime': 'unknown', 'confidence': 0.5, 'error': str(e)}
     
-    async def train_models(self, historical_data: List[Dict]) -> Dict:
+    async def train_models(self, historical_data: List[Dict], save: bool = True) -> Dict:
         """
         Train ML models with historical data
         
         Args:
             historical_data: Historical trading and market data
+            save: Write the trained models to ``model_dir``
             
         Returns:
             Training results and performance metrics
@@ -227,36 +369,53 @@ class MLSignalPredictor:
             logger.info(f"Training ML models with {len(historical_data)} samples")
             
             # Prepare training data
-            signal_features, signal_targets = await self._prepare_signal_training_data(historical_data)
-            exit_features, exit_targets = await self._prepare_exit_training_data(historical_data)
-            regime_features, regime_targets = await self._prepare_regime_training_data(historical_data)
-            
-            results = {}
+            training_sets = {
+                'signal_strength': await self._prepare_signal_training_data(historical_data),
+                'exit_timing': await self._prepare_exit_training_data(historical_data),
+                'regime_classification': await self._prepare_regime_training_data(historical_data)
+            }
             
-            # Train signal strength model
-            if len(signal_features) >= self.min_training_samples:
-                signal_result = self._train_signal_strength_model(signal_features, signal_targets)
-                results['signal_strength'] = signal_result
+            return self.train_on_arrays(training_sets, save, samples=len(historical_data))
             
-            # Train exit timing model
-            if len(exit_features) >= self.min_training_samples:
-                exit_result = self._train_exit_timing_model(exit_features, exit_targets)
-                results['exit_timing'] = exit_result
+        except Exception as e:
+            logger.error(f"Error training ML models: {e}")
+            return {'status': 'error', 'error': str(e)}
+    
+    def train_on_arrays(self, training_sets: Dict[str, Tuple[np.ndarray, np.ndarray]], save: bool = True,
+                        samples: int = None) -> Dict:
+        """
+        Train ML models from feature matrices, e.g. the feature store's labelled rows
+        
+        Args:
+            training_sets: (features, targets) per model name; models with too few rows are skipped
+            save: Write the trained models to ``model_dir``
+            samples: Sample count to report (default: the largest set)
             
-            # Train regime classifier
-            if len(regime_features) >= self.min_training_samples:
-                regime_result = self._train_regime_classifier(regime_features, regime_targets)
-                results['regime_classification'] = regime_result
+        Returns:
+            Training results and performance metrics
+        """
+        try:
+            trainers = {
+                'signal_strength': self._train_signal_strength_model,
+                'exit_timing': self._train_exit_timing_model,
+                'regime_classification': self._train_regime_classifier
+            }
+            results = {}
+            for name, (features, targets) in training_sets.items():
+                if len(features) >= self.min_training_samples:
+                    results[name] = trainers[name](features, targets)
             
             # Save models
-            self._save_models()
+            if save:
+                self._save_models()
             
             logger.info(f"ML model training completed: {len(results)} models trained")
             
             return {
                 'status': 'success',
                 'models_trained': len(results),
-                'training_samples': len(historical_data),
+                'training_samples': samples if samples is not None else max(
+                    (len(features) for features, _ in training_sets.values()), default=0),
                 'results': results,
                 'timestamp': datetime.now()
             }
@@ -266,119 +425,42 @@ class MLSignalPredictor:
             return {'status': 'error', 'error': str(e)}
     
     async def _extract_signal_features(self, signal_data: Dict, market_data: Dict = None) -> List[float]:
-        """Extract features for signal strength prediction"""
+        """Extract features for signal strength prediction (``SIGNAL_FEATURES`` layout)"""
         try:
-            features = []
-            
-            # Basic signal features
-            features.extend([
-                signal_data.get('correlation', 0.0),
-                signal_data.get('deviation', 0.0),
-                abs(signal_data.get('correlation', 0.0)),  # Absolute correlation
-                signal_data.get('deviation', 0.0) ** 2,    # Squared deviation
-            ])
-            
-            # Market context features
-            if market_data:
-                features.extend([
-                    market_data.get('volatility', 0.03),
-                    market_data.get('volume_ratio', 1.0),
-                    market_data.get('price_change_1h', 0.0),
-                    market_data.get('price_change_4h', 0.0),
-                    market_data.get('price_change_24h', 0.0),
-                ])
-            
-            # Time-based features
-            now = datetime.now()
-            features.extend([
-                now.hour / 24.0,                    # Hour of day (normalized)
-                now.weekday() / 6.0,               # Day of week (normalized)
-                (now.timestamp() % 86400) / 86400  # Time within day
-            ])
-            
-            return features
-            
+            return signal_features(signal_data, market_data).tolist()
         except Exception as e:
             logger.error(f"Error extracting signal features: {e}")
             return []
     
+    def _signal_feature_matrix(self, signals: List[Dict], market_data: Dict = None) -> np.ndarray:
+        """Signal strength features for every signal as rows, recorded in the feature store
+        
+        Signals already in the store (same symbol and timestamp) reuse their
+        row, so a signal is labelled later with exactly the features it was
+        scored with.
+        """
+        table = self.feature_store['signal_strength']
+        # Each row is read before the next append, which may compact the table
+        rows = [table.row(self.feature_store.record_signal(signal, market_data)) for signal in signals]
+        return np.array(rows).reshape(len(rows), len(table.columns))
+    
     async def _extract_exit_features(self, position_data: Dict, market_conditions: Dict = None) -> List[float]:
-        """Extract features for exit timing prediction"""
+        """Extract features for exit timing prediction (``EXIT_FEATURES`` layout)"""
         try:
-            features = []
-            
-            # Position features
-            entry_time = position_data.get('entry_time')
-            if isinstance(entry_time, str):
-                entry_time = datetime.fromisoformat(entry_time.replace('T', ' '))
-            elif isinstance(entry_time, datetime):
-                entry_time = entry_time
-            else:
-                entry_time = datetime.now() - timedelta(hours=1)  # Default
-            
-            position_age_hours = (datetime.now() - entry_time).total_seconds() / 3600
-            
-            features.extend([
-                position_age_hours,
-                position_data.get('entry_price', 0.0),
-                position_data.get('current_profit_pct', 0.0),
-                abs(position_data.get('current_profit_pct', 0.0)),
-                position_data.get('leverage', 1.0),
-            ])
-            
-            # Market condition features
-            if market_conditions:
-                features.extend([
-                    market_conditions.get('volatility_regime_score', 0.5),
-                    market_conditions.get('trend_strength', 0.0),
-                    market_conditions.get('volume_trend', 1.0),
-                ])
-            
-            return features
-            
+            return exit_features(position_data, market_conditions).tolist()
         except Exception as e:
             logger.error(f"Error extracting exit features: {e}")
             return []
     
     async def _extract_regime_features(self, market_data: Dict) -> List[float]:
-        """Extract features for regime classification"""
+        """Extract features for regime classification (``REGIME_FEATURES`` layout)"""
         try:
-            features = []
-            
-            # Volatility features
-            features.extend([
-                market_data.get('daily_volatility', 0.03),
-                market_data.get('weekly_volatility', 0.05),
-                market_data.get('volatility_trend', 0.0),
-            ])
-            
-            # Price movement features
-            features.extend([
-                market_data.get('price_change_1d', 0.0),
-                market_data.get('price_change_7d', 0.0),
-                market_data.get('price_change_30d', 0.0),
-            ])
-            
-            # Technical indicators
-            features.extend([
-                market_data.get('rsi', 50.0) / 100.0,         # Normalized RSI
-                market_data.get('macd_signal', 0.0),
-                market_data.get('bollinger_position', 0.5),    # Position in Bollinger bands
-            ])
-            
-            # Volume features
-            features.extend([
-                market_data.get('volume_sma_ratio', 1.0),
-                market_data.get('volume_trend', 0.0),
-            ])
-            
-            return features
-            
+            return regime_features(market_data).tolist()
         except Exception as e:
             logger.error(f"Error extracting regime features: {e}")
             return []
     
-    def _train_signal_strength_model(self, features: List[List[float]], targets: List[float]) -> Dict:
+    def _train_signal_strength_model(self, features: np.ndarray, targets: np.ndarray) -> Dict:
         """Train signal strength prediction model"""
         try:
             X = np.array(features)
@@ -403,6 +485,7 @@ class MLSignalPredictor:
             # Store model and scaler
             self.signal_strength_model = model
             self.scalers['signal_strength'] = scaler
+            self._compile_models()
             
             return {
                 'model_type': 'RandomForestRegressor',
@@ -417,7 +500,7 @@ class MLSignalPredictor:
             logger.error(f"Error training signal strength model: {e}")
             return {'error': str(e)}
     
-    def _train_exit_timing_model(self, features: List[List[float]], targets: List[float]) -> Dict:
+    def _train_exit_timing_model(self, features: np.ndarray, targets: np.ndarray) -> Dict:
         """Train exit timing prediction model"""
         try:
             X = np.array(features)
@@ -461,7 +544,7 @@ class MLSignalPredictor:
             logger.error(f"Error training exit timing model: {e}")
             return {'error': str(e)}
     
-    def _train_regime_classifier(self, features: List[List[float]], targets: List[int]) -> Dict:
+    def _train_regime_classifier(self, features: np.ndarray, targets: np.ndarray) -> Dict:
         """Train regime classification model"""
         try:
             X = np.array(features)
@@ -500,60 +583,55 @@ class MLSignalPredictor:
             logger.error(f"Error training regime classifier: {e}")
             return {'error': str(e)}
     
-    async def _prepare_signal_training_data(self, historical_data: List[Dict]) -> Tuple[List[List[float]], List[float]]:
+    @staticmethod
+    def _signal_target(actual_performance: Dict) -> float:
+        """Trade profit normalized to 0-1"""
+        performance = actual_performance.get('profit_pct', 0.0)
+        return min(1.0, max(0.0, (performance + 0.05) / 0.1))
+    
+    @staticmethod
+    def _exit_target(exit_data: Dict) -> float:
+        """Actual exit time in minutes, bounded to 30min-6hr"""
+        return min(360, max(30, exit_data.get('duration_minutes', 120)))
+    
+    async def _prepare_signal_training_data(self, historical_data: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
         """Prepare training data for signal strength model"""
         features = []
         targets = []
         
         for record in historical_data:
             if 'signal_data' in record and 'actual_performance' in record:
-                signal_features = await self._extract_signal_features(
-                    record['signal_data'], 
-                    record.get('market_data')
-                )
-                if signal_features:
-                    features.append(signal_features)
-                    # Target is actual performance (normalized)
-                    performance = record['actual_performance'].get('profit_pct', 0.0)
-                    targets.append(min(1.0, max(0.0, (performance + 0.05) / 0.1)))  # Normalize to 0-1
+                signal = record['signal_data']
+                timestamp = signal.get('timestamp', record.get('timestamp'))
+                features.append(signal_features(signal, record.get('market_data'), to_millis(timestamp)))
+                targets.append(self._signal_target(record['actual_performance']))
         
-        return features, targets
+        return np.array(features).reshape(-1, len(SIGNAL_FEATURES)), np.array(targets)
     
-    async def _prepare_exit_training_data(self, historical_data: List[Dict]) -> Tuple[List[List[float]], List[float]]:
+    async def _prepare_exit_training_data(self, historical_data: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
         """Prepare training data for exit timing model"""
         features = []
         targets = []
         
         for record in historical_data:
             if 'position_data' in record and 'exit_data' in record:
-                exit_features = await self._extract_exit_features(
-                    record['position_data'],
-                    record.get('market_conditions')
-                )
-                if exit_features:
-                    features.append(exit_features)
-                    # Target is actual exit time in minutes
-                    exit_minutes = record['exit_data'].get('duration_minutes', 120)
-                    targets.append(min(360, max(30, exit_minutes)))  # Bound to 30min-6hr
+                features.append(exit_features(record['position_data'], record.get('market_conditions'),
+                                              to_millis(record.get('timestamp'))))
+                targets.append(self._exit_target(record['exit_data']))
         
-        return features, targets
+        return np.array(features).reshape(-1, len(EXIT_FEATURES)), np.array(targets)
     
-    async def _prepare_regime_training_data(self, historical_data: List[Dict]) -> Tuple[List[List[float]], List[int]]:
+    async def _prepare_regime_training_data(self, historical_data: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
         """Prepare training data for regime classifier"""
         features = []
         targets = []
         
-        regime_mapping = {'bull': 0, 'bear': 1, 'sideways': 2, 'volatile': 3}
-        
         for record in historical_data:
             if 'market_data' in record and 'regime_label' in record:
-                regime_features = await self._extract_regime_features(record['market_data'])
-                if regime_features:
-                    features.append(regime_features)
-                    regime_label = record['regime_label']
-                    targets.append(regime_mapping.get(regime_label, 2))  # Default to sideways
+                features.append(regime_features(record['market_data']))
+                targets.append(REGIME_LABELS.get(record['regime_label'], 2))  # Default to sideways
         
-        return features, targets
+        return np.array(features).reshape(-1, len(REGIME_FEATURES)), np.array(targets, dtype=int)
     
     def _fallback_signal_prediction(self, signal_data: Dict) -> Dict:
         """Fallback signal prediction when ML model unavailable"""
@@ -591,6 +669,12 @@ class MLSignalPredictor:
         
         return max(0.3, min(0.9, (feature_count_factor + feature_quality_factor) / 2))
     
+    def _estimate_prediction_confidences(self, features: np.ndarray) -> np.ndarray:
+        """Row-wise ``_estimate_prediction_confidence``"""
+        feature_count_factor = min(1.0, features.shape[1] / 10.0)
+        feature_quality_factor = 1.0 - features.std(axis=1) / (np.abs(features).mean(axis=1) + 0.01)
+        return np.clip((feature_count_factor + feature_quality_factor) / 2, 0.3, 0.9)
+    
     def _calculate_position_age(self, position_data: Dict) -> float:
         """Calculate position age in hours"""
         try:
@@ -687,6 +771,19 @@ class MLSignalPredictor:
             if os.path.exists(scalers_path):
                 self.scalers = joblib.load(scalers_path)
             
+            # Models fitted on an older feature layout cannot score feature store rows
+            for name, attr, width in (('signal_strength', 'signal_strength_model', len(SIGNAL_FEATURES)),
+                                      ('exit_timing', 'exit_timing_model', len(EXIT_FEATURES)),
+                                      ('regime_classification', 'regime_classifier', len(REGIME_FEATURES))):
+                model = getattr(self, attr)
+                if model is not None and getattr(model, 'n_features_in_', width) != width:
+                    logger.warning(f"Discarding {name} model fitted on {model.n_features_in_} features "
+                                   f"(expected {width}); it will be retrained")
+                    setattr(self, attr, None)
+                    self.scalers.pop(name, None)
+            
+            self._compile_models()
+            
             models_loaded = sum([
                 self.signal_strength_model is not None,
                 self.exit_timing_model is not None,
@@ -702,19 +799,64 @@ class MLSignalPredictor:
     def add_training_sample(self, sample_data: Dict):
         """Add new training sample for model retraining"""
         try:
-            self.training_data.append({
-                'timestamp': datetime.now(),
-                **sample_data
-            })
+            sample = {'timestamp': datetime.now(), **sample_data}
+            self.training_data.append(sample)
+            self._label_feature_rows(sample)
             
             # Check if retraining is needed
-            if len(self.training_data) >= self.retrain_threshold:
-                logger.info(f"Triggering model retraining with {len(self.training_data)} samples")
-                # In a production system, this would trigger async retraining
+            if self.retrainer is not None:
+                self.retrainer.request_retrain()
+            elif len(self.training_data) >= self.retrain_threshold:
+                logger.info(f"Retraining due with {len(self.training_data)} samples, but no retrainer is attached")
                 
         except Exception as e:
             logger.error(f"Error adding training sample: {e}")
     
+    def _label_feature_rows(self, sample: Dict):
+        """Record a sample's outcomes as targets of its feature store rows"""
+        if 'signal_data' in sample and 'actual_performance' in sample:
+            target = self._signal_target(sample['actual_performance'])
+            index = self.feature_store.record_signal(sample['signal_data'], sample.get('market_data'), target=target)
+            self._learn_online('signal_strength', index, target)
+        if 'position_data' in sample and 'exit_data' in sample:
+            self.feature_store.record_exit(sample['position_data'], sample.get('market_conditions'),
+                                           target=self._exit_target(sample['exit_data']),
+                                           timestamp=sample['timestamp'])
+        if 'market_data' in sample and 'regime_label' in sample:
+            target = REGIME_LABELS.get(sample['regime_label'], 2)
+            index = self.feature_store.record_regime(sample['market_data'], target=target,
+                                                     timestamp=sample['timestamp'])
+            self._learn_online('regime_classification', index, target)
+    
+    def _online_model(self, name: str) -> Optional[OnlineModel]:
+        """The online model to serve ``name`` from, if online learning is on and it has warmed up"""
+        model = self.online_models.get(name)
+        return model if config.ML_ONLINE_LEARNING and model is not None and model.ready else None
+    
+    def _batch_prediction(self, name: str, row: np.ndarray) -> Optional[float]:
+        """The live batch model's prediction for one feature row (None without a model)"""
+        feature_array = row.reshape(1, -1)
+        if name in self.scalers:
+            feature_array = self.scalers[name].transform(feature_array)
+        if name == 'signal_strength' and self.signal_strength_model is not None:
+            return float(np.clip(self._predict(name, self.signal_strength_model, feature_array), 0.0, 1.0)[0])
+        if name == 'regime_classification' and self.regime_classifier is not None:
+            return float(round(self.regime_classifier.predict(feature_array)[0]))
+        return None
+    
+    def _learn_online(self, name: str, index: int, target: float):
+        """Update the online model with a labelled row and watch the batch model for drift"""
+        row = self.feature_store[name].row(index)
+        predicted = self._batch_prediction(name, row)
+        if predicted is not None:
+            error = float(predicted != target) if name == 'regime_classification' else abs(predicted - target)
+            if self.drift_detectors[name].update(error):
+                self.drift_detected[name] = True
+                logger.warning(f"Drift detected in {name} model errors, requesting a rebuild")
+                if self.retrainer is not None:
+                    self.retrainer.request_retrain(force=True)
+        self.online_models[name].update(row, target)
+    
     def get_model_status(self) -> Dict:
         """Get current model status and performance"""
         return {
@@ -722,7 +864,16 @@ class MLSignalPredictor:
             'exit_timing_model': self.exit_timing_model is not None,
             'regime_classifier': self.regime_classifier is not None,
             'scalers_loaded': len(self.scalers),
+            'compiled_models': list(self.compiled_models),
+            'model_version': self.model_version,
+            'retraining': self.retrainer.get_status() if self.retrainer is not None else None,
             'training_samples': len(self.training_data),
+            'labeled_features': {name: table.labeled_count for name, table in self.feature_store.tables.items()},
+            'online_learning': {
+                'serving': config.ML_ONLINE_LEARNING,
+                **{name: {'updates': model.updates, 'ready': model.ready} for name, model in self.online_models.items()}
+            },
+            'drift_detected': dict(self.drift_detected),
             'model_performance': self.model_performance,
             'retrain_threshold': self.retrain_threshold
         }
@@ -0,0 +1,210 @@
+"""
+Background ML model retraining
+Trains candidate models on a snapshot of the predictor's labelled feature store rows in
+a worker process, checks each against its held-out rows and swaps those that pass into
+the live predictor, keeping earlier versions for rollback
+"""
+import asyncio
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .ml_signal_predictor import MODEL_ATTRIBUTES, MLSignalPredictor, ModelBundle, ml_signal_predictor
+
+logger = logging.getLogger(__name__)
+
+TrainingSets = Dict[str, Tuple[np.ndarray, np.ndarray]]
+
+
+def train_candidate(training: TrainingSets, holdout: TrainingSets, version: int) -> Optional[ModelBundle]:
+    """Worker-process entry point: fit a fresh predictor and score each model it trained on ``holdout``"""
+    predictor = MLSignalPredictor(load_models=False)
+    result = predictor.train_on_arrays(training, save=False)
+    if result.get('status') != 'success' or not result.get('models_trained'):
+        logger.warning(f"Candidate training produced no models: {result}")
+        return None
+
+    bundle = predictor.export_models()
+    bundle.version = version
+    bundle.trained_at = datetime.now()
+    bundle.training_samples = result['training_samples']
+    bundle.holdout_errors = {
+        name: predictor.holdout_error(*holdout[name], name=name)
+        for name, attr in MODEL_ATTRIBUTES.items() if name in holdout and getattr(bundle, attr) is not None
+    }
+    bundle.results = result.get('results', {})
+    return bundle
+
+
+class ModelRetrainer:
+    """Retrains the predictor's models without pausing the trading loop
+
+    ``request_retrain`` (called as samples arrive) starts a retrain once
+    ``retrain_threshold`` new labelled feature rows have accumulated.
+    Fitting runs in a separate process on a snapshot of the feature store;
+    the newest ``holdout_fraction`` of each model's rows is held out. Each
+    candidate model replaces the live one only if its error on its own holdout
+    is no worse than the live model's by more than ``tolerance``; the others
+    keep the live model. Installed versions are kept for ``rollback``.
+    """
+
+    def __init__(self, predictor: MLSignalPredictor, holdout_fraction: float = 0.2,
+                 tolerance: float = 0.05, max_versions: int = 5, executor: Executor = None):
+        self.predictor = predictor
+        self.holdout_fraction = holdout_fraction
+        self.tolerance = tolerance
+        self.versions: deque = deque(maxlen=max_versions)  # Installed bundles, newest last
+        self._executor = executor
+        self._task: Optional[asyncio.Task] = None
+        self.trained_through = 0  # Labelled rows in the last snapshot
+        self.next_version = predictor.model_version + 1
+        self.stats = {'retrains': 0, 'accepted': 0, 'rejected': 0, 'failed': 0, 'rollbacks': 0, 'models_kept_live': 0}
+        predictor.retrainer = self
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            # Spawned, so the worker does not inherit the event loop or open sockets
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def _labeled_rows(self) -> int:
+        """Rows ever labelled; keeps counting once the feature tables start evicting"""
+        return sum(table.labeled_total for table in self.predictor.feature_store.tables.values())
+
+    def request_retrain(self, force: bool = False) -> bool:
+        """Start a background retrain if enough new samples arrived and none is running
+
+        ``force`` (drift detected) starts one as soon as any new sample arrived.
+        """
+        labeled = self._labeled_rows()
+        needed = 1 if force else self.predictor.retrain_threshold
+        if self.running or labeled - self.trained_through < needed:
+            return False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.debug("No running event loop, retrain deferred")
+            return False
+        logger.info(f"Starting background model retraining with {labeled} labelled rows")
+        self._task = loop.create_task(self.retrain())
+        return True
+
+    async def retrain(self) -> Optional[ModelBundle]:
+        """Train, validate and install a candidate; returns it if it was installed"""
+        training, holdout = {}, {}
+        self.trained_through = self._labeled_rows()
+        for name, (features, targets, _) in self.predictor.feature_store.training_sets().items():
+            # Rows come oldest first, so the holdout is the most recent stretch
+            split = int(len(features) * (1 - self.holdout_fraction))
+            training[name] = (features[:split], targets[:split])
+            holdout[name] = (features[split:], targets[split:])
+        version = self.next_version
+        self.next_version += 1
+        self.stats['retrains'] += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            candidate = await loop.run_in_executor(self._pool(), train_candidate, training, holdout, version)
+        except Exception as e:
+            self.stats['failed'] += 1
+            logger.error(f"Model retraining failed: {e}")
+            return None
+        if candidate is None:
+            self.stats['failed'] += 1
+            return None
+
+        kept_live = self._screen(candidate, holdout)
+        if not any(getattr(candidate, attr) is not None for attr in MODEL_ATTRIBUTES.values()):
+            self.stats['rejected'] += 1
+            logger.warning(f"Rejected model version {version}: no model passed its holdout")
+            return None
+        if kept_live:
+            self.stats['models_kept_live'] += len(kept_live)
+            logger.info(f"Model version {version} keeps the live {', '.join(kept_live)} model(s)")
+
+        self.install(candidate)
+        self.stats['accepted'] += 1
+        await loop.run_in_executor(None, self.predictor._save_models)
+        return candidate
+
+    def _screen(self, candidate: ModelBundle, holdout: TrainingSets) -> List[str]:
+        """Drop the candidate's models that fail their holdout, so ``install`` keeps the live ones
+
+        Returns the names of the dropped models.
+        """
+        dropped = []
+        for name, attr in MODEL_ATTRIBUTES.items():
+            if getattr(candidate, attr) is None:
+                continue
+            live_error = self.predictor.holdout_error(*holdout[name], name=name) if name in holdout else None
+            candidate_error = candidate.holdout_errors.get(name)
+            if self._accept(candidate_error, live_error):
+                continue
+            logger.warning(f"Candidate {name} model failed its holdout: error {candidate_error} vs live {live_error}")
+            setattr(candidate, attr, None)
+            candidate.scalers.pop(name, None)
+            dropped.append(name)
+        return dropped
+
+    def _accept(self, candidate_error: Optional[float], live_error: Optional[float]) -> bool:
+        if live_error is None:
+            return True  # Nothing live to compare with
+        if candidate_error is None:
+            return False
+        return candidate_error <= live_error * (1 + self.tolerance)
+
+    def install(self, bundle: ModelBundle):
+        """Hot-swap a bundle into the predictor; models it lacks are kept from the live set"""
+        live = self.predictor.export_models()
+        if not self.versions:
+            self.versions.append(live)  # So the first swap can be rolled back
+        for name in ('signal_strength_model', 'exit_timing_model', 'regime_classifier'):
+            if getattr(bundle, name) is None:
+                setattr(bundle, name, getattr(live, name))
+        bundle.scalers = {**live.scalers, **bundle.scalers}
+        self.predictor.install_models(bundle)
+        self.versions.append(bundle)
+
+    def rollback(self) -> bool:
+        """Reinstall the previous version; False if there is none"""
+        if len(self.versions) < 2:
+            return False
+        discarded = self.versions.pop()
+        self.predictor.install_models(self.versions[-1])
+        self.predictor._save_models()
+        self.stats['rollbacks'] += 1
+        logger.warning(f"Rolled back ML models from version {discarded.version} to {self.versions[-1].version}")
+        return True
+
+    async def shutdown(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_status(self) -> Dict:
+        return {
+            'running': self.running,
+            'live_version': self.predictor.model_version,
+            'versions': [bundle.version for bundle in self.versions],
+            'trained_through': self.trained_through,
+            **self.stats
+        }
+
+
+# Global instance
+model_retrainer = ModelRetrainer(ml_signal_predictor)
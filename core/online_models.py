@@ -0,0 +1,129 @@
+"""
+Online learning models and drift detection
+Incrementally updated estimators that learn from each closed trade in O(features) time,
+and a Page-Hinkley test that flags when a batch model's errors have drifted upward
+"""
+import logging
+from typing import Optional, Sequence
+
+import numpy as np
+from sklearn.linear_model import SGDClassifier, SGDRegressor
+
+logger = logging.getLogger(__name__)
+
+
+class PageHinkley:
+    """Page-Hinkley test for a sustained increase in the mean of a stream
+
+    Tracks the cumulative deviation of each value from the running mean
+    (less ``delta``, the change tolerated as noise); drift is signalled when
+    it rises more than ``threshold`` above its minimum. The test resets after
+    signalling.
+    """
+
+    def __init__(self, delta: float = 0.01, threshold: float = 1.0, min_samples: int = 30):
+        self.delta = delta
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.drifts = 0
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.cumulative = 0.0
+        self.minimum = 0.0
+
+    def update(self, value: float) -> bool:
+        """Add a value; True if it completes a drift"""
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        self.cumulative += value - self.mean - self.delta
+        self.minimum = min(self.minimum, self.cumulative)
+        if self.count >= self.min_samples and self.cumulative - self.minimum > self.threshold:
+            self.drifts += 1
+            self.reset()
+            return True
+        return False
+
+
+class RunningScaler:
+    """Feature standardization from running means and variances (Welford), O(features) per row"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self._m2 = None
+
+    def partial_fit(self, row: np.ndarray):
+        if self.mean is None:
+            self.mean = np.zeros(row.shape[-1])
+            self._m2 = np.zeros(row.shape[-1])
+        self.count += 1
+        delta = row - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (row - self.mean)
+
+    @property
+    def scale(self) -> np.ndarray:
+        std = np.sqrt(self._m2 / self.count)
+        return np.where(std > 0, std, 1.0)
+
+    def transform(self, features: np.ndarray) -> np.ndarray:
+        return (features - self.mean) / self.scale
+
+
+class OnlineModel:
+    """An SGD estimator and running feature scaler updated one sample at a time
+
+    ``update`` scores the sample before learning from it, so the returned
+    error is an honest out-of-sample (prequential) error. Predictions are
+    only served once ``warmup`` samples have been seen.
+    """
+
+    def __init__(self, estimator, classes: Sequence[int] = None, warmup: int = 50):
+        self.estimator = estimator
+        self.classes = np.asarray(classes) if classes is not None else None
+        self.warmup = warmup
+        self.scaler = RunningScaler()
+        self.updates = 0
+
+    @classmethod
+    def regressor(cls, warmup: int = 50) -> 'OnlineModel':
+        return cls(SGDRegressor(learning_rate='invscaling', eta0=0.01, alpha=1e-4, random_state=42),
+                   warmup=warmup)
+
+    @classmethod
+    def classifier(cls, classes: Sequence[int], warmup: int = 50) -> 'OnlineModel':
+        return cls(SGDClassifier(loss='log_loss', alpha=1e-4, random_state=42), classes=classes, warmup=warmup)
+
+    @property
+    def is_classifier(self) -> bool:
+        return self.classes is not None
+
+    @property
+    def ready(self) -> bool:
+        return self.updates >= self.warmup
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return self.estimator.predict(self.scaler.transform(np.atleast_2d(features)))
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        return self.estimator.predict_proba(self.scaler.transform(np.atleast_2d(features)))
+
+    def update(self, features: np.ndarray, target: float) -> Optional[float]:
+        """Learn from one sample; returns the error on it before learning (None for the first)"""
+        row = np.asarray(features, dtype=np.float64)
+        error = None
+        if self.updates:
+            predicted = self.predict(row)[0]
+            error = float(predicted != target) if self.is_classifier else abs(float(predicted) - target)
+
+        self.scaler.partial_fit(row)
+        scaled = self.scaler.transform(row).reshape(1, -1)
+        if self.is_classifier:
+            self.estimator.partial_fit(scaled, [int(target)], classes=self.classes)
+        else:
+            self.estimator.partial_fit(scaled, [float(target)])
+        self.updates += 1
+        return error
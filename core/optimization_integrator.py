@@ -12,6 +12,7 @@ from .market_regime_detector import market_regime_detector
 from .advanced_risk_manager import advanced_risk_manager
 from .correlation_pair_expander import correlation_pair_expander
 from .ml_signal_predictor import ml_signal_predictor
+from .model_retrainer import model_retrainer  # Attaches background retraining to ml_signal_predictor
 from .enhanced_correlation_engine import get_enhanced_correlation_engine
 from .config.settings import config
 
@@ -33,7 +34,7 @@ class OptimizationIntegrator:
         }
         
     async def generate_enhanced_signal(self, base_signal: Dict, symbols: List[str],
-                                     exchange = None) -> Dict:
+                                     exchange = None, ml_result: Dict = None) -> Dict:
         """
         Generate enhanced trading signal using all optimization systems
         
@@ -41,6 +42,7 @@ class OptimizationIntegrator:
             base_signal: Original correlation breakdown signal
             symbols: List of symbols for analysis
             exchange: Exchange interface
+            ml_result: ML prediction already made for this signal (see ``predict_ml_batch``)
             
         Returns:
             Enhanced signal with optimization improvements
@@ -58,7 +60,7 @@ class OptimizationIntegrator:
                 self._run_multi_timeframe_analysis(base_signal, exchange),
                 self._run_market_regime_analysis(symbols, exchange),
                 self._run_correlation_pair_analysis(symbols, exchange),
-                self._run_ml_signal_prediction(base_signal),
+                self._run_ml_signal_prediction(base_signal, ml_result),
                 return_exceptions=True
             )
             
@@ -207,8 +209,11 @@ class OptimizationIntegrator:
             logger.error(f"Error in correlation pair analysis: {e}")
             return {}
     
-    async def _run_ml_signal_prediction(self, signal: Dict) -> Dict:
+    async def _run_ml_signal_prediction(self, signal: Dict, ml_result: Dict = None) -> Dict:
         """Run ML signal prediction"""
+        if ml_result is not None:
+            return ml_result
+        
         try:
             ml_result = await ml_signal_predictor.predict_signal_strength(signal, {})
             return ml_result
@@ -217,6 +222,18 @@ class OptimizationIntegrator:
             logger.error(f"Error in ML signal prediction: {e}")
             return {}
     
+    async def predict_ml_batch(self, signals: List[Dict]) -> List[Dict]:
+        """ML predictions for a cycle's signals in one model call, in the order of ``signals``"""
+        if not self.optimization_active:
+            return [None] * len(signals)
+        
+        try:
+            return await ml_signal_predictor.predict_signal_strengths(signals, {})
+            
+        except Exception as e:
+            logger.error(f"Error in batched ML signal prediction: {e}")
+            return [None] * len(signals)
+    
     def _combine_signal_enhancements(self, base_signal: Dict, enhanced_corr_result: Dict, 
                                    multi_tf_result: Dict, regime_result: Dict, 
                                    correlation_result: Dict, ml_result: Dict) -> Dict:
@@ -0,0 +1,197 @@
+"""
+Shared order book depth cache
+One locally maintained book per symbol with cumulative depth for O(log levels) fill-cost queries
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from .config.settings import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FillEstimate:
+    """Cost of taking ``quantity`` from one side of the book"""
+    quantity: float
+    filled: float
+    average_price: float
+    mid_price: float
+    slippage_bps: float
+    levels_used: int
+
+    @property
+    def complete(self) -> bool:
+        return self.filled >= self.quantity
+
+
+@dataclass
+class DepthBook:
+    """Sorted price levels with cumulative quantity and notional per side"""
+    symbol: str
+    bid_prices: np.ndarray
+    bid_sizes: np.ndarray
+    ask_prices: np.ndarray
+    ask_sizes: np.ndarray
+    updated: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self):
+        self.bid_cum_qty = np.cumsum(self.bid_sizes)
+        self.bid_cum_notional = np.cumsum(self.bid_sizes * self.bid_prices)
+        self.ask_cum_qty = np.cumsum(self.ask_sizes)
+        self.ask_cum_notional = np.cumsum(self.ask_sizes * self.ask_prices)
+
+    @classmethod
+    def from_levels(cls, symbol: str, bids: Sequence, asks: Sequence, depth: int = None) -> 'DepthBook':
+        """Build from [[price, size], ...] levels (floats or exchange strings)"""
+        bid_levels = _levels(bids, descending=True, depth=depth)
+        ask_levels = _levels(asks, descending=False, depth=depth)
+        return cls(symbol, bid_levels[:, 0], bid_levels[:, 1], ask_levels[:, 0], ask_levels[:, 1])
+
+    @property
+    def best_bid(self) -> float:
+        return float(self.bid_prices[0]) if len(self.bid_prices) else 0.0
+
+    @property
+    def best_ask(self) -> float:
+        return float(self.ask_prices[0]) if len(self.ask_prices) else 0.0
+
+    @property
+    def mid(self) -> float:
+        return (self.best_bid + self.best_ask) / 2
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.updated
+
+    def depth(self, levels: int = 5) -> tuple:
+        """Cumulative (bid, ask) size over the top ``levels``"""
+        bid = float(self.bid_cum_qty[min(levels, len(self.bid_cum_qty)) - 1]) if len(self.bid_cum_qty) else 0.0
+        ask = float(self.ask_cum_qty[min(levels, len(self.ask_cum_qty)) - 1]) if len(self.ask_cum_qty) else 0.0
+        return bid, ask
+
+    def cost_to_fill(self, quantity: float, side: str) -> FillEstimate:
+        """Average price and slippage vs mid of a market order; ``side`` is buy/sell
+
+        Binary search over cumulative depth, so the cost is O(log levels). If
+        the book is too thin the estimate covers the visible depth only.
+        """
+        quantity = abs(quantity)
+        taking_asks = side.lower() in ('buy', 'long')
+        prices = self.ask_prices if taking_asks else self.bid_prices
+        cum_qty = self.ask_cum_qty if taking_asks else self.bid_cum_qty
+        cum_notional = self.ask_cum_notional if taking_asks else self.bid_cum_notional
+        mid = self.mid
+        if quantity <= 0 or not len(prices) or mid <= 0:
+            return FillEstimate(quantity, 0.0, mid, mid, 0.0, 0)
+
+        level = int(np.searchsorted(cum_qty, quantity, side='left'))
+        if level >= len(prices):
+            filled, notional, level = float(cum_qty[-1]), float(cum_notional[-1]), len(prices) - 1
+        else:
+            before_qty = cum_qty[level - 1] if level else 0.0
+            before_notional = cum_notional[level - 1] if level else 0.0
+            filled = quantity
+            notional = float(before_notional + (quantity - before_qty) * prices[level])
+
+        average = notional / filled
+        slippage_bps = abs(average - mid) / mid * 10000
+        return FillEstimate(quantity, filled, average, mid, slippage_bps, level + 1)
+
+
+class OrderBookCache:
+    """Per-symbol depth books shared by risk and signal code
+
+    Books are replaced from REST snapshots (``update``/``get_or_fetch``) or
+    maintained from depth-stream diffs (``apply_diff``). Concurrent callers that
+    find a stale book share a single fetch.
+    """
+
+    def __init__(self, max_age_seconds: float = None, depth: int = None):
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else config.ORDER_BOOK_MAX_AGE_SECONDS
+        self.depth = depth or config.ORDER_BOOK_DEPTH
+        self.books: Dict[str, DepthBook] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.stats = {'hits': 0, 'fetches': 0, 'shared_fetches': 0}
+
+    def update(self, symbol: str, bids: Sequence, asks: Sequence) -> DepthBook:
+        """Replace a symbol's book from a full snapshot"""
+        book = DepthBook.from_levels(symbol, bids, asks, self.depth)
+        self.books[symbol] = book
+        return book
+
+    def apply_diff(self, symbol: str, bids: Sequence, asks: Sequence) -> Optional[DepthBook]:
+        """Apply depth-stream updates: each level's size replaces the old one, zero removes it"""
+        book = self.books.get(symbol)
+        if book is None:
+            return None
+        merged_bids = _merge(book.bid_prices, book.bid_sizes, bids)
+        merged_asks = _merge(book.ask_prices, book.ask_sizes, asks)
+        return self.update(symbol, merged_bids, merged_asks)
+
+    def get(self, symbol: str, max_age: float = None) -> Optional[DepthBook]:
+        """Cached book if it is fresh enough"""
+        book = self.books.get(symbol)
+        max_age = self.max_age_seconds if max_age is None else max_age
+        if book is None or book.age > max_age:
+            return None
+        return book
+
+    async def get_or_fetch(self, symbol: str, fetch_book: Callable[[], Awaitable[Dict]],
+                           max_age: float = None) -> DepthBook:
+        """Fresh cached book, or one fetched with ``fetch_book`` (a ccxt-style snapshot)"""
+        book = self.get(symbol, max_age)
+        if book is not None:
+            self.stats['hits'] += 1
+            return book
+
+        pending = self._pending.get(symbol)
+        if pending is not None:
+            self.stats['shared_fetches'] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[symbol] = future
+        try:
+            self.stats['fetches'] += 1
+            snapshot = await fetch_book()
+            book = self.update(symbol, snapshot['bids'], snapshot['asks'])
+            future.set_result(book)
+            return book
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when no one else is waiting
+            raise
+        finally:
+            self._pending.pop(symbol, None)
+
+    def estimate_slippage(self, symbol: str, quantity: float, side: str = 'buy') -> Optional[float]:
+        """Slippage in bps vs mid for a market order, or None without a fresh book"""
+        book = self.get(symbol)
+        if book is None:
+            return None
+        return book.cost_to_fill(quantity, side).slippage_bps
+
+
+def _levels(levels: Sequence, descending: bool, depth: int = None) -> np.ndarray:
+    array = np.asarray(levels, dtype=float).reshape(-1, 2) if len(levels) else np.zeros((0, 2))
+    array = array[array[:, 1] > 0]
+    order = np.argsort(-array[:, 0] if descending else array[:, 0], kind='stable')
+    array = array[order]
+    return array[:depth] if depth else array
+
+
+def _merge(prices: np.ndarray, sizes: np.ndarray, updates: Sequence) -> np.ndarray:
+    levels = dict(zip(prices.tolist(), sizes.tolist()))
+    for price, size in np.asarray(updates, dtype=float).reshape(-1, 2):
+        levels[price] = size
+    return np.array([[p, s] for p, s in levels.items() if s > 0]).reshape(-1, 2)
+
+
+# Global instance
+order_book_cache = OrderBookCache()
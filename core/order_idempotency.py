@@ -0,0 +1,92 @@
+"""
+Idempotent order submission helpers
+Deterministic client order ids, exchange lookups by client id and jittered retry delays
+"""
+import asyncio
+import hashlib
+import logging
+import random
+from typing import Dict, Optional
+
+import ccxt.async_support as ccxt
+
+from .config.settings import config
+
+logger = logging.getLogger(__name__)
+
+# Binance accepts client order ids matching ^[.A-Z:/a-z0-9_-]{1,36}$
+CLIENT_ORDER_ID_PREFIX = 'qtb'
+
+
+class OrderStateUnknown(Exception):
+    """Raised when it cannot be determined whether an order reached the exchange"""
+    pass
+
+
+def make_client_order_id(signal_id: str, leg: str = 'entry') -> str:
+    """Deterministic client order id for one leg of a signal (27 chars)"""
+    digest = hashlib.sha1(f"{signal_id}:{leg}".encode()).hexdigest()[:24]
+    return f"{CLIENT_ORDER_ID_PREFIX}{digest}"
+
+
+def child_client_order_id(parent_id: str, index: int) -> str:
+    """Client order id for the n-th child order of an execution algorithm"""
+    return f"{parent_id}c{index}"
+
+
+def retry_delay(attempt: int, base: float = None, cap: float = None) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]"""
+    base = config.RETRY_BASE_DELAY if base is None else base
+    cap = config.RETRY_MAX_DELAY if cap is None else cap
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+async def find_order_by_client_id(exchange, client_order_id: str, symbol: str,
+                                  lookups: int = None) -> Optional[Dict]:
+    """Look an order up by client id; None means it never reached the exchange
+
+    Lookups that fail in transit are retried; if the state still cannot be
+    determined OrderStateUnknown is raised so callers never resend blindly.
+    """
+    lookups = lookups or config.ORDER_LOOKUP_ATTEMPTS
+    last_error = None
+    for attempt in range(lookups):
+        try:
+            return await exchange.fetch_order(None, symbol, {'origClientOrderId': client_order_id})
+        except ccxt.OrderNotFound:
+            return None
+        except ccxt.NetworkError as e:
+            last_error = e
+            await asyncio.sleep(retry_delay(attempt))
+    raise OrderStateUnknown(f"Could not determine state of order {client_order_id}: {last_error}")
+
+
+async def create_order_idempotent(exchange, request: Dict, max_retries: int = None,
+                                  check_first: bool = False) -> Dict:
+    """create_order with check-then-retry on transport errors
+
+    ``request`` must carry ``params['clientOrderId']``. When a submission fails in
+    transit the order is looked up by that id and only resent if it is absent.
+    ``check_first`` does the lookup before the first send as well, for requests
+    that may already have gone out through another path (e.g. a failed batch).
+    """
+    max_retries = config.MAX_ORDER_RETRIES if max_retries is None else max_retries
+    client_order_id = request['params']['clientOrderId']
+    if check_first:
+        existing = await find_order_by_client_id(exchange, client_order_id, request['symbol'])
+        if existing:
+            return existing
+    for attempt in range(max_retries + 1):
+        try:
+            return await exchange.create_order(**request)
+        except (ccxt.NetworkError, ccxt.DuplicateOrderId) as e:
+            existing = await find_order_by_client_id(exchange, client_order_id, request['symbol'])
+            if existing:
+                logger.info(f"Order {client_order_id} reached the exchange despite {type(e).__name__}, reusing it")
+                return existing
+            if attempt >= max_retries:
+                raise
+            delay = retry_delay(attempt)
+            logger.warning(f"Order {client_order_id} not on exchange after {type(e).__name__}: {e}. "
+                           f"Resending in {delay:.2f}s")
+            await asyncio.sleep(delay)
@@ -0,0 +1,280 @@
+"""
+Real-time portfolio risk engine
+EWMA covariance of tick returns with a live position vector: volatility, parametric VaR/ES,
+marginal risk contributions and correlation-adjusted pre-trade exposure
+"""
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.stats import norm
+
+from .config.settings import config
+
+logger = logging.getLogger(__name__)
+
+
+class PortfolioRiskEngine:
+    """Covariance matrix and position vector kept up to date tick by tick
+
+    Positions are signed notionals (long positive, short negative). ``Σw`` (the
+    covariance matrix times the position vector) is maintained incrementally, so
+    a price tick costs O(n²), a position change O(n) and a pre-trade check O(n).
+
+    Symbols are keyed by exchange market id (``ETHUSDT``), whatever form they
+    arrive in, and start from a conservative prior (fully correlated, prior
+    volatility) that the EWMA washes out as observations arrive. Prices and
+    positions add symbols; the risk queries only read, falling back to the
+    prior for symbols the engine does not track.
+    """
+
+    def __init__(self, decay: float = None, confidence: float = None,
+                 horizon_seconds: float = None, min_observations: int = None):
+        self.decay = decay or config.PORTFOLIO_RISK_EWMA_DECAY
+        self.confidence = confidence or config.PORTFOLIO_VAR_CONFIDENCE
+        self.horizon_seconds = horizon_seconds or config.PORTFOLIO_VAR_HORIZON_SECONDS
+        self.min_observations = min_observations or config.PORTFOLIO_RISK_MIN_OBSERVATIONS
+        self.z_score = float(norm.ppf(self.confidence))
+        self.es_factor = float(norm.pdf(self.z_score) / (1 - self.confidence))
+
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.cov = np.zeros((0, 0))
+        self.positions = np.zeros(0)
+        self.sigma_w = np.zeros(0)
+        self.last_prices = np.zeros(0)
+        self.observations = np.zeros(0, dtype=int)
+        self.variance = 0.0
+        self.tick_seconds = 1.0
+        self._last_tick: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """True once every tracked symbol has enough observations"""
+        return len(self.symbols) > 0 and int(self.observations.min()) >= self.min_observations
+
+    def _prior_variance(self) -> float:
+        warmed = self.observations >= self.min_observations
+        prior_var = float(np.mean(np.diag(self.cov)[warmed])) if warmed.any() else config.PORTFOLIO_RISK_PRIOR_VOL ** 2
+        return max(prior_var, 1e-12)
+
+    def _covariance_row(self, symbol: str) -> Tuple[np.ndarray, float]:
+        """Covariance of ``symbol`` with every tracked symbol and its own variance (the prior if untracked)"""
+        index = self.index.get(symbol)
+        if index is not None:
+            return self.cov[index], float(self.cov[index, index])
+        prior_var = self._prior_variance()
+        vols = np.sqrt(np.maximum(np.diag(self.cov), 0.0))
+        return vols * np.sqrt(prior_var), prior_var  # Prior: fully correlated
+
+    def _ensure_symbol(self, symbol: str) -> int:
+        index = self.index.get(symbol)
+        if index is not None:
+            return index
+
+        row, prior_var = self._covariance_row(symbol)
+        n = len(self.symbols)
+        cov = np.empty((n + 1, n + 1))
+        cov[:n, :n] = self.cov
+        cov[n, :n] = cov[:n, n] = row
+        cov[n, n] = prior_var
+        self.cov = cov
+        self.positions = np.append(self.positions, 0.0)
+        self.sigma_w = np.append(self.sigma_w, float(cov[n, :n] @ self.positions[:n]))
+        self.last_prices = np.append(self.last_prices, np.nan)
+        self.observations = np.append(self.observations, 0)
+        self.symbols.append(symbol)
+        self.index[symbol] = n
+        return n
+
+    def update_prices(self, prices: Dict[str, float], timestamp: float = None):
+        """Fold one tick of prices into the covariance
+
+        Only pairs of symbols priced in this tick are updated; the others keep
+        their estimate rather than decaying toward zero.
+        """
+        indices, values = [], []
+        for symbol, price in prices.items():
+            if price:
+                indices.append(self._ensure_symbol(market_id(symbol)))
+                values.append(float(price))
+        if not indices:
+            return
+
+        timestamp = timestamp if timestamp is not None else time.time()
+        if self._last_tick is not None and timestamp > self._last_tick:
+            self.tick_seconds = 0.9 * self.tick_seconds + 0.1 * (timestamp - self._last_tick)
+        self._last_tick = timestamp
+
+        indices = np.asarray(indices)
+        values = np.asarray(values)
+        previous = self.last_prices[indices]
+        self.last_prices[indices] = values
+        seen = ~np.isnan(previous)
+        if not seen.any():
+            return
+
+        observed = indices[seen]
+        returns = np.zeros(len(self.symbols))
+        returns[observed] = np.log(values[seen] / previous[seen])
+        self.observations[observed] += 1
+
+        # cov' = λ·cov + (1-λ)·r·rᵀ  ⇒  Σ'w = λ·Σw + (1-λ)·r·(r·w), on the observed block only
+        weight = 1 - self.decay
+        if len(observed) == len(self.symbols):
+            self.cov *= self.decay
+            self.sigma_w *= self.decay
+        else:
+            block = np.ix_(observed, observed)
+            self.sigma_w[observed] -= weight * (self.cov[block] @ self.positions[observed])
+            self.cov[block] *= self.decay
+        self.cov += weight * np.outer(returns, returns)
+        self.sigma_w += weight * returns * float(returns @ self.positions)
+        self.variance = max(float(self.positions @ self.sigma_w), 0.0)
+
+    def set_position(self, symbol: str, notional: float):
+        """Set the signed notional held in a symbol"""
+        index = self._ensure_symbol(market_id(symbol))
+        delta = notional - self.positions[index]
+        if delta:
+            self.positions[index] = notional
+            self.sigma_w += self.cov[:, index] * delta
+            self.variance = max(float(self.positions @ self.sigma_w), 0.0)
+
+    def sync_positions(self, positions: Dict[str, Dict]):
+        """Replace the position vector from executor-style positions
+
+        Each value needs ``quantity``, ``entry_price`` and ``side``; symbols not
+        listed are flat.
+        """
+        target = {symbol: 0.0 for symbol in self.symbols}
+        for symbol, position in (positions or {}).items():
+            notional = float(position.get('quantity', 0) or 0) * float(position.get('entry_price', 0) or 0)
+            target[market_id(position.get('symbol', symbol))] = _direction(position.get('side')) * notional
+        for symbol, notional in target.items():
+            self.set_position(symbol, notional)
+
+    def _horizon_scale(self) -> float:
+        return float(np.sqrt(self.horizon_seconds / max(self.tick_seconds, 1e-3)))
+
+    def _var(self, variance: float) -> float:
+        return float(self.z_score * np.sqrt(max(variance, 0.0)) * self._horizon_scale())
+
+    def correlated_exposure(self, symbol: str, exposures: Optional[Dict[str, float]] = None) -> float:
+        """Correlation-weighted exposure of a book to ``symbol`` (own position included)
+
+        Σⱼ ρᵢⱼ·wⱼ over the book, from the live position vector unless
+        ``exposures`` (signed, any unit) is given. Untracked symbols count as
+        fully correlated.
+        """
+        symbol = market_id(symbol)
+        index = self.index.get(symbol)
+        own, untracked = 0.0, 0.0
+        if exposures is None:
+            weights = self.positions.copy()
+        else:
+            weights = np.zeros(len(self.symbols))
+            for other, exposure in exposures.items():
+                other = market_id(other)
+                if other == symbol:
+                    own += exposure
+                elif other in self.index:
+                    weights[self.index[other]] += exposure
+                else:
+                    untracked += exposure
+        if index is not None:
+            own += weights[index]
+            weights[index] = 0.0
+
+        row, variance = self._covariance_row(symbol)
+        vols = np.sqrt(np.maximum(np.diag(self.cov), 1e-24))
+        return own + untracked + float(row @ (weights / vols)) / np.sqrt(max(variance, 1e-24))
+
+    def pre_trade_check(self, symbol: str, notional: float) -> Dict:
+        """Risk of the book before and after adding ``notional`` (signed) of ``symbol``"""
+        symbol = market_id(symbol)
+        index = self.index.get(symbol)
+        row, own_variance = self._covariance_row(symbol)
+        sigma_w = self.sigma_w[index] if index is not None else float(row @ self.positions)
+        position = float(self.positions[index]) if index is not None else 0.0
+        projected_variance = self.variance + 2 * notional * sigma_w + notional ** 2 * own_variance
+        existing = self.correlated_exposure(symbol)
+        direction = np.sign(notional) or 1.0
+        var_now = self._var(self.variance)
+        var_after = self._var(projected_variance)
+        gross = float(np.abs(self.positions).sum())
+        return {
+            'ready': self.ready,
+            'portfolio_vol': float(np.sqrt(self.variance)),
+            'projected_vol': float(np.sqrt(max(projected_variance, 0.0))),
+            'var': var_now,
+            'projected_var': var_after,
+            'incremental_var': var_after - var_now,
+            'projected_es': var_after / self.z_score * self.es_factor,
+            'correlated_exposure': float(direction * existing),
+            'projected_correlated_exposure': float(direction * existing + abs(notional)),
+            'gross_exposure': gross,
+            'projected_gross_exposure': gross + abs(notional),
+            'symbol_exposure': abs(position),
+            'projected_symbol_exposure': abs(position) + abs(notional)
+        }
+
+    def metrics(self) -> Dict:
+        """Portfolio volatility, VaR/ES and per-position risk contributions"""
+        vol = float(np.sqrt(self.variance))
+        var = self._var(self.variance)
+        marginal = self.sigma_w / vol if vol > 0 else np.zeros(len(self.symbols))
+        components = self.positions * marginal
+        return {
+            'ready': self.ready,
+            'symbols': len(self.symbols),
+            'portfolio_vol': vol,
+            'var': var,
+            'expected_shortfall': var / self.z_score * self.es_factor if self.z_score else 0.0,
+            'confidence': self.confidence,
+            'horizon_seconds': self.horizon_seconds,
+            'gross_exposure': float(np.abs(self.positions).sum()),
+            'marginal_risk': {s: float(marginal[i]) for i, s in enumerate(self.symbols) if self.positions[i]},
+            'risk_contribution': {s: float(components[i]) for i, s in enumerate(self.symbols) if self.positions[i]}
+        }
+
+    def covariance(self, symbols: List[str]) -> np.ndarray:
+        """Per-tick covariance of ``symbols`` (untracked symbols get the prior, and are not added)"""
+        indices = [self.index.get(market_id(symbol)) for symbol in symbols]
+        known = np.array([index is not None for index in indices], dtype=bool)
+        rows = np.array([index for index in indices if index is not None], dtype=int)
+        vols = np.full(len(symbols), np.sqrt(self._prior_variance()))
+        vols[known] = np.sqrt(np.maximum(np.diag(self.cov)[rows], 0.0))
+        cov = np.outer(vols, vols)  # Prior: fully correlated
+        cov[np.ix_(known, known)] = self.cov[np.ix_(rows, rows)]
+        return cov
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        """Last price seen for a symbol"""
+        index = self.index.get(market_id(symbol))
+        if index is None or np.isnan(self.last_prices[index]):
+            return None
+        return float(self.last_prices[index])
+
+    def correlation(self, symbol_a: str, symbol_b: str) -> Optional[float]:
+        """Current EWMA correlation between two tracked symbols"""
+        symbol_a, symbol_b = market_id(symbol_a), market_id(symbol_b)
+        if symbol_a not in self.index or symbol_b not in self.index:
+            return None
+        i, j = self.index[symbol_a], self.index[symbol_b]
+        denominator = np.sqrt(self.cov[i, i] * self.cov[j, j])
+        return float(self.cov[i, j] / denominator) if denominator > 0 else None
+
+
+def market_id(symbol: str) -> str:
+    """Exchange market id of a symbol: ccxt unified ``ETH/USDT:USDT`` becomes ``ETHUSDT``"""
+    return symbol.split(':')[0].replace('/', '') if symbol else symbol
+
+
+def _direction(side: Optional[str]) -> float:
+    return -1.0 if str(side).lower() in ('short', 'sell') else 1.0
+
+
+# Global instance
+portfolio_risk_engine = PortfolioRiskEngine()
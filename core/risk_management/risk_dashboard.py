@@ -16,6 +16,9 @@ from dataclasses import asdict
 import logging
 from collections import deque
 
+from ..config.settings import config
+from ..stress_engine import stress_engine
+
 class RiskDashboard:
     """Real-time risk monitoring and alerting system"""
     
@@ -90,7 +93,8 @@ class RiskDashboard:
                 'portfolio_heat': self._calculate_portfolio_heat(risk_summary),
                 'risk_score': self._calculate_risk_score(risk_summary),
                 'velocity_metrics': await self._calculate_velocity_metrics(),
-                'exposure_metrics': self._calculate_exposure_metrics(risk_summary)
+                'exposure_metrics': self._calculate_exposure_metrics(risk_summary),
+                'stress': self._run_stress_test(risk_summary)
             }
             
             return risk_data
@@ -240,6 +244,16 @@ class RiskDashboard:
             self.logger.error(f"Exposure metrics calculation error: {e}")
             return {}
     
+    def _run_stress_test(self, risk_summary: Dict) -> Dict:
+        """Shock scenarios applied to the open positions"""
+        try:
+            balance = risk_summary['account_risk']['total_balance']
+            return stress_engine.run(risk_summary['positions']['details'], balance).to_dict()
+            
+        except Exception as e:
+            self.logger.error(f"Stress test error: {e}")
+            return {}
+    
     def _store_historical_data(self, risk_data: Dict):
         """Store data for historical analysis"""
         try:
@@ -349,6 +363,17 @@ class RiskDashboard:
                     'data': {'loss_pct': daily_loss_pct, 'limit': loss_limit}
                 })
             
+            # Stress scenarios that liquidate the account
+            stress = risk_data.get('stress', {})
+            if stress.get('liquidation_probability', 0) > config.MAX_STRESS_LIQUIDATION_PROBABILITY:
+                alerts.append({
+                    'level': 'CRITICAL',
+                    'type': 'stress_liquidation',
+                    'message': f"Liquidation in {stress['liquidation_probability']:.1%} of stress scenarios "
+                               f"(worst: {stress['worst_scenario']})",
+                    'data': stress
+                })
+            
             # High consecutive losses
             consecutive = risk_data['account_risk']['consecutive_losses']
             max_consecutive = risk_data['risk_parameters']['max_consecutive_losses']
@@ -22,6 +22,16 @@ import logging
 import json
 from threading import Lock, Event
 
+from ..exit_engine import exit_engine
+from ..market_state import market_state_cache
+from ..order_book_cache import order_book_cache
+
+# Consecutive updates a tracked position may be absent on the exchange before it is dropped
+MISSING_POSITION_UPDATES = 3
+
+# Scalping positions should be short-term
+MAX_POSITION_HOLD_SECONDS = 300
+
 class RiskLevel(Enum):
     LOW = "low"
     MODERATE = "moderate" 
@@ -117,13 +127,20 @@ class ScalpingRiskManager:
             'last_reset': datetime.now().date()
         }
         
-        # Funding rate cache
+        # Funding rates, mirrored from the shared market state cache on each refresh
         self.funding_rates: Dict[str, Dict] = {}
         self.next_funding_time: datetime = None
+        self._maintenance_rates: Dict[str, float] = {}
         
         # Slippage tracking
         self.slippage_history: Dict[str, List[float]] = {}
         
+        # Reconciliation: consecutive updates a tracked position was absent on the exchange
+        self._missing_position_updates: Dict[str, int] = {}
+        
+        # Positions with an exit in flight, so the exit engine and position updates don't both close one
+        self._exiting: set = set()
+        
     async def initialize(self):
         """Initialize risk management system"""
         try:
@@ -179,7 +196,8 @@ class ScalpingRiskManager:
                     return False, f"Leverage {leverage}x exceeds maximum {self.risk_params.max_leverage}x", {}
                 
                 # Position size validation
-                position_value = quantity * (entry_price or await self._get_current_price(symbol))
+                current_price = entry_price or await self._get_current_price(symbol)
+                position_value = quantity * current_price
                 max_position = min(
                     self.risk_params.max_position_size_usd,
                     self.account_risk.available_balance * self.risk_params.position_size_percent * leverage
@@ -189,8 +207,7 @@ class ScalpingRiskManager:
                     return False, f"Position size ${position_value:.2f} exceeds maximum ${max_position:.2f}", {}
                 
                 # Liquidation distance check
-                liquidation_price = await self._calculate_liquidation_price(symbol, side, quantity, leverage, entry_price)
-                current_price = entry_price or await self._get_current_price(symbol)
+                liquidation_price = await self._calculate_liquidation_price(symbol, side, quantity, leverage, current_price)
                 
                 liquidation_distance = abs(liquidation_price - current_price) / current_price
                 if liquidation_distance < self.risk_params.liquidation_buffer:
@@ -245,56 +262,111 @@ class ScalpingRiskManager:
                 self.positions[order_id] = position_risk
                 self.daily_stats['trades'] += 1
                 
+                # Liquidation proximity and hold time fire from the exit engine on the crossing tick
+                buffer = self.risk_params.liquidation_buffer
+                exit_engine.register(
+                    order_id, symbol, side,
+                    stop_loss=liquidation_price / (1 - buffer) if side == 'BUY' else liquidation_price / (1 + buffer),
+                    max_hold_seconds=MAX_POSITION_HOLD_SECONDS,
+                    on_trigger=self._on_exit_trigger,
+                    metadata={'source': 'scalping_risk_manager'}
+                )
+                
                 self.logger.info(f"Position registered: {symbol} {side} {quantity} @ {entry_price}")
                 
         except Exception as e:
             self.logger.error(f"Position registration error: {e}")
     
     async def update_positions(self):
-        """Update all position risk metrics"""
+        """Reconcile tracked positions with the exchange and act on exit triggers
+        
+        Exchange positions are indexed by symbol once per update and only the
+        in-memory metric updates run under the lock; exits and the account
+        refresh are awaited after it is released.
+        """
         try:
             if not self.positions:
                 return
             
             # Get current positions from exchange
             exchange_positions = await self.exchange.futures_position_information()
+            exchange_by_symbol = self._index_exchange_positions(exchange_positions)
             
             with self._lock:
-                for order_id, position_risk in self.positions.items():
-                    # Find matching exchange position
-                    exchange_pos = None
-                    for pos in exchange_positions:
-                        if pos['symbol'] == position_risk.symbol:
-                            exchange_pos = pos
-                            break
-                    
-                    if exchange_pos:
-                        # Update metrics
-                        position_risk.unrealized_pnl = float(exchange_pos['unRealizedProfit'])
-                        position_risk.margin_ratio = float(exchange_pos['marginRatio'])
-                        
-                        # Calculate risk level
-                        current_price = float(exchange_pos['markPrice'])
-                        liquidation_distance = abs(position_risk.liquidation_price - current_price) / current_price
-                        
-                        position_risk.risk_level = self._calculate_position_risk_level(
-                            liquidation_distance, position_risk.margin_ratio
-                        )
-                        
-                        # Check for exit triggers
-                        exit_reasons = await self._check_exit_triggers(position_risk, current_price)
-                        if exit_reasons:
-                            position_risk.exit_reasons.extend(exit_reasons)
-                            await self._execute_emergency_exit(order_id, position_risk)
-                
-                # Update account risk
-                await self._update_account_risk()
+                exits = self._reconcile_positions(exchange_by_symbol)
+            
+            for symbol, exchange_pos in exchange_by_symbol.items():
+                if 'markPrice' in exchange_pos:
+                    mark_price = float(exchange_pos['markPrice'])
+                    market_state_cache.update(symbol, mark_price)
+                    exit_engine.on_price(symbol, mark_price)
+            
+            for order_id, position_risk in exits:
+                await self._execute_emergency_exit(order_id, position_risk)
+            
+            # Update account risk
+            await self._update_account_risk()
                 
         except Exception as e:
             self.logger.error(f"Position update error: {e}")
     
+    @staticmethod
+    def _index_exchange_positions(exchange_positions: List[Dict]) -> Dict[str, Dict]:
+        """Exchange positions by symbol, skipping flat entries"""
+        indexed = {}
+        for pos in exchange_positions:
+            if 'positionAmt' in pos and float(pos['positionAmt']) == 0:
+                continue
+            indexed.setdefault(pos['symbol'], pos)
+        return indexed
+    
+    def _reconcile_positions(self, exchange_by_symbol: Dict[str, Dict]) -> List[Tuple[str, PositionRisk]]:
+        """Update tracked positions from indexed exchange data; returns positions to exit
+        
+        Must be called with the lock held. A tracked position missing from the
+        exchange for MISSING_POSITION_UPDATES consecutive updates was closed
+        elsewhere (stop hit, manual close) and is dropped.
+        """
+        exits = []
+        for order_id, position_risk in list(self.positions.items()):
+            exchange_pos = exchange_by_symbol.get(position_risk.symbol)
+            if exchange_pos is None:
+                misses = self._missing_position_updates.get(order_id, 0) + 1
+                if misses >= MISSING_POSITION_UPDATES:
+                    del self.positions[order_id]
+                    self._missing_position_updates.pop(order_id, None)
+                    exit_engine.cancel(order_id)
+                    self.logger.info(f"Position {position_risk.symbol} ({order_id}) closed outside risk manager")
+                else:
+                    self._missing_position_updates[order_id] = misses
+                continue
+            self._missing_position_updates.pop(order_id, None)
+            
+            # Update metrics
+            position_risk.unrealized_pnl = float(exchange_pos['unRealizedProfit'])
+            position_risk.margin_ratio = float(exchange_pos['marginRatio'])
+            
+            # Calculate risk level
+            current_price = float(exchange_pos['markPrice'])
+            liquidation_distance = abs(position_risk.liquidation_price - current_price) / current_price
+            
+            position_risk.risk_level = self._calculate_position_risk_level(
+                liquidation_distance, position_risk.margin_ratio
+            )
+            
+            # Check for exit triggers
+            exit_reasons = self._exit_triggers(position_risk, current_price)
+            if exit_reasons:
+                position_risk.exit_reasons.extend(exit_reasons)
+                exits.append((order_id, position_risk))
+        return exits
+    
     async def _check_exit_triggers(self, position: PositionRisk, current_price: float) -> List[str]:
         """Check if position should be exited immediately"""
+        return self._exit_triggers(position, current_price)
+    
+    def _exit_triggers(self, position: PositionRisk, current_price: float) -> List[str]:
+        """Exit reasons for a position at the given mark price"""
         exit_reasons = []
         
         # Liquidation proximity
@@ -307,21 +379,34 @@ class ScalpingRiskManager:
             exit_reasons.append(f"High margin ratio: {position.margin_ratio*100:.1f}%")
         
         # Time-based exit (positions should be short-term)
-        if position.time_held > 300:  # 5 minutes
+        if position.time_held > MAX_POSITION_HOLD_SECONDS:
             exit_reasons.append(f"Position held too long: {position.time_held}s")
         
         # Funding rate proximity
         if self.next_funding_time:
             time_to_funding = (self.next_funding_time - datetime.now()).total_seconds()
             if time_to_funding < self.risk_params.funding_time_buffer:
-                funding_rate = self.funding_rates.get(position.symbol, {}).get('fundingRate', 0)
+                funding_rate = self._funding_rate(position.symbol) or 0
                 if abs(float(funding_rate)) > self.risk_params.funding_rate_threshold:
                     exit_reasons.append(f"High funding rate approaching: {float(funding_rate)*100:.3f}%")
         
         return exit_reasons
     
+    async def _on_exit_trigger(self, trigger):
+        """Exit engine callback for a tracked position"""
+        with self._lock:
+            position = self.positions.get(trigger.key)
+            if position is None:
+                return
+            position.exit_reasons.append(trigger.reason)
+        await self._execute_emergency_exit(trigger.key, position)
+    
     async def _execute_emergency_exit(self, order_id: str, position: PositionRisk):
         """Execute emergency position exit"""
+        with self._lock:
+            if order_id in self._exiting:
+                return  # Already being exited by the exit engine or a position update
+            self._exiting.add(order_id)
         try:
             self.logger.warning(f"Emergency exit triggered for {position.symbol}: {position.exit_reasons}")
             
@@ -337,7 +422,9 @@ class ScalpingRiskManager:
             await self._execute_exit_order(position, exit_type)
             
             # Remove from tracking
-            del self.positions[order_id]
+            with self._lock:
+                self.positions.pop(order_id, None)
+            exit_engine.cancel(order_id)
             
             # Update consecutive losses if needed
             if position.unrealized_pnl < 0:
@@ -353,7 +440,10 @@ class ScalpingRiskManager:
             
         except Exception as e:
             self.logger.error(f"Emergency exit error: {e}")
-    
+        finally:
+            with self._lock:
+                self._exiting.discard(order_id)
+
     async def _execute_exit_order(self, position: PositionRisk, exit_type: ExitType):
         """Execute position exit order"""
         try:
@@ -392,35 +482,29 @@ class ScalpingRiskManager:
         
         with self._lock:
             self.account_risk.circuit_breaker_active = True
-            
-            # Close all positions immediately
-            for order_id, position in list(self.positions.items()):
-                await self._execute_exit_order(position, ExitType.MARKET)
-                del self.positions[order_id]
-            
-            # Log circuit breaker activation
-            self.trade_history.append({
-                'timestamp': datetime.now().isoformat(),
-                'event': 'circuit_breaker_activated',
-                'consecutive_losses': self.account_risk.consecutive_losses,
-                'daily_pnl': self.account_risk.daily_pnl,
-                'reason': 'Maximum consecutive losses exceeded'
-            })
+            positions = list(self.positions.values())
+            for order_id in self.positions:
+                exit_engine.cancel(order_id)
+            self.positions.clear()
+        
+        # Close all positions immediately, outside the lock
+        for position in positions:
+            await self._execute_exit_order(position, ExitType.MARKET)
+        
+        # Log circuit breaker activation
+        self.trade_history.append({
+            'timestamp': datetime.now().isoformat(),
+            'event': 'circuit_breaker_activated',
+            'consecutive_losses': self.account_risk.consecutive_losses,
+            'daily_pnl': self.account_risk.daily_pnl,
+            'reason': 'Maximum consecutive losses exceeded'
+        })
     
     async def _calculate_liquidation_price(self, symbol: str, side: str, quantity: float, 
                                          leverage: float, entry_price: float) -> float:
         """Calculate liquidation price for position"""
         try:
-            # Get maintenance margin rate
-            exchange_info = await self.exchange.futures_exchange_info()
-            maintenance_rate = 0.004  # Default 0.4%
-            
-            for symbol_info in exchange_info['symbols']:
-                if symbol_info['symbol'] == symbol:
-                    # Use bracket data if available
-                    if 'brackets' in symbol_info:
-                        maintenance_rate = float(symbol_info['brackets'][0]['maintMarginRatio'])
-                    break
+            maintenance_rate = await self._get_maintenance_rate(symbol)
             
             # Calculate liquidation price
             if side == 'BUY':
@@ -438,9 +522,23 @@ class ScalpingRiskManager:
             else:
                 return entry_price * 1.1
     
+    async def _get_maintenance_rate(self, symbol: str) -> float:
+        """Maintenance margin rate, read from exchange info once per session"""
+        if not self._maintenance_rates:
+            exchange_info = await self.exchange.futures_exchange_info()
+            for symbol_info in exchange_info['symbols']:
+                # Use bracket data if available
+                if 'brackets' in symbol_info:
+                    self._maintenance_rates[symbol_info['symbol']] = float(symbol_info['brackets'][0]['maintMarginRatio'])
+            self._maintenance_rates.setdefault('', 0.004)  # Marks the table as loaded
+        return self._maintenance_rates.get(symbol, 0.004)  # Default 0.4%
+    
     async def _get_current_price(self, symbol: str) -> float:
-        """Get current market price"""
+        """Mark price from the shared cache; one bulk premium index request when it is stale"""
         try:
+            state = await market_state_cache.get_or_refresh(symbol, self.exchange.futures_mark_price)
+            if state is not None:
+                return state.mark_price
             ticker = await self.exchange.futures_symbol_ticker(symbol=symbol)
             return float(ticker['price'])
         except Exception as e:
@@ -450,30 +548,15 @@ class ScalpingRiskManager:
     async def _estimate_slippage(self, symbol: str, quantity: float) -> float:
         """Estimate slippage for market order"""
         try:
-            # Get order book
-            depth = await self.exchange.futures_order_book(symbol=symbol, limit=20)
-            
-            # Calculate slippage based on order book depth
-            bids = [(float(bid[0]), float(bid[1])) for bid in depth['bids']]
-            asks = [(float(ask[0]), float(ask[1])) for ask in depth['asks']]
-            
-            # Simulate market order impact
-            remaining_qty = abs(quantity)
-            total_cost = 0.0
-            prices = asks if quantity > 0 else bids
-            
-            for price, size in prices:
-                if remaining_qty <= 0:
-                    break
-                
-                fill_qty = min(remaining_qty, size)
-                total_cost += fill_qty * price
-                remaining_qty -= fill_qty
+            # Shared depth cache: one snapshot serves every check within its max age
+            book = await order_book_cache.get_or_fetch(
+                symbol,
+                lambda: self.exchange.futures_order_book(symbol=symbol, limit=order_book_cache.depth)
+            )
+            fill = book.cost_to_fill(quantity, 'buy' if quantity > 0 else 'sell')
             
-            if total_cost > 0 and quantity != 0:
-                avg_price = total_cost / abs(quantity)
-                mid_price = (bids[0][0] + asks[0][0]) / 2
-                slippage_bps = abs(avg_price - mid_price) / mid_price * 10000
+            if fill.filled > 0:
+                slippage_bps = fill.slippage_bps
                 
                 # Apply adjustment factor
                 slippage_bps *= self.risk_params.slippage_adjustment
@@ -496,24 +579,24 @@ class ScalpingRiskManager:
             return 5.0  # Conservative estimate
     
     async def _update_funding_rates(self):
-        """Update funding rates for all symbols"""
+        """Update funding rates for all symbols from one bulk premium index request"""
         try:
-            funding_rates = await self.exchange.futures_funding_rate()
+            await market_state_cache.refresh(self.exchange.futures_mark_price,
+                                             max_age=market_state_cache.funding_max_age)
             
-            for rate_info in funding_rates:
-                symbol = rate_info['symbol']
+            for symbol, state in market_state_cache.states.items():
+                if state.funding_rate is None:
+                    continue  # Only ever seen in mark price updates
                 self.funding_rates[symbol] = {
-                    'fundingRate': float(rate_info['fundingRate']),
-                    'fundingTime': int(rate_info['fundingTime']),
-                    'updated': datetime.now()
+                    'fundingRate': state.funding_rate,
+                    'fundingTime': state.next_funding_time,
+                    'updated': datetime.now() - timedelta(seconds=state.funding_age)
                 }
             
-            # Calculate next funding time
-            if funding_rates:
-                next_funding = max([int(rate['fundingTime']) for rate in funding_rates])
-                self.next_funding_time = datetime.fromtimestamp(next_funding / 1000)
+            # Nearest upcoming funding time
+            self.next_funding_time = market_state_cache.next_funding_time() or self.next_funding_time
             
-            self.logger.info(f"Updated funding rates for {len(funding_rates)} symbols")
+            self.logger.info(f"Updated funding rates for {len(market_state_cache.states)} symbols")
             
         except Exception as e:
             self.logger.error(f"Funding rate update error: {e}")
@@ -521,11 +604,14 @@ class ScalpingRiskManager:
     async def _check_funding_risk(self, symbol: str, side: str) -> Dict:
         """Check funding rate risk for position"""
         try:
-            if symbol not in self.funding_rates:
+            funding_rate = self._funding_rate(symbol)
+            if funding_rate is None:
+                # Nothing fresh cached (e.g. the last bulk refresh failed): fetch before assessing
+                await self._update_funding_rates()
+                funding_rate = self._funding_rate(symbol)
+            if funding_rate is None:
                 return {'risk_level': RiskLevel.LOW, 'message': 'No funding data'}
             
-            funding_rate = self.funding_rates[symbol]['fundingRate']
-            
             # Calculate cost impact
             if (side == 'BUY' and funding_rate > 0) or (side == 'SELL' and funding_rate < 0):
                 # Position will pay funding
@@ -546,6 +632,19 @@ class ScalpingRiskManager:
             self.logger.error(f"Funding risk check error: {e}")
             return {'risk_level': RiskLevel.MODERATE, 'message': 'Unable to assess funding risk'}
     
+    def _funding_rate(self, symbol: str) -> Optional[float]:
+        """Funding rate from the shared cache, falling back to the last mirrored value
+        
+        Either is only used within the funding staleness bound.
+        """
+        funding_rate = market_state_cache.funding_rate(symbol)
+        mirrored = self.funding_rates.get(symbol)
+        if funding_rate is None and mirrored is not None:
+            age = (datetime.now() - mirrored['updated']).total_seconds()
+            if age <= market_state_cache.funding_max_age:
+                funding_rate = mirrored['fundingRate']
+        return funding_rate
+    
     def _calculate_position_risk_level(self, liquidation_distance: float, margin_ratio: float) -> RiskLevel:
         """Calculate overall risk level for position"""
         if liquidation_distance < 0.1 or margin_ratio > 0.9:  # 10% from liquidation or 90% margin
@@ -628,23 +727,28 @@ class ScalpingRiskManager:
         
         with self._lock:
             self._emergency_stop.set()
-            
-            # Close all positions with market orders
-            for order_id, position in list(self.positions.items()):
-                try:
-                    await self._execute_exit_order(position, ExitType.EMERGENCY)
-                    del self.positions[order_id]
-                except Exception as e:
-                    self.logger.error(f"Emergency exit failed for {position.symbol}: {e}")
-            
-            # Log emergency stop
-            self.trade_history.append({
-                'timestamp': datetime.now().isoformat(),
-                'event': 'emergency_stop',
-                'reason': reason,
-                'positions_closed': len(self.positions),
-                'daily_pnl': self.account_risk.daily_pnl if self.account_risk else 0
-            })
+            positions = list(self.positions.items())
+        
+        # Close all positions with market orders, outside the lock
+        closed = 0
+        for order_id, position in positions:
+            try:
+                await self._execute_exit_order(position, ExitType.EMERGENCY)
+                with self._lock:
+                    self.positions.pop(order_id, None)
+                exit_engine.cancel(order_id)
+                closed += 1
+            except Exception as e:
+                self.logger.error(f"Emergency exit failed for {position.symbol}: {e}")
+        
+        # Log emergency stop
+        self.trade_history.append({
+            'timestamp': datetime.now().isoformat(),
+            'event': 'emergency_stop',
+            'reason': reason,
+            'positions_closed': closed,
+            'daily_pnl': self.account_risk.daily_pnl if self.account_risk else 0
+        })
     
     def reset_emergency_stop(self):
         """Reset emergency stop flag"""
@@ -673,6 +777,9 @@ class ScalpingRiskManager:
                             {
                                 'symbol': pos.symbol,
                                 'side': pos.side,
+                                'quantity': pos.quantity,
+                                'entry_price': pos.entry_price,
+                                'leverage': pos.leverage,
                                 'unrealized_pnl': pos.unrealized_pnl,
                                 'risk_level': pos.risk_level.value,
                                 'liquidation_price': pos.liquidation_price,
@@ -6,8 +6,12 @@ import logging
 import asyncio
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 from .config.settings import config
 from .leverage_manager import leverage_manager
+from .portfolio_risk import portfolio_risk_engine
+from .signal_batch import SignalBatch, SignalDecisions
+from .sliding_window import TradeWindows
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +20,17 @@ class RiskManager:
     
     def __init__(self):
         self.emergency_mode = False
-        self.daily_trades_count = 0
-        self.daily_start = datetime.now().date()
+        self.trade_windows = TradeWindows()  # Executed entries
+        self.scalp_windows = TradeWindows()  # Closed scalps, valued by PnL %
         self.active_correlations = {}
         self.margin_usage_history = []
         self.risk_violations = []
         
+    @property
+    def daily_trades_count(self) -> int:
+        """Entries executed over the last 24 hours"""
+        return self.trade_windows['24h'].count()
+    
     async def validate_trade_risk(self, signal: Dict, account_balance: float,
                                 proposed_leverage: int, position_size: float) -> Dict:
         """
@@ -55,7 +64,7 @@ class RiskManager:
             
             # Check position concentration
             symbol = signal.get('symbol', '')
-            correlation_risk = await self._check_correlation_risk(symbol, position_size)
+            correlation_risk = await self._check_correlation_risk(symbol, position_size, signal.get('action', 'buy'))
             if correlation_risk['high_risk']:
                 validation_result['warnings'].append(f'High correlation exposure: {correlation_risk["exposure"]:.1%}')
                 validation_result['adjustments']['max_position_size'] = correlation_risk['max_allowed']
@@ -119,31 +128,20 @@ class RiskManager:
                 'risk_score': 1.0
             }
     
-    async def _check_correlation_risk(self, symbol: str, position_size: float) -> Dict:
-        """Check if new position would create excessive correlation exposure"""
+    async def _check_correlation_risk(self, symbol: str, position_size: float, side: str = 'buy') -> Dict:
+        """Check if new position would create excessive correlation exposure
+        
+        Exposure of open positions is weighted by their live correlation with
+        ``symbol`` from the portfolio risk engine; hedges offset it.
+        """
         try:
-            # Group symbols by correlation - INCLUDING AXSUSDT
-            correlation_groups = {
-                'crypto_majors': ['BTCUSDT', 'ETHUSDT'],
-                'high_volatility': ['AXSUSDT', 'SOLUSDT'],  # AXSUSDT in high volatility group
-                'altcoins': ['BNBUSDT', 'XRPUSDT']
-            }
-            
-            current_group = None
-            for group, symbols in correlation_groups.items():
-                if symbol in symbols:
-                    current_group = group
-                    break
-            
-            if not current_group:
-                return {'high_risk': False, 'exposure': 0.0, 'max_allowed': position_size}
-            
-            # Calculate current exposure in this correlation group
-            current_exposure = sum(
-                pos.get('position_size', 0) 
+            exposures = {
+                pos_symbol: (-1 if str(pos.get('side', 'buy')).lower() in ('sell', 'short') else 1)
+                * pos.get('position_size', 0)
                 for pos_symbol, pos in self.active_correlations.items()
-                if pos_symbol in correlation_groups[current_group]
-            )
+            }
+            direction = -1 if str(side).lower() in ('sell', 'short') else 1
+            current_exposure = max(0.0, direction * portfolio_risk_engine.correlated_exposure(symbol, exposures))
             
             total_exposure = current_exposure + position_size
             max_allowed_exposure = config.MAX_CORRELATION_EXPOSURE
@@ -210,16 +208,8 @@ class RiskManager:
     def _check_overtrading(self) -> bool:
         """Check if trading frequency is excessive"""
         try:
-            current_date = datetime.now().date()
-            
-            # Reset daily counter if new day
-            if current_date != self.daily_start:
-                self.daily_trades_count = 0
-                self.daily_start = current_date
-            
-            # Check if approaching daily trade limit for scalping
-            max_daily_trades = 35  # Higher limit for scalping strategy
-            return self.daily_trades_count >= max_daily_trades
+            # Rolling 24h trade count against the scalping daily limit
+            return self.daily_trades_count >= config.MAX_DAILY_TRADES
             
         except Exception as e:
             logger.error(f"Error checking overtrading: {e}")
@@ -387,13 +377,15 @@ class RiskManager:
             return {
                 'emergency_mode': self.emergency_mode,
                 'daily_trades': self.daily_trades_count,
+                'trades_last_hour': self.trade_windows['1h'].count(),
                 'daily_pnl': leverage_manager.daily_pnl,
                 'daily_drawdown_limit': config.MAX_DAILY_DRAWDOWN,
                 'active_positions': len(self.active_correlations),
                 'max_positions': config.MAX_CONCURRENT_POSITIONS,
                 'recent_violations': len([v for v in self.risk_violations 
                                         if v['timestamp'] > datetime.now() - timedelta(hours=24)]),
-                'risk_status': self._get_overall_risk_status()
+                'risk_status': self._get_overall_risk_status(),
+                'portfolio': portfolio_risk_engine.metrics()
             }
         except Exception as e:
             logger.error(f"Error getting risk metrics: {e}")
@@ -539,8 +531,9 @@ class RiskManager:
             current_avg = self.scalping_metrics['average_hold_time']
             self.scalping_metrics['average_hold_time'] = (current_avg * (total - 1) + hold_time) / total
             
-            # Update last trade time for frequency control
+            # Update last trade time and rolling windows for frequency control
             self.last_trade_time = datetime.now()
+            self.scalp_windows.record(pnl)
             
         except Exception as e:
             logger.error(f"Error updating scalping metrics: {e}")
@@ -565,20 +558,9 @@ class RiskManager:
             return {}
     
     def _calculate_trades_per_hour(self) -> float:
-        """Calculate average trades per hour for scalping"""
+        """Scalps closed over the last hour"""
         try:
-            if not hasattr(self, 'scalping_metrics'):
-                return 0.0
-            
-            total_trades = self.scalping_metrics.get('total_scalping_trades', 0)
-            if total_trades == 0:
-                return 0.0
-            
-            # Estimate based on average hold time and trading hours
-            avg_hold_time = self.scalping_metrics.get('average_hold_time', 300)  # 5 minutes default
-            trades_per_hour = 3600 / max(avg_hold_time, 60)  # At least 1 minute per trade
-            
-            return min(trades_per_hour, 20)  # Cap at 20 trades per hour
+            return float(self.scalp_windows['1h'].count())
             
         except Exception as e:
             logger.error(f"Error calculating trades per hour: {e}")
@@ -629,54 +611,82 @@ class RiskManager:
         except Exception as e:
             logger.error(f"Error resetting emergency mode: {e}")
     
+    def record_trade(self):
+        """Count an executed entry against the daily trade budget"""
+        self.trade_windows.record()
+    
+    def evaluate_signals(self, signals: List[Dict]) -> SignalDecisions:
+        """
+        Evaluate a cycle's signals as one batch
+        Rules run as array operations over the whole batch; each signal gets an
+        approval and, when rejected, the first rule that rejected it
+        """
+        batch = SignalBatch.from_signals(signals or [])
+        count = len(batch)
+        approved = np.ones(count, dtype=bool)
+        reasons = [''] * count
+        
+        def reject(mask: np.ndarray, reason: str):
+            for i in np.flatnonzero(mask & approved):
+                reasons[i] = reason
+            approved[mask] = False
+        
+        if not count:
+            return SignalDecisions(batch.signals, approved, reasons)
+        
+        if self.emergency_mode:
+            logger.warning("Emergency mode active - filtering out all signals")
+            reject(np.ones(count, dtype=bool), 'emergency_mode')
+            return SignalDecisions(batch.signals, approved, reasons)
+        
+        reject(~batch.valid, 'missing_fields')
+        reject(batch.direction == 0, 'not_an_entry')
+        reject(batch.confidence < config.MIN_SIGNAL_CONFIDENCE, 'low_confidence')
+        
+        # Daily loss limit against each signal's account balance
+        reject(leverage_manager.daily_pnl < -config.MAX_DAILY_DRAWDOWN * batch.account_balance, 'daily_loss_limit')
+        
+        # Conflicting directions: per symbol, the side with more total confidence wins
+        codes = batch.symbol_codes
+        weight = np.where(approved, batch.confidence, 0.0)
+        long_score = np.bincount(codes, weights=weight * (batch.direction > 0), minlength=len(batch.symbols))
+        short_score = np.bincount(codes, weights=weight * (batch.direction < 0), minlength=len(batch.symbols))
+        winner = np.sign(long_score - short_score)[codes]
+        reject(batch.direction != winner, 'conflicting_direction')
+        
+        # Per-symbol cap, highest confidence first
+        order = np.lexsort((-batch.confidence, ~approved, codes))
+        sorted_codes = codes[order]
+        group_start = np.r_[0, np.flatnonzero(np.diff(sorted_codes)) + 1]
+        rank = np.empty(count, dtype=np.int64)
+        rank[order] = np.arange(count) - np.repeat(group_start, np.diff(np.r_[group_start, count]))
+        reject(rank >= config.MAX_SIGNALS_PER_SYMBOL, 'symbol_cap')
+        
+        # Daily trade budget, highest confidence first
+        remaining = max(0, config.MAX_DAILY_TRADES - self.daily_trades_count)
+        by_confidence = np.lexsort((-batch.confidence, ~approved))
+        over_budget = np.zeros(count, dtype=bool)
+        over_budget[by_confidence[remaining:]] = True
+        reject(over_budget, 'trade_budget')
+        
+        return SignalDecisions(batch.signals, approved, reasons)
+    
     def filter_signals(self, signals: List[Dict]) -> List[Dict]:
         """
         Filter trading signals based on risk management rules
-        Compatible with ultra-high frequency trading system
+        Compatible with ultra-high frequency trading system; approved signals come
+        back normalized (``price``/``entry_price``, ``action``, ``confidence``)
         """
         if not signals:
             return []
         
         try:
-            filtered_signals = []
-            
-            for signal in signals:
-                # Skip if emergency mode active
-                if self.emergency_mode:
-                    logger.warning("Emergency mode active - filtering out all signals")
-                    continue
-                
-                # Basic signal validation
-                if not isinstance(signal, dict):
-                    logger.warning("Invalid signal format - skipping")
-                    continue
-                
-                # Check required signal fields
-                required_fields = ['symbol', 'action', 'confidence', 'price']
-                if not all(field in signal for field in required_fields):
-                    logger.warning(f"Signal missing required fields: {signal}")
-                    continue
-                
-                # Skip low confidence signals
-                if signal.get('confidence', 0) < 0.3:
-                    logger.debug(f"Filtering low confidence signal: {signal['confidence']}")
-                    continue
-                
-                # Check trading frequency limits
-                if self._check_overtrading():
-                    logger.warning("Trading frequency limit reached - filtering signals")
-                    continue
-                
-                # Check daily loss limits
-                account_balance = signal.get('account_balance', 10000)  # Default fallback
-                if leverage_manager.daily_pnl < -config.MAX_DAILY_DRAWDOWN * account_balance:
-                    logger.warning("Daily loss limit reached - filtering signals")
-                    continue
-                
-                # Signal passed all filters
-                filtered_signals.append(signal)
-                logger.debug(f"Signal approved for {signal['symbol']}: confidence {signal['confidence']}")
+            decisions = self.evaluate_signals(signals)
+            rejected = decisions.rejection_counts()
+            if rejected:
+                logger.debug(f"Rejected signals by reason: {rejected}")
             
+            filtered_signals = decisions.approved_signals
             logger.info(f"Filtered {len(signals)} signals down to {len(filtered_signals)} approved signals")
             return filtered_signals
             
@@ -0,0 +1,132 @@
+"""
+Rolling percentile ranks over time windows
+Sorted ring buffers that rank a reading against the last 24h/7d/30d of samples with
+O(log n) queries and bounded memory
+"""
+import logging
+import math
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Window name -> (window seconds, samples kept); one sample per window / samples
+PERCENTILE_WINDOWS = {
+    '24h': (86400, 288),    # 5-minute samples
+    '7d': (604800, 336),    # 30-minute samples
+    '30d': (2592000, 360)   # 2-hour samples
+}
+
+
+class RollingPercentile:
+    """Percentile rank of a value among the samples of the last ``window_seconds``
+
+    Readings are bucketed into ``capacity`` sample slots across the window;
+    a newer reading in the same slot replaces the older one. Samples are
+    held twice in preallocated float32 arrays: a ring in arrival order (for
+    expiry) and a sorted array (for ranking), so a rank is two binary
+    searches and memory is fixed at ``capacity``.
+    """
+
+    def __init__(self, window_seconds: float, capacity: int):
+        self.window_seconds = float(window_seconds)
+        self.capacity = int(capacity)
+        self.sample_seconds = self.window_seconds / self.capacity
+        self._slots = np.zeros(self.capacity, dtype=np.int64)  # Arrival ring, oldest at _head
+        self._arrivals = np.zeros(self.capacity, dtype=np.float32)
+        self._head = 0
+        self._sorted = np.zeros(self.capacity, dtype=np.float32)
+        self._size = 0
+        self._total = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._slots.nbytes + self._arrivals.nbytes + self._sorted.nbytes
+
+    def _remove(self, value: np.float32):
+        n = self._size
+        index = int(np.searchsorted(self._sorted[:n], value, 'left'))
+        self._sorted[index:n - 1] = self._sorted[index + 1:n]
+        self._size -= 1
+        self._total -= float(value)
+
+    def _insert(self, value: np.float32):
+        n = self._size
+        index = int(np.searchsorted(self._sorted[:n], value, 'right'))
+        self._sorted[index + 1:n + 1] = self._sorted[index:n]
+        self._sorted[index] = value
+        self._size += 1
+        self._total += float(value)
+
+    def _slot(self, offset: int) -> int:
+        return (self._head + offset) % self.capacity
+
+    def add(self, value: float, timestamp: float = None):
+        """Record a reading; NaN readings are ignored"""
+        if value != value:
+            return
+        value = np.float32(value)
+        slot = math.floor((time.time() if timestamp is None else timestamp) / self.sample_seconds)
+        if self._size:
+            newest = self._slot(self._size - 1)
+            if self._slots[newest] >= slot:
+                slot = int(self._slots[newest])
+                self._remove(self._arrivals[newest])
+            else:
+                # Expire samples older than the window, or the oldest when full
+                oldest_slot = slot - self.capacity + 1
+                while self._size and (self._slots[self._head] < oldest_slot or self._size == self.capacity):
+                    self._remove(self._arrivals[self._head])
+                    self._head = self._slot(1)
+        if not self._size:
+            self._total = 0.0
+        position = self._slot(self._size)
+        self._slots[position] = slot
+        self._arrivals[position] = value
+        self._insert(value)
+
+    def percentile(self, value: float) -> float:
+        """``scipy.stats.percentileofscore`` (kind='rank') of ``value`` among the samples; NaN if empty"""
+        n = self._size
+        if not n:
+            return float('nan')
+        value = np.float32(value)
+        left = int(np.searchsorted(self._sorted[:n], value, 'left'))
+        right = int(np.searchsorted(self._sorted[:n], value, 'right'))
+        return (left + right + (1 if right > left else 0)) * 50.0 / n
+
+    def quantile(self, q: float) -> float:
+        """Sample at quantile ``q`` (nearest rank), NaN if empty"""
+        if not self._size:
+            return float('nan')
+        index = min(self._size - 1, max(0, math.ceil(q * self._size) - 1))
+        return float(self._sorted[index])
+
+    def mean(self) -> float:
+        return self._total / self._size if self._size else float('nan')
+
+
+class PercentileTracker:
+    """One symbol's readings ranked over the standard 24h/7d/30d windows"""
+
+    def __init__(self, windows: Dict[str, Tuple[float, int]] = None):
+        self.windows = {name: RollingPercentile(seconds, capacity)
+                        for name, (seconds, capacity) in (windows or PERCENTILE_WINDOWS).items()}
+
+    def __getitem__(self, name: str) -> RollingPercentile:
+        return self.windows[name]
+
+    def add(self, value: float, timestamp: float = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        for window in self.windows.values():
+            window.add(value, timestamp)
+
+    def percentiles(self, value: float, default: float = 50.0) -> Dict[str, float]:
+        """Rank of ``value`` in every window, ``default`` for windows without samples"""
+        return {name: (window.percentile(value) if len(window) else default)
+                for name, window in self.windows.items()}
@@ -18,6 +18,9 @@ from scipy import stats
 from scipy.stats import zscore
 import talib
 
+from .history_prewarm import HistoryPrewarmer
+from .order_book_cache import order_book_cache
+
 logger = logging.getLogger(__name__)
 
 class MarketRegime(Enum):
@@ -195,33 +198,42 @@ class ScalpingCorrelationEngine:
         
         logger.info(f"ScalpingCorrelationEngine initialized with {len(self.scalping_pairs)} scalping pairs")
     
-    async def initialize_real_time_feeds(self):
-        """Initialize real-time data feeds for all timeframes"""
+    def history_requirements(self) -> Dict[Tuple[str, str], int]:
+        """Candles needed per (symbol, timeframe) to fill the analysis buffers"""
+        return {
+            (symbol, timeframe): self.correlation_lookback * 2
+            for timeframe in self.timeframes
+            for symbol in self.scalping_pairs + self.reference_pairs
+        }
+    
+    def load_history(self, candles: Dict[Tuple[str, str], np.ndarray]):
+        """Fill price, volume and tick buffers from pre-warmed OHLCV"""
+        for (symbol, timeframe), ohlcv in candles.items():
+            if len(ohlcv) < self.correlation_lookback:
+                logger.warning(f"Not enough history to initialize {symbol} {timeframe}: {len(ohlcv)} candles")
+                continue
+            
+            # Initialize price and volume buffers
+            recent = ohlcv[-self.correlation_lookback:]
+            self.price_buffers[timeframe][symbol].extend(recent[:, 4].tolist())
+            self.volume_buffers[timeframe][symbol].extend(recent[:, 5].tolist())
+            
+            # Initialize tick buffer with last price
+            if timeframe == '1m':
+                self.tick_buffers[symbol].extend([float(recent[-1, 4])] * 10)
+    
+    async def initialize_real_time_feeds(self, prewarmer: HistoryPrewarmer = None):
+        """Initialize real-time data feeds for all timeframes
+        
+        Args:
+            prewarmer: Shared pre-warm stage (request budget, candle store); by
+                default one is created for this engine's exchange
+        """
         try:
             logger.info("Initializing real-time feeds for scalping...")
             
-            # Initialize price buffers with recent data
-            for timeframe in self.timeframes:
-                for symbol in self.scalping_pairs + self.reference_pairs:
-                    try:
-                        ohlcv = await self.exchange.fetch_ohlcv(
-                            symbol, timeframe, limit=self.correlation_lookback * 2
-                        )
-                        
-                        if len(ohlcv) >= self.correlation_lookback:
-                            # Initialize price and volume buffers
-                            prices = [candle[4] for candle in ohlcv[-self.correlation_lookback:]]
-                            volumes = [candle[5] for candle in ohlcv[-self.correlation_lookback:]]
-                            
-                            self.price_buffers[timeframe][symbol].extend(prices)
-                            self.volume_buffers[timeframe][symbol].extend(volumes)
-                            
-                            # Initialize tick buffer with last price
-                            if timeframe == '1m':
-                                self.tick_buffers[symbol].extend([prices[-1]] * 10)
-                                
-                    except Exception as e:
-                        logger.warning(f"Failed to initialize {symbol} {timeframe}: {e}")
+            # Initialize price buffers with recent data, all symbols and timeframes at once
+            await (prewarmer or HistoryPrewarmer(self.exchange)).prewarm([self])
             
             # Initialize correlation matrices
             for timeframe in self.timeframes:
@@ -269,15 +281,16 @@ class ScalpingCorrelationEngine:
     async def update_order_book_data(self, symbol: str):
         """Update real-time order book data for spread analysis"""
         try:
-            order_book = await self.exchange.fetch_order_book(symbol, limit=10)
+            book = await order_book_cache.get_or_fetch(
+                symbol, lambda: self.exchange.fetch_order_book(symbol, limit=order_book_cache.depth)
+            )
             
-            if order_book['bids'] and order_book['asks']:
-                best_bid = order_book['bids'][0][0]
-                best_ask = order_book['asks'][0][0]
+            if len(book.bid_prices) and len(book.ask_prices):
+                best_bid = book.best_bid
+                best_ask = book.best_ask
                 
                 # Calculate depth and imbalance
-                bid_depth_5 = sum([order[1] for order in order_book['bids'][:5]])
-                ask_depth_5 = sum([order[1] for order in order_book['asks'][:5]])
+                bid_depth_5, ask_depth_5 = book.depth(5)
                 
                 bid_ask_spread_pct = (best_ask - best_bid) / best_bid * 100
                 imbalance_ratio = bid_depth_5 / (ask_depth_5 + 0.001)  # Avoid division by zero
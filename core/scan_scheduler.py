@@ -0,0 +1,138 @@
+"""
+Priority-tiered scan scheduling
+Gives each pair a rescan interval from its latest opportunity score and hands out
+scans in overdue order within a rolling request-weight budget and a concurrency cap
+"""
+import asyncio
+import itertools
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from .config.settings import config
+from .sliding_window import SlidingWindowCounter
+
+logger = logging.getLogger(__name__)
+
+# (tier, minimum opportunity score, rescan interval seconds), hottest first
+SCAN_TIERS: Tuple[Tuple[str, float, float], ...] = (
+    ('hot', 60, 5),
+    ('warm', 35, 15),
+    ('cool', 15, 60),
+    ('dormant', 0, 300)
+)
+
+TICKERS_WEIGHT = 40  # Binance futures 24hr ticker for every symbol
+
+
+def kline_weight(limit: int) -> int:
+    """Binance futures request weight of one klines call"""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+class ScanScheduler:
+    """Decides which pairs to scan on each tick
+
+    A pair is due once its tier's interval has elapsed since its last scan;
+    pairs never scanned are due at once. Due pairs are handed out most
+    overdue first, so pairs in the same tier take turns rather than the
+    same few winning every tick, and only as many as the remaining
+    request-weight budget for the rolling minute allows.
+    """
+
+    def __init__(self, tiers: Tuple[Tuple[str, float, float], ...] = SCAN_TIERS,
+                 weight_budget: int = None, max_concurrency: int = None):
+        self.tiers = tuple(sorted(tiers, key=lambda tier: tier[1], reverse=True))
+        self.weight_budget = weight_budget if weight_budget is not None else config.SCAN_REQUEST_WEIGHT_PER_MINUTE
+        self.max_concurrency = max_concurrency if max_concurrency is not None else config.SCAN_MAX_CONCURRENCY
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.weight_used = SlidingWindowCounter(60, buckets=60)
+        self.scores: Dict[str, float] = {}
+        self.last_scanned: Dict[str, float] = {}
+        self._order = itertools.count()
+        self._rotation: Dict[str, int] = {}  # Tie-break among pairs due at the same moment
+
+    def tier(self, symbol: str) -> Tuple[str, float]:
+        """(tier name, rescan interval) for the symbol's latest score"""
+        score = self.scores.get(symbol, 0.0)
+        for name, minimum, interval in self.tiers:
+            if score >= minimum:
+                return name, interval
+        name, _, interval = self.tiers[-1]
+        return name, interval
+
+    def next_due(self, symbol: str) -> float:
+        last = self.last_scanned.get(symbol)
+        return float('-inf') if last is None else last + self.tier(symbol)[1]
+
+    def budget_remaining(self, now: float = None) -> float:
+        return self.weight_budget - self.weight_used.total(now)
+
+    def spend(self, weight: float, now: float = None):
+        """Charge a request's weight against the rolling minute"""
+        self.weight_used.add(weight, now)
+
+    def due(self, symbols: Iterable[str], now: float = None,
+            cost: Callable[[str], float] = None, reserve: float = 0) -> List[str]:
+        """
+        Pairs to scan now, most overdue first
+
+        Args:
+            symbols: Pairs eligible for scanning
+            now: Current time (epoch seconds)
+            cost: Expected request weight of scanning a pair (default 1)
+            reserve: Weight kept back for requests shared by the batch
+
+        Returns:
+            Due pairs that fit in the remaining budget
+        """
+        now = time.time() if now is None else now
+        budget = self.budget_remaining(now) - reserve
+        queue = []
+        for symbol in dict.fromkeys(symbols):
+            next_due = self.next_due(symbol)
+            if next_due <= now:
+                rotation = self._rotation.setdefault(symbol, next(self._order))
+                queue.append((next_due, rotation, symbol))
+
+        selected = []
+        for _, _, symbol in sorted(queue):
+            weight = cost(symbol) if cost else 1
+            if weight > budget:
+                break
+            budget -= weight
+            selected.append(symbol)
+        if len(selected) < len(queue):
+            logger.debug(f"Scan budget deferred {len(queue) - len(selected)} due pairs")
+        return selected
+
+    def record(self, symbol: str, score: float = None, now: float = None):
+        """Mark a pair scanned; ``score`` (None keeps the previous one) sets its next tier"""
+        self.last_scanned[symbol] = time.time() if now is None else now
+        if score is not None:
+            self.scores[symbol] = float(score)
+        self._rotation[symbol] = next(self._order)
+
+    def seconds_until_next(self, symbols: Iterable[str], now: float = None) -> float:
+        """Time until the earliest pair becomes due (0 if one already is)"""
+        now = time.time() if now is None else now
+        next_times = [self.next_due(symbol) for symbol in symbols]
+        return max(0.0, min(next_times) - now) if next_times else float('inf')
+
+    def get_status(self) -> Dict:
+        tiers = {name: 0 for name, _, _ in self.tiers}
+        for symbol in self.last_scanned:
+            tiers[self.tier(symbol)[0]] += 1
+        return {
+            'tiers': tiers,
+            'weight_used_last_minute': self.weight_used.total(),
+            'weight_budget': self.weight_budget,
+            'max_concurrency': self.max_concurrency
+        }
@@ -0,0 +1,115 @@
+"""
+Signal normalization and columnar batches
+Maps the field names used by different signal sources onto one schema and lays a cycle's
+signals out as arrays for vectorized risk rules
+"""
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Canonical field -> names used by the signal sources, in order of preference
+FIELD_ALIASES = {
+    'price': ('price', 'entry_price', 'current_price'),
+    'action': ('action', 'side', 'direction'),
+    'confidence': ('confidence', 'signal_strength', 'strength')
+}
+REQUIRED_FIELDS = ('symbol', 'action', 'confidence', 'price')
+
+BUY_ACTIONS = ('buy', 'long')
+SELL_ACTIONS = ('sell', 'short')
+
+
+def normalize_signal(signal: Dict) -> Optional[Dict]:
+    """Copy of ``signal`` with canonical ``price``/``entry_price``, ``action`` and ``confidence``
+
+    Existing fields are kept as they are; only missing canonical fields are
+    filled from their aliases. Returns None for anything that is not a dict.
+    """
+    if not isinstance(signal, dict):
+        return None
+    normalized = dict(signal)
+    for canonical, aliases in FIELD_ALIASES.items():
+        if normalized.get(canonical) is None:
+            for alias in aliases:
+                value = signal.get(alias)
+                if value is not None:
+                    normalized[canonical] = getattr(value, 'value', value)
+                    break
+    if normalized.get('entry_price') is None and normalized.get('price') is not None:
+        normalized['entry_price'] = normalized['price']
+    return normalized
+
+
+def action_direction(action) -> int:
+    """+1 for entries on the long side, -1 for shorts, 0 for anything else (e.g. close)"""
+    action = str(action).lower()
+    if action in BUY_ACTIONS:
+        return 1
+    if action in SELL_ACTIONS:
+        return -1
+    return 0
+
+
+@dataclass
+class SignalBatch:
+    """One cycle's signals as columns; rows line up with ``signals``"""
+    signals: List[Optional[Dict]]
+    valid: np.ndarray
+    symbol_codes: np.ndarray
+    symbols: np.ndarray
+    direction: np.ndarray
+    confidence: np.ndarray
+    price: np.ndarray
+    account_balance: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.signals)
+
+    @classmethod
+    def from_signals(cls, signals: List[Dict], default_balance: float = 10000) -> 'SignalBatch':
+        normalized = [normalize_signal(signal) for signal in signals]
+        rows = [signal or {} for signal in normalized]
+        valid = np.array([signal is not None and all(signal.get(f) is not None for f in REQUIRED_FIELDS)
+                          for signal in normalized], dtype=bool)
+        symbols, codes = np.unique(np.array([str(row.get('symbol', '')) for row in rows], dtype=object),
+                                   return_inverse=True)
+        return cls(
+            signals=normalized,
+            valid=valid,
+            symbol_codes=codes.astype(np.int64).reshape(-1),
+            symbols=symbols,
+            direction=np.array([action_direction(row.get('action')) for row in rows], dtype=np.int8),
+            confidence=np.array([_float(row.get('confidence')) for row in rows]),
+            price=np.array([_float(row.get('price')) for row in rows]),
+            account_balance=np.array([_float(row.get('account_balance'), default_balance) for row in rows])
+        )
+
+
+@dataclass
+class SignalDecisions:
+    """Approval and reason per signal; an empty reason means approved"""
+    signals: List[Optional[Dict]]
+    approved: np.ndarray
+    reasons: List[str]
+
+    @property
+    def approved_signals(self) -> List[Dict]:
+        return [signal for signal, ok in zip(self.signals, self.approved) if ok]
+
+    def rejection_counts(self) -> Dict[str, int]:
+        counts = {}
+        for reason in self.reasons:
+            if reason:
+                counts[reason] = counts.get(reason, 0) + 1
+        return counts
+
+
+def _float(value, default: float = 0.0) -> float:
+    try:
+        return float(value) if value is not None else default
+    except (TypeError, ValueError):
+        return default
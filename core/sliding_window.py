@@ -0,0 +1,156 @@
+"""
+Time-bucketed sliding-window counters
+Counts, sums and win/loss tallies over rolling windows with O(1) update and query,
+for trade-frequency and performance statistics on the signal path
+"""
+import logging
+import math
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Standard windows used by the trading managers (name -> seconds)
+STANDARD_WINDOWS = {'1m': 60, '1h': 3600, '24h': 86400}
+
+
+class SlidingWindowCounter:
+    """Rolling count, sum and win/loss tallies over the last ``window_seconds``
+
+    The window is a ring of ``buckets`` time slots. Running totals are kept
+    alongside the ring, so a query only clears the slots that expired since
+    the last call: at most ``buckets`` slots, independent of how many events
+    fell inside the window. Resolution is one slot (``window / buckets``).
+    """
+
+    def __init__(self, window_seconds: float, buckets: int = 60):
+        self.window_seconds = float(window_seconds)
+        self.buckets = int(buckets)
+        self.bucket_seconds = self.window_seconds / self.buckets
+
+        self._epochs = np.full(self.buckets, -1, dtype=np.int64)
+        self._counts = np.zeros(self.buckets, dtype=np.int64)
+        self._sums = np.zeros(self.buckets)
+        self._wins = np.zeros(self.buckets, dtype=np.int64)
+        self._losses = np.zeros(self.buckets, dtype=np.int64)
+        self._head = -1  # Latest epoch seen
+
+        self._count = 0
+        self._sum = 0.0
+        self._win_count = 0
+        self._loss_count = 0
+
+    def _epoch(self, timestamp: Optional[float]) -> int:
+        return math.floor((time.time() if timestamp is None else timestamp) / self.bucket_seconds)
+
+    def _advance(self, epoch: int):
+        """Expire every slot that fell out of the window ending at ``epoch``"""
+        if epoch <= self._head:
+            return
+        if epoch - self._head >= self.buckets:
+            self._clear()
+        else:
+            for e in range(self._head + 1, epoch + 1):
+                self._evict(e % self.buckets)
+        self._head = epoch
+
+    def _evict(self, slot: int):
+        if self._epochs[slot] < 0:
+            return
+        self._count -= int(self._counts[slot])
+        self._sum -= float(self._sums[slot])
+        self._win_count -= int(self._wins[slot])
+        self._loss_count -= int(self._losses[slot])
+        self._epochs[slot] = -1
+        self._counts[slot] = self._wins[slot] = self._losses[slot] = 0
+        self._sums[slot] = 0.0
+        if not self._count:
+            self._sum = 0.0  # Drop accumulated rounding once the window is empty
+
+    def _clear(self):
+        self._epochs[:] = -1
+        self._counts[:] = 0
+        self._sums[:] = 0.0
+        self._wins[:] = 0
+        self._losses[:] = 0
+        self._count = self._win_count = self._loss_count = 0
+        self._sum = 0.0
+
+    def add(self, value: float = 0.0, timestamp: float = None, win: Optional[bool] = None):
+        """Record one event; ``win`` defaults to the sign of ``value`` (zero counts as neither)"""
+        epoch = self._epoch(timestamp)
+        self._advance(epoch)
+        if epoch <= self._head - self.buckets:
+            return  # Older than the window
+        slot = epoch % self.buckets
+        if self._epochs[slot] != epoch:
+            self._evict(slot)
+            self._epochs[slot] = epoch
+
+        if win is None:
+            win = value > 0 if value else None
+        self._counts[slot] += 1
+        self._sums[slot] += value
+        self._count += 1
+        self._sum += value
+        if win is True:
+            self._wins[slot] += 1
+            self._win_count += 1
+        elif win is False:
+            self._losses[slot] += 1
+            self._loss_count += 1
+
+    def count(self, now: float = None) -> int:
+        self._advance(self._epoch(now))
+        return self._count
+
+    def total(self, now: float = None) -> float:
+        self._advance(self._epoch(now))
+        return self._sum
+
+    def wins(self, now: float = None) -> int:
+        self._advance(self._epoch(now))
+        return self._win_count
+
+    def losses(self, now: float = None) -> int:
+        self._advance(self._epoch(now))
+        return self._loss_count
+
+    def win_rate(self, now: float = None, default: float = 0.5) -> float:
+        """Wins over decided events in the window, ``default`` when there are none"""
+        self._advance(self._epoch(now))
+        decided = self._win_count + self._loss_count
+        return self._win_count / decided if decided else default
+
+    def rate_per_hour(self, now: float = None) -> float:
+        return self.count(now) * 3600.0 / self.window_seconds
+
+
+class TradeWindows:
+    """The standard 1m/1h/24h sliding windows over one event stream"""
+
+    def __init__(self, windows: Dict[str, float] = None, buckets: int = 60):
+        self.windows = {name: SlidingWindowCounter(seconds, buckets)
+                        for name, seconds in (windows or STANDARD_WINDOWS).items()}
+
+    def __getitem__(self, name: str) -> SlidingWindowCounter:
+        return self.windows[name]
+
+    def record(self, value: float = 0.0, timestamp: float = None, win: Optional[bool] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        for window in self.windows.values():
+            window.add(value, timestamp, win)
+
+    def snapshot(self, now: float = None) -> Dict[str, Dict]:
+        now = time.time() if now is None else now
+        return {
+            name: {
+                'count': window.count(now),
+                'total': window.total(now),
+                'wins': window.wins(now),
+                'losses': window.losses(now)
+            }
+            for name, window in self.windows.items()
+        }
@@ -0,0 +1,172 @@
+"""
+Startup profiling
+Times startup phases and every module import (self and cumulative, like
+``python -X importtime``) so slow boots can be traced to the module responsible
+"""
+import importlib.abc
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_ms: float  # Executing the module body itself
+    cumulative_ms: float  # Including the imports it triggered
+    depth: int  # Nesting level; 0 for imports made directly by startup code
+    thread: str
+
+
+class _TimedLoader:
+    """Wraps a module loader so ``exec_module`` is timed; everything else is delegated"""
+
+    def __init__(self, loader, timer: 'ImportTimer'):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        create_module = getattr(self._loader, 'create_module', None)
+        return create_module(spec) if create_module is not None else None
+
+    def exec_module(self, module):
+        try:
+            with self._timer.timing(module.__name__):
+                self._loader.exec_module(module)
+        finally:
+            # The module keeps its real loader once it has run
+            module.__loader__ = self._loader
+            if getattr(module, '__spec__', None) is not None:
+                module.__spec__.loader = self._loader
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path finder recording how long each newly imported module takes to load
+
+    It finds nothing itself: it asks the finders after it for the spec and
+    wraps the spec's loader. Nested imports are attributed per thread, so a
+    module's self time excludes the modules it imported.
+    """
+
+    def __init__(self):
+        self.records: List[ImportRecord] = []
+        self._local = threading.local()
+
+    @property
+    def installed(self) -> bool:
+        return self in sys.meta_path
+
+    def install(self):
+        if not self.installed:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self.installed:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    @contextmanager
+    def timing(self, module: str):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = [time.perf_counter(), 0.0]  # Start, time spent in nested imports
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            cumulative = time.perf_counter() - frame[0]
+            if stack:
+                stack[-1][1] += cumulative
+            self.records.append(ImportRecord(
+                module=module,
+                self_ms=round((cumulative - frame[1]) * 1000, 3),
+                cumulative_ms=round(cumulative * 1000, 3),
+                depth=len(stack),
+                thread=threading.current_thread().name
+            ))
+
+    def slowest(self, count: int = 15, by: str = 'cumulative_ms') -> List[ImportRecord]:
+        return sorted(self.records, key=lambda record: getattr(record, by), reverse=True)[:count]
+
+
+class StartupProfile:
+    """Phase durations, milestones and import times from process start to first trading cycle"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}  # Phase name -> duration ms
+        self.milestones: Dict[str, float] = {}  # Milestone -> ms since start
+        self.imports = ImportTimer()
+        self.completed = False
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 3)
+
+    def start(self):
+        """Begin recording imports"""
+        self.imports.install()
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.perf_counter() - start) * 1000, 3)
+
+    def mark(self, milestone: str):
+        self.milestones[milestone] = self.elapsed_ms()
+
+    def finish(self):
+        """Stop recording imports; the report is final from here on"""
+        self.imports.uninstall()
+        self.mark('ready')
+        self.completed = True
+
+    def report(self, top: int = 15) -> Dict:
+        return {
+            'completed': self.completed,
+            'elapsed_ms': self.milestones.get('ready', self.elapsed_ms()),
+            'phases_ms': dict(self.phases),
+            'milestones_ms': dict(self.milestones),
+            'modules_imported': len(self.imports.records),
+            'slowest_imports': [asdict(record) for record in self.imports.slowest(top)],
+            'heaviest_modules': [asdict(record) for record in self.imports.slowest(top, by='self_ms')]
+        }
+
+    def format_report(self, top: int = 15) -> str:
+        """Text breakdown in the ``-X importtime`` layout"""
+        lines = [f"Startup took {self.milestones.get('ready', self.elapsed_ms()):.0f} ms"]
+        lines.extend(f"  {name}: {duration:.0f} ms" for name, duration in self.phases.items())
+        lines.append("import time: self [ms] | cumulative | imported package")
+        for record in self.imports.slowest(top):
+            lines.append(f"import time: {record.self_ms:8.1f} | {record.cumulative_ms:10.1f} | "
+                         f"{'  ' * record.depth}{record.module}")
+        return '\n'.join(lines)
+
+
+# Global instance
+startup_profile = StartupProfile()
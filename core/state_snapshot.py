@@ -0,0 +1,165 @@
+"""
+Warm-start state snapshots
+Periodically writes the analytic state of registered components (price histories,
+buffers, regime and performance history) to one compact binary file, atomically and
+off the event loop, and restores it at boot if it is recent enough
+"""
+import asyncio
+import logging
+import os
+import pickle
+import tempfile
+import time
+import zlib
+from typing import Dict, Optional
+
+from .config.settings import config
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'QTBSNAP1'
+SNAPSHOT_VERSION = 1
+
+
+class StateSnapshotter:
+    """Saves and restores the warm state of registered components
+
+    A component provides ``export_state() -> Dict`` and
+    ``restore_state(state: Dict)``. ``export_state`` runs on the event loop
+    and must return copies (the snapshot is serialized in a worker thread
+    while the component keeps changing). Files are written to a temporary
+    name and renamed into place, so a crash mid-write leaves the previous
+    snapshot intact.
+    """
+
+    def __init__(self, path: str = None, interval: float = None, max_age: float = None):
+        self.path = path or config.STATE_SNAPSHOT_PATH
+        self.interval = interval if interval is not None else config.STATE_SNAPSHOT_INTERVAL
+        self.max_age = max_age if max_age is not None else config.STATE_SNAPSHOT_MAX_AGE
+        self.components: Dict[str, object] = {}
+        self.running = False
+        self.restored_from: Optional[float] = None  # saved_at of the snapshot restored at boot
+        self._writing: Optional[asyncio.Future] = None
+        self.stats = {'saves': 0, 'failures': 0, 'last_save': None, 'last_size_bytes': 0, 'last_save_ms': 0.0}
+
+    def register(self, name: str, component):
+        self.components[name] = component
+
+    def collect(self) -> Dict:
+        """The snapshot of every registered component, as of now"""
+        components = {}
+        for name, component in self.components.items():
+            try:
+                components[name] = component.export_state()
+            except Exception as e:
+                logger.error(f"Error exporting state of {name}: {e}")
+        return {'version': SNAPSHOT_VERSION, 'saved_at': time.time(), 'components': components}
+
+    def write(self, snapshot: Dict) -> int:
+        """Serialize and atomically replace the snapshot file; returns its size in bytes"""
+        payload = SNAPSHOT_MAGIC + zlib.compress(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL), 3)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.snapshot-', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(payload)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return len(payload)
+
+    async def save(self) -> bool:
+        """Snapshot now, writing in a worker thread; skipped while a previous write is in flight"""
+        if self._writing is not None and not self._writing.done():
+            return False
+        start = time.perf_counter()
+        snapshot = self.collect()
+        loop = asyncio.get_running_loop()
+        self._writing = loop.run_in_executor(None, self.write, snapshot)
+        try:
+            size = await self._writing
+        except Exception as e:
+            self.stats['failures'] += 1
+            logger.error(f"Error writing state snapshot to {self.path}: {e}")
+            return False
+        self.stats['saves'] += 1
+        self.stats['last_save'] = snapshot['saved_at']
+        self.stats['last_size_bytes'] = size
+        self.stats['last_save_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return True
+
+    def load(self) -> Optional[Dict]:
+        """The snapshot on disk, or None if it is missing, unreadable or stale"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'rb') as handle:
+                payload = handle.read()
+            if not payload.startswith(SNAPSHOT_MAGIC):
+                raise ValueError("not a state snapshot")
+            snapshot = pickle.loads(zlib.decompress(payload[len(SNAPSHOT_MAGIC):]))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable state snapshot {self.path}: {e}")
+            return None
+
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            logger.warning(f"Ignoring state snapshot version {snapshot.get('version')} (expected {SNAPSHOT_VERSION})")
+            return None
+        age = time.time() - snapshot['saved_at']
+        if age > self.max_age:
+            logger.info(f"Ignoring stale state snapshot ({age:.0f}s old, limit {self.max_age}s)")
+            return None
+        return snapshot
+
+    def restore(self) -> Dict[str, bool]:
+        """Restore registered components from the snapshot on disk; returns which were restored"""
+        snapshot = self.load()
+        if snapshot is None:
+            return {}
+        restored = {}
+        for name, component in self.components.items():
+            state = snapshot['components'].get(name)
+            if state is None:
+                continue
+            try:
+                component.restore_state(state)
+                restored[name] = True
+            except Exception as e:
+                restored[name] = False
+                logger.error(f"Error restoring state of {name}: {e}")
+        self.restored_from = snapshot['saved_at']
+        logger.info(f"Restored warm state from {time.time() - snapshot['saved_at']:.0f}s ago: "
+                    f"{', '.join(name for name, ok in restored.items() if ok) or 'nothing'}")
+        return restored
+
+    async def run(self):
+        """Snapshot every ``interval`` seconds until ``stop``"""
+        self.running = True
+        while self.running:
+            await asyncio.sleep(self.interval)
+            if self.running:
+                await self.save()
+
+    async def stop(self):
+        """Stop the periodic loop and take a final snapshot"""
+        self.running = False
+        if self._writing is not None and not self._writing.done():
+            await asyncio.wait([self._writing])
+        await self.save()
+
+    def get_status(self) -> Dict:
+        return {
+            'path': self.path,
+            'components': list(self.components),
+            'restored_from': self.restored_from,
+            **self.stats
+        }
+
+
+# Global instance
+state_snapshotter = StateSnapshotter()
@@ -0,0 +1,267 @@
+"""
+Portfolio stress-testing engine
+Applies historical replays, correlated shocks from the live covariance and funding spikes
+to the open book in one vectorized pass: PnL, margin ratio and liquidations per scenario
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .config.settings import config
+from .portfolio_risk import market_id, portfolio_risk_engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StressResult:
+    """Outcome of one stress run; losses are positive numbers in account currency"""
+    scenarios: int
+    worst_loss: float
+    worst_scenario: str
+    expected_shortfall: float  # Mean loss of the worst 1% of scenarios
+    loss_95: float
+    loss_99: float
+    liquidation_probability: float  # Share of correlated scenarios that liquidate the account
+    liquidating_scenarios: int
+    positions_liquidated_worst: int
+    worst_margin_ratio: float
+    min_equity: float
+    by_source: Dict[str, Dict] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'scenarios': self.scenarios,
+            'worst_loss': self.worst_loss,
+            'worst_scenario': self.worst_scenario,
+            'expected_shortfall': self.expected_shortfall,
+            'loss_95': self.loss_95,
+            'loss_99': self.loss_99,
+            'liquidation_probability': self.liquidation_probability,
+            'liquidating_scenarios': self.liquidating_scenarios,
+            'positions_liquidated_worst': self.positions_liquidated_worst,
+            'worst_margin_ratio': self.worst_margin_ratio,
+            'min_equity': self.min_equity,
+            'by_source': self.by_source,
+            'elapsed_ms': self.elapsed_ms
+        }
+
+
+class StressEngine:
+    """Scenario matrix × position vector stress tests
+
+    Scenarios are log-return shocks per symbol (rows) plus a funding rate each.
+    Historical rows replay daily returns, correlated rows are fat-tailed draws
+    scaled by the portfolio risk engine's covariance, and funding rows apply
+    rate spikes with no price move. The standard draws are generated once and
+    reused, so a run is a few matrix products over the open positions.
+    Symbols are keyed by market id, as in the portfolio risk engine, so
+    ccxt unified position symbols meet their own history and covariance.
+    """
+
+    def __init__(self, correlated_scenarios: int = None, horizon_seconds: float = None,
+                 tail_dof: int = None, maintenance_margin_rate: float = None, seed: int = 7):
+        self.correlated_scenarios = correlated_scenarios or config.STRESS_CORRELATED_SCENARIOS
+        self.horizon_seconds = horizon_seconds or config.STRESS_HORIZON_SECONDS
+        self.tail_dof = tail_dof or config.STRESS_TAIL_DOF
+        self.maintenance_margin_rate = maintenance_margin_rate or config.MAINTENANCE_MARGIN_RATE
+        self.funding_spikes = np.asarray(config.STRESS_FUNDING_SPIKES, dtype=float) * config.STRESS_FUNDING_PERIODS
+
+        self.history: Dict[str, np.ndarray] = {}
+        self.history_labels: List[str] = []
+        self._rng = np.random.default_rng(seed)
+        self._draws = np.zeros((self.correlated_scenarios, 0))
+        self._tail_scale = self._student_t_scale()
+        self.last_result: Optional[StressResult] = None
+
+    def _student_t_scale(self) -> np.ndarray:
+        """Per-scenario scale turning normal draws into unit-variance Student-t draws"""
+        dof = self.tail_dof
+        chi2 = self._rng.chisquare(dof, self.correlated_scenarios)
+        return np.sqrt((dof - 2) / chi2) if dof > 2 else np.sqrt(dof / chi2)
+
+    def _standard_draws(self, n: int) -> np.ndarray:
+        if self._draws.shape[1] < n:
+            extra = self._rng.standard_normal((self.correlated_scenarios, n - self._draws.shape[1]))
+            self._draws = np.hstack([self._draws, extra])
+        return self._draws[:, :n]
+
+    def set_history(self, returns: Dict[str, Sequence[float]], labels: Sequence[str] = None):
+        """Daily log returns per symbol, aligned on the same days (oldest first)"""
+        length = min((len(r) for r in returns.values()), default=0)
+        self.history = {market_id(symbol): np.asarray(r, dtype=float)[-length:] for symbol, r in returns.items() if length}
+        self.history_labels = list(labels)[-length:] if labels is not None else [f"day-{i}" for i in range(length)]
+
+    async def load_history(self, exchange, symbols: Iterable[str], days: int = None):
+        """Replay scenarios from daily candles (ccxt ``fetch_ohlcv``)"""
+        days = days or config.STRESS_HISTORY_DAYS
+        symbols = list(symbols)
+        candles = await asyncio.gather(
+            *(exchange.fetch_ohlcv(symbol, '1d', limit=days + 1) for symbol in symbols),
+            return_exceptions=True
+        )
+        closes = {}
+        for symbol, rows in zip(symbols, candles):
+            if isinstance(rows, Exception) or not rows:
+                logger.warning(f"No daily history for {symbol}: {rows if isinstance(rows, Exception) else 'empty'}")
+                continue
+            closes[symbol] = {row[0]: row[4] for row in rows}
+        if not closes:
+            return
+
+        timestamps = sorted(set.intersection(*(set(c) for c in closes.values())))
+        if len(timestamps) < 2:
+            return
+        returns = {symbol: np.diff(np.log([c[t] for t in timestamps])) for symbol, c in closes.items()}
+        labels = [datetime.fromtimestamp(t / 1000).strftime('%Y-%m-%d') for t in timestamps[1:]]
+        self.set_history(returns, labels)
+        logger.info(f"Stress history loaded: {len(labels)} days for {len(returns)} symbols")
+
+    def _historical_shocks(self, symbols: List[str]) -> np.ndarray:
+        if not self.history:
+            return np.zeros((0, len(symbols)))
+        known = np.column_stack(list(self.history.values()))
+        market = known.mean(axis=1)  # Proxy for symbols without their own history
+        return np.column_stack([self.history.get(symbol, market) for symbol in symbols])
+
+    def _correlated_shocks(self, symbols: List[str]) -> np.ndarray:
+        ticks = self.horizon_seconds / max(portfolio_risk_engine.tick_seconds, 1e-3)
+        cov = portfolio_risk_engine.covariance(symbols) * ticks
+        eigenvalues, eigenvectors = np.linalg.eigh((cov + cov.T) / 2)
+        factor = eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+        return (self._standard_draws(len(symbols)) @ factor.T) * self._tail_scale[:, None]
+
+    def run(self, positions, balance: float, candidate: Dict = None) -> StressResult:
+        """Stress the open book, optionally with a proposed position added
+
+        ``positions`` holds position dicts (``symbol``, ``side``, ``quantity``,
+        ``entry_price`` and optional ``leverage``/``mark_price``), as a list or
+        a dict keyed by id. ``candidate`` is ``{'symbol', 'notional'
+        (signed), 'leverage'}``.
+        """
+        started = time.perf_counter()
+        book = _position_arrays(positions, candidate)
+        if not book['symbols']:
+            result = StressResult(0, 0.0, '', 0.0, 0.0, 0.0, 0.0, 0, 0, 0.0, balance,
+                                  elapsed_ms=(time.perf_counter() - started) * 1000)
+            self.last_result = result
+            return result
+
+        symbols = book['symbols']
+        historical = self._historical_shocks(symbols)
+        correlated = self._correlated_shocks(symbols)
+        funding_rows = np.zeros((len(self.funding_spikes), len(symbols)))
+        shocks = np.vstack([historical, correlated, funding_rows])
+        funding = np.concatenate([np.zeros(len(historical) + len(correlated)), self.funding_spikes])
+        sources = [('historical', len(historical)), ('correlated', len(correlated)), ('funding', len(funding_rows))]
+
+        # Scenario × position matrices
+        notional = book['notional']
+        gross = np.abs(notional)
+        moves = shocks[:, book['columns']]
+        growth = np.exp(moves)
+        pnl = notional * (growth - 1.0) - notional * funding[:, None]
+        shocked_gross = gross * growth
+
+        total_pnl = pnl.sum(axis=1)
+        equity = balance + book['unrealized'] + total_pnl
+        maintenance = self.maintenance_margin_rate * shocked_gross.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            margin_ratio = np.where(equity > 0, maintenance / equity, np.inf)
+        account_liquidated = equity <= maintenance
+        # Isolated view: a position is liquidated once its loss eats its margin down to maintenance
+        positions_liquidated = (-pnl >= gross / book['leverage'] - self.maintenance_margin_rate * shocked_gross).sum(axis=1)
+
+        losses = -total_pnl
+        worst = int(np.argmax(losses))
+        tail = np.sort(losses)[-max(1, len(losses) // 100):]
+        correlated_slice = slice(len(historical), len(historical) + len(correlated))
+
+        by_source, offset = {}, 0
+        for name, count in sources:
+            if count:
+                part = slice(offset, offset + count)
+                by_source[name] = {
+                    'scenarios': count,
+                    'worst_loss': float(losses[part].max()),
+                    'liquidating_scenarios': int(account_liquidated[part].sum())
+                }
+            offset += count
+
+        result = StressResult(
+            scenarios=len(losses),
+            worst_loss=float(losses[worst]),
+            worst_scenario=self._label(worst, sources),
+            expected_shortfall=float(tail.mean()),
+            loss_95=float(np.percentile(losses, 95)),
+            loss_99=float(np.percentile(losses, 99)),
+            liquidation_probability=float(account_liquidated[correlated_slice].mean()) if len(correlated) else 0.0,
+            liquidating_scenarios=int(account_liquidated.sum()),
+            positions_liquidated_worst=int(positions_liquidated[worst]),
+            worst_margin_ratio=float(margin_ratio.max()),
+            min_equity=float(equity.min()),
+            by_source=by_source,
+            elapsed_ms=(time.perf_counter() - started) * 1000
+        )
+        self.last_result = result
+        return result
+
+    def _label(self, row: int, sources) -> str:
+        for name, count in sources:
+            if row < count:
+                if name == 'historical':
+                    return f"historical:{self.history_labels[row]}"
+                if name == 'funding':
+                    return f"funding:{self.funding_spikes[row]:+.2%}"
+                return f"correlated:{row}"
+            row -= count
+        return ''
+
+
+def _position_arrays(positions, candidate: Dict = None) -> Dict:
+    """Signed notionals, leverage, symbol columns and unrealized PnL of a book"""
+    entries = list(positions.values()) if isinstance(positions, dict) else list(positions or [])
+    symbols, columns, notional, leverage = [], [], [], []
+    unrealized = 0.0
+
+    def column(symbol: str) -> int:
+        symbol = market_id(symbol)
+        if symbol not in symbols:
+            symbols.append(symbol)
+        return symbols.index(symbol)
+
+    for position in entries:
+        quantity = float(position.get('quantity', 0) or 0)
+        if not quantity:
+            continue
+        symbol = position['symbol']
+        direction = -1.0 if str(position.get('side')).lower() in ('sell', 'short') else 1.0
+        entry_price = float(position.get('entry_price', 0) or 0)
+        mark_price = float(position.get('mark_price') or portfolio_risk_engine.last_price(symbol) or entry_price)
+        columns.append(column(symbol))
+        notional.append(direction * abs(quantity) * mark_price)
+        leverage.append(float(position.get('leverage') or config.DEFAULT_LEVERAGE))
+        unrealized += direction * abs(quantity) * (mark_price - entry_price)
+
+    if candidate and candidate.get('notional'):
+        columns.append(column(candidate['symbol']))
+        notional.append(float(candidate['notional']))
+        leverage.append(float(candidate.get('leverage') or config.DEFAULT_LEVERAGE))
+
+    return {
+        'symbols': symbols,
+        'columns': np.asarray(columns, dtype=int),
+        'notional': np.asarray(notional, dtype=float),
+        'leverage': np.maximum(np.asarray(leverage, dtype=float), 1.0),
+        'unrealized': unrealized
+    }
+
+
+# Global instance
+stress_engine = StressEngine()
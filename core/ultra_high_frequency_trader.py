@@ -4,6 +4,7 @@ Specialized for 1-5 minute holds with 620% monthly target potential
 """
 
 import asyncio
+import copy
 import json
 import logging
 import numpy as np
@@ -13,6 +14,7 @@ from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 from .config.settings import config
+from .sliding_window import TradeWindows
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +30,8 @@ class UltraHighFrequencyTrader:
         
         # Ultra-high frequency state tracking
         self.last_signal_time = None
+        self.signal_windows = TradeWindows()  # Signals emitted
+        self.trade_windows = TradeWindows()  # Closed trades, valued by PnL %
         self.active_positions = {}
         self.volatility_history = []
         self.momentum_tracker = {}
@@ -466,10 +470,15 @@ class UltraHighFrequencyTrader:
     def _can_generate_signal(self) -> bool:
         """Check if new signal can be generated based on frequency limits"""
         try:
+            uhf_config = self.axs_config['ultra_high_frequency']
+            max_per_hour = uhf_config.get('max_trades_per_hour')
+            if max_per_hour and self.signal_windows['1h'].count() >= max_per_hour:
+                return False
+            
             if not self.last_signal_time:
                 return True
             
-            min_interval = self.axs_config['ultra_high_frequency']['min_signal_interval']
+            min_interval = uhf_config['min_signal_interval']
             time_since_last = (datetime.now() - self.last_signal_time).total_seconds()
             
             return time_since_last >= min_interval
@@ -551,6 +560,11 @@ class UltraHighFrequencyTrader:
             hold_time = trade_result.get('hold_time_seconds', 0)
             pnl_pct = trade_result.get('pnl_pct', 0)
             
+            self.trade_windows.record(pnl_pct)
+            hourly = self.trade_windows['1h']
+            self.frequency_metrics['trades_per_hour'] = hourly.count()
+            self.frequency_metrics['success_rate'] = hourly.win_rate(default=0)
+            
             logger.info(f"UHF Metrics Update - Hold Time: {hold_time}s, "
                        f"PnL: {pnl_pct:.2%}, Consecutive Losses: {self.consecutive_losses}")
             
@@ -566,6 +580,7 @@ class UltraHighFrequencyTrader:
                 'circuit_breaker_active': self.circuit_breaker_active,
                 'cooldown_end_time': self.cooldown_end_time.isoformat() if self.cooldown_end_time else None,
                 'last_signal_time': self.last_signal_time.isoformat() if self.last_signal_time else None,
+                'signals_last_hour': self.signal_windows['1h'].count(),
                 'active_positions': len(self.active_positions),
                 'volatility_readings': len(self.volatility_history),
                 'target_monthly_return': self.axs_config['target_performance']['monthly_target']
@@ -578,6 +593,21 @@ class UltraHighFrequencyTrader:
     def update_signal_time(self):
         """Update last signal generation time"""
         self.last_signal_time = datetime.now()
+        self.signal_windows.record()
+    
+    # Metrics carried across restarts; open positions are re-read from the exchange
+    WARM_STATE = ('last_signal_time', 'signal_windows', 'trade_windows', 'volatility_history', 'momentum_tracker',
+                  'frequency_metrics', 'consecutive_losses', 'circuit_breaker_active', 'cooldown_end_time')
+    
+    def export_state(self) -> Dict:
+        """Performance metrics and circuit breaker state for warm-start snapshots (copies)"""
+        return copy.deepcopy({name: getattr(self, name) for name in self.WARM_STATE})
+    
+    def restore_state(self, state: Dict):
+        """Resume from a warm-start snapshot"""
+        for name in self.WARM_STATE:
+            if name in state:
+                setattr(self, name, state[name])
 
 # Global instance
 ultra_high_frequency_trader = UltraHighFrequencyTrader()
\ No newline at end of file
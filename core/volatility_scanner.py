@@ -13,6 +13,7 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 import logging
 import ccxt.async_support as ccxt
+from scipy.stats import percentileofscore
 from enum import Enum
 import json
 import os
@@ -21,6 +22,12 @@ import heapq
 import aiohttp
 import time
 
+from .candle_buffer import CandleSeries
+from .cross_sectional_volatility import CrossSectionalVolatility
+from .metric_history import MetricHistory
+from .rolling_percentile import PercentileTracker
+from .scan_scheduler import ScanScheduler, TICKERS_WEIGHT, kline_weight
+
 logger = logging.getLogger(__name__)
 
 class VolatilityState(Enum):
@@ -142,7 +149,8 @@ class AdvancedVolatilityScanner:
                  api_secret: str,
                  testnet: bool = False,
                  scan_interval: int = 30,
-                 max_monitored_pairs: int = 50):
+                 max_monitored_pairs: int = 50,
+                 cross_sectional: bool = False):
         """
         Initialize the advanced volatility scanner
         
@@ -152,12 +160,14 @@ class AdvancedVolatilityScanner:
             testnet: Use testnet if True
             scan_interval: Seconds between scans
             max_monitored_pairs: Maximum pairs to monitor
+            cross_sectional: Scan every monitored pair in one vectorized pass
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.testnet = testnet
         self.scan_interval = scan_interval
         self.max_monitored_pairs = max_monitored_pairs
+        self.cross_sectional = cross_sectional
         
         # Exchange connection
         self.exchange = None
@@ -165,8 +175,11 @@ class AdvancedVolatilityScanner:
         # Tracked pairs and their data
         self.monitored_pairs: Set[str] = set()
         self.volatility_profiles: Dict[str, VolatilityProfile] = {}
-        self.historical_data: Dict[str, pd.DataFrame] = {}
-        self.volatility_history: Dict[str, deque] = {}
+        self.candles: Dict[str, CandleSeries] = {}  # Incrementally updated 5m bars per symbol
+        self.timeframe = '5m'
+        self.candle_limit = 500  # ~40 hours of data
+        self.volatility_history: Dict[str, MetricHistory] = {}  # float32 metric snapshots per scan
+        self.volatility_percentiles: Dict[str, PercentileTracker] = {}  # 1h vol ranked over 24h/7d/30d
         
         # Dynamic pair management
         self.active_pairs: Set[str] = set()
@@ -202,6 +215,16 @@ class AdvancedVolatilityScanner:
             'accumulation_volume': 1.5
         }
         
+        # Whole-universe vectorized metrics (cross-sectional mode)
+        self.cross_section = CrossSectionalVolatility(
+            breakout_multiplier=self.volatility_thresholds['breakout_multiplier'],
+            trend_strength=self.regime_params['trend_strength'],
+            length=self.candle_limit
+        )
+        
+        # Per-pair rescan intervals by opportunity tier, within the request-weight budget
+        self.scheduler = ScanScheduler()
+        
         # Initialize components
         self.running = False
         self.scanner_task = None
@@ -270,7 +293,7 @@ class AdvancedVolatilityScanner:
             
             # Initialize history tracking
             for symbol in self.monitored_pairs:
-                self.volatility_history[symbol] = deque(maxlen=288)  # 24 hours at 5-min intervals
+                self.volatility_history[symbol] = MetricHistory(288)  # 24 hours at 5-min intervals
             
             logger.info(f"Initialized with {len(self.active_pairs)} active pairs, "
                        f"{len(self.candidate_pairs)} candidates")
@@ -388,12 +411,12 @@ class AdvancedVolatilityScanner:
             logger.error(f"Error calculating volatility metrics for {symbol}: {e}")
             return {}
     
-    def detect_market_regime(self, ohlcv_data: pd.DataFrame, volatility_metrics: Dict) -> MarketCondition:
+    def detect_market_regime(self, ohlcv_data, volatility_metrics: Dict) -> MarketCondition:
         """
         Detect current market regime using price action and volatility
         
         Args:
-            ohlcv_data: OHLCV data
+            ohlcv_data: OHLCV data (DataFrame or CandleSeries)
             volatility_metrics: Calculated volatility metrics
             
         Returns:
@@ -403,16 +426,13 @@ class AdvancedVolatilityScanner:
             if len(ohlcv_data) < 50:
                 return MarketCondition.RANGING
             
-            close = ohlcv_data['close']
-            volume = ohlcv_data['volume']
+            # Only the newest 50 bars matter, so work on array tails
+            close = np.asarray(ohlcv_data['close'], dtype=float)[-50:]
+            volume = np.asarray(ohlcv_data['volume'], dtype=float)[-20:]
             
             # Calculate trend strength
-            sma_20 = close.rolling(window=20).mean()
-            sma_50 = close.rolling(window=50).mean()
-            
-            current_price = close.iloc[-1]
-            sma_20_current = sma_20.iloc[-1]
-            sma_50_current = sma_50.iloc[-1]
+            sma_20_current = close[-20:].mean()
+            sma_50_current = close.mean()
             
             # Trend detection
             if sma_20_current > sma_50_current * 1.02:
@@ -426,16 +446,15 @@ class AdvancedVolatilityScanner:
                 trend_strength = 0
             
             # RSI for exhaustion detection
-            delta = close.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            current_rsi = rsi.iloc[-1]
+            delta = np.diff(close[-15:])
+            gain = np.where(delta > 0, delta, 0).mean()
+            loss = np.where(delta < 0, -delta, 0).mean()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                current_rsi = 100 - (100 / (1 + gain / loss))
             
             # Volume analysis
-            avg_volume = volume.rolling(window=20).mean().iloc[-1]
-            current_volume = volume.iloc[-1]
+            avg_volume = volume.mean()
+            current_volume = volume[-1]
             volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
             
             # Volatility breakout detection
@@ -448,7 +467,7 @@ class AdvancedVolatilityScanner:
             
             # Accumulation/Distribution
             if trend == 'neutral' and volume_ratio > 1.5:
-                if close.iloc[-5:].mean() > close.iloc[-10:-5].mean():
+                if close[-5:].mean() > close[-10:-5].mean():
                     return MarketCondition.ACCUMULATION
                 else:
                     return MarketCondition.DISTRIBUTION
@@ -466,19 +485,21 @@ class AdvancedVolatilityScanner:
             logger.error(f"Error detecting market regime: {e}")
             return MarketCondition.RANGING
     
-    def classify_volatility_state(self, volatility_metrics: Dict, historical_volatility: deque) -> VolatilityState:
+    def classify_volatility_state(self, volatility_metrics: Dict, historical_volatility) -> VolatilityState:
         """
         Classify current volatility state based on historical context
         
         Args:
             volatility_metrics: Current volatility metrics
-            historical_volatility: Historical volatility data
+            historical_volatility: Historical volatility data (deque of metrics or PercentileTracker)
             
         Returns:
             VolatilityState enum
         """
         try:
             current_vol = volatility_metrics.get('vol_1h', 0)
+            if isinstance(historical_volatility, PercentileTracker):
+                historical_volatility = historical_volatility['24h']
             
             if not historical_volatility or len(historical_volatility) < 10:
                 # Not enough history, use absolute thresholds
@@ -494,11 +515,15 @@ class AdvancedVolatilityScanner:
                     return VolatilityState.EXTREME
             
             # Calculate percentile
-            historical_values = [h.get('vol_1h', 0) for h in historical_volatility]
-            percentile = percentileofscore(historical_values, current_vol)
+            if hasattr(historical_volatility, 'percentile'):
+                percentile = historical_volatility.percentile(current_vol)
+                avg_vol = historical_volatility.mean()
+            else:
+                historical_values = [h.get('vol_1h', 0) for h in historical_volatility]
+                percentile = percentileofscore(historical_values, current_vol)
+                avg_vol = np.mean(historical_values)
             
             # Check for breakout
-            avg_vol = np.mean(historical_values)
             if current_vol > avg_vol * self.volatility_thresholds['breakout_multiplier']:
                 return VolatilityState.BREAKOUT
             
@@ -572,99 +597,125 @@ class AdvancedVolatilityScanner:
         
         return min(score, 100)
     
-    async def scan_single_pair(self, symbol: str) -> Optional[VolatilityProfile]:
+    async def _refresh_candles(self, symbol: str) -> Optional[CandleSeries]:
+        """
+        Bring a symbol's candle buffer up to date
+        
+        The first call loads the full history; later calls fetch only from the
+        newest stored bar on, which refreshes the forming bar and appends any
+        bars closed since the last scan.
+        """
+        series = self.candles.get(symbol)
+        bar_ms = self.exchange.parse_timeframe(self.timeframe) * 1000
+        if series is not None and len(series):
+            missed = (self.exchange.milliseconds() - series.last_timestamp) // bar_ms + 1
+            if missed < self.candle_limit:
+                self.scheduler.spend(kline_weight(int(missed) + 1))
+                series.update(await self.exchange.fetch_ohlcv(
+                    symbol, self.timeframe, since=series.last_timestamp, limit=int(missed) + 1
+                ))
+                return series
+        
+        self.scheduler.spend(kline_weight(self.candle_limit))
+        ohlcv = await self.exchange.fetch_ohlcv(symbol, self.timeframe, limit=self.candle_limit)
+        if not ohlcv:
+            return None
+        series = CandleSeries(symbol, self.candle_limit)
+        series.update(ohlcv)
+        self.candles[symbol] = series
+        return series
+    
+    def _build_profile(self, symbol: str, metrics: Dict, ticker: Dict, vol_state: VolatilityState,
+                       market_condition: MarketCondition, percentile_24h: float,
+                       breakout_strength: float, percentile_7d: float = 0,
+                       percentile_30d: float = 0) -> VolatilityProfile:
+        """Volatility profile from computed metrics; scores are filled in by the caller"""
+        bid_ask_spread = (ticker['ask'] - ticker['bid']) / ticker['bid'] * 100 if ticker['bid'] else 0
+        breakout_detected = vol_state == VolatilityState.BREAKOUT
+        
+        return VolatilityProfile(
+            symbol=symbol,
+            timestamp=datetime.now(),
+            atr=metrics.get('atr', 0),
+            atr_percent=metrics.get('atr_percent', 0),
+            historical_vol=metrics.get('historical_vol', 0),
+            parkinson_vol=metrics.get('parkinson_vol', 0),
+            garman_klass_vol=metrics.get('garman_klass_vol', 0),
+            yang_zhang_vol=metrics.get('yang_zhang_vol', 0),
+            vol_5min=metrics.get('vol_5min', 0),
+            vol_15min=metrics.get('vol_15min', 0),
+            vol_1h=metrics.get('vol_1h', 0),
+            vol_4h=metrics.get('vol_4h', 0),
+            vol_24h=metrics.get('vol_24h', 0),
+            vol_7d=0,  # Would need more data
+            vol_30d=0,  # Would need more data
+            percentile_24h=percentile_24h,
+            percentile_7d=percentile_7d,
+            percentile_30d=percentile_30d,
+            volume_24h=ticker.get('quoteVolume', 0),
+            volume_spike_ratio=metrics.get('volume_spike_ratio', 1),
+            volume_volatility_correlation=metrics.get('volume_volatility_correlation', 0),
+            price_change_5min=metrics.get('price_change_5min', 0),
+            price_change_1h=metrics.get('price_change_1h', 0),
+            price_change_24h=metrics.get('price_change_24h', 0),
+            high_low_ratio=metrics.get('high_low_ratio', 0),
+            volatility_state=vol_state,
+            market_condition=market_condition,
+            breakout_detected=breakout_detected,
+            breakout_strength=breakout_strength,
+            volatility_score=0,  # Will be calculated
+            opportunity_score=0,  # Will be calculated
+            risk_score=0,  # Will be calculated
+            bid_ask_spread=bid_ask_spread
+        )
+    
+    async def scan_single_pair(self, symbol: str, ticker: Dict = None) -> Optional[VolatilityProfile]:
         """
         Scan a single pair for volatility metrics
         
         Args:
             symbol: Trading pair symbol
+            ticker: Ticker from a bulk ``fetch_tickers``; fetched on its own if omitted
             
         Returns:
             VolatilityProfile or None
         """
         try:
-            # Fetch OHLCV data
-            timeframe = '5m'
-            limit = 500  # ~40 hours of data
-            ohlcv = await self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            # Incremental OHLCV update
+            series = await self._refresh_candles(symbol)
             
-            if not ohlcv or len(ohlcv) < 30:
+            if series is None or len(series) < 30:
                 return None
             
-            # Convert to DataFrame
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            
-            # Store historical data
-            self.historical_data[symbol] = df
-            
-            # Calculate volatility metrics
-            metrics = await self.calculate_volatility_metrics(symbol, df)
+            # Volatility metrics from the buffer's running statistics
+            metrics = series.metrics()
             
             if not metrics:
                 return None
             
-            # Get historical volatility for this symbol
-            historical = self.volatility_history.get(symbol, deque(maxlen=288))
+            # Rolling 24h/7d/30d ranking of this symbol's 1h volatility
+            tracker = self.volatility_percentiles.setdefault(symbol, PercentileTracker())
             
             # Classify volatility state
-            vol_state = self.classify_volatility_state(metrics, historical)
+            vol_state = self.classify_volatility_state(metrics, tracker)
             
             # Detect market regime
-            market_condition = self.detect_market_regime(df, metrics)
+            market_condition = self.detect_market_regime(series, metrics)
             
             # Calculate percentiles
-            if len(historical) > 0:
-                vol_values_24h = [h.get('vol_1h', 0) for h in list(historical)[-288:]]
-                percentile_24h = percentileofscore(vol_values_24h, metrics.get('vol_1h', 0)) if vol_values_24h else 50
-            else:
-                percentile_24h = 50
+            percentiles = tracker.percentiles(metrics.get('vol_1h', 0))
             
             # Detect breakout
-            breakout_detected = vol_state == VolatilityState.BREAKOUT
             breakout_strength = metrics.get('vol_1h', 0) / metrics.get('vol_24h', 1) if metrics.get('vol_24h', 0) > 0 else 1
             
             # Get additional market data
-            ticker = await self.exchange.fetch_ticker(symbol)
-            bid_ask_spread = (ticker['ask'] - ticker['bid']) / ticker['bid'] * 100 if ticker['bid'] else 0
+            if ticker is None:
+                ticker = await self.exchange.fetch_ticker(symbol)
             
             # Create volatility profile
-            profile = VolatilityProfile(
-                symbol=symbol,
-                timestamp=datetime.now(),
-                atr=metrics.get('atr', 0),
-                atr_percent=metrics.get('atr_percent', 0),
-                historical_vol=metrics.get('historical_vol', 0),
-                parkinson_vol=metrics.get('parkinson_vol', 0),
-                garman_klass_vol=metrics.get('garman_klass_vol', 0),
-                yang_zhang_vol=metrics.get('yang_zhang_vol', 0),
-                vol_5min=metrics.get('vol_5min', 0),
-                vol_15min=metrics.get('vol_15min', 0),
-                vol_1h=metrics.get('vol_1h', 0),
-                vol_4h=metrics.get('vol_4h', 0),
-                vol_24h=metrics.get('vol_24h', 0),
-                vol_7d=0,  # Would need more data
-                vol_30d=0,  # Would need more data
-                percentile_24h=percentile_24h,
-                percentile_7d=0,  # Would need more data
-                percentile_30d=0,  # Would need more data
-                volume_24h=ticker.get('quoteVolume', 0),
-                volume_spike_ratio=metrics.get('volume_spike_ratio', 1),
-                volume_volatility_correlation=metrics.get('volume_volatility_correlation', 0),
-                price_change_5min=metrics.get('price_change_5min', 0),
-                price_change_1h=metrics.get('price_change_1h', 0),
-                price_change_24h=metrics.get('price_change_24h', 0),
-                high_low_ratio=metrics.get('high_low_ratio', 0),
-                volatility_state=vol_state,
-                market_condition=market_condition,
-                breakout_detected=breakout_detected,
-                breakout_strength=breakout_strength,
-                volatility_score=0,  # Will be calculated
-                opportunity_score=0,  # Will be calculated
-                risk_score=0,  # Will be calculated
-                bid_ask_spread=bid_ask_spread
-            )
+            profile = self._build_profile(symbol, metrics, ticker, vol_state, market_condition,
+                                          percentiles['24h'], breakout_strength,
+                                          percentiles['7d'], percentiles['30d'])
             
             # Calculate scores
             profile.opportunity_score = self.calculate_opportunity_score(profile)
@@ -672,7 +723,8 @@ class AdvancedVolatilityScanner:
             profile.risk_score = min(profile.atr_percent * 10, 100)  # Simple risk score
             
             # Update history
-            self.volatility_history[symbol].append(metrics)
+            self.volatility_history.setdefault(symbol, MetricHistory(288)).append(metrics)
+            tracker.add(metrics.get('vol_1h', 0))
             
             return profile
             
@@ -680,24 +732,53 @@ class AdvancedVolatilityScanner:
             logger.error(f"Error scanning pair {symbol}: {e}")
             return None
     
+    def _scan_pool(self) -> List[str]:
+        """Pairs the scheduler chooses from: active, then candidates, then dormant"""
+        pool = list(self.active_pairs) + list(self.candidate_pairs) + list(self.dormant_pairs)
+        return [symbol for symbol in pool if symbol not in self.blacklisted_pairs]
+    
+    def _scan_weight(self, symbol: str) -> int:
+        """Expected request weight of scanning a pair (full history load or incremental update)"""
+        series = self.candles.get(symbol)
+        return kline_weight(3) if series is not None and len(series) else kline_weight(self.candle_limit)
+    
+    async def _scheduled_scan(self, symbol: str, ticker: Dict = None) -> Optional[VolatilityProfile]:
+        """Scan a pair within the concurrency cap and move it to the tier its score earns"""
+        async with self.scheduler.semaphore:
+            profile = await self.scan_single_pair(symbol, ticker)
+        self.scheduler.record(symbol, profile.opportunity_score if profile else None)
+        return profile
+    
     async def scan_all_pairs(self) -> List[VolatilityProfile]:
         """
-        Scan all monitored pairs for volatility
+        Scan the pairs that are due for volatility
+        
+        Each pair is rescanned on its tier's interval (hot pairs every few
+        seconds, dormant pairs every few minutes), most overdue first and
+        only as many as the request-weight budget allows.
         
         Returns:
-            List of volatility profiles
+            List of volatility profiles for the pairs scanned
         """
+        if self.cross_sectional:
+            return await self.scan_universe()
+        
         start_time = time.time()
         profiles = []
         
-        # Scan active pairs first
-        tasks = []
-        for symbol in self.active_pairs:
-            tasks.append(self.scan_single_pair(symbol))
+        symbols = self.scheduler.due(self._scan_pool(), cost=self._scan_weight, reserve=TICKERS_WEIGHT)
+        if not symbols:
+            return profiles
         
-        # Then scan candidate pairs
-        for symbol in list(self.candidate_pairs)[:10]:  # Scan top 10 candidates
-            tasks.append(self.scan_single_pair(symbol))
+        # Spreads and 24h volume for every pair from one bulk request
+        try:
+            self.scheduler.spend(TICKERS_WEIGHT)
+            tickers = await self.exchange.fetch_tickers(symbols)
+        except Exception as e:
+            logger.warning(f"Bulk ticker fetch failed, falling back to per-pair tickers: {e}")
+            tickers = {}
+        
+        tasks = [self._scheduled_scan(symbol, tickers.get(symbol)) for symbol in symbols]
         
         # Execute scans concurrently
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -723,6 +804,95 @@ class AdvancedVolatilityScanner:
         
         return profiles
     
+    async def scan_universe(self, symbols: List[str] = None) -> List[VolatilityProfile]:
+        """
+        Scan every monitored pair in one cross-sectional pass
+        
+        Candles are refreshed incrementally for the pairs the scheduler finds
+        due, within its request-weight budget and concurrency cap; the other
+        pairs take part with the candles they already hold. Metrics, regimes,
+        volatility states, percentiles and opportunity scores are computed for
+        the whole universe at once on aligned (symbol x time) arrays.
+        
+        Args:
+            symbols: Pairs to scan (default: all monitored pairs)
+            
+        Returns:
+            List of volatility profiles (none when no pair is due)
+        """
+        start_time = time.time()
+        symbols = list(symbols if symbols is not None else self.monitored_pairs or self.active_pairs)
+        due = self.scheduler.due(symbols, cost=self._scan_weight, reserve=TICKERS_WEIGHT)
+        if not due:
+            return []
+        
+        try:
+            self.scheduler.spend(TICKERS_WEIGHT)
+            tickers = await self.exchange.fetch_tickers(symbols)
+        except Exception as e:
+            logger.warning(f"Bulk ticker fetch failed, scanning without tickers: {e}")
+            tickers = {}
+        
+        async def refresh(symbol: str) -> Optional[CandleSeries]:
+            async with self.scheduler.semaphore:
+                return await self._refresh_candles(symbol)
+        
+        refreshed = await asyncio.gather(*(refresh(symbol) for symbol in due), return_exceptions=True)
+        updated = set()
+        for symbol, series in zip(due, refreshed):
+            if isinstance(series, CandleSeries):
+                updated.add(symbol)
+            elif isinstance(series, Exception):
+                logger.error(f"Error refreshing candles for {symbol}: {series}")
+        candles = {
+            symbol: self.candles[symbol] for symbol in symbols
+            if symbol in self.candles and (symbol in updated or symbol not in due)
+        }
+        
+        snapshot = self.cross_section.evaluate(candles)
+        profiles = []
+        for i, symbol in enumerate(snapshot.symbols):
+            metrics = snapshot.row(i)
+            ticker = tickers.get(symbol) or {'bid': 0, 'ask': 0, 'quoteVolume': 0}
+            tracker = self.volatility_percentiles.setdefault(symbol, PercentileTracker())
+            percentiles = tracker.percentiles(metrics['vol_1h'])
+            profile = self._build_profile(
+                symbol, metrics, ticker,
+                VolatilityState(snapshot.state(i)), MarketCondition(snapshot.regime(i)),
+                float(snapshot.percentile_24h[i]), float(snapshot.breakout_strength[i]),
+                percentiles['7d'], percentiles['30d']
+            )
+            profile.opportunity_score = float(snapshot.opportunity_score[i])
+            profile.volatility_score = float(snapshot.volatility_score[i])
+            profile.risk_score = float(snapshot.risk_score[i])
+            
+            # Pairs evaluated on the candles they held add nothing new to their history
+            if symbol in updated:
+                tracker.add(metrics['vol_1h'])
+                self.volatility_history.setdefault(symbol, MetricHistory(288)).append(metrics)
+            self.volatility_profiles[symbol] = profile
+            profiles.append(profile)
+        
+        scores = {profile.symbol: profile.opportunity_score for profile in profiles}
+        for symbol in due:
+            self.scheduler.record(symbol, scores.get(symbol) if symbol in updated else None)
+        
+        scan_time = time.time() - start_time
+        self.scan_performance.append({
+            'timestamp': datetime.now(),
+            'scan_time': scan_time,
+            'pairs_scanned': len(symbols),
+            'pairs_refreshed': len(updated),
+            'successful_scans': len(profiles),
+            'compute_ms': snapshot.elapsed_ms
+        })
+        self.scan_count += 1
+        self.last_scan_time = datetime.now()
+        
+        logger.info(f"Cross-sectional scan of {len(profiles)} pairs in {scan_time:.2f}s "
+                    f"(metrics {snapshot.elapsed_ms:.1f}ms)")
+        return profiles
+    
     def identify_opportunities(self, profiles: List[VolatilityProfile]) -> List[TradingOpportunity]:
         """
         Identify trading opportunities from volatility profiles
@@ -833,10 +1003,9 @@ class AdvancedVolatilityScanner:
                         profile.opportunity_score < 30):
                         
                         # Check historical volatility
-                        history = self.volatility_history.get(symbol, deque())
-                        if len(history) >= 288:  # 24 hours of data
-                            recent_scores = [h.get('vol_1h', 0) for h in list(history)[-288:]]
-                            avg_recent_vol = np.mean(recent_scores)
+                        history = self.volatility_history.get(symbol)
+                        if history is not None and len(history) >= 288:  # 24 hours of data
+                            avg_recent_vol = np.nanmean(history.column('vol_1h')[-288:])
                             if avg_recent_vol < 0.02:  # Less than 2% average volatility
                                 pairs_to_remove.add(symbol)
                                 logger.info(f"Removing {symbol} from active pairs - low volatility")
@@ -851,6 +1020,8 @@ class AdvancedVolatilityScanner:
                 active_profiles.sort(key=lambda x: x.opportunity_score, reverse=True)
                 self.active_pairs = set([p.symbol for p in active_profiles[:15]])
             
+            self.dormant_pairs -= self.active_pairs
+            
             # Update candidate pairs
             all_monitored = set([p.symbol for p in profiles])
             self.candidate_pairs = all_monitored - self.active_pairs - self.dormant_pairs
@@ -876,19 +1047,24 @@ class AdvancedVolatilityScanner:
         
         while self.running:
             try:
-                # Scan all pairs
+                # Scan the pairs that are due
                 profiles = await self.scan_all_pairs()
                 
                 # Identify opportunities
                 opportunities = self.identify_opportunities(profiles)
                 
-                # Update tracked opportunities
-                self.opportunities = opportunities
+                # Update tracked opportunities, keeping live ones for pairs not rescanned
+                scanned = {profile.symbol for profile in profiles}
+                now = datetime.now()
+                self.opportunities = [opp for opp in self.opportunities
+                                      if opp.symbol not in scanned and opp.expires_at > now] + opportunities
                 for opp in opportunities:
                     self.opportunity_history.append(opp)
                 
-                # Update active pairs dynamically
-                await self.update_active_pairs(profiles)
+                # Update active pairs dynamically from the latest profile of every pair
+                pool = self._scan_pool()
+                await self.update_active_pairs([self.volatility_profiles[symbol] for symbol in pool
+                                                if symbol in self.volatility_profiles])
                 
                 # Log summary
                 if opportunities:
@@ -898,8 +1074,12 @@ class AdvancedVolatilityScanner:
                                   f"(confidence: {opp.confidence:.2f}, "
                                   f"score: {opp.volatility_profile.opportunity_score:.1f})")
                 
-                # Sleep before next scan
-                await asyncio.sleep(self.scan_interval)
+                # Sleep until the next pair is due (whole-universe scans keep the fixed interval)
+                if self.cross_sectional:
+                    await asyncio.sleep(self.scan_interval)
+                else:
+                    wait = self.scheduler.seconds_until_next(self._scan_pool())
+                    await asyncio.sleep(min(self.scan_interval, max(1.0, wait)))
                 
             except Exception as e:
                 logger.error(f"Scanner error: {e}")
@@ -984,6 +1164,7 @@ class AdvancedVolatilityScanner:
             'opportunities_found': self.opportunities_found,
             'current_opportunities': len(self.opportunities),
             'monitored_pairs': len(self.monitored_pairs),
+            'scheduler': self.scheduler.get_status(),
             'performance': {
                 'avg_scan_time': np.mean([p['scan_time'] for p in self.scan_performance]) if self.scan_performance else 0,
                 'success_rate': np.mean([p['successful_scans'] / p['pairs_scanned'] 
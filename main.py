@@ -14,6 +14,10 @@ import os
 # Add current directory to Python path to fix import issues
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Profile startup from here on: phases and per-module import times
+from core.startup_profile import startup_profile
+startup_profile.start()
+
 # Initialize production logging first
 try:
     from utils.production_logger import setup_production_logging, get_trading_logger
@@ -31,25 +35,58 @@ except ImportError:
 startup_logger.info("Loading configuration...")
 
 try:
+    # Only what the health server needs is imported up front
     from core.config.settings import config
-    from core.data_collector import DataCollector
-    from core.correlation_engine import CorrelationEngine
-    from core.signal_generator import SignalGenerator
-    from core.volatility_signal_generator import VolatilitySignalGenerator
-    from core.ultra_high_frequency_trader import ultra_high_frequency_trader
-    from core.executor import Executor
-    from core.risk_manager import RiskManager
-    from analytics.performance import PerformanceTracker
-    from analytics.failure_analyzer import FailureAnalyzer
-    from core.environment_manager import environment_manager, Environment
-    from core.data_authenticity_validator import authenticity_validator
+    from core.latency_tracker import latency_tracker
+    from core.lazy_import import lazy_import, resolve
     from api.health import run_health_server_thread
-    
-    startup_logger.info("Core modules imported successfully - HIGH VOLATILITY SYSTEM ACTIVE")
 except ImportError as e:
     startup_logger.critical(f"Error importing modules: {e}")
     startup_logger.critical("Please install dependencies with: pip install -r requirements.txt")
     sys.exit(1)
+startup_profile.mark('health_imports')
+
+# Trading subsystems (pandas, SciPy, sklearn, ccxt, model files) load once the health server is up
+DataCollector = lazy_import('core.data_collector', 'DataCollector')
+CorrelationEngine = lazy_import('core.correlation_engine', 'CorrelationEngine')
+SignalGenerator = lazy_import('core.signal_generator', 'SignalGenerator')
+VolatilitySignalGenerator = lazy_import('core.volatility_signal_generator', 'VolatilitySignalGenerator')
+ultra_high_frequency_trader = lazy_import('core.ultra_high_frequency_trader', 'ultra_high_frequency_trader')
+Executor = lazy_import('core.executor', 'Executor')
+RiskManager = lazy_import('core.risk_manager', 'RiskManager')
+PerformanceTracker = lazy_import('analytics.performance', 'PerformanceTracker')
+FailureAnalyzer = lazy_import('analytics.failure_analyzer', 'FailureAnalyzer')
+environment_manager = lazy_import('core.environment_manager', 'environment_manager')
+Environment = lazy_import('core.environment_manager', 'Environment')
+authenticity_validator = lazy_import('core.data_authenticity_validator', 'authenticity_validator')
+portfolio_risk_engine = lazy_import('core.portfolio_risk', 'portfolio_risk_engine')
+exit_engine = lazy_import('core.exit_engine', 'exit_engine')
+stress_engine = lazy_import('core.stress_engine', 'stress_engine')
+market_regime_detector = lazy_import('core.market_regime_detector', 'market_regime_detector')
+state_snapshotter = lazy_import('core.state_snapshot', 'state_snapshotter')
+HistoryPrewarmer = lazy_import('core.history_prewarm', 'HistoryPrewarmer')
+CandleStore = lazy_import('core.history_prewarm', 'CandleStore')
+
+TRADING_MODULES = (
+    DataCollector, CorrelationEngine, SignalGenerator, VolatilitySignalGenerator, Executor, RiskManager,
+    PerformanceTracker, FailureAnalyzer, environment_manager, Environment, authenticity_validator,
+    portfolio_risk_engine, exit_engine, stress_engine, market_regime_detector, state_snapshotter,
+    HistoryPrewarmer, CandleStore
+)
+
+def load_trading_modules():
+    """Import the trading subsystems now, failing fast on missing dependencies
+    
+    The AXSUSDT ultra-high frequency trader loads when the bot registers it for state snapshots.
+    """
+    try:
+        for module in TRADING_MODULES:
+            resolve(module)
+        logger.info("Core modules imported successfully - HIGH VOLATILITY SYSTEM ACTIVE")
+    except ImportError as e:
+        logger.critical(f"Error importing modules: {e}")
+        logger.critical("Please install dependencies with: pip install -r requirements.txt")
+        sys.exit(1)
 
 # Use production logger if available, fallback otherwise
 try:
@@ -99,6 +136,13 @@ class TradingBot:
         self.performance_tracker = PerformanceTracker()
         self.failure_analyzer = FailureAnalyzer()
         
+        # Warm analytic state from the last run, if recent enough
+        state_snapshotter.register('correlation_engine', self.correlation_engine)
+        state_snapshotter.register('data_collector', self.data_collector)
+        state_snapshotter.register('market_regime_detector', resolve(market_regime_detector))
+        state_snapshotter.register('ultra_high_frequency_trader', resolve(ultra_high_frequency_trader))
+        state_snapshotter.restore()
+        
         self.running = False
         
     async def start(self):
@@ -114,85 +158,114 @@ class TradingBot:
             raise Exception("Failed to initialize exchange connection")
         logger.info("Exchange connection initialized successfully")
         
+        # Pre-warm analysis buffers (the gap since the restored snapshot, or all of it on a cold start)
+        # alongside the stress engine's daily history, whose worst days are replayed before each new position
+        prewarmer = HistoryPrewarmer(self.executor.exchange, store=CandleStore(config.CANDLE_STORE_DIR))
+        await asyncio.gather(
+            prewarmer.prewarm([self.correlation_engine]),
+            stress_engine.load_history(self.executor.exchange, config.SYMBOLS)
+        )
+        asyncio.create_task(state_snapshotter.run())
+        
         # Main trading loop
         while self.running:
             try:
-                # Collect latest data
-                market_data = await self.data_collector.get_latest_data()
-                
-                # Calculate correlations
-                correlations = self.correlation_engine.calculate(market_data)
-                
-                # Generate traditional signals
-                traditional_signals = self.signal_generator.generate(correlations, market_data)
-                
-                # Generate high-volatility signals
-                volatility_signals = await self.volatility_signal_generator.generate_volatility_signals(
-                    market_data, account_balance=15000  # Default balance
-                )
-                
-                # Combine all signals with required fields
-                signals = traditional_signals + [
-                    {
-                        'id': f"{vs.symbol}_{int(datetime.now().timestamp())}_{i}",
-                        'symbol': vs.symbol,
-                        'action': 'buy' if vs.direction.value == 'long' else 'sell',
-                        'side': vs.direction.value,
-                        'confidence': vs.confidence,
-                        'volatility_tier': vs.volatility_tier.value,
-                        'entry_price': vs.entry_price,
-                        'stop_loss': vs.stop_loss,
-                        'take_profit': vs.take_profit_1,
-                        'position_size_pct': vs.position_size_pct,
-                        'trading_mode': 'high_volatility',
-                        'correlation_basis': vs.correlation_basis
-                    } for i, vs in enumerate(volatility_signals)
-                ]
-                
-                # Generate AXSUSDT ultra-high frequency signals
-                if 'AXSUSDT' in market_data:
-                    uhf_analysis = await ultra_high_frequency_trader.analyze_ultra_high_frequency_opportunity(
-                        market_data, correlations
-                    )
-                    if uhf_analysis['signal']:
-                        uhf_signal = uhf_analysis['signal']
-                        # Ensure required fields are present
-                        if 'id' not in uhf_signal:
-                            uhf_signal['id'] = f"AXSUSDT_UHF_{int(datetime.now().timestamp())}"
-                        if 'action' not in uhf_signal:
-                            uhf_signal['action'] = uhf_signal.get('side', 'buy').lower()
-                        if 'confidence' not in uhf_signal:
-                            uhf_signal['confidence'] = uhf_analysis['confidence']
-                        
-                        uhf_signal['uhf_confidence'] = uhf_analysis['confidence']
-                        uhf_signal['volatility_score'] = uhf_analysis['volatility_score']
-                        signals.append(uhf_signal)
-                        logger.info(f"UHF Signal added: AXSUSDT {uhf_signal['side']} "
-                                  f"(confidence={uhf_analysis['confidence']:.2f})")
-                        ultra_high_frequency_trader.update_signal_time()
-                
-                # Risk checks
-                approved_signals = self.risk_manager.filter_signals(signals)
-                
-                # Execute trades
-                for signal in approved_signals:
-                    execution_result = await self.executor.execute(signal)
+                # Each cycle is traced stage by stage for the latency budget
+                with latency_tracker.trace('cycle'):
+                    # Collect latest data
+                    with latency_tracker.span('data_collection'):
+                        market_data = await self.data_collector.get_latest_data()
                     
-                    # Track performance
-                    self.performance_tracker.record_trade(execution_result)
+                    # Calculate correlations
+                    with latency_tracker.span('correlation'):
+                        correlations = self.correlation_engine.calculate(market_data)
+                        portfolio_risk_engine.update_prices({
+                            symbol: data.get('last') for symbol, data in market_data.items() if data
+                        })
                     
-                    # Update ultra-high frequency trader metrics if AXSUSDT
-                    if signal.get('symbol') == 'AXSUSDT' and hasattr(signal, 'trading_mode'):
-                        if signal.get('trading_mode') == 'ultra_high_frequency':
-                            ultra_high_frequency_trader.update_trade_result(execution_result)
+                    # Registered exits fire on the tick that crosses them
+                    with latency_tracker.span('exit_engine'):
+                        for symbol, data in market_data.items():
+                            if data and data.get('last'):
+                                exit_engine.on_price(symbol, data['last'])
                     
-                    # Analyze if failed
-                    if execution_result.status not in ['FILLED', 'SUCCESS']:
-                        failure_analysis = self.failure_analyzer.analyze(
-                            signal, execution_result, market_data
+                    # Generate traditional signals
+                    with latency_tracker.span('signal_generation'):
+                        traditional_signals = self.signal_generator.generate(correlations, market_data)
+                    
+                    # Generate high-volatility signals
+                    with latency_tracker.span('volatility_signals'):
+                        volatility_signals = await self.volatility_signal_generator.generate_volatility_signals(
+                            market_data, account_balance=15000  # Default balance
                         )
-                        logger.warning(f"Trade failed: {failure_analysis}")
-                
+                    
+                    # Combine all signals with required fields
+                    signals = traditional_signals + [
+                        {
+                            'id': f"{vs.symbol}_{int(datetime.now().timestamp())}_{i}",
+                            'symbol': vs.symbol,
+                            'action': 'buy' if vs.direction.value == 'long' else 'sell',
+                            'side': vs.direction.value,
+                            'confidence': vs.confidence,
+                            'volatility_tier': vs.volatility_tier.value,
+                            'entry_price': vs.entry_price,
+                            'stop_loss': vs.stop_loss,
+                            'take_profit': vs.take_profit_1,
+                            'position_size_pct': vs.position_size_pct,
+                            'trading_mode': 'high_volatility',
+                            'correlation_basis': vs.correlation_basis
+                        } for i, vs in enumerate(volatility_signals)
+                    ]
+                    
+                    # Generate AXSUSDT ultra-high frequency signals
+                    if 'AXSUSDT' in market_data:
+                        with latency_tracker.span('uhf_analysis'):
+                            uhf_analysis = await ultra_high_frequency_trader.analyze_ultra_high_frequency_opportunity(
+                                market_data, correlations
+                            )
+                        if uhf_analysis['signal']:
+                            uhf_signal = uhf_analysis['signal']
+                            # Ensure required fields are present
+                            if 'id' not in uhf_signal:
+                                uhf_signal['id'] = f"AXSUSDT_UHF_{int(datetime.now().timestamp())}"
+                            if 'action' not in uhf_signal:
+                                uhf_signal['action'] = uhf_signal.get('side', 'buy').lower()
+                            if 'confidence' not in uhf_signal:
+                                uhf_signal['confidence'] = uhf_analysis['confidence']
+                            
+                            uhf_signal['uhf_confidence'] = uhf_analysis['confidence']
+                            uhf_signal['volatility_score'] = uhf_analysis['volatility_score']
+                            signals.append(uhf_signal)
+                            logger.info(f"UHF Signal added: AXSUSDT {uhf_signal['side']} "
+                                      f"(confidence={uhf_analysis['confidence']:.2f})")
+                            ultra_high_frequency_trader.update_signal_time()
+                    
+                    # Risk checks
+                    with latency_tracker.span('risk_filter'):
+                        approved_signals = self.risk_manager.filter_signals(signals)
+                    
+                    # Execute trades - entries and brackets go out as batch orders
+                    with latency_tracker.span('execution'):
+                        execution_results = await self.executor.execute_batch(approved_signals)
+                    
+                    for signal, execution_result in zip(approved_signals, execution_results):
+                        # Track performance
+                        self.performance_tracker.record_trade(execution_result)
+                        if execution_result.status in ['FILLED', 'SUCCESS']:
+                            self.risk_manager.record_trade()
+                        
+                        # Update ultra-high frequency trader metrics if AXSUSDT
+                        if signal.get('symbol') == 'AXSUSDT' and hasattr(signal, 'trading_mode'):
+                            if signal.get('trading_mode') == 'ultra_high_frequency':
+                                ultra_high_frequency_trader.update_trade_result(execution_result)
+                        
+                        # Analyze if failed
+                        if execution_result.status not in ['FILLED', 'SUCCESS']:
+                            failure_analysis = self.failure_analyzer.analyze(
+                                signal, execution_result, market_data
+                            )
+                            logger.warning(f"Trade failed: {failure_analysis}")
+                    
                 # Log status
                 logger.info(f"Signals: {len(signals)}, Approved: {len(approved_signals)}")
                 
@@ -213,6 +286,9 @@ class TradingBot:
         # Stop data collection
         await self.data_collector.stop()
         
+        # Final warm-start snapshot
+        await state_snapshotter.stop()
+        
         # Save performance data
         self.performance_tracker.save_report()
         
@@ -255,12 +331,17 @@ async def main():
         health_port = int(os.getenv("HEALTH_CHECK_PORT", 8080))
         logger.info(f"Starting health check server on port {health_port}")
         run_health_server_thread(health_port)
+        startup_profile.mark('health_server_started')
         
         # Dashboard integrated with health server at / and /dashboard
         
+        with startup_profile.phase('trading_modules'):
+            load_trading_modules()
+        
         # Create bot instance
         logger.info("Creating bot instance...")
-        bot = TradingBot()
+        with startup_profile.phase('bot_init'):
+            bot = TradingBot()
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, signal_handler)
@@ -278,6 +359,10 @@ async def main():
         
         logger.info("Bot initialization complete", **startup_info)
         
+        # Startup breakdown, also served at /health/startup
+        startup_profile.finish()
+        logger.info(startup_profile.format_report())
+        
         # Start bot with error handling
         await bot.start()
         
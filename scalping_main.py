@@ -19,6 +19,7 @@ from core.signal_generator import SignalGenerator
 from core.trade_executor import TradeExecutor
 from core.risk_manager import risk_manager
 from core.leverage_manager import leverage_manager
+from core.exit_engine import exit_engine, ExitKind, is_long
 from utils.logger_config import setup_logger
 from utils.telegram_notifier import TelegramNotifier
 
@@ -382,8 +383,10 @@ class ScalpingTradingBot:
                     'entry_time': datetime.now(),
                     'entry_price': result.get('fill_price', signal['entry_price']),
                     'quantity': result.get('quantity', 0),
-                    'side': signal['action']
+                    'side': signal['action'],
+                    'exit_key': f"scalping_{signal['symbol']}_{self.cycle_count}"
                 }
+                self._register_exits(self.current_position)
                 
                 self.daily_trade_count += 1
                 self.scalping_stats['executed_trades'] += 1
@@ -408,6 +411,30 @@ class ScalpingTradingBot:
         except Exception as e:
             logger.error(f"Error executing scalping signals: {e}", exc_info=True)
     
+    def _register_exits(self, position: Dict):
+        """Register take-profit, stop-loss and max-hold exits with the exit engine"""
+        entry_price = position['entry_price']
+        direction = 1 if is_long(position['side']) else -1
+        params = scalping_config.parameters
+        exit_engine.register(
+            position['exit_key'], position['signal']['symbol'], position['side'],
+            stop_loss=entry_price * (1 - direction * params.STOP_LOSS_PERCENT),
+            take_profit=entry_price * (1 + direction * params.TAKE_PROFIT_PERCENT),
+            max_hold_seconds=params.POSITION_HOLD_TIME_MAX,
+            on_trigger=self._on_exit_trigger,
+            metadata={'source': 'scalping_main'}
+        )
+    
+    def _on_exit_trigger(self, trigger):
+        """Remember an exit fired by the exit engine, whichever caller fed it the tick
+        
+        The engine is shared, so the trigger may come from another component's
+        ``on_price``/``on_time`` call; the close happens on the next position check
+        and is retried there if it fails.
+        """
+        if self.current_position and trigger.key == self.current_position['exit_key']:
+            self.current_position['exit_kind'] = trigger.kind
+    
     async def _manage_existing_position(self):
         """Manage existing scalping position"""
         try:
@@ -436,22 +463,24 @@ class ScalpingTradingBot:
             # Calculate holding time
             hold_time = (datetime.now() - entry_time).total_seconds()
             
+            # Take profit, stop loss and max hold time fire from the exit engine, here or on
+            # another component's tick, and are recorded by _on_exit_trigger
+            exit_engine.on_price(symbol, current_price)
+            
             # Check exit conditions
             should_exit = False
             exit_reason = ""
+            exit_kind = self.current_position.get('exit_kind')
             
-            # Take profit check
-            if pnl_pct >= scalping_config.parameters.TAKE_PROFIT_PERCENT:
+            if exit_kind == ExitKind.TAKE_PROFIT:
                 should_exit = True
                 exit_reason = f"Take profit hit: {pnl_pct:.2%}"
             
-            # Stop loss check
-            elif pnl_pct <= -scalping_config.parameters.STOP_LOSS_PERCENT:
+            elif exit_kind == ExitKind.STOP_LOSS:
                 should_exit = True
                 exit_reason = f"Stop loss hit: {pnl_pct:.2%}"
             
-            # Maximum hold time check
-            elif hold_time > scalping_config.parameters.POSITION_HOLD_TIME_MAX:
+            elif exit_kind == ExitKind.MAX_HOLD:
                 should_exit = True
                 exit_reason = f"Max hold time exceeded: {hold_time:.0f}s"
             
@@ -531,6 +560,7 @@ class ScalpingTradingBot:
                 logger.info(f"✅ Position closed: {reason} - P&L: {pnl_pct:.2%}")
                 
                 # Clear current position
+                exit_engine.cancel(self.current_position['exit_key'])
                 self.current_position = None
                 
             else:
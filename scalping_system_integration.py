@@ -15,6 +15,8 @@ import ccxt.async_support as ccxt
 import pandas as pd
 import numpy as np
 
+from core.config.settings import config as settings
+from core.history_prewarm import CandleStore, HistoryPrewarmer
 from core.scalping_correlation_engine import ScalpingCorrelationEngine, ScalpingSignal, MarketRegime
 from core.scalping_backtest_engine import ScalpingBacktestEngine, BacktestMetrics
 
@@ -93,7 +95,9 @@ class ScalpingSystemManager:
             
             # Initialize scalping engine
             self.scalping_engine = ScalpingCorrelationEngine(self.exchange)
-            await self.scalping_engine.initialize_real_time_feeds()
+            await self.scalping_engine.initialize_real_time_feeds(
+                HistoryPrewarmer(self.exchange, store=CandleStore(settings.CANDLE_STORE_DIR))
+            )
             
             # Initialize backtest engine
             self.backtest_engine = ScalpingBacktestEngine(self.exchange)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Executor throughput and latency benchmark
+Pushes signals through Executor.execute against the in-process ExchangeSimulator
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import numpy as np
+
+from core.config.settings import config
+from core.exchange_simulator import ExchangeSimulator, LatencyProfile, ErrorProfile
+from core.executor import Executor
+from core.latency_tracker import latency_tracker
+from core.optimization_integrator import optimization_integrator
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - ExecutorBenchmark - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark Executor.execute against an in-process exchange")
+    parser.add_argument('--signals', type=int, default=2000, help='Number of signals to execute')
+    parser.add_argument('--concurrency', type=int, default=50, help='Signals in flight at once')
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='Median exchange round trip (ms)')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='Lognormal sigma of round trips')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Transport error rate per call')
+    parser.add_argument('--reject-rate', type=float, default=0.0, help='Order rejection rate')
+    parser.add_argument('--mode', default='market',
+                        choices=['market', 'post_only', 'marketable_limit', 'twap', 'iceberg'],
+                        help='Execution mode requested by every signal')
+    parser.add_argument('--symbols', default=','.join(config.SYMBOLS), help='Comma-separated symbols')
+    parser.add_argument('--full-pipeline', action='store_true',
+                        help='Keep signal enhancement enabled (slow, fetches candles per signal)')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for the exchange random walk')
+    parser.add_argument('--json', dest='json_path', default=None, help='Also write the report to this file')
+    return parser.parse_args()
+
+
+def build_signals(count: int, symbols, exchange: ExchangeSimulator, mode: str):
+    """Correlation-breakdown style signals spread round-robin over symbols
+    
+    Sizes stay small so the risk manager's portfolio heat limit does not reject
+    the run long before the exchange path is exercised.
+    """
+    started = int(time.time() * 1000)
+    signals = []
+    for i in range(count):
+        symbol = symbols[i % len(symbols)]
+        price = exchange.mark_price(symbol)
+        action = 'buy' if i % 2 == 0 else 'sell'
+        direction = 1 if action == 'buy' else -1
+        signals.append({
+            'id': f'BENCH_{symbol}_{started}_{i}',
+            'symbol': symbol,
+            'action': action,
+            'entry_price': price,
+            'stop_loss': price * (1 - direction * 0.01),
+            'take_profit': price * (1 + direction * 0.02),
+            'confidence': 0.8,
+            'deviation': 0.2,
+            'correlation': 0.6,
+            'suggested_leverage': 3,
+            'suggested_position_size': 0.001,
+            'execution_mode': mode,
+            'timestamp': started
+        })
+    return signals
+
+
+async def run(args):
+    symbols = [s.strip() for s in args.symbols.split(',') if s.strip()]
+    exchange = ExchangeSimulator(
+        latency=LatencyProfile(args.latency_ms, args.latency_sigma),
+        errors=ErrorProfile(network_error_rate=args.error_rate, rejection_rate=args.reject_rate),
+        balance=1e9,
+        seed=args.seed
+    )
+    executor = Executor(retry_delay=0, exchange=exchange)
+    if not await executor.initialize_exchange():
+        raise SystemExit("Could not initialize the exchange backend")
+    optimization_integrator.set_optimization_active(args.full_pipeline)
+    latency_tracker.reset()
+
+    signals = build_signals(args.signals, symbols, exchange, args.mode)
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+
+    async def execute(signal):
+        async with semaphore:
+            return await executor.execute(signal)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(execute(signal) for signal in signals))
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array([r.execution_time_ms for r in results], dtype=float)
+    statuses = {}
+    for result in results:
+        statuses[result.status] = statuses.get(result.status, 0) + 1
+    filled = statuses.get('FILLED', 0)
+
+    report = {
+        'signals': len(signals),
+        'concurrency': args.concurrency,
+        'mode': args.mode,
+        'elapsed_seconds': elapsed,
+        'signals_per_second': len(signals) / elapsed if elapsed else 0.0,
+        'orders_per_second': filled / elapsed if elapsed else 0.0,
+        'statuses': statuses,
+        'latency_ms': {
+            'p50': float(np.percentile(latencies, 50)),
+            'p90': float(np.percentile(latencies, 90)),
+            'p99': float(np.percentile(latencies, 99)),
+            'max': float(latencies.max())
+        },
+        'stages_ms': latency_tracker.snapshot().get('execution', {}),
+        'exchange': exchange.stats()
+    }
+    await executor.cleanup()
+    return report
+
+
+def print_report(report):
+    latency = report['latency_ms']
+    print(f"Signals:      {report['signals']} ({report['mode']}, concurrency {report['concurrency']})")
+    print(f"Elapsed:      {report['elapsed_seconds']:.2f}s")
+    print(f"Throughput:   {report['signals_per_second']:.1f} signals/s, {report['orders_per_second']:.1f} orders/s")
+    print(f"Latency (ms): p50 {latency['p50']:.1f}  p90 {latency['p90']:.1f}  "
+          f"p99 {latency['p99']:.1f}  max {latency['max']:.1f}")
+    print(f"Statuses:     {report['statuses']}")
+    print("Stages (ms):")
+    for stage, stats in sorted(report['stages_ms'].items(), key=lambda item: -item[1].get('p99', 0)):
+        print(f"  {stage:<24} n={stats['count']:<6} p50 {stats['p50']:8.2f}  p99 {stats['p99']:8.2f}")
+    print(f"Exchange:     {report['exchange']}")
+
+
+def main():
+    args = parse_args()
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
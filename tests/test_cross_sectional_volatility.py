@@ -0,0 +1,92 @@
+"""
+Tests for cross-sectional volatility metrics over the scanner universe
+"""
+
+import sys
+import os
+from collections import deque
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.candle_buffer import CandleSeries
+from core.cross_sectional_volatility import CrossSectionalVolatility
+from core.volatility_scanner import AdvancedVolatilityScanner, VolatilityState, MarketCondition
+
+
+def universe(count, bars=500, seed=3):
+    """Random-walk pairs with different volatilities, trends and lengths"""
+    rng = np.random.default_rng(seed)
+    candles = {}
+    for i in range(count):
+        n = bars if i % 4 else int(rng.integers(35, bars))
+        sigma = rng.uniform(0.001, 0.02)
+        drift = rng.normal(0, 0.002)
+        close = 100 * np.exp(np.cumsum(rng.normal(drift, sigma, n)))
+        open_price = np.r_[close[0], close[:-1]] * np.exp(rng.normal(0, sigma / 5, n))
+        high = np.maximum(open_price, close) * np.exp(np.abs(rng.normal(0, sigma, n)))
+        low = np.minimum(open_price, close) * np.exp(-np.abs(rng.normal(0, sigma, n)))
+        volume = rng.lognormal(3, 0.8, n)
+        series = CandleSeries(f"PAIR{i}/USDT", bars)
+        series.update(np.column_stack([np.arange(n) * 300_000, open_price, high, low, close, volume]).tolist())
+        candles[series.symbol] = series
+    return candles
+
+
+def test_matches_per_symbol_scanner_logic():
+    """Metrics, states, regimes, percentiles and scores equal the per-symbol path"""
+    candles = universe(40)
+    scanner = AdvancedVolatilityScanner('key', 'secret')
+    engine = CrossSectionalVolatility(breakout_multiplier=2.0, trend_strength=0.7)
+    histories = {symbol: deque(maxlen=288) for symbol in candles}
+    rng = np.random.default_rng(4)
+
+    for _ in range(12):  # Builds enough history for the percentile branch
+        snapshot = engine.evaluate(candles)
+        for i, symbol in enumerate(snapshot.symbols):
+            expected = candles[symbol].metrics()
+            actual = snapshot.row(i)
+            for name, value in expected.items():
+                # The vectorized pass reads the float32 bar store, the per-symbol path exact running sums
+                assert actual[name] == pytest.approx(value, rel=1e-4, abs=1e-5, nan_ok=True), name
+
+            history = histories[symbol]
+            state = scanner.classify_volatility_state(expected, history)
+            regime = scanner.detect_market_regime(candles[symbol], expected)
+            assert snapshot.state(i) == state.value
+            assert snapshot.regime(i) == regime.value
+
+            profile = scanner._build_profile(symbol, expected, {'bid': 1, 'ask': 1, 'quoteVolume': 0},
+                                             state, regime, float(snapshot.percentile_24h[i]), 1.0)
+            assert snapshot.opportunity_score[i] == scanner.calculate_opportunity_score(profile)
+            history.append(expected)
+
+        # A new bar per pass so readings move between passes
+        for series in candles.values():
+            last = series['close'][-1]
+            move = np.exp(rng.normal(0, 0.01))
+            series.update([[series.last_timestamp + 300_000, last, max(last, last * move) * 1.002,
+                            min(last, last * move) * 0.998, last * move, rng.lognormal(3, 0.8)]])
+
+
+def test_short_history_pairs_are_skipped():
+    """Pairs below the minimum bar count are reported, not scored"""
+    candles = universe(3)
+    short = CandleSeries('NEW/USDT')
+    short.update([[i * 300_000, 1.0, 1.1, 0.9, 1.0, 10.0] for i in range(10)])
+    candles['NEW/USDT'] = short
+
+    snapshot = CrossSectionalVolatility().evaluate(candles)
+    assert snapshot.skipped == ['NEW/USDT']
+    assert len(snapshot) == 3
+
+
+def test_full_universe_in_milliseconds():
+    """Three hundred pairs of 500 bars score in well under 100 ms"""
+    candles = universe(300, seed=9)
+    engine = CrossSectionalVolatility()
+    engine.evaluate(candles)
+    timings = [engine.evaluate(candles, record=False).elapsed_ms for _ in range(3)]
+    assert min(timings) < 100
@@ -0,0 +1,103 @@
+"""
+Tests for the in-process exchange backend and its use by the Executor
+"""
+
+import sys
+import os
+from unittest.mock import AsyncMock, patch
+
+import ccxt.async_support as ccxt
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core import executor as executor_module
+from core.executor import Executor
+from core.exchange_simulator import ExchangeSimulator, LatencyProfile, ErrorProfile
+
+
+def make_exchange(**kwargs):
+    kwargs.setdefault('latency', LatencyProfile(median_ms=0))
+    kwargs.setdefault('volatility_bps', 0)
+    return ExchangeSimulator(prices={'AXSUSDT': 100.0}, seed=7, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_market_order_fills_with_slippage_and_opens_position():
+    """Market buys fill above the ask by the configured slippage"""
+    exchange = make_exchange(spread_bps=2.0, slippage_bps=5.0)
+
+    order = await exchange.create_order('AXSUSDT', 'market', 'buy', 2.0, None, {'clientOrderId': 'qtb1'})
+
+    assert order['status'] == 'closed'
+    assert order['average'] == pytest.approx(100.01 * 1.0005)
+    positions = await exchange.fetch_positions()
+    assert positions[0]['contracts'] == 2.0 and positions[0]['side'] == 'long'
+    found = await exchange.fetch_order(None, 'AXSUSDT', {'origClientOrderId': 'qtb1'})
+    assert found['id'] == order['id']
+
+
+@pytest.mark.asyncio
+async def test_limit_orders_rest_and_post_only_rejects_crossing():
+    """Passive limits rest; post-only orders that would take are refused"""
+    exchange = make_exchange(passive_fill_probability=0.0)
+
+    resting = await exchange.create_order('AXSUSDT', 'limit', 'buy', 1.0, 99.0, {})
+    assert resting['status'] == 'open'
+    await exchange.cancel_order(resting['id'], 'AXSUSDT')
+    assert (await exchange.fetch_order(resting['id'], 'AXSUSDT'))['status'] == 'canceled'
+
+    with pytest.raises(ccxt.OrderImmediatelyFillable):
+        await exchange.create_order('AXSUSDT', 'limit', 'buy', 1.0, 101.0, {'postOnly': True})
+
+
+@pytest.mark.asyncio
+async def test_injected_timeouts_can_land_the_order():
+    """A landed timeout leaves the order on the book; a resend is a duplicate"""
+    exchange = make_exchange(errors=ErrorProfile(network_error_rate=1.0, landed_ratio=1.0))
+
+    with pytest.raises(ccxt.RequestTimeout):
+        await exchange.create_order('AXSUSDT', 'market', 'sell', 1.0, None, {'clientOrderId': 'qtb2'})
+
+    assert exchange.stats()['orders'] == 1
+    assert exchange.stats()['injected_errors'] == {'create_order': 1}
+    exchange.errors = ErrorProfile()
+    with pytest.raises(ccxt.DuplicateOrderId):
+        await exchange.create_order('AXSUSDT', 'market', 'sell', 1.0, None, {'clientOrderId': 'qtb2'})
+
+
+@pytest.mark.asyncio
+async def test_ohlcv_ends_at_current_price():
+    exchange = make_exchange(volatility_bps=5.0)
+    candles = await exchange.fetch_ohlcv('AXSUSDT', '5m', limit=50)
+    assert len(candles) == 50
+    assert candles[-1][4] == pytest.approx(exchange.mark_price('AXSUSDT'))
+    assert candles[1][0] - candles[0][0] == 300000
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_against_exchange_backend():
+    """The Executor uses an injected backend in place of the Binance client"""
+    exchange = make_exchange()
+    executor = Executor(retry_delay=0, exchange=exchange)
+    integrator = executor_module.optimization_integrator
+    with patch.object(integrator, 'generate_enhanced_signal', AsyncMock(return_value={})), \
+         patch.object(integrator, 'validate_enhanced_trade_risk', AsyncMock(return_value={'approved': True})), \
+         patch.object(integrator, 'setup_enhanced_exit_management', AsyncMock(return_value={})), \
+         patch.object(executor_module.leverage_manager, 'calculate_optimal_leverage', AsyncMock(return_value=5)), \
+         patch.object(executor_module.leverage_manager, 'calculate_optimal_position_size', return_value=1.5):
+        result = await executor.execute({'id': 'AXSUSDT_1700000000_0', 'symbol': 'AXSUSDT', 'action': 'buy',
+                                         'entry_price': 100.02, 'confidence': 0.8, 'execution_mode': 'market'})
+
+    assert result.status == 'FILLED'
+    assert executor.exchange is exchange
+    assert exchange.leverage['AXSUSDT'] == 5
+    assert exchange.positions['AXSUSDT']['contracts'] == 1.5
+
+
+@pytest.mark.asyncio
+async def test_executor_refuses_backend_in_production():
+    executor = Executor(exchange=make_exchange())
+    with patch.object(executor_module.environment_manager, 'is_production', return_value=True):
+        assert await executor.initialize_exchange() is False
+    assert executor.exchange is None
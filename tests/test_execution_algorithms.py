@@ -0,0 +1,200 @@
+"""
+Tests for limit, post-only and sliced execution algorithms
+"""
+
+import sys
+import os
+from unittest.mock import patch
+
+import ccxt.async_support as ccxt
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.execution_algorithms import ExecutionAlgorithms, ExecutionMode
+
+
+class BookExchange:
+    """Exchange stub with a static book; limit orders fill when they cross it"""
+
+    def __init__(self, bid=100.0, ask=100.1, passive_fill_ratio=0.0, liquidity=True):
+        self.bid = bid
+        self.ask = ask
+        self.passive_fill_ratio = passive_fill_ratio
+        self.liquidity = liquidity  # False: crossing IOC orders expire unfilled
+        self.orders = {}
+        self.by_client_id = {}
+        self.created = []
+
+    async def fetch_order_book(self, symbol, limit=5):
+        return {'bids': [[self.bid, 10.0]], 'asks': [[self.ask, 10.0]]}
+
+    async def create_order(self, symbol, type, side, amount, price=None, params=None):
+        crosses = price >= self.ask if side == 'buy' else price <= self.bid
+        if params.get('postOnly') and crosses:
+            raise AssertionError("post-only order crossed the book")
+        if crosses and not self.liquidity:
+            fill_price, filled, status = None, 0.0, 'expired'
+        elif crosses:
+            fill_price = self.ask if side == 'buy' else self.bid
+            filled, status = amount, 'closed'
+        else:
+            fill_price = price
+            filled = amount * self.passive_fill_ratio
+            status = 'closed' if filled >= amount else 'open'
+        order = {'id': str(len(self.created) + 1), 'status': status, 'filled': filled,
+                 'average': fill_price if filled else None, 'price': price, 'amount': amount,
+                 'params': params, 'timestamp': 0}
+        self.orders[order['id']] = order
+        self.by_client_id[params['clientOrderId']] = order
+        self.created.append(order)
+        return order
+
+    async def fetch_order(self, order_id, symbol, params=None):
+        if order_id is None:
+            client_order_id = params['origClientOrderId']
+            if client_order_id not in self.by_client_id:
+                raise ccxt.OrderNotFound(client_order_id)
+            return self.by_client_id[client_order_id]
+        return self.orders[order_id]
+
+    async def cancel_order(self, order_id, symbol):
+        self.orders[order_id]['status'] = 'canceled'
+
+
+@pytest.mark.asyncio
+async def test_marketable_limit_capped_at_tolerance():
+    """IOC limit price never exceeds the slippage cap around arrival mid"""
+    exchange = BookExchange()
+    algos = ExecutionAlgorithms(exchange, slippage_tolerance=0.001)
+
+    order = await algos.execute(ExecutionMode.MARKETABLE_LIMIT, 'AXSUSDT', 'buy', 2.0)
+
+    child = exchange.created[0]
+    assert child['params']['timeInForce'] == 'IOC'
+    assert child['price'] == pytest.approx(100.05 * 1.001)
+    assert order['filled'] == 2.0
+    assert order['execution_cost']['arrival_price'] == pytest.approx(100.05)
+    assert order['execution_cost']['cost_bps'] == pytest.approx((100.1 - 100.05) / 100.05 * 1e4)
+
+
+@pytest.mark.asyncio
+async def test_post_only_rests_at_touch_and_earns_spread():
+    """A filled post-only order is priced at the touch and beats arrival"""
+    exchange = BookExchange(passive_fill_ratio=1.0)
+    algos = ExecutionAlgorithms(exchange, reprice_seconds=0.01, poll_interval=0)
+
+    order = await algos.execute(ExecutionMode.POST_ONLY, 'SANDUSDT', 'sell', 5.0)
+
+    assert exchange.created[0]['params']['postOnly'] is True
+    assert exchange.created[0]['price'] == 100.1
+    assert order['execution_cost']['cost_bps'] < 0
+
+
+@pytest.mark.asyncio
+async def test_post_only_reprices_then_crosses_remainder():
+    """Unfilled post-only orders are cancelled, repriced and finally crossed"""
+    exchange = BookExchange(passive_fill_ratio=0.0)
+    algos = ExecutionAlgorithms(exchange, reprice_seconds=0.01, max_reprices=2, poll_interval=0)
+
+    order = await algos.execute(ExecutionMode.POST_ONLY, 'AXSUSDT', 'buy', 1.0)
+
+    assert [o['params'].get('postOnly') for o in exchange.created] == [True] * 3 + [None]
+    assert exchange.created[-1]['params']['timeInForce'] == 'IOC'
+    assert all(o['status'] == 'canceled' for o in exchange.created[:3])
+    assert order['filled'] == 1.0
+    assert order['execution_cost']['child_orders'] == 4
+
+
+@pytest.mark.asyncio
+async def test_twap_slices_parent_evenly():
+    """TWAP sends equal slices that add up to the parent quantity"""
+    exchange = BookExchange()
+    algos = ExecutionAlgorithms(exchange)
+
+    with patch('core.execution_algorithms.config.TWAP_SLICES', 4), \
+         patch('core.execution_algorithms.config.TWAP_DURATION_SECONDS', 0):
+        order = await algos.execute(ExecutionMode.TWAP, 'AXSUSDT', 'buy', 8.0)
+
+    assert [o['amount'] for o in exchange.created] == [2.0] * 4
+    assert order['filled'] == pytest.approx(8.0)
+
+
+def test_large_clips_select_sliced_mode():
+    """Notional above the slice threshold switches to the sliced algorithm"""
+    algos = ExecutionAlgorithms(BookExchange())
+    with patch('core.execution_algorithms.config.SLICE_THRESHOLD_USD', 1000):
+        assert algos.select_mode({}, 100.0, 100.0).value == 'twap'
+        assert algos.select_mode({'execution_mode': 'post_only'}, 100.0, 100.0) == ExecutionMode.POST_ONLY
+
+
+@pytest.mark.asyncio
+async def test_unfilled_run_returns_zero_fill_order():
+    """An IOC that finds no liquidity comes back as a cancelled, unfilled parent"""
+    algos = ExecutionAlgorithms(BookExchange(liquidity=False))
+
+    order = await algos.execute(ExecutionMode.MARKETABLE_LIMIT, 'AXSUSDT', 'buy', 2.0)
+
+    assert order['filled'] == 0 and order['status'] == 'canceled' and order['average'] is None
+
+
+@pytest.mark.asyncio
+async def test_recover_aggregates_children_across_gaps():
+    """Children found by client id are summed, resting ones cancelled; unused ids are skipped"""
+    exchange = BookExchange(passive_fill_ratio=0.5)
+    algos = ExecutionAlgorithms(exchange, max_reprices=2, poll_interval=0)
+    await algos._create_limit('parent', 'AXSUSDT', 'buy', 2.0, 100.0, {'postOnly': True})  # c0, half filled
+    algos._child_counters['parent'] = 2  # c1 was rejected for crossing
+    await algos._create_limit('parent', 'AXSUSDT', 'buy', 1.0, 100.2, {'timeInForce': 'IOC'})  # c2, filled
+
+    order = await algos.recover(ExecutionMode.POST_ONLY, 'AXSUSDT', 'buy', 3.0, 'parent')
+
+    assert order['filled'] == pytest.approx(2.0)
+    assert order['execution_cost']['child_orders'] == 2
+    assert exchange.by_client_id['parentc0']['status'] == 'canceled'
+    assert await algos.recover(ExecutionMode.POST_ONLY, 'AXSUSDT', 'buy', 3.0, 'other') is None
+
+
+class RejectingExchange(BookExchange):
+    """Book exchange whose first post-only orders are refused with the given errors"""
+
+    def __init__(self, errors, **kwargs):
+        super().__init__(**kwargs)
+        self.errors = list(errors)
+
+    async def create_order(self, symbol, type, side, amount, price=None, params=None):
+        if params.get('postOnly') and self.errors:
+            raise self.errors.pop(0)
+        return await super().create_order(symbol, type, side, amount, price, params)
+
+
+@pytest.mark.asyncio
+async def test_post_only_would_take_rejection_is_repriced():
+    """Binance's GTX rejection arrives as InvalidOrder and only triggers a reprice"""
+    error = ccxt.InvalidOrder('binanceusdm {"code":-5022,"msg":"Due to the order could not be executed as maker, '
+                              'the Post Only order will be rejected."}')
+    exchange = RejectingExchange([error], passive_fill_ratio=1.0)
+    algos = ExecutionAlgorithms(exchange, reprice_seconds=0.01, poll_interval=0)
+
+    order = await algos.execute(ExecutionMode.POST_ONLY, 'AXSUSDT', 'buy', 1.0)
+
+    assert order['filled'] == 1.0 and exchange.created[0]['params']['postOnly'] is True
+
+
+@pytest.mark.asyncio
+async def test_other_invalid_orders_surface_from_post_only():
+    """Precision or min-notional errors are raised instead of looping through reprices"""
+    error = ccxt.InvalidOrder('binanceusdm {"code":-4164,"msg":"Order\'s notional must be no smaller than 5"}')
+    exchange = RejectingExchange([error] * 10)
+    algos = ExecutionAlgorithms(exchange, reprice_seconds=0.01, poll_interval=0)
+
+    with pytest.raises(ccxt.InvalidOrder):
+        await algos.execute(ExecutionMode.POST_ONLY, 'AXSUSDT', 'buy', 0.01)
+    assert len(exchange.errors) == 9 and exchange.created == []
+
+
+def test_market_orders_are_the_default_mode():
+    """Limit-based execution and slicing are opt-in"""
+    algos = ExecutionAlgorithms(BookExchange())
+    assert algos.select_mode({}, 0.01, 100.0) == ExecutionMode.MARKET
+    assert algos.select_mode({}, 500.0, 3000.0) == ExecutionMode.MARKET  # A $1.5M clip
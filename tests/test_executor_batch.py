@@ -0,0 +1,244 @@
+"""
+Tests for batch order submission in the Executor
+"""
+
+import sys
+import os
+from unittest.mock import AsyncMock, patch
+
+import ccxt.async_support as ccxt
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core import executor as executor_module
+from core.executor import Executor
+from tests.test_execution_algorithms import BookExchange
+
+
+class BatchExchange:
+    """Exchange stub recording single and batch order requests"""
+
+    def __init__(self, batch_error=None, reject_symbols=(), expire_symbols=()):
+        self.has = {'createOrders': True}
+        self.batch_error = batch_error
+        self.reject_symbols = set(reject_symbols)
+        self.expire_symbols = set(expire_symbols)  # Market orders that find no liquidity and expire
+        self.batches = []
+        self.singles = []
+        self.cancelled = []
+        self.next_id = 0
+
+    def _fill(self, request):
+        if request['symbol'] in self.reject_symbols:
+            return {'id': None, 'info': {'code': -2019, 'msg': 'Margin is insufficient.'}}
+        self.next_id += 1
+        if request['symbol'] in self.expire_symbols:
+            return {'id': str(self.next_id), 'symbol': request['symbol'], 'status': 'expired',
+                    'filled': 0.0, 'average': None, 'type': request['type']}
+        return {'id': str(self.next_id), 'symbol': request['symbol'], 'status': 'closed',
+                'filled': request['amount'], 'average': 100.0, 'type': request['type']}
+
+    async def create_orders(self, orders, params={}):
+        if self.batch_error:
+            raise self.batch_error
+        self.batches.append(orders)
+        return [self._fill(order) for order in orders]
+
+    async def create_order(self, symbol, type, side, amount, price=None, params={}):
+        request = {'symbol': symbol, 'type': type, 'side': side, 'amount': amount, 'params': params}
+        self.singles.append(request)
+        return self._fill(request)
+
+    async def cancel_order(self, order_id, symbol=None, params={}):
+        self.cancelled.append(order_id)
+        return {'id': order_id, 'status': 'canceled'}
+
+    async def fetch_balance(self):
+        return {'USDT': {'free': 10000.0}}
+
+    async def fetch_positions(self):
+        return []
+
+    async def set_leverage(self, leverage, symbol):
+        return {}
+
+
+def make_signal(symbol, index):
+    return {
+        'id': f'sig_{index}', 'symbol': symbol, 'action': 'buy', 'entry_price': 100.0,
+        'confidence': 0.8, 'stop_loss': 98.0, 'take_profit': 104.0, 'execution_mode': 'market'
+    }
+
+
+@pytest.fixture
+def patched_pipeline():
+    integrator = executor_module.optimization_integrator
+    with patch.object(integrator, 'generate_enhanced_signal', AsyncMock(return_value={})), \
+         patch.object(integrator, 'validate_enhanced_trade_risk', AsyncMock(return_value={'approved': True})), \
+         patch.object(integrator, 'setup_enhanced_exit_management', AsyncMock(return_value={})), \
+         patch.object(executor_module.authenticity_validator, 'validate_market_data', return_value=True), \
+         patch.object(executor_module.leverage_manager, 'calculate_optimal_leverage', AsyncMock(return_value=8)), \
+         patch.object(executor_module.leverage_manager, 'calculate_optimal_position_size', return_value=1.0):
+        yield
+
+
+@pytest.fixture
+def protective_orders():
+    with patch.object(executor_module.config, 'PLACE_PROTECTIVE_ORDERS', True):
+        yield
+
+
+def make_executor(exchange):
+    executor = Executor(retry_delay=0)
+    executor.exchange = exchange
+    executor.connected = True
+    return executor
+
+
+@pytest.mark.asyncio
+async def test_entries_and_brackets_are_batched(patched_pipeline, protective_orders):
+    """Entries go out in one batch, brackets in exchange-sized batches"""
+    exchange = BatchExchange()
+    executor = make_executor(exchange)
+    signals = [make_signal(symbol, i) for i, symbol in enumerate(['AXSUSDT', 'SANDUSDT', 'ETHUSDT'])]
+
+    results = await executor.execute_batch(signals)
+
+    assert [r.status for r in results] == ['FILLED'] * 3
+    assert [r.signal_id for r in results] == ['sig_0', 'sig_1', 'sig_2']
+    assert [o['type'] for o in exchange.batches[0]] == ['market'] * 3
+    # Six bracket legs: a full batch of five plus one single order
+    assert len(exchange.batches[1]) == 5
+    assert len(exchange.singles) == 1
+    for result in results:
+        protective = result.additional_info['protective_orders']
+        assert protective['stop_loss'] and protective['take_profit']
+
+
+@pytest.mark.asyncio
+async def test_per_order_rejections_map_to_their_result(patched_pipeline):
+    """A rejected leg inside a batch only fails its own signal"""
+    exchange = BatchExchange(reject_symbols={'SANDUSDT'})
+    executor = make_executor(exchange)
+    signals = [make_signal(symbol, i) for i, symbol in enumerate(['AXSUSDT', 'SANDUSDT'])]
+
+    results = await executor.execute_batch(signals)
+
+    assert results[0].status == 'FILLED'
+    assert results[1].status == 'REJECTED'
+    assert 'Margin is insufficient' in results[1].error_message
+
+
+@pytest.mark.asyncio
+async def test_expired_leg_is_rejected_not_filled(patched_pipeline, protective_orders):
+    """A batch leg that expires without a fill is neither tracked nor bracketed"""
+    exchange = BatchExchange(expire_symbols={'SANDUSDT'})
+    exchange.fetch_order = AsyncMock(side_effect=AssertionError('expired legs are final'))
+    executor = make_executor(exchange)
+    signals = [make_signal(symbol, i) for i, symbol in enumerate(['AXSUSDT', 'SANDUSDT'])]
+
+    results = await executor.execute_batch(signals)
+
+    assert results[0].status == 'FILLED'
+    assert results[1].status == 'REJECTED' and 'not filled' in results[1].error_message
+    assert 'sig_1' not in executor.positions
+    assert executor.successful_trades == 1
+    assert 'protective_orders' not in results[1].additional_info
+    assert {o['symbol'] for batch in exchange.batches[1:] for o in batch} | \
+        {o['symbol'] for o in exchange.singles} == {'AXSUSDT'}
+
+
+@pytest.mark.asyncio
+async def test_closing_positions_cancels_their_protective_orders(patched_pipeline, protective_orders):
+    """Brackets are cancelled before the close so no reduce-only trigger outlives its position"""
+    exchange = BatchExchange()
+    executor = make_executor(exchange)
+    results = await executor.execute_batch([make_signal(symbol, i) for i, symbol in enumerate(['AXSUSDT', 'SANDUSDT'])])
+    brackets = [order_id for result in results for order_id in result.additional_info['protective_orders'].values()]
+
+    await executor.close_all_positions()
+
+    assert sorted(exchange.cancelled) == sorted(brackets) and len(brackets) == 4
+    for position in executor.positions.values():
+        assert position['status'] == 'closed' and position['protective_orders'] == {}
+
+
+@pytest.mark.asyncio
+async def test_protective_orders_are_opt_in(patched_pipeline):
+    exchange = BatchExchange()
+    executor = make_executor(exchange)
+
+    results = await executor.execute_batch([make_signal(symbol, i) for i, symbol in enumerate(['AXSUSDT', 'SANDUSDT'])])
+
+    assert [r.status for r in results] == ['FILLED', 'FILLED']
+    assert len(exchange.batches) == 1 and exchange.singles == []
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_single_orders(patched_pipeline):
+    """An exchange-level batch rejection falls back to individual orders"""
+    exchange = BatchExchange(batch_error=ccxt.NotSupported('batch disabled'))
+    executor = make_executor(exchange)
+    signals = [make_signal(symbol, i) for i, symbol in enumerate(['AXSUSDT', 'SANDUSDT'])]
+
+    results = await executor.execute_batch(signals)
+
+    assert [r.status for r in results] == ['FILLED', 'FILLED']
+    assert exchange.batches == []
+    assert [o['type'] for o in exchange.singles[:2]] == ['market', 'market']
+
+
+class AlgoExchange(BookExchange):
+    """Book exchange that also takes protective orders and can drop the book mid-run"""
+
+    def __init__(self, book_failures=(), **kwargs):
+        super().__init__(**kwargs)
+        self.book_failures = set(book_failures)  # fetch_order_book calls (1-based) that fail in transit
+        self.book_calls = 0
+        self.protective = []
+
+    async def fetch_order_book(self, symbol, limit=5):
+        self.book_calls += 1
+        if self.book_calls in self.book_failures:
+            raise ccxt.NetworkError('connection reset')
+        return await super().fetch_order_book(symbol, limit)
+
+    async def create_order(self, symbol, type, side, amount, price=None, params=None):
+        if params.get('reduceOnly'):
+            self.protective.append(type)
+            return {'id': f'p{len(self.protective)}', 'symbol': symbol, 'type': type}
+        return await super().create_order(symbol, type, side, amount, price, params)
+
+
+@pytest.mark.asyncio
+async def test_interrupted_algorithm_is_recovered_and_bracketed(protective_orders):
+    """A TWAP cut off after its first slice is rebuilt from its children, not reported unknown"""
+    exchange = AlgoExchange(book_failures={3})  # Arrival book and first slice succeed, second slice fails
+    executor = make_executor(exchange)
+    signal = {**make_signal('AXSUSDT', 0), 'execution_mode': 'twap'}
+    result = executor._new_result(signal)
+
+    with patch('core.execution_algorithms.config.TWAP_SLICES', 2), \
+         patch('core.execution_algorithms.config.TWAP_DURATION_SECONDS', 0):
+        await executor._place_with_retries(signal, result, 2.0)
+
+    assert result.status == 'FILLED' and result.retry_count == 1
+    assert result.executed_quantity == pytest.approx(1.0)
+    assert len(exchange.created) == 1  # Nothing resent
+    assert exchange.protective == ['STOP_MARKET', 'TAKE_PROFIT_MARKET']
+
+
+@pytest.mark.asyncio
+async def test_unfilled_marketable_limit_is_a_clean_rejection():
+    """An IOC that finds no liquidity ends as REJECTED without retries or protective orders"""
+    exchange = AlgoExchange(liquidity=False)
+    executor = make_executor(exchange)
+    signal = {**make_signal('AXSUSDT', 0), 'execution_mode': 'marketable_limit'}
+    result = executor._new_result(signal)
+
+    await executor._place_with_retries(signal, result, 2.0)
+
+    assert result.status == 'REJECTED' and 'not filled' in result.error_message
+    assert result.retry_count == 0 and len(exchange.created) == 1
+    assert exchange.protective == []
@@ -0,0 +1,121 @@
+"""
+Tests for the event-driven exit engine
+"""
+
+import sys
+import os
+import asyncio
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.exit_engine import ExitEngine, ExitKind
+
+
+def test_fixed_levels_fire_on_crossing_tick():
+    """Stops and targets fire on the tick that crosses them, for both sides"""
+    engine = ExitEngine()
+    engine.register('long', 'AXSUSDT', 'buy', stop_loss=95.0, take_profit=110.0)
+    engine.register('short', 'AXSUSDT', 'sell', stop_loss=105.0, take_profit=90.0)
+
+    assert engine.on_price('AXSUSDT', 100.0) == []
+    fired = engine.on_price('AXSUSDT', 106.0)
+    assert [(t.key, t.kind) for t in fired] == [('short', ExitKind.STOP_LOSS)]
+
+    fired = engine.on_price('AXSUSDT', 111.0)
+    assert [(t.key, t.kind) for t in fired] == [('long', ExitKind.TAKE_PROFIT)]
+    assert len(engine) == 0
+    assert engine.on_price('AXSUSDT', 50.0) == []
+
+
+def test_trailing_stop_ratchets_and_fires():
+    """A trailing stop follows new highs, never moves back, and fires on the pullback"""
+    engine = ExitEngine()
+    engine.register('trail', 'AXSUSDT', 'BUY', trailing_distance=2.0, reference_price=100.0)
+
+    engine.on_price('AXSUSDT', 104.0)
+    assert engine.trailing_stop('trail') == pytest.approx(102.0)
+    engine.on_price('AXSUSDT', 103.0)
+    assert engine.trailing_stop('trail') == pytest.approx(102.0)
+
+    fired = engine.on_price('AXSUSDT', 101.9)
+    assert fired[0].kind == ExitKind.TRAILING_STOP
+    assert fired[0].level == pytest.approx(102.0)
+    assert engine.trailing_stop('trail') is None
+
+
+def test_cancel_replace_and_max_hold():
+    """Replaced levels stop firing; max-hold exits fire by time on any tick"""
+    engine = ExitEngine()
+    engine.register('pos', 'AXSUSDT', 'buy', stop_loss=95.0, now=0.0)
+    engine.register('pos', 'AXSUSDT', 'buy', stop_loss=90.0, max_hold_seconds=60, now=0.0)
+
+    assert engine.on_price('AXSUSDT', 94.0, timestamp=10.0) == []
+    fired = engine.on_price('BTCUSDT', 30000.0, timestamp=61.0)
+    assert [(t.key, t.kind, t.price) for t in fired] == [('pos', ExitKind.MAX_HOLD, 94.0)]
+
+    engine.register('gone', 'AXSUSDT', 'sell', take_profit=80.0)
+    assert engine.cancel('gone')
+    assert engine.on_price('AXSUSDT', 70.0) == []
+
+    # A position already past its hold time expires on the next tick
+    engine.register('overdue', 'AXSUSDT', 'buy', stop_loss=50.0, max_hold_seconds=0, now=100.0)
+    assert [(t.key, t.kind) for t in engine.on_time(100.0)] == [('overdue', ExitKind.MAX_HOLD)]
+
+
+@pytest.mark.asyncio
+async def test_coroutine_callbacks_are_scheduled():
+    """Owners registered with an async callback hear about their exit without polling"""
+    engine = ExitEngine()
+    received = []
+
+    async def on_trigger(trigger):
+        received.append(trigger.key)
+
+    engine.register('pos', 'AXSUSDT', 'buy', stop_loss=95.0, on_trigger=on_trigger)
+    engine.on_price('AXSUSDT', 94.0)
+    await asyncio.sleep(0)
+    assert received == ['pos']
+
+
+def test_matches_brute_force_scan():
+    """On a random walk the engine fires exactly the exits a per-position scan would"""
+    rng = np.random.default_rng(7)
+    engine = ExitEngine()
+    reference = {}
+    price = 100.0
+
+    for tick in range(1, 400):
+        if rng.random() < 0.3:
+            key = f"pos{tick}"
+            long = rng.random() < 0.5
+            direction = 1 if long else -1
+            levels = {
+                'stop': price * (1 - direction * 0.02 * rng.random()),
+                'target': price * (1 + direction * 0.03 * rng.random()),
+                'distance': price * 0.01 * rng.random() if rng.random() < 0.6 else None,
+                'peak': price,
+                'long': long
+            }
+            engine.register(key, 'AXSUSDT', 'buy' if long else 'sell', stop_loss=levels['stop'],
+                            take_profit=levels['target'], trailing_distance=levels['distance'],
+                            reference_price=price)
+            reference[key] = levels
+
+        price *= np.exp(rng.normal(0, 0.004))
+        fired = sorted(t.key for t in engine.on_price('AXSUSDT', price))
+
+        expected = []
+        for key, levels in list(reference.items()):
+            direction = 1 if levels['long'] else -1
+            hit = direction * price <= direction * levels['stop'] or direction * price >= direction * levels['target']
+            if levels['distance']:
+                levels['peak'] = max(levels['peak'], price) if levels['long'] else min(levels['peak'], price)
+                hit = hit or direction * price <= direction * (levels['peak'] - direction * levels['distance'])
+            if hit:
+                expected.append(key)
+                del reference[key]
+
+        assert fired == sorted(expected)
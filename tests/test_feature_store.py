@@ -0,0 +1,151 @@
+"""
+Tests for the incremental ML feature store
+"""
+
+import sys
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.feature_store import (
+    FeatureStore, FeatureTable, SIGNAL_FEATURES, EXIT_FEATURES, REGIME_FEATURES, signal_features, to_millis
+)
+from core.ml_signal_predictor import MLSignalPredictor
+
+
+def test_to_millis_accepts_common_timestamp_forms():
+    moment = datetime(2026, 3, 4, 13, 30, 15, 250000)
+    expected = int(moment.timestamp() * 1000)
+    assert to_millis(moment) == expected
+    assert to_millis(moment.isoformat()) == expected
+    assert to_millis(moment.timestamp()) == expected
+    assert to_millis(expected) == expected
+
+
+def test_table_grows_and_returns_labelled_rows_oldest_first():
+    table = FeatureTable(('a', 'b'), capacity=2)
+    for i, timestamp in enumerate([300, 100, 200, 400, 500]):
+        table.append('XUSDT', timestamp, np.array([i, -i]), target=float(i) if i != 3 else np.nan)
+    assert len(table) == 5
+    assert table.labeled_count == 4
+
+    features, targets, timestamps = table.labeled()
+    np.testing.assert_array_equal(timestamps, [100, 200, 300, 500])
+    np.testing.assert_array_equal(targets, [1, 2, 0, 4])
+    np.testing.assert_array_equal(features[:, 0], [1, 2, 0, 4])
+
+
+def test_duplicate_keys_reuse_the_row():
+    table = FeatureTable(('a',))
+    first = table.append('XUSDT', 1000, np.array([1.0]))
+    assert table.append('XUSDT', 1000, np.array([9.0]), target=0.5) == first
+    assert table.matrix([first])[0, 0] == 1.0
+    assert table.labeled()[1][0] == 0.5
+
+    assert table.append('XUSDT', 1000, np.array([2.0]), unique=False) != first
+    assert len(table) == 2
+
+
+def test_table_is_bounded_and_evicts_unlabelled_rows_first():
+    table = FeatureTable(('a',), capacity=4, max_rows=100)
+    for i in range(1000):
+        # Every tenth signal is labelled; the rest were scored and never traded
+        table.append('XUSDT', i, np.array([float(i)]), target=float(i) if i % 10 == 0 else np.nan)
+        assert len(table) <= 100
+    assert len(table._values) == 100
+    assert table.labeled_total == 100 and table.evicted == len(range(1000)) - len(table)
+
+    # Labelled rows outlive older unlabelled ones, and keys still point at their rows
+    features, targets, timestamps = table.labeled()
+    assert len(targets) >= 50 and timestamps[-1] == 990
+    np.testing.assert_array_equal(features[:, 0], timestamps)
+    assert table.index_of('XUSDT', 0) is None
+    newest = table.index_of('XUSDT', 999)
+    assert table.row(newest)[0] == 999.0 and len(table._keys) == len(table)
+
+
+def test_predictor_scoring_memory_is_bounded():
+    predictor = MLSignalPredictor()
+    predictor.feature_store = FeatureStore(max_rows=200)
+    for cycle in range(50):
+        signals = [{'symbol': f'S{i}USDT', 'timestamp': cycle * 60 + i, 'correlation': 0.5, 'deviation': 0.1}
+                   for i in range(20)]
+        matrix = predictor._signal_feature_matrix(signals)
+        assert matrix.shape == (20, len(SIGNAL_FEATURES))
+    assert len(predictor.feature_store['signal_strength']) <= 200
+
+
+def test_signal_is_labelled_with_the_features_it_was_scored_with():
+    store = FeatureStore()
+    signal = {'symbol': 'ETHUSDT', 'timestamp': '2026-03-04T13:30:15', 'correlation': 0.8, 'deviation': 0.2}
+    served = store.record_signal(signal, {'volatility': 0.05})
+
+    # The outcome arrives later, without the market context of the scoring cycle
+    labelled = store.record_signal(signal, {}, target=0.7)
+    assert labelled == served
+    features, targets, _ = store.training_sets()['signal_strength']
+    assert features.shape == (1, len(SIGNAL_FEATURES))
+    assert features[0, SIGNAL_FEATURES.index('volatility')] == 0.05
+    assert targets[0] == 0.7
+
+
+def test_rows_have_fixed_width_without_market_context():
+    signal = {'correlation': 0.5, 'deviation': 0.1, 'timestamp': '2026-03-04T13:30:15'}
+    assert signal_features(signal).shape == (len(SIGNAL_FEATURES),)
+    np.testing.assert_array_equal(signal_features(signal), signal_features(signal, {}))
+
+    store = FeatureStore()
+    store.record_exit({'entry_price': 100.0}, target=90)
+    store.record_regime({'rsi': 70}, target=0)
+    assert store['exit_timing'].matrix().shape == (1, len(EXIT_FEATURES))
+    assert store['regime_classification'].matrix().shape == (1, len(REGIME_FEATURES))
+
+
+@pytest.mark.asyncio
+async def test_training_and_inference_read_the_same_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    predictor = MLSignalPredictor(load_models=False)
+    predictor.retrain_threshold = 10_000
+    rng = np.random.default_rng(4)
+    start = datetime(2026, 3, 4).timestamp()
+
+    for i in range(80):
+        deviation = float(rng.uniform(0, 0.5))
+        signal = {'symbol': f'P{i % 8}USDT', 'timestamp': datetime.fromtimestamp(start + 60 * i).isoformat(),
+                  'correlation': float(rng.uniform(-1, 1)), 'deviation': deviation}
+        await predictor.predict_signal_strength(signal, {'volatility': deviation / 10})
+        predictor.add_training_sample({
+            'signal_data': signal,
+            'actual_performance': {'profit_pct': 0.1 * deviation - 0.02}
+        })
+
+    table = predictor.feature_store['signal_strength']
+    assert len(table) == 80 and table.labeled_count == 80
+
+    # The dict path rebuilds exactly the stored rows
+    features, targets, _ = predictor.feature_store.training_sets()['signal_strength']
+    rebuilt, rebuilt_targets = await predictor._prepare_signal_training_data(
+        [{**sample, 'market_data': {'volatility': sample['signal_data']['deviation'] / 10}}
+         for sample in predictor.training_data])
+    np.testing.assert_array_equal(features, rebuilt)
+    np.testing.assert_allclose(targets, rebuilt_targets)
+
+    result = predictor.train_on_arrays({'signal_strength': (features, targets)}, save=False)
+    assert result['models_trained'] == 1
+    assert predictor.signal_strength_model.n_features_in_ == len(SIGNAL_FEATURES)
+
+
+def test_legacy_width_models_are_discarded(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    predictor = MLSignalPredictor(load_models=False)
+    X = np.random.default_rng(0).normal(size=(60, 7))
+    predictor._train_signal_strength_model(X, (X[:, 0] > 0).astype(float))
+    predictor._save_models()
+
+    reloaded = MLSignalPredictor()
+    assert reloaded.signal_strength_model is None
+    assert 'signal_strength' not in reloaded.scalers
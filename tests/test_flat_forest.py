@@ -0,0 +1,85 @@
+"""
+Tests for flattened-tree inference and batched ML signal prediction
+"""
+
+import sys
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesRegressor, GradientBoostingClassifier, RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.flat_forest import FlatForest
+from core.ml_signal_predictor import MLSignalPredictor
+
+
+def training_set(rows=400, features=12, seed=11):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, features))
+    y = np.tanh(X[:, 0] * X[:, 1]) + 0.5 * X[:, 2] + rng.normal(0, 0.1, rows)
+    return X, y, rng
+
+
+@pytest.mark.parametrize('model', [
+    RandomForestRegressor(n_estimators=100, random_state=42, max_depth=10),
+    ExtraTreesRegressor(n_estimators=30, random_state=1),
+    DecisionTreeRegressor(max_depth=6, random_state=0)
+])
+def test_predictions_match_sklearn(model):
+    X, y, rng = training_set()
+    model.fit(X, y)
+    flat = FlatForest.from_model(model)
+
+    X_test = rng.normal(size=(200, X.shape[1]))
+    # Rows sitting exactly on split thresholds exercise the float32 comparison
+    tree = model.estimators_[0].tree_ if hasattr(model, 'estimators_') else model.tree_
+    splits = np.flatnonzero(tree.children_left != -1)[:20]
+    X_test[np.arange(len(splits)), tree.feature[splits]] = tree.threshold[splits]
+
+    np.testing.assert_allclose(flat.predict(X_test), model.predict(X_test), rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(flat.predict(X_test[0]), model.predict(X_test[:1]), rtol=1e-12)
+
+
+def test_unsupported_models_are_left_to_sklearn():
+    X, y, _ = training_set(rows=100)
+    classifier = GradientBoostingClassifier(n_estimators=5).fit(X, y > 0)
+    assert FlatForest.from_model(classifier) is None
+
+
+@pytest.fixture
+def trained_predictor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    predictor = MLSignalPredictor()
+    X, y, _ = training_set(rows=300)
+    predictor._train_signal_strength_model(X, np.clip((y + 2) / 4, 0, 1))
+    return predictor
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_single_predictions(trained_predictor):
+    rng = np.random.default_rng(5)
+    timestamp = datetime(2026, 3, 4, 13, 30, 15).isoformat()
+    signals = [{'symbol': f'P{i}USDT', 'timestamp': timestamp, 'correlation': float(rng.uniform(-1, 1)),
+                'deviation': float(rng.uniform(0, 0.5))} for i in range(25)]
+    assert 'signal_strength' in trained_predictor.compiled_models
+
+    batch = await trained_predictor.predict_signal_strengths(signals, {})
+    singles = [await trained_predictor.predict_signal_strength(signal, {}) for signal in signals]
+    for batched, single in zip(batch, singles):
+        assert batched['ml_predicted_strength'] == pytest.approx(single['ml_predicted_strength'], abs=1e-12)
+        assert batched['confidence'] == pytest.approx(single['confidence'])
+        assert batched['features_used'] == 12
+
+    # The flattened trees give what the sklearn model gives
+    features = trained_predictor._signal_feature_matrix(signals, {})
+    scaled = trained_predictor.scalers['signal_strength'].transform(features)
+    np.testing.assert_allclose(
+        trained_predictor._predict('signal_strength', trained_predictor.signal_strength_model, scaled),
+        trained_predictor.signal_strength_model.predict(scaled), rtol=1e-12
+    )
+    features_single = [await trained_predictor._extract_signal_features(signal, {}) for signal in signals]
+    np.testing.assert_array_equal(features, np.array(features_single))
@@ -0,0 +1,135 @@
+"""
+Tests for the startup history pre-warm
+"""
+
+import sys
+import os
+import time
+import asyncio
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.correlation_engine import CorrelationEngine
+from core.history_prewarm import CandleStore, HistoryPrewarmer, timeframe_ms
+
+
+class CandleExchange:
+    """One-minute candles whose close is the candle's minute index; records every call"""
+
+    def __init__(self, latency=0.0, failing=()):
+        self.latency = latency
+        self.failing = set(failing)
+        self.calls = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=100):
+        self.calls.append((symbol, timeframe, since, limit))
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if symbol in self.failing:
+                raise ConnectionError('exchange unavailable')
+            step = timeframe_ms(timeframe)
+            last = int(time.time() * 1000) // step
+            first = since // step if since is not None else last - limit + 1
+            return [[minute * step, 0, 0, 0, float(minute), 1.0] for minute in range(first, min(first + limit, last + 1))]
+        finally:
+            self.in_flight -= 1
+
+
+class BufferEngine:
+    """Engine needing a fixed set of histories"""
+
+    def __init__(self, requirements):
+        self.requirements = requirements
+        self.loaded = {}
+
+    def history_requirements(self):
+        return self.requirements
+
+    def load_history(self, candles):
+        self.loaded = candles
+
+
+def test_timeframe_ms():
+    assert timeframe_ms('1m') == 60_000
+    assert timeframe_ms('4h') == 4 * 3_600_000
+    assert timeframe_ms('1d') == 86_400_000
+
+
+def test_shared_requirements_fetched_once_concurrently():
+    symbols = [f'PAIR{i}USDT' for i in range(11)]
+    first = BufferEngine({(symbol, timeframe): 60 for symbol in symbols for timeframe in ('1m', '3m', '5m')})
+    second = BufferEngine({(symbol, '1m'): 80 for symbol in symbols[:3]})
+    exchange = CandleExchange(latency=0.05, failing=['PAIR10USDT'])
+    prewarmer = HistoryPrewarmer(exchange, weight_budget=1000, max_concurrency=8)
+
+    start = time.perf_counter()
+    asyncio.run(prewarmer.prewarm([first, second]))
+    elapsed = time.perf_counter() - start
+
+    assert len(exchange.calls) == 33
+    assert exchange.peak_in_flight == 8
+    assert elapsed < 33 * 0.05 / 2  # Far quicker than one call after another
+    assert prewarmer.stats['failed'] == 3
+
+    # The deeper requirement wins and each engine gets what it asked for
+    assert len(second.loaded[('PAIR0USDT', '1m')]) == 80
+    assert len(first.loaded[('PAIR0USDT', '1m')]) == 60
+    assert len(first.loaded) == 30 and ('PAIR10USDT', '1m') not in first.loaded
+
+
+def test_weight_budget_delays_requests_beyond_it():
+    engine = BufferEngine({(f'PAIR{i}USDT', '1m'): 60 for i in range(3)})
+    prewarmer = HistoryPrewarmer(CandleExchange(), weight_budget=2, max_concurrency=3)
+    prewarmer.weight_used.bucket_seconds = 0.05  # Poll interval while waiting for budget
+
+    async def run():
+        task = asyncio.create_task(prewarmer.prewarm([engine]))
+        await asyncio.sleep(0.2)
+        assert prewarmer.stats['requests'] == 2
+        task.cancel()
+
+    asyncio.run(run())
+
+
+def test_candle_store_is_topped_up_with_missing_candles(tmp_path):
+    store = CandleStore(str(tmp_path))
+    key = ('BTC/USDT', '1m')
+    engine = BufferEngine({key: 50})
+    exchange = CandleExchange()
+    asyncio.run(HistoryPrewarmer(exchange, store=store).prewarm([engine]))
+    assert os.path.exists(store.path(key))
+
+    # Age the stored history by five minutes
+    stored = store.load(key)[:-5]
+    store.save(key, stored)
+    exchange.calls.clear()
+    asyncio.run(HistoryPrewarmer(exchange, store=store).prewarm([engine]))
+
+    (symbol, timeframe, since, limit), = exchange.calls
+    assert since == int(stored[-1, 0]) and limit < 10
+    candles = engine.loaded[key]
+    assert len(candles) == 50
+    assert np.all(np.diff(candles[:, 0]) == 60_000)  # No gaps or duplicated candles
+
+
+def test_correlation_engine_extends_restored_history():
+    engine = CorrelationEngine(window_size=20, symbols=['BTCUSDT', 'ETHUSDT'])
+    now_minute = int(time.time() * 1000) // 60_000
+    engine.price_history = {'BTCUSDT': [50.0] * 30}
+    engine.history_as_of_ms = (now_minute - 3) * 60_000
+
+    asyncio.run(HistoryPrewarmer(CandleExchange()).prewarm([engine]))
+
+    # Candles opened after the snapshot extend the restored history
+    extended = engine.price_history['BTCUSDT']
+    assert extended[:30] == [50.0] * 30 and len(extended) in (33, 34)
+    assert extended[-1] == float(now_minute) or extended[-1] == float(now_minute - 1)
+    # A symbol without history is seeded with the full candle window
+    assert len(engine.price_history['ETHUSDT']) == 70
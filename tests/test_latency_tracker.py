@@ -0,0 +1,88 @@
+"""
+Tests for per-stage latency instrumentation
+"""
+
+import asyncio
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.latency_tracker import LatencyHistogram, LatencyTracker
+
+
+def test_histogram_percentiles_within_precision():
+    """Percentiles stay within the log-linear bucket error"""
+    histogram = LatencyHistogram()
+    values = np.random.default_rng(7).lognormal(mean=2.0, sigma=1.0, size=5000)
+    for value in values:
+        histogram.record(value)
+
+    summary = histogram.percentiles()
+    assert summary['count'] == 5000
+    for q, key in ((0.5, 'p50'), (0.99, 'p99')):
+        exact = np.quantile(values, q)
+        assert summary[key] == pytest.approx(exact, rel=0.03)
+    assert summary['max'] >= values.max() * 0.99
+
+
+def test_histogram_rolling_window_expires_old_samples():
+    """Samples older than the window drop out of the percentiles"""
+    histogram = LatencyHistogram(window_seconds=1.0, slices=2)
+    histogram.record(5.0)
+    histogram.slice_started[:] -= 10.0
+    histogram.record(1.0)
+
+    summary = histogram.percentiles()
+    assert summary['count'] == 1
+    assert summary['p50'] == pytest.approx(1.0, rel=0.01)
+
+
+def test_trace_records_stage_breakdown():
+    """Spans attach to the current trace and are recorded on finish"""
+    tracker = LatencyTracker()
+
+    with tracker.trace('execution') as trace:
+        with tracker.span('risk_validation'):
+            pass
+        with tracker.span('order_placement'):
+            pass
+
+    breakdown = trace.breakdown()
+    assert set(breakdown) == {'risk_validation', 'order_placement', 'total'}
+    snapshot = tracker.snapshot()
+    assert snapshot['execution']['total']['count'] == 1
+    assert snapshot['execution']['order_placement']['count'] == 1
+
+
+@pytest.mark.asyncio
+async def test_nested_traces_are_task_local():
+    """A nested trace owns its spans and the outer trace resumes afterwards"""
+    tracker = LatencyTracker()
+
+    async def execute():
+        with tracker.trace('execution'):
+            with tracker.span('fill_polling'):
+                await asyncio.sleep(0)
+
+    with tracker.trace('cycle') as cycle:
+        with tracker.span('execution'):
+            await asyncio.gather(execute(), execute())
+        with tracker.span('risk_filter'):
+            pass
+
+    assert set(cycle.breakdown()) == {'execution', 'risk_filter', 'total'}
+    snapshot = tracker.snapshot()
+    assert snapshot['execution']['fill_polling']['count'] == 2
+    assert 'fill_polling' not in snapshot['cycle']
+
+
+def test_untraced_span_uses_explicit_pipeline():
+    """Spans outside a trace are recorded under their own pipeline"""
+    tracker = LatencyTracker()
+    with tracker.span('scan', pipeline='scanner'):
+        pass
+    assert tracker.snapshot()['scanner']['scan']['count'] == 1
@@ -0,0 +1,74 @@
+"""
+Tests for the shared mark-price and funding cache
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.market_state import MarketStateCache
+
+
+def premium_index(prices, funding='0.0001', next_funding=1700000000000):
+    return [{'symbol': symbol, 'markPrice': str(price), 'indexPrice': str(price),
+             'lastFundingRate': funding, 'nextFundingTime': next_funding}
+            for symbol, price in prices.items()]
+
+
+@pytest.mark.asyncio
+async def test_one_bulk_request_serves_every_symbol():
+    """Concurrent reads of a stale table share one premium index request"""
+    cache = MarketStateCache(mark_max_age=5.0, funding_max_age=300)
+    calls = []
+
+    async def fetch_all():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return premium_index({'BTCUSDT': 50000.0, 'ETHUSDT': 3000.0, 'AXSUSDT': 7.5})
+
+    states = await asyncio.gather(*(cache.get_or_refresh(symbol, fetch_all)
+                                    for symbol in ('BTCUSDT', 'ETHUSDT', 'AXSUSDT')))
+    assert [state.mark_price for state in states] == [50000.0, 3000.0, 7.5]
+    assert len(calls) == 1
+
+    assert (await cache.get_or_refresh('ETHUSDT', fetch_all)).mark_price == 3000.0
+    assert await cache.refresh(fetch_all) == 0
+    assert len(calls) == 1
+    assert cache.funding_rate('AXSUSDT') == pytest.approx(0.0001)
+    assert cache.next_funding_time().timestamp() == pytest.approx(1700000000)
+
+
+def test_staleness_bounds_and_stream_updates():
+    """Mark prices and funding expire on their own bounds; stream events keep them fresh"""
+    cache = MarketStateCache(mark_max_age=1.0, funding_max_age=60)
+    cache.apply_premium_index(premium_index({'BTCUSDT': 50000.0}, funding='0.0005'))
+    cache.states['BTCUSDT'].updated = time.monotonic() - 10
+
+    assert cache.get('BTCUSDT') is None
+    assert cache.funding_rate('BTCUSDT') == pytest.approx(0.0005)
+
+    cache.apply_mark_price_event({'e': 'markPriceUpdate', 's': 'BTCUSDT', 'p': '50100.5', 'r': '0.0002'})
+    state = cache.get('BTCUSDT')
+    assert state.mark_price == 50100.5
+    assert state.funding_rate == pytest.approx(0.0002)
+    assert state.index_price == 50000.0
+    assert cache.apply_mark_price_event({'s': 'BTCUSDT'}) is None
+
+
+def test_mark_updates_do_not_refresh_funding():
+    """Funding has its own timestamp, and a symbol only seen in mark updates has no funding rate"""
+    cache = MarketStateCache(mark_max_age=1.0, funding_max_age=60)
+    cache.update('AXSUSDT', 7.5)
+    assert cache.get('AXSUSDT').mark_price == 7.5
+    assert cache.funding_rate('AXSUSDT') is None
+
+    cache.apply_premium_index(premium_index({'BTCUSDT': 50000.0}, funding='0.0005'))
+    cache.states['BTCUSDT'].funding_updated = time.monotonic() - 120  # Bulk refreshes failing since
+    cache.update('BTCUSDT', 50200.0)  # Positions keep ticking
+    assert cache.get('BTCUSDT') is not None
+    assert cache.funding_rate('BTCUSDT') is None
@@ -0,0 +1,72 @@
+"""
+Tests for compact float32 scanner storage
+"""
+
+import sys
+import os
+import tracemalloc
+from collections import deque
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.candle_buffer import CandleSeries
+from core.metric_history import MetricHistory, METRIC_FIELDS
+from core.rolling_percentile import PercentileTracker
+from tests.test_candle_buffer import random_bars
+
+
+def test_history_ring_keeps_newest_snapshots():
+    history = MetricHistory(capacity=4)
+    for i in range(6):
+        history.append({'vol_1h': 0.1 * i, 'atr': i, 'not_a_metric': 1.0}, timestamp=1_700_000_000 + i)
+
+    assert len(history) == 4
+    np.testing.assert_allclose(history.column('vol_1h'), [0.2, 0.3, 0.4, 0.5], rtol=1e-6)
+    assert history.column('vol_1h').dtype == np.float32
+    assert list(history.timestamps()) == [(1_700_000_000 + i) * 1000 for i in range(2, 6)]
+    assert history.latest()['atr'] == 5.0
+    assert np.isnan(history.latest()['vol_24h'])
+
+    frame = history.frame()
+    assert list(frame.columns) == list(METRIC_FIELDS)
+    assert frame['atr'].tolist() == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_candle_timestamps_stay_exact():
+    """Millisecond timestamps live on their own int64 axis, bars in float32 columns"""
+    rows = random_bars(600)
+    series = CandleSeries('AXS/USDT', capacity=500)
+    series.update([[row[0] + 1_700_000_000_000] + row[1:] for row in rows])
+    assert series['timestamp'][-1] == rows[-1][0] + 1_700_000_000_000
+    assert series['close'].dtype == np.float32
+    assert series.metrics()['current_price'] == rows[-1][4]
+
+
+def test_scanner_state_is_compact():
+    """A symbol's bars, metric history and percentile windows fit in a fraction of the dict/deque layout"""
+    rows = random_bars(800)
+
+    def footprint(store_history):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        series = CandleSeries('AXS/USDT', 500)
+        series.update(rows[:500])
+        tracker = PercentileTracker()
+        history = store_history()
+        for j in range(300):
+            series.update([rows[500 + j]])
+            metrics = series.metrics()
+            history.append(metrics)
+            tracker.add(metrics['vol_1h'], timestamp=j * 1800)
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        return used
+
+    footprint(lambda: MetricHistory(288))  # Warm-up: one-off library caches are not per-symbol state
+    compact = footprint(lambda: MetricHistory(288))
+    dicts = footprint(lambda: deque(maxlen=288))
+    assert compact < 100 * 1024
+    assert dicts > 3 * compact
@@ -0,0 +1,152 @@
+"""
+Tests for background model retraining and hot-swapping
+"""
+
+import sys
+import os
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import core.model_retrainer as model_retrainer
+from core.ml_signal_predictor import REGIME_LABELS, MLSignalPredictor
+from core.model_retrainer import ModelRetrainer
+
+
+def trade_samples(count, seed=2):
+    rng = np.random.default_rng(seed)
+    samples = []
+    for _ in range(count):
+        deviation = float(rng.uniform(0, 0.5))
+        samples.append({
+            'signal_data': {'correlation': float(rng.uniform(-1, 1)), 'deviation': deviation},
+            'market_data': {},
+            'actual_performance': {'profit_pct': 0.1 * deviation - 0.02 + float(rng.normal(0, 0.005))}
+        })
+    return samples
+
+
+def regime_samples(count, seed=4):
+    rng = np.random.default_rng(seed)
+    samples = []
+    for index in range(count):
+        rsi = float(rng.uniform(0, 100))
+        samples.append({
+            'market_data': {'symbol': f'PAIR{seed}-{index}', 'rsi': rsi},
+            'regime_label': 'bull' if rsi > 50 else 'bear'
+        })
+    return samples
+
+
+class ConstantRegime:
+    """Regime classifier that always answers 'volatile'"""
+
+    def predict(self, features):
+        return np.full(len(features), float(REGIME_LABELS['volatile']))
+
+
+@pytest.fixture
+def predictor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return MLSignalPredictor(load_models=False)
+
+
+@pytest.mark.asyncio
+async def test_retrains_in_worker_process_without_blocking_the_loop(predictor):
+    retrainer = ModelRetrainer(predictor)
+    try:
+        for sample in trade_samples(99):
+            predictor.add_training_sample(sample)
+        assert not retrainer.running
+
+        predictor.add_training_sample(trade_samples(1, seed=3)[0])
+        assert retrainer.running
+
+        longest_gap = 0.0
+        last = time.perf_counter()
+        while retrainer.running:
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            longest_gap = max(longest_gap, now - last)
+            last = now
+
+        assert longest_gap < 0.5
+        assert retrainer.stats['accepted'] == 1
+        assert predictor.model_version == 1
+        assert 'signal_strength' in predictor.compiled_models
+        assert os.path.exists(os.path.join(predictor.model_dir, 'signal_strength_model.pkl'))
+        assert not retrainer.request_retrain()  # No new samples since the snapshot
+    finally:
+        await retrainer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_validation_gate_and_rollback(predictor):
+    retrainer = ModelRetrainer(predictor, executor=ThreadPoolExecutor(max_workers=1))
+    predictor.retrain_threshold = 10_000  # Retrain only when the test says so
+    for sample in trade_samples(150):
+        predictor.add_training_sample(sample)
+
+    first = await retrainer.retrain()
+    assert first is not None and predictor.model_version == 1
+    first_model = predictor.signal_strength_model
+
+    # A candidate must beat the live model by more than it can
+    retrainer.tolerance = -1.0
+    for sample in trade_samples(100, seed=9):
+        predictor.add_training_sample(sample)
+    assert await retrainer.retrain() is None
+    assert retrainer.stats['rejected'] == 1
+    assert predictor.signal_strength_model is first_model
+
+    retrainer.tolerance = 10.0
+    second = await retrainer.retrain()
+    assert second is not None and predictor.model_version == 3
+    assert predictor.scalers['signal_strength'] is second.scalers['signal_strength']
+
+    assert retrainer.rollback()
+    assert predictor.model_version == 1
+    assert predictor.signal_strength_model is first_model
+    await retrainer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_each_model_is_validated_on_its_own_holdout(predictor, monkeypatch):
+    retrainer = ModelRetrainer(predictor, executor=ThreadPoolExecutor(max_workers=1))
+    predictor.retrain_threshold = 10_000
+    for sample in trade_samples(150) + regime_samples(150):
+        predictor.add_training_sample(sample)
+    assert await retrainer.retrain() is not None
+    live_regime = predictor.regime_classifier
+    live_regime_scaler = predictor.scalers['regime_classification']
+
+    train_candidate = model_retrainer.train_candidate
+
+    def with_broken_regime(training, holdout, version):
+        bundle = train_candidate(training, holdout, version)
+        bundle.regime_classifier = ConstantRegime()
+        scorer = MLSignalPredictor(load_models=False)
+        scorer.install_models(bundle)
+        bundle.holdout_errors['regime_classification'] = scorer.holdout_error(
+            *holdout['regime_classification'], name='regime_classification')
+        return bundle
+
+    monkeypatch.setattr(model_retrainer, 'train_candidate', with_broken_regime)
+    retrainer.tolerance = 10.0
+    for sample in trade_samples(50, seed=9) + regime_samples(50, seed=5):
+        predictor.add_training_sample(sample)
+    second = await retrainer.retrain()
+
+    # The signal strength model is swapped in, the failing regime classifier is not
+    assert second is not None and predictor.model_version == 2
+    assert second.holdout_errors['regime_classification'] == 1.0
+    assert predictor.signal_strength_model is second.signal_strength_model
+    assert predictor.regime_classifier is live_regime
+    assert predictor.scalers['regime_classification'] is live_regime_scaler
+    assert retrainer.stats['models_kept_live'] == 1
+    await retrainer.shutdown()
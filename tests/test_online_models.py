@@ -0,0 +1,102 @@
+"""
+Tests for online learning models and drift detection
+"""
+
+import sys
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.config.settings import config
+from core.feature_store import SIGNAL_FEATURES
+from core.ml_signal_predictor import MLSignalPredictor
+from core.online_models import OnlineModel, PageHinkley
+
+
+def test_page_hinkley_flags_a_rise_in_error_only():
+    rng = np.random.default_rng(1)
+    detector = PageHinkley()
+    assert not any(detector.update(value) for value in rng.uniform(0.05, 0.15, 500))
+
+    flagged_at = next(i for i, value in enumerate(rng.uniform(0.4, 0.6, 100)) if detector.update(value))
+    assert flagged_at < 10
+    assert detector.drifts == 1 and detector.count == 0
+
+
+def test_regressor_learns_one_sample_at_a_time():
+    rng = np.random.default_rng(2)
+    model = OnlineModel.regressor(warmup=20)
+    errors = []
+    for _ in range(2000):
+        x = rng.normal(size=4)
+        error = model.update(x, 0.5 + 0.2 * x[0] - 0.1 * x[2])
+        errors.append(error)
+    assert errors[0] is None
+    assert model.ready and model.updates == 2000
+    assert np.mean(errors[-200:]) < 0.5 * np.mean(errors[1:201])
+
+    x = rng.normal(size=(50, 4))
+    np.testing.assert_allclose(model.predict(x), 0.5 + 0.2 * x[:, 0] - 0.1 * x[:, 2], atol=0.05)
+
+
+def test_classifier_learns_separable_classes():
+    rng = np.random.default_rng(3)
+    model = OnlineModel.classifier([0, 1, 2, 3])
+    centers = np.array([[3, 0], [-3, 0], [0, 3], [0, -3]])
+    for _ in range(400):
+        label = int(rng.integers(4))
+        model.update(centers[label] + rng.normal(0, 0.5, 2), label)
+
+    probabilities = model.predict_proba(centers)
+    assert probabilities.shape == (4, 4)
+    np.testing.assert_array_equal(model.predict(centers), [0, 1, 2, 3])
+
+
+def signal_sample(rng, minute, flipped=False):
+    deviation = float(rng.uniform(0, 0.5))
+    profit = (0.02 - 0.1 * deviation) if flipped else (0.1 * deviation - 0.02)
+    return {
+        'signal_data': {'symbol': 'ETHUSDT', 'correlation': float(rng.uniform(-1, 1)), 'deviation': deviation,
+                        'timestamp': datetime.fromtimestamp(datetime(2026, 3, 4).timestamp() + 60 * minute).isoformat()},
+        'market_data': {},
+        'actual_performance': {'profit_pct': profit}
+    }
+
+
+@pytest.mark.asyncio
+async def test_predictor_flags_drift_and_serves_online_model(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    predictor = MLSignalPredictor(load_models=False)
+    predictor.retrain_threshold = 10_000
+    rng = np.random.default_rng(4)
+
+    for minute in range(200):
+        predictor.add_training_sample(signal_sample(rng, minute))
+    features, targets, _ = predictor.feature_store.training_sets()['signal_strength']
+    assert features.shape == (200, len(SIGNAL_FEATURES))
+    predictor.train_on_arrays({'signal_strength': (features, targets)}, save=False)
+    assert predictor.online_models['signal_strength'].updates == 200
+
+    # Same relationship: the batch model keeps up
+    for minute in range(200, 300):
+        predictor.add_training_sample(signal_sample(rng, minute))
+    assert not predictor.drift_detected['signal_strength']
+
+    # Profit now falls with deviation
+    for minute in range(300, 400):
+        predictor.add_training_sample(signal_sample(rng, minute, flipped=True))
+    assert predictor.drift_detected['signal_strength']
+
+    signal = signal_sample(rng, 400)['signal_data']
+    assert (await predictor.predict_signal_strength(signal))['model_type'] == 'RandomForestRegressor'
+    monkeypatch.setattr(config, 'ML_ONLINE_LEARNING', True)
+    prediction = await predictor.predict_signal_strength(signal)
+    assert prediction['model_type'] == 'online_SGDRegressor'
+    assert 0.0 <= prediction['ml_predicted_strength'] <= 1.0
+
+    predictor.install_models(predictor.export_models())
+    assert not predictor.drift_detected['signal_strength']
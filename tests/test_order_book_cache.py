@@ -0,0 +1,86 @@
+"""
+Tests for the shared order book depth cache and fill-cost estimates
+"""
+
+import sys
+import os
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.order_book_cache import DepthBook, OrderBookCache
+
+
+BIDS = [['99.9', '1.0'], ['99.8', '2.0'], ['99.7', '3.0']]
+ASKS = [['100.1', '1.0'], ['100.2', '2.0'], ['100.3', '3.0']]
+
+
+def walk_levels(levels, quantity):
+    """Reference level-by-level walk, as the risk manager used to do it"""
+    remaining, cost = quantity, 0.0
+    for price, size in levels:
+        fill = min(remaining, size)
+        cost += fill * price
+        remaining -= fill
+        if remaining <= 0:
+            break
+    return cost / (quantity - remaining)
+
+
+def test_cost_to_fill_matches_level_walk():
+    """Binary search over cumulative depth gives the same average price as walking levels"""
+    book = DepthBook.from_levels('AXSUSDT', BIDS, ASKS)
+    asks = [(float(p), float(s)) for p, s in ASKS]
+    bids = [(float(p), float(s)) for p, s in BIDS]
+
+    for quantity in (0.5, 1.0, 2.5, 6.0):
+        buy = book.cost_to_fill(quantity, 'buy')
+        sell = book.cost_to_fill(quantity, 'sell')
+        assert buy.average_price == pytest.approx(walk_levels(asks, quantity))
+        assert sell.average_price == pytest.approx(walk_levels(bids, quantity))
+        assert buy.complete and sell.complete
+
+    thin = book.cost_to_fill(10.0, 'buy')
+    assert not thin.complete
+    assert thin.filled == pytest.approx(6.0)
+    assert book.cost_to_fill(1.0, 'buy').slippage_bps == pytest.approx(10.0)
+
+
+def test_apply_diff_updates_and_removes_levels():
+    """Stream diffs replace sizes, drop zero-size levels and keep price order"""
+    cache = OrderBookCache(max_age_seconds=60, depth=20)
+    cache.update('AXSUSDT', BIDS, ASKS)
+    book = cache.apply_diff('AXSUSDT', bids=[['99.9', '0'], ['99.95', '4.0']], asks=[['100.05', '0.5']])
+
+    assert book.best_bid == pytest.approx(99.95)
+    assert book.best_ask == pytest.approx(100.05)
+    assert list(book.bid_prices) == sorted(book.bid_prices, reverse=True)
+    assert 99.9 not in book.bid_prices
+    assert book.depth(2) == (pytest.approx(6.0), pytest.approx(1.5))
+    assert cache.apply_diff('BTCUSDT', [], []) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_readers_share_one_fetch():
+    """Stale-book readers coalesce onto one snapshot; fresh reads hit the cache"""
+    cache = OrderBookCache(max_age_seconds=60, depth=20)
+    calls = 0
+
+    async def fetch_book():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {'bids': BIDS, 'asks': ASKS}
+
+    books = await asyncio.gather(*(cache.get_or_fetch('AXSUSDT', fetch_book) for _ in range(5)))
+    assert calls == 1
+    assert all(book is books[0] for book in books)
+
+    await cache.get_or_fetch('AXSUSDT', fetch_book)
+    assert calls == 1
+    assert cache.estimate_slippage('AXSUSDT', 1.0, 'sell') == pytest.approx(10.0)
+
+    await cache.get_or_fetch('AXSUSDT', fetch_book, max_age=0)
+    assert calls == 2
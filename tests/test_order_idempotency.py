@@ -0,0 +1,160 @@
+"""
+Tests for idempotent client order ids and check-then-retry order submission
+"""
+
+import sys
+import os
+from unittest.mock import AsyncMock, patch
+
+import ccxt.async_support as ccxt
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core import executor as executor_module
+from core.executor import Executor
+from core.order_idempotency import (
+    OrderStateUnknown, make_client_order_id, create_order_idempotent, find_order_by_client_id
+)
+
+
+class FlakyExchange:
+    """Exchange stub whose first submissions fail in transit, before or after landing"""
+
+    def __init__(self, failures=1, lands_before_failure=True, lookup_failures=0):
+        self.failures = failures
+        self.lands_before_failure = lands_before_failure
+        self.lookup_failures = lookup_failures
+        self.orders = {}
+        self.submissions = 0
+
+    def _book(self, symbol, amount, params):
+        order = {'id': str(len(self.orders) + 1), 'symbol': symbol, 'status': 'closed',
+                 'filled': amount, 'average': 100.0, 'clientOrderId': params['clientOrderId']}
+        self.orders[order['id']] = order
+        return order
+
+    async def create_order(self, symbol, type, side, amount, price=None, params=None):
+        self.submissions += 1
+        if self.failures > 0:
+            self.failures -= 1
+            if self.lands_before_failure:
+                self._book(symbol, amount, params)
+            raise ccxt.RequestTimeout('timed out')
+        return self._book(symbol, amount, params)
+
+    async def fetch_order(self, order_id, symbol, params=None):
+        if order_id is None:
+            if self.lookup_failures > 0:
+                self.lookup_failures -= 1
+                raise ccxt.NetworkError('lookup failed')
+            for order in self.orders.values():
+                if order['clientOrderId'] == params['origClientOrderId']:
+                    return order
+            raise ccxt.OrderNotFound('Order does not exist.')
+        return self.orders[order_id]
+
+    async def fetch_balance(self):
+        return {'USDT': {'free': 10000.0}}
+
+    async def fetch_positions(self):
+        return []
+
+    async def set_leverage(self, leverage, symbol):
+        return {}
+
+
+def request_for(client_order_id):
+    return {'symbol': 'AXSUSDT', 'type': 'market', 'side': 'buy', 'amount': 1.0,
+            'price': None, 'params': {'clientOrderId': client_order_id}}
+
+
+@pytest.fixture(autouse=True)
+def no_backoff():
+    with patch.object(executor_module.config, 'RETRY_BASE_DELAY', 0):
+        yield
+
+
+def test_client_order_ids_are_deterministic_and_valid():
+    """Same signal and leg give the same id; ids fit Binance's 36-char limit"""
+    entry = make_client_order_id('AXSUSDT_1700000000_0')
+    assert entry == make_client_order_id('AXSUSDT_1700000000_0')
+    assert entry != make_client_order_id('AXSUSDT_1700000000_0', 'stop_loss')
+    assert len(entry) <= 36
+
+
+@pytest.mark.asyncio
+async def test_timeout_after_landing_reuses_order():
+    """An order that landed before the timeout is found, not resent"""
+    exchange = FlakyExchange(lands_before_failure=True)
+    order = await create_order_idempotent(exchange, request_for('qtbabc'))
+    assert order['clientOrderId'] == 'qtbabc'
+    assert exchange.submissions == 1
+    assert len(exchange.orders) == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_before_landing_resends_once():
+    """An order that never landed is resent exactly once"""
+    exchange = FlakyExchange(lands_before_failure=False)
+    await create_order_idempotent(exchange, request_for('qtbabc'))
+    assert exchange.submissions == 2
+    assert len(exchange.orders) == 1
+
+
+@pytest.mark.asyncio
+async def test_unresolvable_lookup_raises():
+    """If the exchange cannot confirm the order state, callers must not resend"""
+    exchange = FlakyExchange(lookup_failures=10)
+    with pytest.raises(OrderStateUnknown):
+        await find_order_by_client_id(exchange, 'qtbabc', 'AXSUSDT', lookups=2)
+
+
+@pytest.fixture
+def patched_pipeline():
+    integrator = executor_module.optimization_integrator
+    with patch.object(integrator, 'generate_enhanced_signal', AsyncMock(return_value={})), \
+         patch.object(integrator, 'validate_enhanced_trade_risk', AsyncMock(return_value={'approved': True})), \
+         patch.object(integrator, 'setup_enhanced_exit_management', AsyncMock(return_value={})), \
+         patch.object(executor_module.authenticity_validator, 'validate_market_data', return_value=True), \
+         patch.object(executor_module.leverage_manager, 'calculate_optimal_leverage', AsyncMock(return_value=8)), \
+         patch.object(executor_module.leverage_manager, 'calculate_optimal_position_size', return_value=1.0), \
+         patch.object(executor_module.config, 'PLACE_PROTECTIVE_ORDERS', False):
+        yield
+
+
+def make_signal():
+    return {'id': 'AXSUSDT_1700000000_0', 'symbol': 'AXSUSDT', 'action': 'buy', 'entry_price': 100.0,
+            'confidence': 0.8, 'execution_mode': 'market'}
+
+
+@pytest.mark.asyncio
+async def test_executor_recovers_landed_order_without_duplicate(patched_pipeline):
+    """Executor retry finds the order by client id instead of placing a second one"""
+    exchange = FlakyExchange(lands_before_failure=True)
+    executor = Executor()
+    executor.exchange = exchange
+    executor.connected = True
+
+    result = await executor.execute(make_signal())
+
+    assert result.status == 'FILLED'
+    assert result.retry_count == 1
+    assert exchange.submissions == 1
+    assert len(exchange.orders) == 1
+
+
+@pytest.mark.asyncio
+async def test_executor_rejects_repeated_signal(patched_pipeline):
+    """A signal id that already executed is not executed again"""
+    exchange = FlakyExchange(failures=0)
+    executor = Executor()
+    executor.exchange = exchange
+    executor.connected = True
+
+    first = await executor.execute(make_signal())
+    second = await executor.execute(make_signal())
+
+    assert first.status == 'FILLED'
+    assert second.status == 'REJECTED'
+    assert len(exchange.orders) == 1
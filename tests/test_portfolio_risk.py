@@ -0,0 +1,154 @@
+"""
+Tests for the covariance-based portfolio risk engine
+"""
+
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.portfolio_risk import PortfolioRiskEngine
+from core.risk_manager import RiskManager
+from core.advanced_risk_manager import AdvancedRiskManager
+
+
+def warmed_engine(ticks=400, seed=3):
+    """ETH and AVAX move together (rho 0.8), GALA independently"""
+    engine = PortfolioRiskEngine(min_observations=20)
+    rng = np.random.default_rng(seed)
+    prices = np.array([3000.0, 30.0, 0.03])
+    for t in range(ticks):
+        z = rng.normal(size=3)
+        prices = prices * np.exp(np.array([z[0], 0.8 * z[0] + 0.6 * z[1], z[2]]) * 0.0005)
+        engine.update_prices(dict(zip(['ETHUSDT', 'AVAXUSDT', 'GALAUSDT'], prices)), timestamp=t)
+    return engine
+
+
+def test_covariance_tracks_correlation_structure():
+    engine = warmed_engine()
+    assert engine.ready
+    assert engine.correlation('ETHUSDT', 'AVAXUSDT') == pytest.approx(0.8, abs=0.15)
+    assert abs(engine.correlation('ETHUSDT', 'GALAUSDT')) < 0.25
+    assert engine.tick_seconds == pytest.approx(1.0)
+
+
+def test_incremental_state_matches_full_recompute():
+    """Σw and variance kept incrementally equal the dense products"""
+    engine = warmed_engine(ticks=50)
+    engine.set_position('ETHUSDT', 2000.0)
+    engine.set_position('GALAUSDT', -500.0)
+    engine.update_prices({'ETHUSDT': 3010.0, 'AVAXUSDT': 30.1, 'GALAUSDT': 0.0301}, timestamp=51)
+    engine.set_position('AVAXUSDT', 700.0)
+
+    np.testing.assert_allclose(engine.sigma_w, engine.cov @ engine.positions)
+    assert engine.variance == pytest.approx(engine.positions @ engine.cov @ engine.positions)
+
+
+def test_pre_trade_check_projects_variance_and_exposure():
+    engine = warmed_engine()
+    engine.set_position('ETHUSDT', 1000.0)
+
+    check = engine.pre_trade_check('AVAXUSDT', 1000.0)
+
+    weights = engine.positions.copy()
+    weights[engine.index['AVAXUSDT']] += 1000.0
+    assert check['projected_vol'] ** 2 == pytest.approx(weights @ engine.cov @ weights)
+    assert check['correlated_exposure'] == pytest.approx(1000.0 * engine.correlation('ETHUSDT', 'AVAXUSDT'))
+    assert check['projected_var'] > check['var'] > 0
+    # Shorting the correlated name hedges the book
+    assert engine.pre_trade_check('AVAXUSDT', -1000.0)['incremental_var'] < 0
+
+
+def test_metrics_contributions_sum_to_volatility():
+    engine = warmed_engine()
+    engine.set_position('ETHUSDT', 1500.0)
+    engine.set_position('AVAXUSDT', 800.0)
+    engine.set_position('GALAUSDT', -300.0)
+
+    metrics = engine.metrics()
+
+    assert sum(metrics['risk_contribution'].values()) == pytest.approx(metrics['portfolio_vol'])
+    assert metrics['expected_shortfall'] > metrics['var']
+
+
+@pytest.mark.asyncio
+async def test_correlation_risk_uses_live_correlations():
+    """Correlated open positions count toward the limit; uncorrelated ones barely do"""
+    engine = warmed_engine()
+    manager = RiskManager()
+    manager.update_position_tracking('ETHUSDT', {'position_size': 0.3, 'side': 'buy'})
+
+    with patch('core.risk_manager.portfolio_risk_engine', engine), \
+         patch('core.risk_manager.config.MAX_CORRELATION_EXPOSURE', 0.4):
+        correlated = await manager._check_correlation_risk('AVAXUSDT', 0.2, 'buy')
+        uncorrelated = await manager._check_correlation_risk('GALAUSDT', 0.2, 'buy')
+
+    assert correlated['high_risk']
+    assert not uncorrelated['high_risk']
+
+
+@pytest.mark.asyncio
+async def test_advanced_validation_flags_var_limit():
+    engine = warmed_engine()
+    manager = AdvancedRiskManager()
+    signal = {'symbol': 'AVAXUSDT', 'action': 'buy', 'deviation': 0.2}
+    positions = {'ETHUSDT': {'symbol': 'ETHUSDT', 'side': 'long', 'quantity': 1.0, 'entry_price': 3000.0}}
+
+    with patch('core.advanced_risk_manager.portfolio_risk_engine', engine), \
+         patch('core.advanced_risk_manager.config.MAX_PORTFOLIO_VAR', 1e-6):
+        engine.sync_positions(positions)
+        pre_trade = manager._pre_trade_check(signal, 10000.0, 3, 0.01)
+        result = await manager._analyze_correlation_exposure(signal, 10000.0, pre_trade)
+
+    assert engine.positions[engine.index['ETHUSDT']] == 3000.0
+    assert result['correlation_data']['covariance_ready']
+    assert any('VaR' in w for w in result['warnings'])
+
+
+def test_unified_symbols_share_the_price_feed_entry():
+    """Positions keyed by ccxt unified symbols land on the market-id rows the prices update"""
+    engine = warmed_engine()
+    engine.sync_positions({'ETH/USDT:USDT': {'symbol': 'ETH/USDT:USDT', 'side': 'long',
+                                             'quantity': 3.0, 'entry_price': 3000.0}})
+
+    assert engine.symbols == ['ETHUSDT', 'AVAXUSDT', 'GALAUSDT'] and engine.ready
+    assert engine.correlated_exposure('ETHUSDT') == pytest.approx(9000.0)
+    assert engine.pre_trade_check('ETH/USDT:USDT', 1000.0)['symbol_exposure'] == pytest.approx(9000.0)
+    assert engine.last_price('ETH/USDT:USDT') == engine.last_price('ETHUSDT')
+
+
+def test_unpriced_symbols_keep_their_covariance():
+    """A tick without a symbol leaves its variance and correlations alone"""
+    engine = warmed_engine()
+    engine.set_position('GALAUSDT', 500.0)
+    gala = engine.index['GALAUSDT']
+    variance = engine.cov[gala, gala]
+    cross = engine.cov[gala, engine.index['ETHUSDT']]
+
+    prices = {'ETHUSDT': engine.last_price('ETHUSDT'), 'AVAXUSDT': engine.last_price('AVAXUSDT')}
+    for t in range(400, 500):
+        prices = {symbol: price * 1.0001 for symbol, price in prices.items()}
+        engine.update_prices(prices, timestamp=t)
+
+    assert engine.cov[gala, gala] == variance
+    assert engine.cov[gala, engine.index['ETHUSDT']] == cross
+    np.testing.assert_allclose(engine.sigma_w, engine.cov @ engine.positions)
+
+
+def test_risk_queries_do_not_track_new_symbols():
+    engine = warmed_engine()
+    engine.set_position('ETHUSDT', 1000.0)
+
+    cov = engine.covariance(['ETHUSDT', 'SANDUSDT'])
+    check = engine.pre_trade_check('SANDUSDT', 500.0)
+    exposure = engine.correlated_exposure('SANDUSDT', {'SUSHIUSDT': 200.0, 'ETHUSDT': 100.0})
+
+    assert 'SANDUSDT' not in engine.index and 'SUSHIUSDT' not in engine.index and engine.ready
+    # Untracked symbols get the fully correlated prior
+    assert cov[0, 1] == pytest.approx(np.sqrt(cov[0, 0] * cov[1, 1]))
+    assert check['correlated_exposure'] == pytest.approx(1000.0)
+    assert exposure == pytest.approx(300.0)
@@ -0,0 +1,70 @@
+"""
+Tests for rolling 24h/7d/30d percentile ranks
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+from scipy.stats import percentileofscore
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.rolling_percentile import RollingPercentile, PercentileTracker
+from core.volatility_scanner import AdvancedVolatilityScanner, VolatilityState
+
+
+def test_rank_matches_scipy_over_the_window():
+    """Ranks equal percentileofscore over exactly the samples still in the window"""
+    rng = np.random.default_rng(7)
+    window = RollingPercentile(3600, 12)  # 5-minute samples
+    values = np.round(rng.lognormal(0, 0.4, 40), 2)  # Rounded so ties occur
+    for i, value in enumerate(values):
+        window.add(value, timestamp=i * 300)
+
+    kept = values[-12:]
+    assert len(window) == 12
+    for probe in (kept[0], kept.min(), kept.max(), 0.0, 99.0, float(np.median(kept))):
+        assert window.percentile(probe) == pytest.approx(percentileofscore(kept, probe))
+    assert window.mean() == pytest.approx(kept.mean())
+    assert window.quantile(0.5) == pytest.approx(sorted(kept)[5])  # Samples are stored as float32
+
+
+def test_same_slot_replaces_and_gaps_expire():
+    """A newer reading in a slot replaces the older one; old slots expire by time"""
+    window = RollingPercentile(3600, 12)
+    window.add(1.0, timestamp=0)
+    window.add(2.0, timestamp=100)
+    window.add(3.0, timestamp=300)
+    assert len(window) == 2
+    assert window.mean() == pytest.approx(2.5)
+
+    window.add(4.0, timestamp=3600)
+    assert len(window) == 2  # Slot 0 fell out of the hour
+    window.add(5.0, timestamp=10 * 3600)
+    assert len(window) == 1
+    assert window.percentile(5.0) == 100.0
+
+
+def test_memory_is_bounded_by_capacity():
+    tracker = PercentileTracker()
+    for i in range(5000):
+        tracker.add(float(i % 97), timestamp=i * 30)
+    assert len(tracker['24h']) <= 288
+    assert len(tracker['7d']) <= 336
+    assert len(tracker['30d']) <= 360
+    assert PercentileTracker().percentiles(1.0) == {'24h': 50.0, '7d': 50.0, '30d': 50.0}
+
+
+def test_scanner_classifies_from_tracker():
+    """The scanner ranks the current reading against the 24h window and fills 7d/30d"""
+    scanner = AdvancedVolatilityScanner('key', 'secret')
+    tracker = PercentileTracker()
+    for i in range(40):
+        tracker.add(0.5 + 0.01 * (i % 5), timestamp=i * 600)
+
+    assert scanner.classify_volatility_state({'vol_1h': 2.0}, tracker) == VolatilityState.BREAKOUT
+    assert scanner.classify_volatility_state({'vol_1h': 0.1}, tracker) == VolatilityState.DORMANT
+    ranks = tracker.percentiles(2.0)
+    assert ranks['7d'] == ranks['30d'] == 100.0
@@ -78,6 +78,19 @@ class MockExchange:
             }
         ]
     
+    async def futures_mark_price(self):
+        next_funding = int((datetime.now() + timedelta(hours=1)).timestamp() * 1000)
+        return [
+            {
+                'symbol': symbol,
+                'markPrice': str(price),
+                'indexPrice': str(price),
+                'lastFundingRate': '0.0001',
+                'nextFundingTime': next_funding
+            }
+            for symbol, price in self.prices.items()
+        ]
+    
     async def futures_create_order(self, **kwargs):
         order = {
             'orderId': len(self.orders) + 1,
@@ -493,6 +506,47 @@ async def test_performance_metrics_edge_cases(risk_manager):
     summary = risk_manager.get_risk_summary()
     assert summary['account_risk']['daily_pnl_pct'] == -10.0
 
+@pytest.mark.asyncio
+async def test_reconciliation_indexes_positions_and_exits_outside_lock(mock_exchange, risk_params):
+    """Exchange positions are matched by symbol; exits run after the lock is released"""
+    manager = ScalpingRiskManager(mock_exchange, risk_params)
+    await manager.initialize()
+    for i, symbol in enumerate(['BTCUSDT', 'ETHUSDT']):
+        await manager.register_position(symbol=symbol, side='BUY', quantity=0.1, entry_price=100.0,
+                                        leverage=5.0, order_id=f'order_{i}')
+    mock_exchange.positions = [
+        {'symbol': 'ETHUSDT', 'positionAmt': '0', 'unRealizedProfit': '0', 'marginRatio': '0', 'markPrice': '0'},
+        {'symbol': 'ETHUSDT', 'positionAmt': '0.1', 'unRealizedProfit': '-1.0', 'marginRatio': '0.95', 'markPrice': '99.0'},
+        {'symbol': 'BTCUSDT', 'positionAmt': '0.1', 'unRealizedProfit': '2.0', 'marginRatio': '0.1', 'markPrice': '101.0'},
+    ]
+    
+    lock_held = []
+    async def record_exit(position, exit_type):
+        lock_held.append(manager._lock.locked())
+    
+    with patch.object(manager, '_execute_exit_order', side_effect=record_exit):
+        await manager.update_positions()
+    
+    assert lock_held == [False]
+    assert list(manager.positions) == ['order_0']
+    assert manager.positions['order_0'].unrealized_pnl == 2.0
+
+@pytest.mark.asyncio
+async def test_reconciliation_drops_positions_closed_elsewhere(mock_exchange, risk_params):
+    """A tracked position missing from the exchange is dropped after repeated misses"""
+    manager = ScalpingRiskManager(mock_exchange, risk_params)
+    await manager.initialize()
+    await manager.register_position(symbol='BTCUSDT', side='BUY', quantity=0.1, entry_price=50000.0,
+                                    leverage=5.0, order_id='order_0')
+    mock_exchange.positions = []
+    
+    from core.risk_management.scalping_risk_manager import MISSING_POSITION_UPDATES
+    for _ in range(MISSING_POSITION_UPDATES - 1):
+        await manager.update_positions()
+    assert 'order_0' in manager.positions
+    await manager.update_positions()
+    assert manager.positions == {}
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Tests for the priority-tiered scan scheduler
+"""
+
+import sys
+import os
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.scan_scheduler import ScanScheduler, TICKERS_WEIGHT
+from core.volatility_scanner import AdvancedVolatilityScanner
+from tests.test_candle_buffer import random_bars
+
+
+def test_tiers_set_rescan_intervals():
+    scheduler = ScanScheduler(weight_budget=1000, max_concurrency=4)
+    scheduler.record('HOT/USDT', 80, now=0)
+    scheduler.record('WARM/USDT', 40, now=0)
+    scheduler.record('DORMANT/USDT', 5, now=0)
+    pool = ['HOT/USDT', 'WARM/USDT', 'DORMANT/USDT', 'NEW/USDT']
+
+    assert scheduler.due(pool, now=1) == ['NEW/USDT']
+    assert scheduler.due(pool, now=6) == ['NEW/USDT', 'HOT/USDT']
+    assert scheduler.due(pool, now=20) == ['NEW/USDT', 'HOT/USDT', 'WARM/USDT']
+    assert set(scheduler.due(pool, now=301)) == set(pool)
+    assert scheduler.seconds_until_next(pool[:3], now=2) == pytest.approx(3)
+
+
+def test_budget_caps_scans_and_candidates_rotate():
+    """Only what fits in the minute's weight is handed out; deferred pairs go first next time"""
+    scheduler = ScanScheduler(weight_budget=10, max_concurrency=4)
+    pool = [f'P{i}/USDT' for i in range(8)]
+
+    first = scheduler.due(pool, now=0, cost=lambda symbol: 2)
+    assert first == pool[:5]
+    for symbol in first:
+        scheduler.spend(2, now=0)
+        scheduler.record(symbol, 0, now=0)
+
+    assert scheduler.due(pool, now=30, cost=lambda symbol: 2) == []
+    second = scheduler.due(pool, now=301, cost=lambda symbol: 2)
+    assert second == pool[5:] + pool[:2]
+
+
+class TieredExchange:
+    """Serves a fixed bar history and counts concurrent klines requests"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.in_flight = 0
+        self.peak = 0
+        self.ohlcv_calls = []
+
+    def parse_timeframe(self, timeframe):
+        return 300
+
+    def milliseconds(self):
+        return self.rows[-1][0]
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.ohlcv_calls.append(symbol)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        return [row for row in self.rows if since is None or row[0] >= since][-limit:]
+
+    async def fetch_tickers(self, symbols):
+        return {symbol: {'bid': 99.9, 'ask': 100.1, 'quoteVolume': 5e7} for symbol in symbols}
+
+
+@pytest.mark.asyncio
+async def test_scanner_scans_due_pairs_within_concurrency_cap():
+    exchange = TieredExchange(random_bars(520))
+    scanner = AdvancedVolatilityScanner('key', 'secret')
+    scanner.exchange = exchange
+    scanner.scheduler = ScanScheduler(weight_budget=5 * 12 + TICKERS_WEIGHT, max_concurrency=3)
+    scanner.active_pairs = {f'A{i}/USDT' for i in range(6)}
+    scanner.dormant_pairs = {f'D{i}/USDT' for i in range(10)}
+
+    profiles = await scanner.scan_all_pairs()
+    assert len(profiles) == 12  # Full history loads cost 5 each
+    assert exchange.peak == 3
+    assert set(scanner.scheduler.last_scanned) >= scanner.active_pairs
+
+    # Nothing is due again straight away
+    exchange.ohlcv_calls.clear()
+    assert await scanner.scan_all_pairs() == []
+    assert exchange.ohlcv_calls == []
+
+
+@pytest.mark.asyncio
+async def test_cross_sectional_scan_refreshes_within_budget_and_cap():
+    """The universe pass only refreshes due pairs the budget covers, under the concurrency cap"""
+    exchange = TieredExchange(random_bars(520))
+    scanner = AdvancedVolatilityScanner('key', 'secret', cross_sectional=True)
+    scanner.exchange = exchange
+    scanner.scheduler = ScanScheduler(weight_budget=5 * 8 + TICKERS_WEIGHT, max_concurrency=3)
+    scanner.monitored_pairs = {f'P{i}/USDT' for i in range(12)}
+
+    profiles = await scanner.scan_all_pairs()
+    assert len(exchange.ohlcv_calls) == 8 and len(profiles) == 8  # Full history loads cost 5 each
+    assert exchange.peak == 3
+    assert scanner.scheduler.budget_remaining() == 0
+
+    # Nothing is due again straight away, and the spent budget holds back the rest
+    exchange.ohlcv_calls.clear()
+    assert await scanner.scan_all_pairs() == []
+    assert exchange.ohlcv_calls == []
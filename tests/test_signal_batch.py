@@ -0,0 +1,63 @@
+"""
+Tests for batch signal risk evaluation
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.risk_manager import RiskManager
+from core.signal_batch import normalize_signal
+
+
+def signal(symbol, action, confidence, **fields):
+    return {'symbol': symbol, 'action': action, 'confidence': confidence, 'price': 100.0, **fields}
+
+
+def test_normalization_accepts_generator_and_uhf_fields():
+    """entry_price/side sources pass the filter and come back with both price fields"""
+    manager = RiskManager()
+    generator = {'symbol': 'ETHUSDT', 'action': 'long', 'confidence': 0.8, 'entry_price': 2000.0}
+    uhf = {'symbol': 'AXSUSDT', 'side': 'BUY', 'confidence': 0.7, 'entry_price': 7.5}
+
+    approved = manager.filter_signals([generator, uhf])
+    assert [s['symbol'] for s in approved] == ['ETHUSDT', 'AXSUSDT']
+    assert approved[0]['price'] == approved[0]['entry_price'] == 2000.0
+    assert approved[1]['action'] == 'BUY'
+    assert 'price' not in generator
+    assert normalize_signal({'symbol': 'ETHUSDT', 'current_price': 5.0})['entry_price'] == 5.0
+
+
+def test_rules_and_reasons():
+    """Each rejected signal carries the first rule that rejected it"""
+    manager = RiskManager()
+    signals = [
+        signal('ETHUSDT', 'buy', 0.9),
+        signal('ETHUSDT', 'buy', 0.6),   # second on the symbol
+        signal('ETHUSDT', 'sell', 0.5),  # loses to the long side
+        signal('AXSUSDT', 'buy', 0.1),   # low confidence
+        signal('SOLUSDT', 'close', 0.9),
+        {'symbol': 'BTCUSDT', 'action': 'buy'},
+        'not a signal'
+    ]
+    decisions = manager.evaluate_signals(signals)
+
+    assert decisions.approved.tolist() == [True, False, False, False, False, False, False]
+    assert decisions.reasons == ['', 'symbol_cap', 'conflicting_direction', 'low_confidence',
+                                 'not_an_entry', 'missing_fields', 'missing_fields']
+
+
+def test_trade_budget_keeps_highest_confidence():
+    """Only the remaining daily budget is approved, best signals first"""
+    manager = RiskManager()
+    for _ in range(33):
+        manager.record_trade()
+    signals = [signal(f"S{i}USDT", 'buy', 0.4 + i / 10) for i in range(4)]
+
+    decisions = manager.evaluate_signals(signals)
+    assert decisions.approved.tolist() == [False, False, True, True]
+    assert decisions.rejection_counts() == {'trade_budget': 2}
+
+    manager.emergency_mode = True
+    assert manager.filter_signals(signals) == []
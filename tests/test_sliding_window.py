@@ -0,0 +1,71 @@
+"""
+Tests for the sliding-window counters
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.sliding_window import SlidingWindowCounter, TradeWindows
+from core.leverage_manager import LeverageManager
+from core.risk_manager import RiskManager
+
+
+def test_counts_expire_with_the_window():
+    """Events leave the window one slot after it passes them"""
+    window = SlidingWindowCounter(60, buckets=60)
+    window.add(2.0, timestamp=1000.0)
+    window.add(-1.0, timestamp=1030.0)
+    window.add(0.0, timestamp=1031.0)
+
+    assert window.count(now=1031.0) == 3
+    assert window.total(now=1031.0) == pytest.approx(1.0)
+    assert (window.wins(now=1031.0), window.losses(now=1031.0)) == (1, 1)
+
+    assert window.count(now=1060.0) == 2
+    assert window.win_rate(now=1060.0) == 0.0
+    assert window.count(now=1100.0) == 0
+    assert window.win_rate(now=1100.0) == 0.5
+
+
+def test_matches_brute_force_over_random_stream():
+    """Counts and sums equal a scan over the events in the bucketed window"""
+    rng = np.random.default_rng(11)
+    window = SlidingWindowCounter(3600, buckets=60)
+    events, now = [], 0.0
+
+    for _ in range(2000):
+        now += rng.exponential(20)
+        value = rng.normal()
+        window.add(value, timestamp=now)
+        events.append((now, value))
+
+        start = (np.floor(now / 60) - 59) * 60
+        inside = [v for t, v in events if t >= start]
+        assert window.count(now) == len(inside)
+        assert window.total(now) == pytest.approx(sum(inside), abs=1e-9)
+        assert window.wins(now) == sum(v > 0 for v in inside)
+
+
+def test_managers_use_rolling_windows():
+    """Trade budget and win rate come from the windows rather than list scans"""
+    risk = RiskManager()
+    for _ in range(3):
+        risk.record_trade()
+    assert risk.daily_trades_count == 3
+    assert risk.get_risk_metrics()['trades_last_hour'] == 3
+
+    leverage = LeverageManager()
+    assert leverage._calculate_recent_win_rate() == 0.5
+    for pnl in (5, -2, 3, 1):
+        leverage.add_trade_result({'pnl_usd': pnl})
+    assert leverage._calculate_recent_win_rate() == pytest.approx(0.75)
+
+    windows = TradeWindows()
+    windows.record(1.0, timestamp=0.0)
+    assert windows.snapshot(now=120.0)['1m']['count'] == 0
+    assert windows.snapshot(now=120.0)['1h']['count'] == 1
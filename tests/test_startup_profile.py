@@ -0,0 +1,126 @@
+"""
+Tests for startup profiling and deferred imports
+"""
+
+import sys
+import os
+import importlib
+import textwrap
+from enum import Enum
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.lazy_import import LazyAttribute, lazy_import, resolve
+from core.startup_profile import ImportTimer, StartupProfile
+
+
+@pytest.fixture
+def module_dir(tmp_path, monkeypatch):
+    """A throwaway package whose modules record when they are executed"""
+    package = tmp_path / 'bootpkg'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'leaf.py').write_text(textwrap.dedent('''
+        import time
+        LOADS = []
+        time.sleep(0.02)
+        LOADS.append('leaf')
+    '''))
+    (package / 'heavy.py').write_text(textwrap.dedent('''
+        import time
+        from bootpkg import leaf
+        time.sleep(0.03)
+        leaf.LOADS.append('heavy')
+
+        class Engine:
+            def __init__(self, name):
+                self.name = name
+
+            def describe(self):
+                return f"engine {self.name}"
+
+        engine = Engine('global')
+    '''))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield package
+    for name in [name for name in sys.modules if name.startswith('bootpkg')]:
+        del sys.modules[name]
+
+
+def test_import_timer_splits_self_and_cumulative_time(module_dir):
+    timer = ImportTimer()
+    timer.install()
+    try:
+        heavy = importlib.import_module('bootpkg.heavy')
+    finally:
+        timer.uninstall()
+    assert not timer.installed
+
+    records = {record.module: record for record in timer.records}
+    assert {'bootpkg', 'bootpkg.leaf', 'bootpkg.heavy'} <= set(records)
+    leaf, parent = records['bootpkg.leaf'], records['bootpkg.heavy']
+    assert leaf.depth == parent.depth + 1
+    assert leaf.cumulative_ms >= 20
+    assert parent.cumulative_ms >= leaf.cumulative_ms + 30
+    assert parent.self_ms == pytest.approx(parent.cumulative_ms - leaf.cumulative_ms, abs=1.0)
+    assert timer.slowest(1)[0].module in ('bootpkg', 'bootpkg.heavy')
+
+    # Modules keep their real loaders once imported
+    assert type(heavy.__loader__).__name__ == 'SourceFileLoader'
+    assert heavy.__spec__.loader is heavy.__loader__
+
+
+def test_profile_reports_phases_and_imports(module_dir):
+    profile = StartupProfile()
+    profile.start()
+    with profile.phase('modules'):
+        importlib.import_module('bootpkg.heavy')
+    profile.mark('health_server_started')
+    report = profile.report()
+    assert not report['completed']
+
+    profile.finish()
+    report = profile.report(top=2)
+    assert report['completed'] and not profile.imports.installed
+    assert report['phases_ms']['modules'] >= 50
+    assert report['milestones_ms']['ready'] >= report['milestones_ms']['health_server_started']
+    assert len(report['slowest_imports']) == 2
+    assert 'bootpkg.heavy' in profile.format_report()
+
+
+def test_lazy_attribute_imports_on_first_use(module_dir):
+    Engine = lazy_import('bootpkg.heavy', 'Engine')
+    engine = lazy_import('bootpkg.heavy', 'engine')
+    assert isinstance(engine, LazyAttribute)
+    assert 'bootpkg.heavy' not in sys.modules
+    assert 'not loaded' in repr(engine)
+
+    assert engine.describe() == 'engine global'
+    assert 'bootpkg.heavy' in sys.modules and engine.loaded
+    assert Engine('local').describe() == 'engine local'
+
+    engine.name = 'renamed'
+    real = resolve(engine)
+    assert real.name == 'renamed' and type(real).__name__ == 'Engine'
+    assert resolve(real) is real
+
+
+class Color(Enum):
+    RED = 'red'
+
+
+def test_lazy_enum_members_compare_equal():
+    Color = lazy_import('tests.test_startup_profile', 'Color')
+    assert Color.RED == Color.RED and Color.RED is resolve(Color).RED
+    with pytest.raises(AttributeError):
+        Color.PURPLE
+
+
+def test_health_endpoint_serves_startup_report():
+    from api.health import app
+    response = app.test_client().get('/health/startup')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert {'completed', 'phases_ms', 'slowest_imports'} <= set(body)
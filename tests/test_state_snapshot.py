@@ -0,0 +1,118 @@
+"""
+Tests for warm-start state snapshots
+"""
+
+import sys
+import os
+import time
+import asyncio
+from datetime import datetime
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.correlation_engine import CorrelationEngine
+from core.data_collector import DataCollector
+from core.market_regime_detector import MarketRegimeDetector
+from core.state_snapshot import SNAPSHOT_MAGIC, StateSnapshotter
+
+
+class Counter:
+    """Minimal snapshot component"""
+
+    def __init__(self, value=0):
+        self.value = value
+
+    def export_state(self):
+        return {'value': self.value}
+
+    def restore_state(self, state):
+        self.value = state['value']
+
+
+def test_snapshot_round_trip_is_atomic_and_compact(tmp_path):
+    path = str(tmp_path / 'warm.snapshot')
+    snapshotter = StateSnapshotter(path=path, interval=60, max_age=60)
+    snapshotter.register('counter', Counter(7))
+    assert asyncio.run(snapshotter.save())
+
+    with open(path, 'rb') as handle:
+        assert handle.read().startswith(SNAPSHOT_MAGIC)
+    assert os.listdir(tmp_path) == ['warm.snapshot']  # No temporary files left behind
+    assert snapshotter.stats['saves'] == 1 and snapshotter.stats['last_size_bytes'] > 0
+
+    restored = Counter()
+    fresh = StateSnapshotter(path=path, max_age=60)
+    fresh.register('counter', restored)
+    fresh.register('unknown', Counter(3))
+    assert fresh.restore() == {'counter': True}
+    assert restored.value == 7 and fresh.restored_from is not None
+
+
+def test_stale_or_corrupt_snapshots_are_ignored(tmp_path):
+    path = str(tmp_path / 'warm.snapshot')
+    snapshotter = StateSnapshotter(path=path, max_age=60)
+    snapshotter.register('counter', Counter(1))
+    snapshot = snapshotter.collect()
+    snapshot['saved_at'] = time.time() - 120
+    snapshotter.write(snapshot)
+    assert snapshotter.load() is None
+    assert snapshotter.restore() == {} and snapshotter.restored_from is None
+
+    with open(path, 'wb') as handle:
+        handle.write(SNAPSHOT_MAGIC + b'truncated')
+    assert snapshotter.load() is None
+
+    assert StateSnapshotter(path=str(tmp_path / 'missing.snapshot')).load() is None
+
+
+def test_stop_takes_final_snapshot(tmp_path):
+    path = str(tmp_path / 'warm.snapshot')
+    snapshotter = StateSnapshotter(path=path, interval=3600, max_age=60)
+    counter = Counter(1)
+    snapshotter.register('counter', counter)
+
+    async def run_then_stop():
+        task = asyncio.create_task(snapshotter.run())
+        await asyncio.sleep(0)
+        counter.value = 5
+        await snapshotter.stop()
+        task.cancel()
+
+    asyncio.run(run_then_stop())
+    assert snapshotter.load()['components']['counter'] == {'value': 5}
+
+
+def test_components_resume_from_snapshot(tmp_path):
+    path = str(tmp_path / 'warm.snapshot')
+    engine = CorrelationEngine(window_size=20)
+    engine.price_history = {'BTCUSDT': [100.0 + i for i in range(40)]}
+    engine.correlation_history = {'ETHUSDT': [0.5, 0.6]}
+    collector = DataCollector(['BTCUSDT'])
+    now = datetime.now().replace(microsecond=0)
+    collector.data_buffer['BTCUSDT'] = [
+        {'timestamp': now, 'price': 100.0, 'volume': 5.0, 'bid': None, 'ask': 100.5}
+    ]
+    detector = MarketRegimeDetector()
+    detector.regime_history = [{'regime': 'trending'}]
+    detector.regime_confidence = 0.8
+
+    snapshotter = StateSnapshotter(path=path, max_age=60)
+    for name, component in (('correlation', engine), ('collector', collector), ('regime', detector)):
+        snapshotter.register(name, component)
+    snapshotter.write(snapshotter.collect())
+
+    engine2, collector2, detector2 = CorrelationEngine(window_size=20), DataCollector(['BTCUSDT']), MarketRegimeDetector()
+    live_point = {'timestamp': now, 'price': 101.0, 'volume': 1.0, 'bid': 100.9, 'ask': 101.1}
+    collector2.data_buffer['BTCUSDT'].append(live_point)
+    restorer = StateSnapshotter(path=path, max_age=60)
+    for name, component in (('correlation', engine2), ('collector', collector2), ('regime', detector2)):
+        restorer.register(name, component)
+    assert restorer.restore() == {'correlation': True, 'collector': True, 'regime': True}
+
+    assert engine2.price_history == engine.price_history and engine2.history_as_of_ms is not None
+    assert engine2.correlation_history == {'ETHUSDT': [0.5, 0.6]}
+    assert collector2.data_buffer['BTCUSDT'] == collector.data_buffer['BTCUSDT'] + [live_point]
+    assert detector2.regime_history == [{'regime': 'trending'}] and detector2.regime_confidence == 0.8
+
@@ -0,0 +1,87 @@
+"""
+Tests for the vectorized portfolio stress engine
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.portfolio_risk import portfolio_risk_engine
+from core.stress_engine import StressEngine
+
+
+def long_position(symbol, quantity=1.0, price=100.0, leverage=5):
+    return {'symbol': symbol, 'side': 'buy', 'quantity': quantity, 'entry_price': price,
+            'mark_price': price, 'leverage': leverage}
+
+
+def test_historical_replay_and_funding_losses():
+    """Replayed days and funding spikes give exact PnL on the book"""
+    engine = StressEngine(correlated_scenarios=100)
+    engine.set_history({'STRESSAUSDT': [0.01, -0.10, 0.02]}, labels=['d1', 'd2', 'd3'])
+
+    result = engine.run([long_position('STRESSAUSDT')], balance=1000.0)
+
+    assert result.by_source['historical']['scenarios'] == 3
+    assert result.by_source['historical']['worst_loss'] == pytest.approx(100.0 * -np.expm1(-0.10))
+    assert result.by_source['funding']['worst_loss'] == pytest.approx(100.0 * max(engine.funding_spikes))
+    assert result.scenarios == 3 + 100 + len(engine.funding_spikes)
+
+
+def test_symbols_without_history_follow_the_market():
+    """A symbol missing from the replay history takes the cross-sectional mean move"""
+    engine = StressEngine(correlated_scenarios=10)
+    engine.set_history({'STRESSAUSDT': [-0.2], 'STRESSBUSDT': [0.0]}, labels=['crash'])
+
+    result = engine.run([long_position('STRESSCUSDT')], balance=1000.0)
+    assert result.by_source['historical']['worst_loss'] == pytest.approx(100.0 * -np.expm1(-0.1))
+
+
+def test_unified_symbols_replay_their_own_history_without_touching_live_risk():
+    """A ccxt unified position symbol meets its market-id history; the live engine gains no symbols"""
+    engine = StressEngine(correlated_scenarios=10)
+    engine.set_history({'STRESSAUSDT': [-0.2], 'STRESSBUSDT': [0.0]}, labels=['crash'])
+    tracked = list(portfolio_risk_engine.symbols)
+
+    result = engine.run([long_position('STRESSA/USDT:USDT')], balance=1000.0,
+                        candidate={'symbol': 'STRESSD/USDT:USDT', 'notional': 100.0})
+
+    assert result.by_source['historical']['worst_loss'] == pytest.approx(
+        100.0 * -np.expm1(-0.2) + 100.0 * -np.expm1(-0.1))
+    assert portfolio_risk_engine.symbols == tracked
+
+
+def test_leverage_drives_liquidations_and_candidate_is_included():
+    """A crash liquidates a thinly margined account and the highly levered positions"""
+    engine = StressEngine(correlated_scenarios=10)
+    engine.set_history({'STRESSAUSDT': [-0.3]}, labels=['crash'])
+    book = [long_position('STRESSAUSDT', quantity=10, leverage=20)]
+
+    result = engine.run(book, balance=200.0)
+    assert result.worst_scenario == 'historical:crash'
+    assert result.positions_liquidated_worst == 1
+    assert result.min_equity < 0
+    assert result.by_source['historical']['liquidating_scenarios'] == 1
+
+    with_candidate = engine.run(book, balance=200.0, candidate={
+        'symbol': 'STRESSAUSDT', 'notional': 1000.0, 'leverage': 20})
+    assert with_candidate.positions_liquidated_worst == 2
+    assert with_candidate.worst_loss > result.worst_loss
+
+
+def test_thousands_of_scenarios_within_budget():
+    """Twenty positions against 5000+ scenarios stays well under 50 ms"""
+    rng = np.random.default_rng(3)
+    symbols = [f"STRESS{i}USDT" for i in range(20)]
+    engine = StressEngine(correlated_scenarios=5000)
+    engine.set_history({symbol: rng.normal(0, 0.04, 365) for symbol in symbols})
+    book = [long_position(symbol) for symbol in symbols]
+
+    engine.run(book, balance=5000.0)
+    timings = [engine.run(book, balance=5000.0).elapsed_ms for _ in range(5)]
+    assert engine.last_result.scenarios >= 5000
+    assert min(timings) < 50